@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the rrweb batch decoder.
+
+Writes a synthetic recording (gzipped NDJSON batches, 500 MB of decompressed
+events by default) and measures events/sec for:
+
+  line-by-line  gzip text mode and json.loads per line (the previous loader)
+  decoder       event_decoder block parsing with sampled validation
+  passthrough   event_decoder raw NDJSON blocks, decompressed but not parsed
+
+Events are counted and dropped batch by batch, so memory use stays at one
+batch regardless of the recording size.
+
+Usage:
+    python benchmark_event_decoder.py [OPTIONS]
+
+Examples:
+    python benchmark_event_decoder.py
+    python benchmark_event_decoder.py --size-mb 50 --repeat 3
+    python benchmark_event_decoder.py --dir /tmp/replay-bench --keep
+"""
+
+import argparse
+import gzip
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from event_decoder import (  # noqa: E402
+    JSON_BACKEND,
+    SAMPLE_INTERVAL,
+    iter_decoded_blocks,
+    iter_raw_blocks,
+)
+from recording_cache import batch_sort_key  # noqa: E402
+
+BASE_TIMESTAMP = 1_700_000_000_000
+
+
+def _full_snapshot(timestamp: int, rng: random.Random) -> dict:
+    """A type 2 event with a DOM tree of a few hundred nodes"""
+    nodes = [
+        {
+            "type": 2,
+            "tagName": rng.choice(["div", "span", "a", "p", "li"]),
+            "attributes": {"class": f"c{rng.randrange(1000)}", "id": f"n{i}"},
+            "childNodes": [
+                {
+                    "type": 3,
+                    "textContent": "lorem ipsum " * rng.randrange(1, 6),
+                    "id": i * 2 + 1,
+                }
+            ],
+            "id": i * 2,
+        }
+        for i in range(300)
+    ]
+    return {
+        "type": 2,
+        "data": {
+            "node": {"type": 0, "childNodes": nodes, "id": 1},
+            "initialOffset": {"left": 0, "top": 0},
+        },
+        "timestamp": timestamp,
+    }
+
+
+def _incremental(timestamp: int, rng: random.Random) -> dict:
+    """A type 3 event: mouse moves, scrolls or small DOM mutations"""
+    source = rng.choice([0, 1, 3])
+    if source == 1:
+        data = {
+            "source": 1,
+            "positions": [
+                {
+                    "x": rng.randrange(1920),
+                    "y": rng.randrange(1080),
+                    "id": rng.randrange(600),
+                    "timeOffset": -k * 16,
+                }
+                for k in range(rng.randrange(1, 8))
+            ],
+        }
+    elif source == 3:
+        data = {
+            "source": 3,
+            "id": rng.randrange(600),
+            "x": 0,
+            "y": rng.randrange(20000),
+        }
+    else:
+        data = {
+            "source": 0,
+            "texts": [],
+            "attributes": [
+                {"id": rng.randrange(600), "attributes": {"style": "opacity: 0.5"}}
+            ],
+            "removes": [],
+            "adds": [
+                {
+                    "parentId": rng.randrange(600),
+                    "nextId": None,
+                    "node": {
+                        "type": 3,
+                        "textContent": "updated " * rng.randrange(1, 10),
+                        "id": rng.randrange(600, 100000),
+                    },
+                }
+            ],
+        }
+    return {"type": 3, "data": data, "timestamp": timestamp}
+
+
+def write_recording(directory: Path, size_mb: int, batch_mb: int, seed: int) -> None:
+    """Write batch-N.ndjson.gz files until size_mb of NDJSON has been written"""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    batch_target = batch_mb * 1024 * 1024
+    timestamp = BASE_TIMESTAMP
+    written = 0
+    batch = 0
+    while written < target:
+        batch_written = 0
+        with gzip.open(
+            directory / f"batch-{batch}.ndjson.gz", "wb", compresslevel=6
+        ) as f:
+            lines = [_full_snapshot(timestamp, rng)]
+            while batch_written < batch_target and written + batch_written < target:
+                timestamp += rng.randrange(5, 50)
+                lines.append(_incremental(timestamp, rng))
+                if len(lines) >= 1000:
+                    data = "".join(json.dumps(event) + "\n" for event in lines).encode(
+                        "utf-8"
+                    )
+                    f.write(data)
+                    batch_written += len(data)
+                    lines = []
+            if lines:
+                data = "".join(json.dumps(event) + "\n" for event in lines).encode(
+                    "utf-8"
+                )
+                f.write(data)
+                batch_written += len(data)
+        written += batch_written
+        batch += 1
+
+
+def run_line_by_line(path: Path) -> tuple:
+    events = 0
+    size = 0
+    with gzip.open(path, "rt") as f:
+        for line in f:
+            if line.strip():
+                json.loads(line)
+                events += 1
+                size += len(line)
+    return events, size
+
+
+def run_decoder(path: Path) -> tuple:
+    events = 0
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter_decoded_blocks(f):
+            events += len(block.events)
+            size += len(block.raw)
+    return events, size
+
+
+def run_passthrough(path: Path) -> tuple:
+    events = 0
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter_raw_blocks(f):
+            events += block.count(b"\n")
+            size += len(block)
+    return events, size
+
+
+def measure(name: str, fn: Callable, batches: List[Path], repeat: int) -> dict:
+    """Best of repeat runs over the whole recording"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events = 0
+        size = 0
+        for path in batches:
+            batch_events, batch_size = fn(path)
+            events += batch_events
+            size += batch_size
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best["seconds"]:
+            best = {"name": name, "seconds": elapsed, "events": events, "bytes": size}
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark rrweb batch decoding throughput"
+    )
+    parser.add_argument(
+        "--size-mb",
+        type=int,
+        default=500,
+        help="Decompressed recording size (default: 500)",
+    )
+    parser.add_argument(
+        "--batch-mb",
+        type=int,
+        default=10,
+        help="Decompressed size per batch (default: 10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per mode, best is reported (default: 1)",
+    )
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        help="Directory for the synthetic recording (default: a temp dir)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the synthetic recording afterwards"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    directory = args.dir or Path(tempfile.mkdtemp(prefix="replay-bench-"))
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        batches = sorted(
+            directory.glob("batch-*.ndjson.gz"),
+            key=lambda path: batch_sort_key(path.name),
+        )
+        if not batches:
+            print(f"Writing {args.size_mb} MB synthetic recording to {directory} ...")
+            start = time.perf_counter()
+            write_recording(directory, args.size_mb, args.batch_mb, args.seed)
+            batches = sorted(
+                directory.glob("batch-*.ndjson.gz"),
+                key=lambda path: batch_sort_key(path.name),
+            )
+            print(f"  {len(batches)} batches in {time.perf_counter() - start:.1f}s")
+        compressed = sum(path.stat().st_size for path in batches)
+
+        print(
+            f"JSON backend: {JSON_BACKEND}, sample interval: {SAMPLE_INTERVAL}, "
+            f"compressed size: {compressed / 1024 / 1024:.1f} MB\n"
+        )
+        results = [
+            measure("line-by-line", run_line_by_line, batches, args.repeat),
+            measure("decoder", run_decoder, batches, args.repeat),
+            measure("passthrough", run_passthrough, batches, args.repeat),
+        ]
+
+        baseline = results[0]["seconds"]
+        print(
+            f"{'mode':<14}{'events':>12}{'seconds':>10}{'events/s':>14}{'MB/s':>9}{'speedup':>9}"
+        )
+        for result in results:
+            seconds = result["seconds"]
+            print(
+                f"{result['name']:<14}{result['events']:>12,}{seconds:>10.2f}"
+                f"{result['events'] / seconds:>14,.0f}{result['bytes'] / 1024 / 1024 / seconds:>9.1f}"
+                f"{baseline / seconds:>8.2f}x"
+            )
+    finally:
+        if not args.keep and args.dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,12 +35,10 @@ import webbrowser
 import socket
 import signal
 import shutil
-import gzip
-import io
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, Tuple
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
 import mimetypes
 
@@ -57,6 +55,7 @@ from bedrock_agentcore.tools.browser_client import BrowserClient
 from bedrock_agentcore._utils.endpoints import get_control_plane_endpoint
 from .browser_viewer_replay import BrowserViewerServer
 from .session_replay_viewer import S3DataSource, SessionReplayViewer, SessionReplayHandler
+from .recording_cache import RecordingCache, S3ObjectStore
 
 # Initialize console
 console = Console()
@@ -324,9 +323,11 @@ def view_recordings(s3_location):
                 self.session_id = session_id
                 self.session_prefix = f"{prefix}/{session_id}"
                 self.temp_dir = Path(tempfile.mkdtemp(prefix='bedrock_agentcore_replay_'))
+                self.recording_cache = RecordingCache(S3ObjectStore(self.s3_client))
                 
             def cleanup(self):
                 """Clean up temp files"""
+                self.recording_cache.shutdown()
                 if self.temp_dir.exists():
                     shutil.rmtree(self.temp_dir)
             
@@ -417,55 +418,28 @@ def view_recordings(s3_location):
                     except Exception as e:
                         print(f"⚠️ No metadata found: {e}")
                     
-                    # Get batch files from metadata ta if possible
-                    batch_files = []
+                    # List batch files with their ETags; the decoded cache is keyed by them
+                    batches = self.recording_cache.list_batches(self.bucket, f"{self.session_prefix}/")
+                    
+                    # Use the batch order from metadata if possible
                     if 'batches' in metadata and isinstance(metadata['batches'], list):
-                        for batch in metadata['batches']:
-                            if 'file' in batch:
-                                batch_files.append(f"{self.session_prefix}/{batch['file']}")
+                        by_key = {obj.key: obj for obj in batches}
+                        listed = [by_key.get(f"{self.session_prefix}/{batch['file']}")
+                                  for batch in metadata['batches'] if 'file' in batch]
+                        if listed and all(listed):
+                            batches = listed
                     
-                    # If no batch files found in metadata, look for them directly
-                    if not batch_files:
-                        response = self.s3_client.list_objects_v2(
-                            Bucket=self.bucket,
-                            Prefix=f"{self.session_prefix}/batch-"
-                        )
-                        
-                        if 'Contents' in response:
-                            batch_files = [obj['Key'] for obj in response['Contents']]
+                    print(f"Processing {len(batches)} batch files: {[obj.key for obj in batches]}")
                     
-                    all_events = []
-                    print(f"Processing {len(batch_files)} batch files: {batch_files}")
+                    def report_error(obj, error):
+                        print(f"⚠️ Error processing file {obj.key}: {error}")
                     
-                    for key in batch_files:
-                        try:
-                            print(f"Downloading batch file: {key}")
-                            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                            
-                            # Try to read as gzipped JSON lines
-                            with gzip.GzipFile(fileobj=io.BytesIO(response['Body'].read())) as gz:
-                                content = gz.read().decode('utf-8')
-                                print(f"Read {len(content)} bytes of content")
-                                
-                                # Process each line as a JSON event
-                                for line in content.splitlines():
-                                    if line.strip():
-                                        try:
-                                            event = json.loads(line)
-                                            # Validate event
-                                            if 'type' in event and 'timestamp' in event:
-                                                all_events.append(event)
-                                            else:
-                                                print(f"⚠️ Skipping invalid event (missing required fields)")
-                                        except json.JSONDecodeError as je:
-                                            print(f"⚠️ Invalid JSON in line: {line[:50]}...")
-                                            
-                                print(f"  Added {len(all_events)} events")
-                                            
-                        except Exception as e:
-                            print(f"⚠️ Error processing file {key}: {e}")
-                            import traceback
-                            traceback.print_exc()
+                    # Batches download and decompress in parallel; cached batches are read from disk
+                    all_events = self.recording_cache.load_events(
+                        batches,
+                        on_batch=lambda obj: print(f"  Loaded batch file: {obj.key}"),
+                        on_error=report_error
+                    )
                     
                     print(f"✅ Loaded {len(all_events)} events")
                     
@@ -514,23 +488,11 @@ def view_recordings(s3_location):
                 """Return list of recordings - FIX FOR HTML RESPONSE ISSUE"""
                 try:
                     recordings = self.data_source.list_recordings()
-                    response = json.dumps(recordings)
                     
                     # Debug output to see what we're returning
-                    print(f"Serving recordings list: {response[:100]}...")
-                    
-                    # Ensure proper content type and headers
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.send_header('Content-Length', str(len(response)))
-                    # Add CORS headers to prevent issues
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                    self.send_header('Access-Control-Allow-Headers', '*')
-                    self.end_headers()
+                    print(f"Serving recordings list: {json.dumps(recordings)[:100]}...")
                     
-                    # Write the response as bytes
-                    self.wfile.write(response.encode('utf-8'))
+                    self.send_json(200, recordings)
                     
                 except Exception as e:
                     print(f"❌ Error in serve_recordings_list: {e}")
@@ -538,16 +500,10 @@ def view_recordings(s3_location):
                     traceback.print_exc()
                     
                     # Return a proper error response as JSON with empty recordings array
-                    error_response = json.dumps({
+                    self.send_json(200, {  # Use 200 so client can process the error
                         "error": str(e),
                         "recordings": []
                     })
-                    self.send_response(200)  # Use 200 so client can process the error
-                    self.send_header('Content-Type', 'application/json')
-                    self.send_header('Content-Length', str(len(error_response)))
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(error_response.encode('utf-8'))
             
             def download_and_serve_recording(self, recording_id):
                 """Download recording and serve it - FIX FOR HTML RESPONSE ISSUE"""
@@ -555,52 +511,25 @@ def view_recordings(s3_location):
                     recording_data = self.data_source.download_recording(recording_id)
                     
                     if recording_data:
-                        response = json.dumps({
+                        self.send_json(200, {
                             'success': True,
                             'data': recording_data
                         })
-                        
-                        self.send_response(200)
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(response)))
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(response.encode('utf-8'))
                     else:
-                        error_response = json.dumps({
+                        self.send_json(404, {
                             'success': False,
                             'error': 'Recording not found'
                         })
-                        self.send_response(404)
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(error_response)))
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(error_response.encode('utf-8'))
                         
                 except Exception as e:
                     print(f"❌ Error in download_and_serve_recording: {e}")
                     import traceback
                     traceback.print_exc()
                     
-                    error_response = json.dumps({
+                    self.send_json(500, {
                         'success': False,
                         'error': str(e)
                     })
-                    self.send_response(500)
-                    self.send_header('Content-Type', 'application/json')
-                    self.send_header('Content-Length', str(len(error_response)))
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(error_response.encode('utf-8'))
-            
-            def do_OPTIONS(self):
-                """Handle OPTIONS requests for CORS preflight"""
-                self.send_response(200)
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', '*')
-                self.end_headers()
 
         # Create custom viewer with our fixed handler
         class CustomSessionReplayViewer(SessionReplayViewer):
@@ -617,7 +546,7 @@ def view_recordings(s3_location):
                     return CustomSessionReplayHandler(self.data_source, self.viewer_path, *args, **kwargs)
                 
                 # Start server
-                self.server = HTTPServer(('', port), handler_factory)
+                self.server = ThreadingHTTPServer(('', port), handler_factory)
                 
                 # Start in thread
                 server_thread = threading.Thread(target=self.server.serve_forever)
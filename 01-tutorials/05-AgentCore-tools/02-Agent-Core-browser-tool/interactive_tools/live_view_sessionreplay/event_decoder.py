@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming decoder for gzipped rrweb NDJSON batches
+
+Batch files are decompressed in blocks of whole lines instead of line by
+line, and each block is parsed with a single call by turning it into a
+JSON array. orjson is used when it is installed. Validation samples every
+SAMPLE_INTERVAL-th event: a block that parses cleanly and passes the sample
+is accepted as is, while anything else is re-parsed line by line and only
+the valid events are kept. Invalid lines are counted, not printed.
+
+Sampling can miss an invalid event. Callers that use every event either
+check them as they go and re-decode the block with decode_lines() when one
+fails, or use validated() (as load_events() does).
+
+Clients that only replay a recording can use iter_raw_blocks() to pass
+the decompressed NDJSON through without parsing it.
+"""
+
+import gzip
+import json
+from typing import Iterator, List, NamedTuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    # Optional: the standard library parser is used instead
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+# Decompressed bytes handled per block
+BLOCK_SIZE = 1024 * 1024
+
+# Check one event in this many when a block parses cleanly; 1 checks every event
+SAMPLE_INTERVAL = 64
+
+
+class DecodedBlock(NamedTuple):
+    """Events of a block and their NDJSON, with invalid lines removed"""
+
+    raw: bytes
+    events: List[dict]
+    invalid: int
+
+
+def is_valid_event(event):
+    """An rrweb event needs a type and a numeric timestamp"""
+    return (
+        isinstance(event, dict)
+        and "type" in event
+        and isinstance(event.get("timestamp"), (int, float))
+    )
+
+
+def iter_line_blocks(fileobj, block_size=BLOCK_SIZE) -> Iterator[bytes]:
+    """Read a binary stream in blocks that end on a line boundary"""
+    pending = b""
+    while True:
+        data = fileobj.read(block_size)
+        if not data:
+            break
+        if pending:
+            data = pending + data
+        cut = data.rfind(b"\n") + 1
+        pending = data[cut:]
+        if cut:
+            yield data[:cut]
+    if pending.strip():
+        yield pending + b"\n"
+
+
+def iter_raw_blocks(fileobj, block_size=BLOCK_SIZE) -> Iterator[bytes]:
+    """Decompress a gzip stream into blocks of NDJSON lines, without parsing them"""
+    with gzip.GzipFile(fileobj=fileobj) as gz:
+        yield from iter_line_blocks(gz, block_size)
+
+
+def _sample_is_valid(events, sample_interval):
+    if not events:
+        return True
+    return all(
+        is_valid_event(event) for event in events[::sample_interval]
+    ) and is_valid_event(events[-1])
+
+
+def decode_lines(block) -> DecodedBlock:
+    """Slow path: parse line by line, keeping the raw bytes of valid events"""
+    events = []
+    lines = []
+    invalid = 0
+    for line in block.splitlines():
+        if not line.strip():
+            continue
+        try:
+            event = _loads(line)
+        except ValueError:
+            invalid += 1
+            continue
+        if is_valid_event(event):
+            events.append(event)
+            lines.append(line)
+        else:
+            invalid += 1
+    raw = b"\n".join(lines) + b"\n" if lines else b""
+    return DecodedBlock(raw, events, invalid)
+
+
+def decode_block(block, sample_interval=SAMPLE_INTERVAL) -> DecodedBlock:
+    """Parse a block of NDJSON lines"""
+    body = block.rstrip(b"\n")
+    if not body.strip():
+        return DecodedBlock(b"", [], 0)
+    try:
+        # JSON strings cannot contain raw newlines, so every newline separates two events
+        events = _loads(b"[" + body.replace(b"\n", b",") + b"]")
+    except ValueError:
+        # A bad or blank line somewhere in the block
+        return decode_lines(block)
+    # A line holding several values (or half of one) would change the count
+    if len(events) != body.count(b"\n") + 1 or not _sample_is_valid(
+        events, sample_interval
+    ):
+        return decode_lines(block)
+    return DecodedBlock(body + b"\n", events, 0)
+
+
+def validated(block: DecodedBlock) -> DecodedBlock:
+    """Check every event of a decoded block, re-decoding it line by line if sampling missed one"""
+    if all(map(is_valid_event, block.events)):
+        return block
+    return decode_lines(block.raw)
+
+
+def iter_decoded_blocks(
+    fileobj, block_size=BLOCK_SIZE, sample_interval=SAMPLE_INTERVAL
+) -> Iterator[DecodedBlock]:
+    """Decompress and parse a gzipped NDJSON stream block by block"""
+    for block in iter_raw_blocks(fileobj, block_size):
+        yield decode_block(block, sample_interval)
+
+
+def load_events(fileobj, sample_interval=SAMPLE_INTERVAL):
+    """All events of a gzipped NDJSON stream and the number of invalid lines skipped"""
+    events = []
+    invalid = 0
+    for block in iter_decoded_blocks(fileobj, sample_interval=sample_interval):
+        block = validated(block)
+        events.extend(block.events)
+        invalid += block.invalid
+    return events, invalid
+
+
+def parse_ndjson(data):
+    """Parse NDJSON bytes that are known to be valid, e.g. a decoded cache entry"""
+    data = data.rstrip(b"\n")
+    return _loads(b"[" + data.replace(b"\n", b",") + b"]") if data else []
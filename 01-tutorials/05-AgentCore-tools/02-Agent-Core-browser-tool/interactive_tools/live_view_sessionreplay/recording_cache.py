@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Concurrent batch download and decoded cache for session recordings
+
+Recordings are stored as gzipped NDJSON batch files (batch-N.ndjson.gz).
+RecordingCache downloads the batches of a recording in parallel through a
+bounded thread pool, decompresses each one while it is being read from the
+response stream, and keeps the decoded, validated event lines on disk keyed
+by (bucket, key, ETag). Opening a recording again reads the decoded files
+instead of going back to S3, and a changed object gets a new ETag and so a
+new cache entry.
+
+The object store is pluggable: S3ObjectStore wraps a boto3 S3 client and
+LocalObjectStore serves a directory laid out like a bucket
+(<root>/<bucket>/<key>), which is enough to try the cache without AWS.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+
+try:
+    from .event_decoder import (
+        decode_lines,
+        iter_decoded_blocks,
+        iter_line_blocks,
+        parse_ndjson,
+    )
+except ImportError:
+    from event_decoder import (
+        decode_lines,
+        iter_decoded_blocks,
+        iter_line_blocks,
+        parse_ndjson,
+    )
+
+# Recordings are stored as gzipped NDJSON batch files next to metadata.json
+BATCH_FILE_PREFIX = "batch-"
+BATCH_FILE_SUFFIXES = (".ndjson.gz", ".jsonl.gz")
+
+# rrweb event type of a full DOM snapshot; playback can start from one
+RRWEB_FULL_SNAPSHOT = 2
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "agentcore-replay"
+DEFAULT_MAX_WORKERS = 8
+
+
+def is_batch_file(filename):
+    return filename.startswith(BATCH_FILE_PREFIX) and filename.endswith(
+        BATCH_FILE_SUFFIXES
+    )
+
+
+def batch_sort_key(filename):
+    """Sort batch-2 before batch-10"""
+    match = re.search(r"\d+", filename)
+    return (int(match.group()) if match else -1, filename)
+
+
+class BatchSummary:
+    """Event count, time range and first full snapshot of a batch"""
+
+    def __init__(self):
+        self.events = 0
+        self.invalid = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.full_snapshot_timestamp = None
+
+    def add(self, event):
+        """Count an event; return False if it is not a valid rrweb event"""
+        timestamp = event.get("timestamp") if isinstance(event, dict) else None
+        if not isinstance(timestamp, (int, float)) or "type" not in event:
+            self.invalid += 1
+            return False
+        self.events += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = self.last_timestamp = timestamp
+        self.first_timestamp = min(self.first_timestamp, timestamp)
+        self.last_timestamp = max(self.last_timestamp, timestamp)
+        if (
+            event["type"] == RRWEB_FULL_SNAPSHOT
+            and self.full_snapshot_timestamp is None
+        ):
+            self.full_snapshot_timestamp = timestamp
+        return True
+
+    def add_events(self, events):
+        """Count a decoded block of events.
+
+        The decoder only samples events, so every event is checked here. If
+        any is invalid nothing is counted and False is returned, so the
+        caller can re-decode the block line by line.
+        """
+        if not events:
+            return True
+        timestamps = []
+        for event in events:
+            timestamp = event.get("timestamp") if isinstance(event, dict) else None
+            if not isinstance(timestamp, (int, float)) or "type" not in event:
+                return False
+            timestamps.append(timestamp)
+        self.events += len(events)
+        first, last = min(timestamps), max(timestamps)
+        if self.first_timestamp is None:
+            self.first_timestamp, self.last_timestamp = first, last
+        self.first_timestamp = min(self.first_timestamp, first)
+        self.last_timestamp = max(self.last_timestamp, last)
+        if self.full_snapshot_timestamp is None:
+            self.full_snapshot_timestamp = next(
+                (
+                    event["timestamp"]
+                    for event in events
+                    if event["type"] == RRWEB_FULL_SNAPSHOT
+                ),
+                None,
+            )
+        return True
+
+    def to_dict(self):
+        return {
+            "events": self.events,
+            "invalid": self.invalid,
+            "firstTimestamp": self.first_timestamp,
+            "lastTimestamp": self.last_timestamp,
+            "fullSnapshotTimestamp": self.full_snapshot_timestamp,
+        }
+
+
+class BatchObject(NamedTuple):
+    """A batch file in an object store"""
+
+    bucket: str
+    key: str
+    etag: str
+    size: int = 0
+
+    @property
+    def name(self):
+        return self.key.split("/")[-1]
+
+
+class S3ObjectStore:
+    """Object store backed by a boto3 S3 client"""
+
+    def __init__(self, s3_client):
+        self.s3_client = s3_client
+
+    def list_objects(self, bucket, prefix):
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield BatchObject(
+                    bucket, obj["Key"], obj.get("ETag", ""), obj.get("Size", 0)
+                )
+
+    def open_object(self, obj):
+        """Streaming body of an object; IfMatch keeps content and cache key in step"""
+        kwargs = {"IfMatch": obj.etag} if obj.etag else {}
+        return self.s3_client.get_object(Bucket=obj.bucket, Key=obj.key, **kwargs)[
+            "Body"
+        ]
+
+
+class LocalObjectStore:
+    """Object store backed by a local directory, one subdirectory per bucket"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def list_objects(self, bucket, prefix):
+        bucket_dir = self.root / bucket
+        if not bucket_dir.is_dir():
+            return
+        for path in sorted(bucket_dir.rglob("*")):
+            key = path.relative_to(bucket_dir).as_posix()
+            if path.is_file() and key.startswith(prefix):
+                with open(path, "rb") as f:
+                    etag = '"' + hashlib.md5(f.read()).hexdigest() + '"'
+                yield BatchObject(bucket, key, etag, path.stat().st_size)
+
+    def open_object(self, obj):
+        return open(self.root / obj.bucket / obj.key, "rb")
+
+
+class RecordingCache:
+    """Parallel batch downloads with a persistent decoded cache"""
+
+    def __init__(self, store, cache_dir=None, max_workers=None):
+        self.store = store
+        self.cache_dir = Path(
+            cache_dir or os.getenv("REPLAY_CACHE_DIR", DEFAULT_CACHE_DIR)
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or int(
+            os.getenv("REPLAY_DOWNLOAD_WORKERS", DEFAULT_MAX_WORKERS)
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="replay-download"
+        )
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def list_batches(self, bucket, prefix) -> List[BatchObject]:
+        """Batch files under a prefix, in playback order"""
+        batches = [
+            obj
+            for obj in self.store.list_objects(bucket, prefix)
+            if is_batch_file(obj.name)
+        ]
+        return sorted(batches, key=lambda obj: batch_sort_key(obj.name))
+
+    def _entry_path(self, obj):
+        digest = hashlib.sha256(
+            f"{obj.bucket}\0{obj.key}\0{obj.etag}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def is_cached(self, obj):
+        return self._entry_path(obj).with_suffix(".json").exists()
+
+    def fetch(self, obj) -> Future:
+        """Start decoding a batch into the cache; the future resolves to its index"""
+        key = str(self._entry_path(obj))
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if self.is_cached(obj):
+                future = Future()
+                future.set_result(self._read_index(obj))
+                return future
+            future = self._executor.submit(self._decode, obj)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def prefetch(self, batches) -> List[Future]:
+        """Start fetching all batches; they download in parallel up to max_workers"""
+        return [self.fetch(obj) for obj in batches]
+
+    def _decode(self, obj):
+        """Download, decompress and validate a batch as one streaming pass"""
+        entry = self._entry_path(obj)
+        entry.parent.mkdir(exist_ok=True)
+        lines_path = entry.with_suffix(".ndjson")
+        tmp_path = entry.with_suffix(f".ndjson.{threading.get_ident()}.part")
+        summary = BatchSummary()
+
+        body = self.store.open_object(obj)
+        try:
+            with open(tmp_path, "wb") as out:
+                for block in iter_decoded_blocks(body):
+                    if not summary.add_events(block.events):
+                        # Sampling missed an invalid event; keep only the valid ones
+                        block = decode_lines(block.raw)
+                        summary.add_events(block.events)
+                    summary.invalid += block.invalid
+                    out.write(block.raw)
+            tmp_path.replace(lines_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            body.close()
+
+        # The index is written last; its presence marks a complete entry
+        index = summary.to_dict()
+        index_tmp = entry.with_suffix(f".json.{threading.get_ident()}.part")
+        index_tmp.write_text(json.dumps(index))
+        index_tmp.replace(entry.with_suffix(".json"))
+        return index
+
+    def _read_index(self, obj):
+        return json.loads(self._entry_path(obj).with_suffix(".json").read_text())
+
+    def batch_index(self, obj):
+        """Event count, time range and first full snapshot of a batch"""
+        return self.fetch(obj).result()
+
+    def iter_lines(self, obj) -> Iterator[bytes]:
+        """Decoded NDJSON of a batch in blocks of whole lines, waiting for its download if needed"""
+        self.fetch(obj).result()
+        with open(self._entry_path(obj).with_suffix(".ndjson"), "rb") as f:
+            yield from iter_line_blocks(f)
+
+    def read_events(self, obj) -> list:
+        """Events of a batch, parsed with a single call from the validated cache"""
+        self.fetch(obj).result()
+        return parse_ndjson(self._entry_path(obj).with_suffix(".ndjson").read_bytes())
+
+    def load_events(
+        self,
+        batches,
+        on_batch: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ):
+        """Fetch batches in parallel and return their events in batch order.
+
+        on_batch(obj) is called as each batch is added; a batch that fails is
+        passed to on_error(obj, exception) and skipped.
+        """
+        futures = self.prefetch(batches)
+        events = []
+        for obj, future in zip(batches, futures):
+            try:
+                future.result()
+                events.extend(self.read_events(obj))
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(obj, e)
+                continue
+            if on_batch is not None:
+                on_batch(obj)
+        return events
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -17,9 +17,11 @@ import socket
 import signal
 import shutil
 import gzip
+import zlib
+import hashlib
 from pathlib import Path
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
 import mimetypes
 from datetime import datetime
 
@@ -29,11 +31,127 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+try:
+    from .recording_cache import BatchSummary, RecordingCache, S3ObjectStore, batch_sort_key, is_batch_file
+    from .event_decoder import iter_decoded_blocks, iter_raw_blocks, load_events, validated
+except ImportError:
+    # Run as a script from this folder
+    from recording_cache import BatchSummary, RecordingCache, S3ObjectStore, batch_sort_key, is_batch_file
+    from event_decoder import iter_decoded_blocks, iter_raw_blocks, load_events, validated
+
+try:
+    import brotli
+except ImportError:
+    # Optional: responses fall back to gzip
+    brotli = None
+
 console = Console()
 
+# Streamed NDJSON is written in chunks of about this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/x-ndjson',
+                      'image/svg+xml')
+
+
+class StreamCompressor:
+    """Incremental gzip or brotli encoder; each compress() call returns decodable output"""
+    
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor()
+        else:
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def select_batches(index, batch=None, from_timestamp=None):
+    """Return the batch numbers to stream for an events request.
+
+    batch is "N" or "N-M". from_timestamp starts at the last batch with a full
+    snapshot at or before that time, since rrweb can only seek from a snapshot.
+    """
+    batches = index['batches']
+    if batch is not None:
+        first, _, last = batch.partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        return [entry['batch'] for entry in batches if first <= entry['batch'] <= last]
+    start = 0
+    if from_timestamp is not None:
+        for entry in batches:
+            snapshot = entry.get('fullSnapshotTimestamp')
+            if snapshot is not None and snapshot <= from_timestamp:
+                start = entry['batch']
+    return [entry['batch'] for entry in batches if entry['batch'] >= start]
+
+
+def build_recording_index(recording_id, batches, metadata=None):
+    """Index a recording from (batch name, events) pairs.
+
+    Each entry has the event count, time range and first full snapshot of a
+    batch, so a player can start or seek without loading other batches.
+    """
+    summaries = []
+    for name, events in batches:
+        summary = BatchSummary()
+        for event in events:
+            summary.add(event)
+        summaries.append((name, summary.to_dict()))
+    return index_from_summaries(recording_id, summaries, metadata)
+
+
+def index_from_summaries(recording_id, summaries, metadata=None):
+    """Recording index from (batch name, BatchSummary.to_dict()) pairs"""
+    entries = []
+    for number, (name, summary) in enumerate(summaries):
+        entries.append({
+            'batch': number,
+            'name': name,
+            'events': summary['events'],
+            'firstTimestamp': summary['firstTimestamp'],
+            'lastTimestamp': summary['lastTimestamp'],
+            'fullSnapshotTimestamp': summary['fullSnapshotTimestamp']
+        })
+
+    timestamps = [entry[key] for entry in entries for key in ('firstTimestamp', 'lastTimestamp')
+                  if entry[key] is not None]
+    return {
+        'recordingId': recording_id,
+        'metadata': metadata or {},
+        'batches': entries,
+        'totalEvents': sum(entry['events'] for entry in entries),
+        'startTime': min(timestamps) if timestamps else None,
+        'endTime': max(timestamps) if timestamps else None
+    }
+
 
 class SessionReplayHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for session replay viewer"""
+    """HTTP request handler for session replay viewer
+    
+    Responses carry a Content-Length or use chunked encoding, so browsers
+    keep connections open across requests.
+    """
+    
+    protocol_version = 'HTTP/1.1'
     
     def __init__(self, data_source, viewer_path, *args, **kwargs):
         self.data_source = data_source
@@ -47,12 +165,19 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests"""
         try:
-            path = self.path.split('?')[0]
+            parsed = urlparse(self.path)
+            path = parsed.path
             
             if path == '/':
                 self.serve_file('index.html')
             elif path == '/api/recordings':
                 self.serve_recordings_list()
+            elif path.startswith('/api/recordings/') and path.endswith('/index'):
+                recording_id = unquote(path.split('/')[-2])
+                self.serve_recording_index(recording_id)
+            elif path.startswith('/api/recordings/') and path.endswith('/events'):
+                recording_id = unquote(path.split('/')[-2])
+                self.stream_recording_events(recording_id, parse_qs(parsed.query))
             elif path.startswith('/api/download/'):
                 recording_id = path.split('/')[-1]
                 self.download_and_serve_recording(recording_id)
@@ -66,6 +191,9 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
     def serve_file(self, file_path):
         """Serve static files"""
         full_path = self.viewer_path / file_path
+        if not str(full_path.resolve()).startswith(str(self.viewer_path.resolve()) + os.sep):
+            self.send_error(404, f"File not found: {file_path}")
+            return
         
         if not full_path.exists():
             # Create index.html on the fly
@@ -79,15 +207,17 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
         if content_type is None:
             content_type = 'application/octet-stream'
         
+        stat = full_path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if self.etag_matches(etag):
+            self.send_not_modified(etag)
+            return
+        
         with open(full_path, 'rb') as f:
             content = f.read()
         
-        self.send_response(200)
-        self.send_header('Content-Type', content_type)
-        self.send_header('Content-Length', str(len(content)))
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(content)
+        # Revalidate on every load so edited viewer files show up
+        self.send_body(200, content, content_type, etag=etag, headers={'Cache-Control': 'no-cache'})
     
     def _create_index_html(self, path):
         """Create the viewer HTML interface"""
@@ -351,79 +481,160 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
             }
         }
         
+        // rrweb event types needed before the player can render
+        const EVENT_TYPE_FULL_SNAPSHOT = 2;
+        const EVENT_TYPE_META = 4;
+        let currentStream = null;
+        
+        function destroyPlayer() {
+            // Safely dispose of the existing player first
+            if (currentPlayer) {
+                try {
+                    if (typeof currentPlayer.destroy === 'function') {
+                        currentPlayer.destroy();
+                    } else {
+                        console.warn('Current player does not have a destroy method');
+                    }
+                } catch (e) {
+                    console.error('Error destroying player:', e);
+                }
+                currentPlayer = null;
+            }
+        }
+        
+        function createPlayer(playerEl, events) {
+            playerEl.innerHTML = '';
+            
+            if (typeof rrwebPlayer !== 'function') {
+                throw new Error('rrwebPlayer not found - make sure the library is loaded');
+            }
+            
+            const width = Math.min(playerEl.offsetWidth, 1200);
+            const height = Math.min(playerEl.offsetHeight, 800);
+            
+            console.log('Creating player with dimensions ' + width + 'x' + height);
+            
+            currentPlayer = new rrwebPlayer({
+                target: playerEl,
+                props: {
+                    events: events,
+                    width: width,
+                    height: height,
+                    autoPlay: true,
+                    showController: true
+                }
+            });
+            
+            console.log('Player created:', currentPlayer);
+        }
+        
+        // Read an NDJSON response line by line, calling onEvent for each parsed event
+        async function readEventStream(response, onEvent, signal) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            
+            function handleLine(line) {
+                if (!line.trim()) {
+                    return;
+                }
+                try {
+                    onEvent(JSON.parse(line));
+                } catch (e) {
+                    console.warn('Skipping invalid event line:', e);
+                }
+            }
+            
+            while (true) {
+                const { done, value } = await reader.read();
+                if (signal.aborted) {
+                    return;
+                }
+                if (done) {
+                    break;
+                }
+                buffered += decoder.decode(value, { stream: true });
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                lines.forEach(handleLine);
+            }
+            handleLine(buffered + decoder.decode());
+        }
+        
         async function loadRecording(index) {
             const recording = recordings[index];
             
             document.querySelectorAll('.recording-item').forEach(el => {
                 el.classList.remove('active');
             });
-            // CHANGED: Use string concatenation
             document.querySelector('[data-index="' + index + '"]').classList.add('active');
             
             const playerEl = document.getElementById('player');
-            playerEl.innerHTML = '<div class="empty-state"><div class="loading"></div>Downloading recording...</div>';
+            playerEl.innerHTML = '<div class="empty-state"><div class="loading"></div>Loading recording...</div>';
+            
+            // Stop streaming the previously selected recording
+            if (currentStream) {
+                currentStream.abort();
+            }
+            const stream = new AbortController();
+            currentStream = stream;
             
             try {
-                // Safely dispose of the existing player first
-                if (currentPlayer) {
-                    try {
-                        if (typeof currentPlayer.destroy === 'function') {
-                            currentPlayer.destroy();
-                        } else {
-                            console.warn('Current player does not have a destroy method');
-                        }
-                    } catch (e) {
-                        console.error('Error destroying player:', e);
-                    }
-                    currentPlayer = null;
-                }
-                
-                // CHANGED: Use string concatenation
-                const response = await fetch('/api/download/' + recording.id);
-                const result = await response.json();
+                destroyPlayer();
                 
-                if (!result.success || !result.data) {
-                    throw new Error(result.error || 'Failed to download recording');
+                const response = await fetch('/api/recordings/' + encodeURIComponent(recording.id) + '/events', {
+                    signal: stream.signal
+                });
+                if (!response.ok) {
+                    const result = await response.json().catch(() => ({}));
+                    throw new Error(result.error || 'Failed to load recording');
                 }
                 
-                const { events } = result.data;
+                // The player needs the Meta and a FullSnapshot event to render;
+                // events arriving after it is created are appended while it plays
+                const pending = [];
+                let hasMeta = false;
+                let hasSnapshot = false;
+                let eventCount = 0;
                 
-                if (!events || events.length === 0) {
+                await readEventStream(response, function(event) {
+                    eventCount++;
+                    if (currentPlayer) {
+                        currentPlayer.addEvent(event);
+                        return;
+                    }
+                    pending.push(event);
+                    hasMeta = hasMeta || event.type === EVENT_TYPE_META;
+                    hasSnapshot = hasSnapshot || event.type === EVENT_TYPE_FULL_SNAPSHOT;
+                    if (hasMeta && hasSnapshot) {
+                        console.log('Starting playback after ' + pending.length + ' events');
+                        createPlayer(playerEl, pending);
+                    }
+                }, stream.signal);
+                
+                if (stream.signal.aborted) {
+                    return;
+                }
+                if (eventCount === 0) {
                     throw new Error('Recording contains no events');
                 }
-                
-                // CHANGED: Use string concatenation for logging
-                console.log('Loaded ' + events.length + ' events. First event type: ' + events[0].type);
-                
-                playerEl.innerHTML = '';
-                
-                if (typeof rrwebPlayer !== 'function') {
-                    throw new Error('rrwebPlayer not found - make sure the library is loaded');
+                if (!currentPlayer) {
+                    // No snapshot pair found; let rrweb decide what it can play
+                    createPlayer(playerEl, pending);
                 }
                 
-                const width = Math.min(playerEl.offsetWidth, 1200);
-                const height = Math.min(playerEl.offsetHeight, 800);
-                
-                // CHANGED: Use string concatenation
-                console.log('Creating player with dimensions ' + width + 'x' + height);
-                
-                currentPlayer = new rrwebPlayer({
-                    target: playerEl,
-                    props: {
-                        events: events,
-                        width: width,
-                        height: height,
-                        autoPlay: true,
-                        showController: true
-                    }
-                });
-                
-                console.log('Player created:', currentPlayer);
+                console.log('Loaded ' + eventCount + ' events');
                 
             } catch (e) {
+                if (stream.signal.aborted) {
+                    return;
+                }
                 console.error('Failed to load recording:', e);
-                // CHANGED: Use string concatenation
                 playerEl.innerHTML = '<div class="error">Error: ' + e.message + '</div>';
+            } finally {
+                if (currentStream === stream) {
+                    currentStream = null;
+                }
             }
         }
         
@@ -471,28 +682,13 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
         """Return list of recordings with proper headers"""
         try:
             recordings = self.data_source.list_recordings()
-            response = json.dumps(recordings)
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(response)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            self.end_headers()
-            
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json(200, recordings)
             
         except Exception as e:
             console.print(f"[red]Error in serve_recordings_list: {e}[/red]")
             
-            error_response = json.dumps({"error": str(e), "recordings": []})
-            self.send_response(200)  # Use 200 to ensure client gets the error
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_response)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            # Use 200 to ensure client gets the error
+            self.send_json(200, {"error": str(e), "recordings": []})
 
     def download_and_serve_recording(self, recording_id):
         """Download recording and serve it with proper headers"""
@@ -500,44 +696,258 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
             recording_data = self.data_source.download_recording(recording_id)
             
             if recording_data:
-                response = json.dumps({
+                self.send_json(200, {
                     'success': True,
                     'data': recording_data
                 })
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(response)))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
             else:
-                error_response = json.dumps({
+                self.send_json(404, {
                     'success': False,
                     'error': 'Recording not found'
                 })
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(error_response)))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
                 
         except Exception as e:
             console.print(f"[red]Error in download_and_serve_recording: {e}[/red]")
             import traceback
             traceback.print_exc()
             
-            error_response = json.dumps({
+            self.send_json(500, {
                 'success': False,
                 'error': str(e)
             })
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_response)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+
+    def send_json(self, status, payload):
+        """Send a JSON response"""
+        self.send_body(status, json.dumps(payload).encode('utf-8'), 'application/json')
+    
+    def send_body(self, status, body, content_type, etag=None, headers=None):
+        """Send a complete response, compressed if the client accepts it.
+        
+        Successful responses get an ETag (a hash of the body unless one is
+        given) and a 304 when it matches If-None-Match.
+        """
+        if status == 200:
+            etag = etag or '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.etag_matches(etag):
+                self.send_not_modified(etag)
+                return
+        
+        encoding = self.choose_encoding(content_type, len(body))
+        if encoding:
+            body = compress_body(body, encoding)
+        
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if etag:
+            # Compressed bodies differ in bytes, so their ETag is weak
+            self.send_header('ETag', 'W/' + etag if encoding else etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def etag_matches(self, etag):
+        """Weak comparison against If-None-Match, as for GET revalidation"""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        candidates = [tag.strip() for tag in header.split(',')]
+        return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates)
+    
+    def send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+    
+    def choose_encoding(self, content_type, length=None):
+        """'br', 'gzip' or None from Accept-Encoding; small and binary bodies are sent as is"""
+        if length is not None and length < MIN_COMPRESS_BYTES:
+            return None
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return None
+        accepted = {}
+        for item in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = item.strip().partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.lower()] = quality
+        if brotli is not None and accepted.get('br', 0) > 0:
+            return 'br'
+        if accepted.get('gzip', 0) > 0:
+            return 'gzip'
+        return None
+
+    def get_recording_index(self, recording_id):
+        """Batch index of a recording, or None if it does not exist"""
+        if hasattr(self.data_source, 'get_recording_index'):
+            try:
+                return self.data_source.get_recording_index(recording_id)
+            except NotImplementedError:
+                pass
+        # Data sources without batch access: the whole recording is one batch
+        recording_data = self.data_source.download_recording(recording_id)
+        if not recording_data:
+            return None
+        return build_recording_index(recording_id, [('all', recording_data.get('events', []))],
+                                     recording_data.get('metadata', {}))
+
+    def serve_recording_index(self, recording_id):
+        """Return the batch index (event counts and time range per batch) of a recording"""
+        try:
+            index = self.get_recording_index(recording_id)
+            if index is None:
+                self.send_json(404, {'success': False, 'error': 'Recording not found'})
+            else:
+                self.send_json(200, {'success': True, 'index': index})
+        except Exception as e:
+            console.print(f"[red]Error in serve_recording_index: {e}[/red]")
+            self.send_json(500, {'success': False, 'error': str(e)})
+
+    def list_batch_versions(self, recording_id):
+        """(name, version) pairs of the batches, None if the recording does not exist.
+
+        Raises NotImplementedError for data sources without batch access.
+        """
+        if not hasattr(self.data_source, 'list_batch_versions'):
+            raise NotImplementedError
+        return self.data_source.list_batch_versions(recording_id)
+
+    def iter_event_lines(self, recording_id, batch_numbers, names=None):
+        """Yield NDJSON event lines (bytes) of the given batches, one batch at a time"""
+        if names is None and hasattr(self.data_source, 'iter_batch_lines'):
+            try:
+                names = self.data_source.list_batches(recording_id) or []
+            except NotImplementedError:
+                pass
+        if names is not None:
+            for batch_number in batch_numbers:
+                yield from self.data_source.iter_batch_lines(recording_id, names[batch_number])
+        else:
+            recording_data = self.data_source.download_recording(recording_id) or {}
+            for event in recording_data.get('events', []):
+                yield (json.dumps(event) + '\n').encode('utf-8')
+
+    def stream_recording_events(self, recording_id, query):
+        """Stream recording events as NDJSON, batch by batch.
+
+        Query parameters: batch=N or batch=N-M for specific batches, or
+        from=<timestamp ms> to start at the last full snapshot before it.
+        Without parameters the whole recording is streamed straight from the
+        batch list, so the first events go out before any batch is indexed;
+        the index is only built for batch= and from= requests.
+        """
+        batch = query.get('batch', [None])[0]
+        from_timestamp = query.get('from', [None])[0]
+        names = None
+        try:
+            if from_timestamp is not None:
+                from_timestamp = float(from_timestamp)
+            versions = None
+            if batch is None and from_timestamp is None:
+                try:
+                    versions = self.list_batch_versions(recording_id)
+                except NotImplementedError:
+                    pass
+                else:
+                    if versions is None:
+                        self.send_json(404, {'success': False, 'error': 'Recording not found'})
+                        return
+            if versions is not None:
+                names = [name for name, _ in versions]
+                batch_numbers = list(range(len(names)))
+                # A batch's version changes whenever its content does
+                etag_source = versions
+            else:
+                index = self.get_recording_index(recording_id)
+                if index is None:
+                    self.send_json(404, {'success': False, 'error': 'Recording not found'})
+                    return
+                batch_numbers = select_batches(index, batch=batch, from_timestamp=from_timestamp)
+                # The index changes whenever a batch does, so it stands in for the body
+                etag_source = [index['batches'], batch_numbers]
+        except ValueError as e:
+            self.send_json(400, {'success': False, 'error': f"Invalid query: {e}"})
+            return
+        except Exception as e:
+            console.print(f"[red]Error in stream_recording_events: {e}[/red]")
+            self.send_json(500, {'success': False, 'error': str(e)})
+            return
+
+        etag = '"' + hashlib.sha1(
+            json.dumps(etag_source, sort_keys=True).encode('utf-8')
+        ).hexdigest() + '"'
+        if self.etag_matches(etag):
+            self.send_not_modified(etag)
+            return
+        encoding = self.choose_encoding('application/x-ndjson')
+        compressor = StreamCompressor(encoding) if encoding else None
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', 'W/' + etag if encoding else etag)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('X-Recording-Batches', ','.join(str(number) for number in batch_numbers))
+        chunked = self.protocol_version == 'HTTP/1.1'
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            # HTTP/1.0: the end of the body is the end of the connection
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+
+        try:
+            buffer = []
+            buffered = 0
+            for line in self.iter_event_lines(recording_id, batch_numbers, names):
+                buffer.append(line)
+                buffered += len(line)
+                if buffered >= STREAM_CHUNK_BYTES:
+                    self._write_body_chunk(b''.join(buffer), chunked, compressor)
+                    buffer = []
+                    buffered = 0
+            if buffer:
+                self._write_body_chunk(b''.join(buffer), chunked, compressor)
+            if compressor:
+                self._write_body_chunk(compressor.finish(), chunked)
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            # The viewer switched recordings or was closed
+            self.close_connection = True
+        except Exception as e:
+            # Headers are already sent; cut the stream so the client sees it is incomplete
+            console.print(f"[red]Error while streaming recording {recording_id}: {e}[/red]")
+            self.close_connection = True
+
+    def _write_body_chunk(self, data, chunked, compressor=None):
+        if compressor:
+            data = compressor.compress(data)
+        if not data:
+            # An empty chunk would end a chunked body
+            return
+        if chunked:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+        else:
+            self.wfile.write(data)
 
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS preflight"""
@@ -545,23 +955,78 @@ class SessionReplayHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', '*')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
 
 class DataSource:
-    """Base class for data sources"""
+    """Base class for data sources
+    
+    Sources that implement list_batches() and open_batch() can be streamed
+    batch by batch instead of loading the whole recording with
+    download_recording().
+    """
+    
+    def __init__(self):
+        self._index_cache = {}
+        self._index_lock = threading.Lock()
     
     def list_recordings(self):
         raise NotImplementedError
     
     def download_recording(self, recording_id):
         raise NotImplementedError
+    
+    def get_metadata(self, recording_id):
+        return {}
+    
+    def list_batches(self, recording_id):
+        """Batch file names in playback order, or None if the recording does not exist"""
+        raise NotImplementedError
+    
+    def open_batch(self, recording_id, name):
+        """Binary file object with the gzipped content of a batch"""
+        raise NotImplementedError
+    
+    def list_batch_versions(self, recording_id):
+        """(name, version) pairs in playback order, or None if the recording does not exist"""
+        raise NotImplementedError
+    
+    def iter_batch_lines(self, recording_id, name):
+        """Yield the NDJSON of a batch in blocks of whole lines, passed through without parsing"""
+        with self.open_batch(recording_id, name) as raw:
+            yield from iter_raw_blocks(raw)
+    
+    def iter_batch_events(self, recording_id, name):
+        """Yield the valid events of a batch"""
+        with self.open_batch(recording_id, name) as raw:
+            for block in iter_decoded_blocks(raw):
+                yield from validated(block).events
+    
+    def get_recording_index(self, recording_id):
+        """Batch index of a recording (see build_recording_index), cached per batch list"""
+        names = self.list_batches(recording_id)
+        if names is None:
+            return None
+        cache_key = (recording_id, tuple(names))
+        with self._index_lock:
+            index = self._index_cache.get(cache_key)
+        if index is None:
+            index = build_recording_index(
+                recording_id,
+                ((name, self.iter_batch_events(recording_id, name)) for name in names),
+                self.get_metadata(recording_id)
+            )
+            with self._index_lock:
+                self._index_cache[cache_key] = index
+        return index
 
 
 class LocalDataSource(DataSource):
     """Local file system data source"""
     
     def __init__(self, recordings_dir):
+        super().__init__()
         self.recordings_dir = Path(recordings_dir)
         console.print(f"[cyan]Using local recordings from:[/cyan] {self.recordings_dir}")
     
@@ -604,33 +1069,61 @@ class LocalDataSource(DataSource):
         recordings.sort(key=lambda x: x['timestamp'], reverse=True)
         return recordings
     
+    def _recording_dir(self, recording_id):
+        recording_dir = (self.recordings_dir / recording_id).resolve()
+        # Recording ids come from URLs; stay inside the recordings directory
+        if recording_dir.parent != self.recordings_dir.resolve():
+            return None
+        return recording_dir
+    
+    def get_metadata(self, recording_id):
+        recording_dir = self._recording_dir(recording_id)
+        metadata_file = recording_dir / 'metadata.json' if recording_dir else None
+        if metadata_file is None or not metadata_file.exists():
+            return {}
+        with open(metadata_file, 'r') as f:
+            return json.load(f)
+    
+    def list_batches(self, recording_id):
+        recording_dir = self._recording_dir(recording_id)
+        if recording_dir is None or not recording_dir.is_dir():
+            return None
+        names = [path.name for path in recording_dir.iterdir() if is_batch_file(path.name)]
+        return sorted(names, key=batch_sort_key)
+    
+    def open_batch(self, recording_id, name):
+        return open(self._recording_dir(recording_id) / name, 'rb')
+    
+    def list_batch_versions(self, recording_id):
+        names = self.list_batches(recording_id)
+        if names is None:
+            return None
+        recording_dir = self._recording_dir(recording_id)
+        versions = []
+        for name in names:
+            stat = (recording_dir / name).stat()
+            versions.append((name, f"{stat.st_mtime_ns}-{stat.st_size}"))
+        return versions
+    
     def download_recording(self, recording_id):
         """Load recording from local files"""
-        recording_dir = self.recordings_dir / recording_id
-        
-        if not recording_dir.exists():
+        names = self.list_batches(recording_id)
+        if names is None:
             return None
         
         all_events = []
-        metadata = {}
-        
-        # Load metadata if exists
-        metadata_file = recording_dir / 'metadata.json'
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+        invalid = 0
+        for name in names:
+            with self.open_batch(recording_id, name) as f:
+                events, skipped = load_events(f)
+            all_events.extend(events)
+            invalid += skipped
         
-        # Load batch files
-        batch_files = sorted(recording_dir.glob('batch-*.ndjson.gz'))
-        
-        for batch_file in batch_files:
-            with gzip.open(batch_file, 'rt') as f:
-                for line in f:
-                    if line.strip():
-                        all_events.append(json.loads(line))
+        if invalid:
+            console.print(f"[yellow]Skipped {invalid} invalid event lines in {recording_id}[/yellow]")
         
         return {
-            'metadata': metadata,
+            'metadata': self.get_metadata(recording_id),
             'events': all_events
         }
 
@@ -639,10 +1132,13 @@ class S3DataSource(DataSource):
     """S3 data source"""
     
     def __init__(self, bucket, prefix=''):
+        super().__init__()
         self.s3_client = boto3.client('s3')
         self.bucket = bucket
         self.prefix = prefix.rstrip('/')
         self.temp_dir = Path(tempfile.mkdtemp(prefix="bedrock_agentcore_replay_"))
+        self.recording_cache = RecordingCache(S3ObjectStore(self.s3_client))
+        self._batch_objects = {}
         
         console.print(f"[cyan]Using S3 location:[/cyan]")
         console.print(f"  Bucket: {bucket}")
@@ -650,6 +1146,7 @@ class S3DataSource(DataSource):
     
     def cleanup(self):
         """Clean up temp files"""
+        self.recording_cache.shutdown()
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
     
@@ -771,13 +1268,52 @@ class S3DataSource(DataSource):
             console.print(f"[dim]Error getting metadata: {e}[/dim]")
             return {}
     
+    def _recording_prefix(self, recording_id):
+        return f"{self.prefix}/{recording_id}/" if self.prefix else f"{recording_id}/"
+    
+    def get_metadata(self, recording_id):
+        return self._get_metadata(recording_id)
+    
+    def _list_batch_objects(self, recording_id):
+        batches = self.recording_cache.list_batches(self.bucket, self._recording_prefix(recording_id))
+        self._batch_objects[recording_id] = {obj.name: obj for obj in batches}
+        return batches
+    
+    def list_batches(self, recording_id):
+        batches = self._list_batch_objects(recording_id)
+        if not batches:
+            return None
+        # Batches are usually streamed next; start downloading them all in parallel
+        self.recording_cache.prefetch(batches)
+        return [obj.name for obj in batches]
+    
+    def list_batch_versions(self, recording_id):
+        batches = self._list_batch_objects(recording_id)
+        if not batches:
+            return None
+        self.recording_cache.prefetch(batches)
+        return [(obj.name, obj.etag) for obj in batches]
+    
+    def iter_batch_lines(self, recording_id, name):
+        """Decoded lines from the recording cache"""
+        batches = self._batch_objects.get(recording_id)
+        if batches is None or name not in batches:
+            self._list_batch_objects(recording_id)
+            batches = self._batch_objects[recording_id]
+        yield from self.recording_cache.iter_lines(batches[name])
+    
+    def get_recording_index(self, recording_id):
+        batches = self._list_batch_objects(recording_id)
+        if not batches:
+            return None
+        summaries = [future.result() for future in self.recording_cache.prefetch(batches)]
+        return index_from_summaries(recording_id, list(zip((obj.name for obj in batches), summaries)),
+                                    self.get_metadata(recording_id))
+    
     def download_recording(self, recording_id):
         """Download recording from S3"""
         console.print(f"[cyan]Downloading recording: {recording_id}[/cyan]")
         
-        recording_dir = self.temp_dir / recording_id
-        recording_dir.mkdir(exist_ok=True)
-        
         try:
             with Progress(
                 SpinnerColumn(),
@@ -786,51 +1322,25 @@ class S3DataSource(DataSource):
             ) as progress:
                 
                 # List files for this recording
-                prefix = f"{self.prefix}/{recording_id}/" if self.prefix else f"{recording_id}/"
+                prefix = self._recording_prefix(recording_id)
                 console.print(f"Looking for files with prefix: {prefix}")
                 
-                paginator = self.s3_client.get_paginator('list_objects_v2')
+                batches = self.recording_cache.list_batches(self.bucket, prefix)
+                metadata = self._get_metadata(recording_id)
                 
-                files_to_download = []
-                for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
-                    if 'Contents' in page:
-                        for obj in page['Contents']:
-                            files_to_download.append(obj['Key'])
-                
-                # Download files
-                console.print(f"Downloading {len(files_to_download)} files")
-                task = progress.add_task(f"Downloading {len(files_to_download)} files...", total=len(files_to_download))
+                # Download and decode batches in parallel; cached batches are read from disk
+                cached = sum(1 for obj in batches if self.recording_cache.is_cached(obj))
+                console.print(f"Loading {len(batches)} batch files ({cached} cached)")
+                task = progress.add_task(f"Downloading {len(batches)} files...", total=len(batches))
                 
-                all_events = []
-                metadata = {}
+                def report_error(obj, error):
+                    console.print(f"[yellow]Warning: Error processing batch file {obj.name}: {error}[/yellow]")
                 
-                for key in files_to_download:
-                    filename = key.split('/')[-1]
-                    local_path = recording_dir / filename
-                    
-                    self.s3_client.download_file(self.bucket, key, str(local_path))
-                    progress.advance(task)
-                    
-                    # Process file
-                    if filename == 'metadata.json':
-                        with open(local_path, 'r') as f:
-                            metadata = json.load(f)
-                    elif filename.startswith('batch-') and (filename.endswith('.ndjson.gz') or filename.endswith('.jsonl.gz')):
-                        try:
-                            with gzip.open(local_path, 'rt') as f:
-                                for line in f:
-                                    if line.strip():
-                                        try:
-                                            event_data = json.loads(line)
-                                            # Validate event structure for rrweb
-                                            if 'type' in event_data and 'timestamp' in event_data:
-                                                all_events.append(event_data)
-                                            else:
-                                                console.print(f"[yellow]Skipping invalid event: missing required fields[/yellow]")
-                                        except json.JSONDecodeError as e:
-                                            console.print(f"[yellow]Warning: Invalid JSON in line: {line[:50]}...[/yellow]")
-                        except Exception as e:
-                            console.print(f"[yellow]Warning: Error processing batch file {filename}: {e}[/yellow]")
+                all_events = self.recording_cache.load_events(
+                    batches,
+                    on_batch=lambda obj: progress.advance(task),
+                    on_error=report_error
+                )
             
             console.print(f"[green]✓ Downloaded {len(all_events)} events[/green]")
             
@@ -880,10 +1390,10 @@ class S3DataSource(DataSource):
                     }
                 ]
                 
-                # List downloaded files for debugging
-                console.print("Downloaded files:")
-                for path in recording_dir.iterdir():
-                    console.print(f"  - {path.name} ({path.stat().st_size} bytes)")
+                # List batch files for debugging
+                console.print("Batch files:")
+                for obj in batches:
+                    console.print(f"  - {obj.name} ({obj.size} bytes)")
             
             return {
                 'metadata': metadata,
@@ -929,8 +1439,9 @@ class SessionReplayViewer:
         def handler_factory(*args, **kwargs):
             return SessionReplayHandler(self.data_source, self.viewer_path, *args, **kwargs)
         
-        # Start server
-        self.server = HTTPServer(('', port), handler_factory)
+        # Start server; each request gets its own thread so a large recording
+        # does not hold up the list or other viewers
+        self.server = ThreadingHTTPServer(('', port), handler_factory)
         
         # Start in thread
         server_thread = threading.Thread(target=self.server.serve_forever)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Regression tests for sampled validation in the rrweb batch decoder
+
+Run with pytest or directly: python test_event_decoder.py
+"""
+
+import gzip
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from event_decoder import SAMPLE_INTERVAL, decode_block, load_events  # noqa: E402
+from recording_cache import BatchObject, LocalObjectStore, RecordingCache  # noqa: E402
+
+# Index the sampling skips: not a multiple of SAMPLE_INTERVAL and not the last event
+SKIPPED_INDEX = 5
+EVENT_COUNT = 200
+
+
+def _batch_lines():
+    events = [
+        {"type": 2 if i == 0 else 3, "timestamp": 1000 + i, "data": {}}
+        for i in range(EVENT_COUNT)
+    ]
+    del events[SKIPPED_INDEX]["timestamp"]
+    return b"".join(json.dumps(event).encode("utf-8") + b"\n" for event in events)
+
+
+def test_sampling_skips_the_invalid_event():
+    """The fast path accepts the block, so consumers must check every event"""
+    assert SKIPPED_INDEX % SAMPLE_INTERVAL
+    block = decode_block(_batch_lines())
+    assert block.invalid == 0 and len(block.events) == EVENT_COUNT
+
+
+def test_load_events_drops_an_unsampled_invalid_event():
+    events, invalid = load_events(io.BytesIO(gzip.compress(_batch_lines())))
+    assert invalid == 1
+    assert len(events) == EVENT_COUNT - 1
+    assert all("timestamp" in event for event in events)
+
+
+def test_batch_index_drops_an_unsampled_invalid_event():
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        (root / "bucket" / "rec").mkdir(parents=True)
+        (root / "bucket" / "rec" / "batch-0.ndjson.gz").write_bytes(
+            gzip.compress(_batch_lines())
+        )
+        cache = RecordingCache(LocalObjectStore(root), cache_dir=root / "cache")
+        try:
+            obj = BatchObject("bucket", "rec/batch-0.ndjson.gz", "etag")
+            index = cache.batch_index(obj)
+            assert index["events"] == EVENT_COUNT - 1
+            assert index["invalid"] == 1
+            assert index["fullSnapshotTimestamp"] == 1000
+            assert len(cache.read_events(obj)) == EVENT_COUNT - 1
+        finally:
+            cache.shutdown()
+
+
+if __name__ == "__main__":
+    test_sampling_skips_the_invalid_event()
+    test_load_events_drops_an_unsampled_invalid_event()
+    test_batch_index_drops_an_unsampled_invalid_event()
+    print("ok")
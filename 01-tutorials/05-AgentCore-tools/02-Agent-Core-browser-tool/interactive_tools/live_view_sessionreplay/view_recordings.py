@@ -27,12 +27,10 @@ import webbrowser
 import socket
 import signal
 import shutil
-import gzip
-import io
 import argparse
 from pathlib import Path
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 import boto3
 from rich.console import Console
@@ -43,6 +41,7 @@ console = Console()
 
 # Direct import from session_replay_viewer in the same folder
 from session_replay_viewer import SessionReplayViewer, SessionReplayHandler
+from recording_cache import RecordingCache, S3ObjectStore
 
 # Define CustomS3DataSource directly in this script to avoid import issues
 class CustomS3DataSource:
@@ -55,9 +54,11 @@ class CustomS3DataSource:
         self.session_id = session_id
         self.session_prefix = f"{prefix}/{session_id}"
         self.temp_dir = Path(tempfile.mkdtemp(prefix='bedrock_agentcore_replay_'))
+        self.recording_cache = RecordingCache(S3ObjectStore(self.s3_client))
         
     def cleanup(self):
         """Clean up temp files"""
+        self.recording_cache.shutdown()
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
     
@@ -148,55 +149,28 @@ class CustomS3DataSource:
             except Exception as e:
                 print(f"⚠️ No metadata found: {e}")
             
-            # Get batch files from metadata if possible
-            batch_files = []
+            # List batch files with their ETags; the decoded cache is keyed by them
+            batches = self.recording_cache.list_batches(self.bucket, f"{self.session_prefix}/")
+            
+            # Use the batch order from metadata if possible
             if 'batches' in metadata and isinstance(metadata['batches'], list):
-                for batch in metadata['batches']:
-                    if 'file' in batch:
-                        batch_files.append(f"{self.session_prefix}/{batch['file']}")
+                by_key = {obj.key: obj for obj in batches}
+                listed = [by_key.get(f"{self.session_prefix}/{batch['file']}")
+                          for batch in metadata['batches'] if 'file' in batch]
+                if listed and all(listed):
+                    batches = listed
             
-            # If no batch files found in metadata, look for them directly
-            if not batch_files:
-                response = self.s3_client.list_objects_v2(
-                    Bucket=self.bucket,
-                    Prefix=f"{self.session_prefix}/batch-"
-                )
-                
-                if 'Contents' in response:
-                    batch_files = [obj['Key'] for obj in response['Contents']]
+            print(f"Processing {len(batches)} batch files: {[obj.key for obj in batches]}")
             
-            all_events = []
-            print(f"Processing {len(batch_files)} batch files: {batch_files}")
+            def report_error(obj, error):
+                print(f"⚠️ Error processing file {obj.key}: {error}")
             
-            for key in batch_files:
-                try:
-                    print(f"Downloading batch file: {key}")
-                    response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                    
-                    # Try to read as gzipped JSON lines
-                    with gzip.GzipFile(fileobj=io.BytesIO(response['Body'].read())) as gz:
-                        content = gz.read().decode('utf-8')
-                        print(f"Read {len(content)} bytes of content")
-                        
-                        # Process each line as a JSON event
-                        for line in content.splitlines():
-                            if line.strip():
-                                try:
-                                    event = json.loads(line)
-                                    # Validate event
-                                    if 'type' in event and 'timestamp' in event:
-                                        all_events.append(event)
-                                    else:
-                                        print(f"⚠️ Skipping invalid event (missing required fields)")
-                                except json.JSONDecodeError as je:
-                                    print(f"⚠️ Invalid JSON in line: {line[:50]}...")
-                                    
-                        print(f"  Added {len(all_events)} events")
-                                    
-                except Exception as e:
-                    print(f"⚠️ Error processing file {key}: {e}")
-                    import traceback
-                    traceback.print_exc()
+            # Batches download and decompress in parallel; cached batches are read from disk
+            all_events = self.recording_cache.load_events(
+                batches,
+                on_batch=lambda obj: print(f"  Loaded batch file: {obj.key}"),
+                on_error=report_error
+            )
             
             print(f"✅ Loaded {len(all_events)} events")
             
@@ -245,23 +219,11 @@ class CustomSessionReplayHandler(SessionReplayHandler):
         """Return list of recordings - FIX FOR HTML RESPONSE ISSUE"""
         try:
             recordings = self.data_source.list_recordings()
-            response = json.dumps(recordings)
             
             # Debug output to see what we're returning
-            print(f"Serving recordings list: {response[:100]}...")
+            print(f"Serving recordings list: {json.dumps(recordings)[:100]}...")
             
-            # Ensure proper content type and headers
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(response)))
-            # Add CORS headers to prevent issues
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            self.end_headers()
-            
-            # Write the response as bytes
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json(200, recordings)
             
         except Exception as e:
             print(f"❌ Error in serve_recordings_list: {e}")
@@ -269,16 +231,10 @@ class CustomSessionReplayHandler(SessionReplayHandler):
             traceback.print_exc()
             
             # Return a proper error response as JSON with empty recordings array
-            error_response = json.dumps({
+            self.send_json(200, {  # Use 200 so client can process the error
                 "error": str(e),
                 "recordings": []
             })
-            self.send_response(200)  # Use 200 so client can process the error
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_response)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
     
     def download_and_serve_recording(self, recording_id):
         """Download recording and serve it - FIX FOR HTML RESPONSE ISSUE"""
@@ -286,52 +242,25 @@ class CustomSessionReplayHandler(SessionReplayHandler):
             recording_data = self.data_source.download_recording(recording_id)
             
             if recording_data:
-                response = json.dumps({
+                self.send_json(200, {
                     'success': True,
                     'data': recording_data
                 })
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(response)))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
             else:
-                error_response = json.dumps({
+                self.send_json(404, {
                     'success': False,
                     'error': 'Recording not found'
                 })
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(error_response)))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
                 
         except Exception as e:
             print(f"❌ Error in download_and_serve_recording: {e}")
             import traceback
             traceback.print_exc()
             
-            error_response = json.dumps({
+            self.send_json(500, {
                 'success': False,
                 'error': str(e)
             })
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_response)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
-    
-    def do_OPTIONS(self):
-        """Handle OPTIONS requests for CORS preflight"""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', '*')
-        self.end_headers()
 
 # Define CustomSessionReplayViewer directly in this script
 class CustomSessionReplayViewer(SessionReplayViewer):
@@ -348,7 +277,7 @@ class CustomSessionReplayViewer(SessionReplayViewer):
             return CustomSessionReplayHandler(self.data_source, self.viewer_path, *args, **kwargs)
         
         # Start server
-        self.server = HTTPServer(('', port), handler_factory)
+        self.server = ThreadingHTTPServer(('', port), handler_factory)
         
         # Start in thread
         server_thread = threading.Thread(target=self.server.serve_forever)
@@ -2,7 +2,13 @@
 # IMPORTS
 # ============================================================================
 
+import json
+import time
+import base64
 import logging
+import threading
+import contextvars
+from concurrent.futures import Future
 from .config import get_oauth_settings
 from . import mylogger
  
@@ -11,6 +17,169 @@ logger = mylogger.get_logger()
 # Global variables for OAuth state
 _oauth_initialized = False
 _token_getter = None
+_token_cache = None
+
+# Seconds to wait before retrying a failed background refresh
+REFRESH_RETRY_INTERVAL = 30
+
+# ============================================================================
+# TOKEN CACHE
+# ============================================================================
+
+def decode_token_claims(token):
+    """
+    Decode the claims of a JWT without verifying it.
+    
+    Returns:
+        dict: JWT claims, empty if the token is not a JWT
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return {}
+
+def _token_expiry(token, default_ttl):
+    """
+    Read the expiry time from a JWT's exp claim.
+    
+    Returns:
+        float: Expiry as a Unix timestamp, or now + default_ttl if the token has none
+    """
+    try:
+        return float(decode_token_claims(token)['exp'])
+    except (KeyError, ValueError, TypeError):
+        return time.time() + default_ttl
+
+class TokenCache:
+    """
+    Thread-safe cache for the M2M access token.
+    
+    The cached token is served until refresh_margin seconds before it expires.
+    Inside that window it is still served while one background thread fetches
+    a new token. Once it has expired (or before the first token), callers wait
+    on a single shared refresh instead of each calling the OAuth provider.
+    """
+    
+    def __init__(self, fetch_token, refresh_margin=300, default_ttl=3600):
+        self._fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._inflight = None
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._failures = 0
+        self._refresh_seconds = 0.0
+        self._last_refresh_seconds = None
+    
+    def get(self):
+        """
+        Get a valid token, refreshing it if needed.
+        
+        Returns:
+            str: OAuth token or None if the refresh failed
+        """
+        now = time.time()
+        with self._lock:
+            if self._token and now < self._expires_at:
+                self._hits += 1
+                if now < self._refresh_at or self._inflight is not None:
+                    return self._token
+                # Close to expiry: keep serving this token while a new one is fetched
+                future = self._inflight = Future()
+                token = self._token
+            else:
+                self._misses += 1
+                token = None
+                future = self._inflight
+                owner = future is None
+                if owner:
+                    future = self._inflight = Future()
+        
+        if token:
+            # Copy the context so the refresh sees this request's identity and request id
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(self._refresh, future),
+                             name='m2m-token-refresh', daemon=True).start()
+            return token
+        
+        if owner:
+            self._refresh(future)
+        return future.result()
+    
+    def _refresh(self, future):
+        """Fetch a new token and resolve the shared future with it"""
+        start = time.perf_counter()
+        token = None
+        try:
+            token = self._fetch_token()
+            if not token:
+                logger.warning("⚠️ No token returned from OAuth provider")
+        except Exception as e:
+            logger.error(f"❌ Failed to get M2M token: {e}")
+        elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            self._refreshes += 1
+            self._refresh_seconds += elapsed
+            self._last_refresh_seconds = elapsed
+            now = time.time()
+            if token:
+                self._token = token
+                self._expires_at = _token_expiry(token, self.default_ttl)
+                # Short-lived tokens are refreshed half way through their lifetime
+                lifetime = max(self._expires_at - now, 0)
+                self._refresh_at = self._expires_at - min(self.refresh_margin, lifetime / 2)
+            else:
+                self._failures += 1
+                self._refresh_at = min(now + REFRESH_RETRY_INTERVAL, self._expires_at)
+            self._inflight = None
+        
+        if token:
+            logger.info(f"🔑 M2M token refreshed in {elapsed:.2f}s, "
+                        f"valid for {self._expires_at - now:.0f}s")
+        future.set_result(token)
+    
+    def invalidate(self, token=None):
+        """
+        Drop the cached token, e.g. after the gateway rejects it.
+        
+        Args:
+            token (str, optional): Only drop the cached token if it is still this one,
+                so a token another request already refreshed is kept
+        """
+        with self._lock:
+            if token is not None and token != self._token:
+                return
+            self._token = None
+            self._expires_at = self._refresh_at = 0.0
+    
+    def stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Hit rate, refresh count and refresh latency
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / requests if requests else 0.0,
+                'refreshes': self._refreshes,
+                'failures': self._failures,
+                'avg_refresh_seconds': self._refresh_seconds / self._refreshes if self._refreshes else None,
+                'last_refresh_seconds': self._last_refresh_seconds,
+                'expires_in': max(self._expires_at - time.time(), 0) if self._token else 0
+            }
 
 # ============================================================================
 # OAUTH SETUP
@@ -23,7 +192,7 @@ def setup_oauth():
     Returns:
         bool: True if successful, False if not available
     """
-    global _oauth_initialized, _token_getter
+    global _oauth_initialized, _token_getter, _token_cache
     
     if _oauth_initialized:
         return True
@@ -83,6 +252,11 @@ def setup_oauth():
             return access_token
         
         _token_getter = get_token_sync
+        _token_cache = TokenCache(
+            get_token_sync,
+            refresh_margin=oauth_settings.get('token_refresh_margin', 300),
+            default_ttl=oauth_settings.get('token_default_ttl', 3600)
+        )
         _oauth_initialized = True
         
         logger.info("✅ OAuth initialized.")
@@ -100,32 +274,36 @@ def get_m2m_token():
     """
     Get M2M token for gateway access.
     
+    The token is cached and refreshed ahead of expiry, so most calls do not
+    reach the OAuth provider.
+    
     Returns:
         str: OAuth token or None if not available
     """
-    global _token_getter
-    
-    if not _oauth_initialized or not _token_getter:
+    if not _oauth_initialized or not _token_cache:
         logger.warning("⚠️ OAuth not initialized - no token available")
         return None
     
-    try:
-        logger.info("🔑 Requesting M2M token from OAuth provider...")
-        token = _token_getter()
-        if token:
-            logger.info(f"✅ M2M token obtained successfully")
-            logger.info(f"🔑 Token length: {len(token)} characters")
-            logger.info(f"🔑 Token starts with: {token[:20]}...")
-            return token
-        else:
-            logger.warning("⚠️ No token returned from OAuth provider")
-            return None
-            
-    except Exception as e:
-        logger.error(f"❌ Failed to get M2M token: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-        return None
+    return _token_cache.get()
+
+def invalidate_m2m_token(token=None):
+    """
+    Drop the cached M2M token so the next request fetches a new one.
+    
+    Args:
+        token (str, optional): The rejected token; a different cached token is kept
+    """
+    if _token_cache:
+        _token_cache.invalidate(token)
+
+def get_token_stats():
+    """
+    Get M2M token cache statistics.
+    
+    Returns:
+        dict: Hit rate and refresh latency, empty if OAuth is not initialized
+    """
+    return _token_cache.stats() if _token_cache else {}
 
 # ============================================================================
 # ERROR HANDLING
@@ -14,33 +14,36 @@ logger = mylogger.get_logger()
 # CONFIGURATION LOADING
 # ============================================================================
 
+def get_config():
+    """
+    Get the parsed configuration snapshot.
+    
+    The YAML files are parsed once per process and read again only when one
+    of them changes on disk or reload_configs() is called.
+    
+    Returns:
+        ConfigSnapshot: Read-only configuration with typed accessors
+    """
+    from .config_manager import AgentCoreConfigManager
+    return AgentCoreConfigManager().snapshot()
+
+def reload_configs():
+    """
+    Re-read the configuration files on the next access.
+    """
+    from .config_manager import reload_config
+    reload_config()
+
 def load_configs():
     """
     Load configuration using unified AgentCore configuration system.
     
     Returns:
-        tuple: (merged_config, okta_config) - Two dictionaries with config data
+        tuple: (merged_config, okta_config) - Two read-only mappings with config data
     """
     try:
-        # Import the unified config manager
-        import sys
-        import os
-        
-        # In Docker container, config_manager is in /app/shared/
-        # No need to manipulate path since it's in the same shared directory structure
-        from .config_manager import AgentCoreConfigManager
-        
-        # Initialize config manager
-        config_manager = AgentCoreConfigManager()
-        
-        # Get merged configuration (static + dynamic)
-        merged_config = config_manager.get_merged_config()
-        
-        # Get OAuth settings
-        okta_config = config_manager.get_oauth_settings()
-        
-        logger.info("✅ Loaded configuration using unified AgentCore config system")
-        return merged_config, okta_config
+        config = get_config()
+        return config.merged, config.get('okta', {})
         
     except Exception as e:
         logger.error(f"❌ Failed to load unified configuration: {e}")
@@ -109,7 +112,11 @@ def get_oauth_settings():
         oauth_settings = {
             'provider_name': provider_name,
             'scopes': ['api'],  # Default scopes
-            'auth_flow': 'M2M'  # Machine-to-Machine flow
+            'auth_flow': 'M2M',  # Machine-to-Machine flow
+            # Refresh cached tokens this long before they expire
+            'token_refresh_margin': oauth_config.get('token_refresh_margin', 300),
+            # Lifetime assumed for tokens without a JWT exp claim
+            'token_default_ttl': oauth_config.get('token_default_ttl', 3600)
         }
         
         return oauth_settings
@@ -120,7 +127,9 @@ def get_oauth_settings():
         default_settings = {
             'provider_name': 'bac-identity-provider-okta',
             'scopes': ['api'],
-            'auth_flow': 'M2M'
+            'auth_flow': 'M2M',
+            'token_refresh_margin': 300,
+            'token_default_ttl': 3600
         }
         logger.info(f"🔄 Using default OAuth settings: {default_settings}")
         return default_settings
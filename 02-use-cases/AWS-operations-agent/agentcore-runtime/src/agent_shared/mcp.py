@@ -2,393 +2,402 @@
 # IMPORTS
 # ============================================================================
 
+import time
+import hashlib
 import logging
-from .auth import get_m2m_token
+import functools
+import threading
+from contextlib import contextmanager
+from .auth import get_m2m_token, decode_token_claims, invalidate_m2m_token
 
 from . import mylogger
- 
+
 logger = mylogger.get_logger()
 
-# Global MCP client for persistent connection
-_global_mcp_client = None
-_global_gateway_url = None
-_global_token = None
+# Seconds a cached tool list is reused before it is listed again
+DEFAULT_TOOL_TTL = 300
 
-def create_global_mcp_client(gateway_url, token=None):
+# Seconds an unused connection stays open before it is closed
+DEFAULT_IDLE_TIMEOUT = 900
+
+# Gateway responses that mean the token was rejected
+AUTH_ERROR_STATUSES = (401, 403)
+
+# ============================================================================
+# MCP CLIENT CREATION
+# ============================================================================
+
+def _new_mcp_client(gateway_url, token):
     """
-    Create a global MCP client that stays alive for the application lifetime.
+    Build an MCP client for the gateway; it is not started.
     
-    Args:
-        gateway_url (str): Gateway URL for MCP connection
-        token (str, optional): OAuth token. If None, will try to get one automatically
-    
-    Returns:
-        MCPClient or None: MCP client instance or None if not available
+    Raises:
+        ImportError: If the MCP dependencies are not installed
     """
-    global _global_mcp_client, _global_gateway_url, _global_token
-    
-    if not gateway_url:
-        logger.info("🏠 No gateway URL provided - MCP client not created")
-        return None
+    from mcp.client.streamable_http import streamablehttp_client
+    from strands.tools.mcp.mcp_client import MCPClient
     
-    try:
-        # Import MCP dependencies
-        from mcp.client.streamable_http import streamablehttp_client
-        from strands.tools.mcp.mcp_client import MCPClient
-        
-        # Get token if not provided
-        if not token:
-            token = get_m2m_token()
-            if not token:
-                logger.warning("⚠️ No OAuth token available for MCP client")
-                return None
-        
-        logger.info(f"🔗 Creating global MCP client for gateway: {gateway_url}")
-        logger.info(f"🔑 Using token (length: {len(token)})")
-        
-        # Create transport with authentication
-        def create_transport():
-            headers = {"Authorization": f"Bearer {token}"}
-            return streamablehttp_client(gateway_url, headers=headers)
-        
-        # Create and start MCP client
-        mcp_client = MCPClient(create_transport)
-        
-        # Store globally
-        _global_mcp_client = mcp_client
-        _global_gateway_url = gateway_url
-        _global_token = token
-        
-        logger.info(f"✅ Global MCP client created successfully")
-        return mcp_client
-        
-    except ImportError as e:
-        logger.warning(f"⚠️ MCP dependencies not available: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"❌ Failed to create global MCP client: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-        return None
+    headers = {"Authorization": f"Bearer {token}"}
+    return MCPClient(functools.partial(streamablehttp_client, gateway_url, headers=headers))
 
-def get_mcp_tools_simple(gateway_url, token=None):
+def _token_identity(token):
     """
-    Get available tools from MCP gateway using a simple approach.
-    
-    Args:
-        gateway_url (str): Gateway URL for MCP connection
-        token (str, optional): OAuth token. If None, will try to get one automatically
+    Identify who a token belongs to, so a rotated token maps to the same pool entry.
     
     Returns:
-        list: List of available tools or empty list if none available
+        str: Issuer and subject of a JWT, or a hash of an opaque token
     """
-    if not gateway_url:
-        logger.info("🏠 No gateway URL provided - returning empty tools list")
-        return []
+    claims = decode_token_claims(token)
+    subject = claims.get('sub') or claims.get('client_id') or claims.get('cid')
+    if subject:
+        return f"{claims.get('iss', '')}|{subject}"
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _is_auth_error(error):
+    """
+    Check whether an error, or one it wraps, is a 401/403 from the gateway.
     
-    try:
-        # Import MCP dependencies
-        from mcp.client.streamable_http import streamablehttp_client
-        from strands.tools.mcp.mcp_client import MCPClient
-        
-        # Get token if not provided
-        if not token:
-            token = get_m2m_token()
-            if not token:
-                logger.warning("⚠️ No OAuth token available for MCP client")
-                return []
-        
-        logger.info(f"🔗 Creating simple MCP client for tool discovery")
-        logger.info(f"🌐 Gateway: {gateway_url}")
-        logger.info(f"🔑 Using token (length: {len(token)})")
-        
-        # Create transport with authentication
-        def create_transport():
-            headers = {"Authorization": f"Bearer {token}"}
-            return streamablehttp_client(gateway_url, headers=headers)
-        
-        # Use MCP client within context manager for tool discovery only
-        with MCPClient(create_transport) as mcp_client:
-            logger.info("🔍 Attempting to list tools from MCP client...")
-            
-            # Get tools from MCP client
-            tools = mcp_client.list_tools_sync()
-            tool_count = len(tools) if tools else 0
-            
-            logger.info(f"🛠️ Found {tool_count} MCP tools")
-            
-            if tools:
-                logger.info("📋 Available MCP tools:")
-                for i, tool in enumerate(tools[:5]):  # Show first 5 tools
-                    # Try to get tool name from tool_spec
-                    tool_spec = getattr(tool, 'tool_spec', None)
-                    if tool_spec and hasattr(tool_spec, 'name'):
-                        tool_name = tool_spec.name
-                        tool_desc = getattr(tool_spec, 'description', 'No description')
-                    else:
-                        tool_name = getattr(tool, 'tool_name', 'Unknown')
-                        tool_desc = 'No description'
-                    
-                    logger.info(f"   {i+1}. {tool_name}: {tool_desc[:50]}...")
-                if len(tools) > 5:
-                    logger.info(f"   ... and {len(tools) - 5} more tools")
-            
-            # Return the tools - the client will stay alive within the context manager
-            # The key is that we need to keep the client alive for the agent's lifetime
-            logger.info("✅ Returning MCP tools for agent integration")
-            return tools or []
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to get MCP tools: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-        return []
+    MCP clients surface HTTP errors wrapped in initialization errors and
+    exception groups, so the cause chain and group members are searched.
+    """
+    pending = [error]
+    seen = set()
+    while pending:
+        error = pending.pop()
+        if error is None or id(error) in seen:
+            continue
+        seen.add(id(error))
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+        if status in AUTH_ERROR_STATUSES:
+            return True
+        pending.extend(getattr(error, 'exceptions', None) or ())
+        pending.extend((error.__cause__, error.__context__))
+    return False
+
+def _log_tools(tools):
+    """Log the first few tools of a tool list"""
+    logger.info(f"🛠️ Found {len(tools)} MCP tools")
+    for i, tool in enumerate(tools[:5]):
+        tool_spec = getattr(tool, 'tool_spec', None)
+        if isinstance(tool_spec, dict):
+            tool_name, tool_desc = tool_spec.get('name'), tool_spec.get('description')
+        else:
+            tool_name = getattr(tool, 'tool_name', None) or getattr(tool, 'name', None)
+            tool_desc = getattr(tool, 'description', None)
+        logger.info(f"   {i+1}. {tool_name or 'Unknown'}: {(tool_desc or 'No description')[:50]}...")
+    if len(tools) > 5:
+        logger.info(f"   ... and {len(tools) - 5} more tools")
 
 # ============================================================================
-# MCP CLIENT CREATION
+# MCP CLIENT POOL
 # ============================================================================
 
-def create_mcp_client(gateway_url, token=None):
+class PooledMCPConnection:
     """
-    Create MCP client with authentication.
+    A started MCP client shared by concurrent sessions.
     
-    Args:
-        gateway_url (str): Gateway URL for MCP connection
-        token (str, optional): OAuth token. If None, will try to get one automatically
-    
-    Returns:
-        MCPClient or None: MCP client instance or None if not available
+    Tools listed by a client are bound to it, so a connection stays open
+    until the last session using it has released it, even after it has been
+    replaced in the pool.
     """
-    if not gateway_url:
-        logger.info("🏠 No gateway URL provided - MCP client not created")
-        return None
+
+    def __init__(self, key, client, token):
+        self.key = key
+        self.client = client
+        self.token = token
+        self.refcount = 0
+        self.tools = []
+        self.tools_listed_at = 0.0
+        self.last_used = time.time()
+        self.retired = False
+
+    def close(self):
+        try:
+            self.client.__exit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing MCP client: {e}")
+
+class MCPClientPool:
+    """
+    Persistent MCP connections keyed by (gateway URL, token identity).
     
-    try:
-        # Import MCP dependencies
-        from mcp.client.streamable_http import streamablehttp_client
-        from strands.tools.mcp.mcp_client import MCPClient
-        
-        # Get token if not provided
+    Sessions lease a connection with session() and share its cached tool
+    list. When the tool list is older than tool_ttl it is listed again,
+    which doubles as a health check: a connection that fails it, or whose
+    session raised, is replaced by a fresh one. A rotated token for the same
+    identity also gets a fresh connection. Replaced connections are closed
+    once their last session ends.
+    """
+
+    def __init__(self, tool_ttl=DEFAULT_TOOL_TTL, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.tool_ttl = tool_ttl
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._connections = {}
+        self._connects = 0
+        self._reuses = 0
+        self._tool_listings = 0
+
+    @contextmanager
+    def session(self, gateway_url, token=None):
+        """
+        Lease a warm connection for the duration of a request.
+        
+        Args:
+            gateway_url (str): Gateway URL for MCP connection
+            token (str, optional): OAuth token. If None, the cached M2M token is used
+        
+        Yields:
+            PooledMCPConnection: Connection with its client and tools
+        """
+        connection = self.acquire(gateway_url, token)
+        try:
+            yield connection
+        except Exception as e:
+            # The failure may be the connection's; the next session gets a fresh one
+            self._retire(connection)
+            self._check_auth_error(e, connection.token)
+            raise
+        finally:
+            self.release(connection)
+
+    def acquire(self, gateway_url, token=None):
+        """
+        Get a connection with a current tool list; pair with release().
+        
+        Raises:
+            RuntimeError: If no OAuth token is available
+            ImportError: If the MCP dependencies are not installed
+        """
+        uses_m2m_token = not token
+        token = token or get_m2m_token()
         if not token:
-            token = get_m2m_token()
-            if not token:
-                logger.warning("⚠️ No OAuth token available for MCP client")
-                return None
-        
-        logger.info(f"🔗 Creating MCP client for gateway: {gateway_url}")
-        logger.info(f"🔑 Using token (length: {len(token)}, starts with: {token[:20]}...)")
-        
-        # Create transport with authentication
-        def create_transport():
-            headers = {"Authorization": f"Bearer {token}"}
-            logger.info(f"🌐 Creating transport with headers: {list(headers.keys())}")
-            return streamablehttp_client(
-                gateway_url,
-                headers=headers
-            )
-        
-        # Create MCP client
-        mcp_client = MCPClient(create_transport)
-        logger.info(f"✅ MCP client created successfully")
-        
-        # Test the connection by trying to initialize
+            raise RuntimeError("No OAuth token available for MCP client")
+        
+        key = (gateway_url, _token_identity(token))
+        self._close_idle()
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        # Connecting and listing tools happen once per key, not once per waiting session
+        with key_lock:
+            stale = None
+            with self._lock:
+                connection = self._connections.get(key)
+                if connection is not None and connection.token != token:
+                    logger.info("🔄 OAuth token rotated - reconnecting MCP client")
+                    self._retire_locked(connection)
+                    if connection.refcount == 0:
+                        stale = connection
+                    connection = None
+                if connection is not None:
+                    connection.refcount += 1
+            if stale is not None:
+                stale.close()
+            
+            if connection is not None and time.time() - connection.tools_listed_at > self.tool_ttl:
+                try:
+                    self._list_tools(connection)
+                except Exception as e:
+                    logger.warning(f"⚠️ MCP health check failed, reconnecting: {e}")
+                    self._retire(connection)
+                    if self._check_auth_error(e, token) and uses_m2m_token:
+                        # Reconnect with a fresh token instead of the rejected one
+                        token = get_m2m_token() or token
+                    self.release(connection)
+                    connection = None
+            
+            if connection is None:
+                connection = self._connect(key, gateway_url, token)
+            else:
+                with self._lock:
+                    self._reuses += 1
+        
+        connection.last_used = time.time()
+        return connection
+
+    def release(self, connection):
+        """Return a leased connection; replaced connections close after their last session"""
+        with self._lock:
+            connection.refcount -= 1
+            connection.last_used = time.time()
+            close = connection.retired and connection.refcount == 0
+        if close:
+            connection.close()
+
+    def _connect(self, key, gateway_url, token):
+        logger.info(f"🔗 Connecting MCP client to gateway: {gateway_url}")
+        client = _new_mcp_client(gateway_url, token)
+        client.__enter__()
+        connection = PooledMCPConnection(key, client, token)
+        connection.refcount = 1
         try:
-            # This will test the connection
-            logger.info("🔍 Testing MCP client connection...")
-            # Don't close the client here - let it stay open
-            logger.info("✅ MCP client connection test passed")
-        except Exception as test_e:
-            logger.warning(f"⚠️ MCP client connection test failed: {test_e}")
-            # Still return the client as it might work when actually used
-        
-        return mcp_client
-        
-    except ImportError as e:
-        logger.warning(f"⚠️ MCP dependencies not available: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"❌ Failed to create MCP client: {e}")
-        return None
+            self._list_tools(connection)
+        except BaseException as e:
+            connection.close()
+            self._check_auth_error(e, token)
+            raise
+        with self._lock:
+            self._connections[key] = connection
+            self._connects += 1
+        logger.info("✅ MCP client connected")
+        return connection
+
+    def _list_tools(self, connection):
+        tools = connection.client.list_tools_sync() or []
+        connection.tools = list(tools)
+        connection.tools_listed_at = time.time()
+        with self._lock:
+            self._tool_listings += 1
+        _log_tools(connection.tools)
+
+    def _check_auth_error(self, error, token):
+        """
+        Drop a cached M2M token the gateway rejected, so it is not served until it expires.
+        
+        Returns:
+            bool: True if the error was a 401/403
+        """
+        if not _is_auth_error(error):
+            return False
+        logger.warning("🔑 Gateway rejected the OAuth token - fetching a new one on the next request")
+        invalidate_m2m_token(token)
+        return True
+
+    def _retire(self, connection):
+        with self._lock:
+            self._retire_locked(connection)
+
+    def _retire_locked(self, connection):
+        """Remove a connection from the pool; callers hold self._lock"""
+        connection.retired = True
+        if self._connections.get(connection.key) is connection:
+            del self._connections[connection.key]
+
+    def _close_idle(self):
+        """Close connections no session has used for idle_timeout seconds"""
+        now = time.time()
+        idle = []
+        with self._lock:
+            for connection in list(self._connections.values()):
+                if connection.refcount == 0 and now - connection.last_used > self.idle_timeout:
+                    self._retire_locked(connection)
+                    idle.append(connection)
+        for connection in idle:
+            logger.info("🧹 Closing idle MCP client")
+            connection.close()
+
+    def close_all(self):
+        """Close every connection; connections still in use close when released"""
+        with self._lock:
+            connections = list(self._connections.values())
+            for connection in connections:
+                self._retire_locked(connection)
+            idle = [connection for connection in connections if connection.refcount == 0]
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        """
+        Get pool statistics.
+        
+        Returns:
+            dict: Open connections, active sessions, connects and reuses
+        """
+        with self._lock:
+            return {
+                'connections': len(self._connections),
+                'active_sessions': sum(c.refcount for c in self._connections.values()),
+                'connects': self._connects,
+                'reuses': self._reuses,
+                'tool_listings': self._tool_listings
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_mcp_pool():
+    """
+    Get the process-wide MCP client pool.
+    
+    Returns:
+        MCPClientPool: Shared pool instance
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MCPClientPool()
+        return _pool
 
 # ============================================================================
-# TOOL DISCOVERY
+# COMPATIBILITY HELPERS
 # ============================================================================
 
-def get_mcp_tools_with_client(gateway_url, token=None):
+# Connection held by create_global_mcp_client until cleanup_global_mcp_client
+_global_connection = None
+
+def create_mcp_client(gateway_url, token=None):
     """
-    Get available tools from MCP gateway using a properly managed client.
+    Create an unstarted MCP client with authentication; the caller manages its lifetime.
+    
+    Prefer get_mcp_pool().session(), which reuses warm connections.
     
     Args:
         gateway_url (str): Gateway URL for MCP connection
         token (str, optional): OAuth token. If None, will try to get one automatically
     
     Returns:
-        list: List of available tools or empty list if none available
+        MCPClient or None: MCP client instance or None if not available
     """
     if not gateway_url:
-        logger.info("🏠 No gateway URL provided - returning empty tools list")
-        return []
+        logger.info("🏠 No gateway URL provided - MCP client not created")
+        return None
+    
+    token = token or get_m2m_token()
+    if not token:
+        logger.warning("⚠️ No OAuth token available for MCP client")
+        return None
     
     try:
-        # Import MCP dependencies
-        from mcp.client.streamable_http import streamablehttp_client
-        from strands.tools.mcp.mcp_client import MCPClient
-        
-        # Get token if not provided
-        if not token:
-            token = get_m2m_token()
-            if not token:
-                logger.warning("⚠️ No OAuth token available for MCP client")
-                return []
-        
-        logger.info(f"🔗 Creating MCP client for tool discovery")
-        logger.info(f"🌐 Gateway: {gateway_url}")
-        logger.info(f"🔑 Using token (length: {len(token)})")
-        
-        # Create transport with authentication
-        def create_transport():
-            headers = {"Authorization": f"Bearer {token}"}
-            return streamablehttp_client(gateway_url, headers=headers)
-        
-        # Use MCP client within context manager
-        with MCPClient(create_transport) as mcp_client:
-            logger.info("🔍 Attempting to list tools from MCP client...")
-            
-            # Get tools from MCP client
-            tools = mcp_client.list_tools_sync()
-            tool_count = len(tools) if tools else 0
-            
-            logger.info(f"🛠️ Found {tool_count} MCP tools")
-            
-            if tools:
-                logger.info("📋 Available MCP tools:")
-                for i, tool in enumerate(tools[:5]):  # Show first 5 tools
-                    # Try different attribute names for tool info
-                    tool_name = getattr(tool, 'name', None) or getattr(tool, 'tool_name', None) or str(tool)
-                    tool_desc = getattr(tool, 'description', None) or getattr(tool, 'tool_description', None) or 'No description'
-                    
-                    # Debug: show tool attributes
-                    tool_attrs = [attr for attr in dir(tool) if not attr.startswith('_')]
-                    logger.debug(f"   Tool {i+1} attributes: {tool_attrs}")
-                    
-                    logger.info(f"   {i+1}. {tool_name}: {tool_desc[:50]}...")
-                if len(tools) > 5:
-                    logger.info(f"   ... and {len(tools) - 5} more tools")
-            
-            return tools or []
-        
+        return _new_mcp_client(gateway_url, token)
     except ImportError as e:
         logger.warning(f"⚠️ MCP dependencies not available: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"❌ Failed to get MCP tools: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-        return []
-
-def get_mcp_tools(mcp_client):
-    """
-    Get available tools from MCP client (legacy function for compatibility).
-    
-    Args:
-        mcp_client: MCP client instance
-    
-    Returns:
-        list: List of available tools or empty list if none available
-    """
-    if not mcp_client:
-        logger.info("🏠 No MCP client provided - returning empty tools list")
-        return []
-    
-    try:
-        logger.info("🔍 Attempting to list tools from MCP client...")
-        
-        # Get tools from MCP client
-        tools = mcp_client.list_tools_sync()
-        tool_count = len(tools) if tools else 0
-        
-        logger.info(f"🛠️ Found {tool_count} MCP tools")
-        
-        if tools:
-            logger.info("📋 Available MCP tools:")
-            for i, tool in enumerate(tools[:5]):  # Show first 5 tools
-                tool_name = getattr(tool, 'name', 'Unknown')
-                tool_desc = getattr(tool, 'description', 'No description')
-                logger.info(f"   {i+1}. {tool_name}: {tool_desc[:50]}...")
-            if len(tools) > 5:
-                logger.info(f"   ... and {len(tools) - 5} more tools")
-        
-        return tools or []
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to get MCP tools: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-        return []
-
-# ============================================================================
-# PERSISTENT MCP CLIENT MANAGEMENT
-# ============================================================================
+        return None
 
-def create_persistent_mcp_client(gateway_url, token=None):
+def create_global_mcp_client(gateway_url, token=None):
     """
-    Create a persistent MCP client that stays alive for tool execution.
+    Get a pooled MCP client that stays alive until cleanup_global_mcp_client().
     
     Args:
         gateway_url (str): Gateway URL for MCP connection
         token (str, optional): OAuth token. If None, will try to get one automatically
     
     Returns:
-        MCPClient or None: MCP client instance or None if not available
+        MCPClient or None: Started MCP client or None if not available
     """
-    global _global_mcp_client, _global_gateway_url, _global_token
+    global _global_connection
     
     if not gateway_url:
         logger.info("🏠 No gateway URL provided - MCP client not created")
         return None
     
     try:
-        # Import MCP dependencies
-        from mcp.client.streamable_http import streamablehttp_client
-        from strands.tools.mcp.mcp_client import MCPClient
-        
-        # Get token if not provided
-        if not token:
-            token = get_m2m_token()
-            if not token:
-                logger.warning("⚠️ No OAuth token available for MCP client")
-                return None
-        
-        logger.info(f"🔗 Creating persistent MCP client for gateway: {gateway_url}")
-        logger.info(f"🔑 Using token (length: {len(token)})")
-        
-        # Create transport with authentication
-        def create_transport():
-            headers = {"Authorization": f"Bearer {token}"}
-            return streamablehttp_client(gateway_url, headers=headers)
-        
-        # Create MCP client (don't use context manager - keep it alive)
-        mcp_client = MCPClient(create_transport)
-        
-        # Initialize the client
-        mcp_client.__enter__()
-        
-        # Store globally for tool execution
-        _global_mcp_client = mcp_client
-        _global_gateway_url = gateway_url
-        _global_token = token
-        
-        logger.info(f"✅ Persistent MCP client created successfully")
-        return mcp_client
-        
+        connection = get_mcp_pool().acquire(gateway_url, token)
     except ImportError as e:
         logger.warning(f"⚠️ MCP dependencies not available: {e}")
         return None
     except Exception as e:
-        logger.error(f"❌ Failed to create persistent MCP client: {e}")
-        import traceback
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
+        logger.error(f"❌ Failed to create global MCP client: {e}")
         return None
+    
+    cleanup_global_mcp_client()
+    _global_connection = connection
+    return connection.client
+
+# Kept for compatibility; both return a started, pooled client
+create_persistent_mcp_client = create_global_mcp_client
 
 def get_global_mcp_client():
     """
@@ -397,29 +406,33 @@ def get_global_mcp_client():
     Returns:
         MCPClient or None: Global MCP client instance
     """
-    return _global_mcp_client
+    return _global_connection.client if _global_connection else None
 
 def cleanup_global_mcp_client():
     """
-    Clean up the global MCP client.
+    Release the global MCP client back to the pool.
     """
-    global _global_mcp_client
-    if _global_mcp_client:
-        try:
-            # The client should already be closed from the context manager
-            logger.info("🧹 Global MCP client cleaned up")
-        except Exception as e:
-            logger.warning(f"⚠️ Error cleaning up global MCP client: {e}")
-        finally:
-            _global_mcp_client = None
+    global _global_connection
+    if _global_connection:
+        get_mcp_pool().release(_global_connection)
+        _global_connection = None
+        logger.info("🧹 Global MCP client released")
 
 def cleanup_mcp_client():
     """Legacy cleanup function for compatibility"""
     cleanup_global_mcp_client()
 
-def get_mcp_tools_with_persistent_client(gateway_url, token=None):
+# ============================================================================
+# TOOL DISCOVERY
+# ============================================================================
+
+def get_mcp_tools_with_client(gateway_url, token=None):
     """
-    Get available tools from MCP gateway using a persistent client.
+    Get available tools from the MCP gateway through the global pooled client.
+    
+    The tools are bound to that client, which stays leased until
+    cleanup_global_mcp_client(). New code should use the tools of a
+    get_mcp_pool().session() inside the session instead.
     
     Args:
         gateway_url (str): Gateway URL for MCP connection
@@ -432,36 +445,35 @@ def get_mcp_tools_with_persistent_client(gateway_url, token=None):
         logger.info("🏠 No gateway URL provided - returning empty tools list")
         return []
     
+    if create_global_mcp_client(gateway_url, token) is None:
+        return []
+    return list(_global_connection.tools)
+
+# Kept for compatibility; all of them share the pooled connection
+get_mcp_tools_simple = get_mcp_tools_with_client
+get_mcp_tools_with_persistent_client = get_mcp_tools_with_client
+
+def get_mcp_tools(mcp_client):
+    """
+    Get available tools from MCP client (legacy function for compatibility).
+    
+    Args:
+        mcp_client: MCP client instance
+    
+    Returns:
+        list: List of available tools or empty list if none available
+    """
+    if not mcp_client:
+        logger.info("🏠 No MCP client provided - returning empty tools list")
+        return []
+    
     try:
-        # Create persistent client
-        mcp_client = create_persistent_mcp_client(gateway_url, token)
-        if not mcp_client:
-            logger.warning("⚠️ Failed to create persistent MCP client")
-            return []
-        
-        logger.info("🔍 Attempting to list tools from persistent MCP client...")
-        
-        # Get tools from MCP client
-        tools = mcp_client.list_tools_sync()
-        tool_count = len(tools) if tools else 0
-        
-        logger.info(f"🛠️ Found {tool_count} MCP tools")
-        
-        if tools:
-            logger.info("📋 Available MCP tools:")
-            for i, tool in enumerate(tools[:5]):  # Show first 5 tools
-                # Try different attribute names for tool info
-                tool_name = getattr(tool, 'name', None) or getattr(tool, 'tool_name', None) or str(tool)
-                tool_desc = getattr(tool, 'description', None) or getattr(tool, 'tool_description', None) or 'No description'
-                
-                logger.info(f"   {i+1}. {tool_name}: {tool_desc[:50]}...")
-            if len(tools) > 5:
-                logger.info(f"   ... and {len(tools) - 5} more tools")
-        
-        return tools or []
-        
+        tools = mcp_client.list_tools_sync() or []
+        _log_tools(tools)
+        return tools
+    
     except Exception as e:
-        logger.error(f"❌ Failed to get MCP tools with persistent client: {e}")
+        logger.error(f"❌ Failed to get MCP tools: {e}")
         import traceback
         logger.error(f"❌ Full traceback: {traceback.format_exc()}")
         return []
@@ -4,7 +4,7 @@
 
 import logging
 from datetime import datetime
-from .config import load_configs
+from .config import get_config
 
 from . import mylogger
  
@@ -35,15 +35,8 @@ def setup_memory():
         # Import AgentCore memory client
         from bedrock_agentcore.memory import MemoryClient
         
-        # Load configuration
-        agentcore_config, _ = load_configs()
-        
-        # Get memory configuration
-        memory_config = agentcore_config.get('memory', {})
-        region = agentcore_config.get('aws', {}).get('region', 'us-east-1')
-        
         # Create memory client
-        _memory_client = MemoryClient(region_name=region)
+        _memory_client = MemoryClient(region_name=get_config().region)
         _memory_initialized = True
         
         logger.info("✅ AgentCore Memory client initialized")
@@ -83,10 +76,8 @@ def get_conversation_context(session_id, actor_id, max_results=3):
             _current_session_id = session_id
             logger.info(f"📝 Started memory session: {session_id}")
         
-        # Get memory ID from configuration
-        agentcore_config, _ = load_configs()
-        memory_config = agentcore_config.get('memory', {})
-        memory_id = memory_config.get('id')
+        # Get memory ID from the cached configuration snapshot
+        memory_id = get_config().memory_id
         
         if not memory_id:
             logger.info("📝 Memory ID not found in configuration - no context available")
@@ -164,10 +155,8 @@ def save_conversation(session_id, user_message, assistant_response, actor_id="us
         return
     
     try:
-        # Get memory ID from configuration
-        agentcore_config, _ = load_configs()
-        memory_config = agentcore_config.get('memory', {})
-        memory_id = memory_config.get('id')
+        # Get memory ID from the cached configuration snapshot
+        memory_id = get_config().memory_id
         
         if not memory_id:
             logger.warning("⚠️ Memory ID not found in configuration - conversation not saved")
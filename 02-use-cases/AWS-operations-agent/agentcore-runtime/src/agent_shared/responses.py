@@ -13,19 +13,21 @@ logger = mylogger.get_logger()
 # DIY RESPONSE FORMATTING
 # ============================================================================
 
-def format_diy_response(event):
+def format_diy_response(event, content_data=None):
     """
     Format event for DIY agent streaming (Server-Sent Events) with enhanced text processing.
     
     Args:
         event: Strands streaming event
+        content_data (dict, optional): Result of extract_content_from_event for this event
     
     Returns:
         str: Formatted SSE string with proper newline handling
     """
     try:
         # Extract structured content from event
-        content_data = extract_content_from_event(event)
+        if content_data is None:
+            content_data = extract_content_from_event(event)
         
         # Create enhanced SSE payload
         if content_data['has_text']:
@@ -38,7 +40,8 @@ def format_diy_response(event):
                     'has_formatting': '\n' in content_data['content']
                 }
             }
-            logger.debug(f"📤 Formatted text content: {len(content_data['content'])} chars")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📤 Formatted text content: {len(content_data['content'])} chars")
         else:
             # Non-text event - use legacy format for compatibility
             sse_payload = {
@@ -48,7 +51,8 @@ def format_diy_response(event):
                     'event_type': content_data['event_type']
                 }
             }
-            logger.debug(f"📤 Formatted non-text event: {content_data['event_type']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📤 Formatted non-text event: {content_data['event_type']}")
         
         # Format as Server-Sent Events with proper JSON encoding
         sse_data = json.dumps(sse_payload, ensure_ascii=False)
@@ -101,7 +105,8 @@ def process_text_formatting(text: str) -> str:
     Returns:
         str: Text with proper newlines for display
     """
-    if not text:
+    if not text or '\\' not in text:
+        # Nothing to convert; most deltas take this path
         return text
     
     try:
@@ -117,9 +122,10 @@ def process_text_formatting(text: str) -> str:
         # Clean up any excessive whitespace while preserving intentional formatting
         # Don't strip all whitespace as it might be intentional formatting
         
-        logger.debug(f"📝 Text processing: {len(text)} chars → {len(processed_text)} chars")
-        if '\\n' in text:
-            logger.debug(f"🔄 Converted literal newlines in text: {text[:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📝 Text processing: {len(text)} chars → {len(processed_text)} chars")
+            if '\\n' in text:
+                logger.debug(f"🔄 Converted literal newlines in text: {text[:50]}...")
         
         return processed_text
         
@@ -129,93 +135,132 @@ def process_text_formatting(text: str) -> str:
         # Re-raise to expose the real issue
         raise
 
-def extract_content_from_event(event) -> dict:
+class TextFormatter:
+    """
+    Incremental version of process_text_formatting for one response stream.
+    
+    Each delta is processed once. A trailing backslash is held back until the
+    next delta, so an escape sequence split across two deltas is still
+    converted; call flush() when the stream ends.
+    """
+    
+    def __init__(self):
+        self._pending = ''
+    
+    def feed(self, text: str) -> str:
+        if self._pending:
+            text = self._pending + text
+            self._pending = ''
+        if '\\' not in text:
+            return text
+        # An odd number of trailing backslashes ends in the start of an escape
+        trailing = len(text) - len(text.rstrip('\\'))
+        if trailing % 2:
+            text, self._pending = text[:-1], '\\'
+        return process_text_formatting(text)
+    
+    def flush(self) -> str:
+        pending, self._pending = self._pending, ''
+        return pending
+
+def _event_repr(event) -> str:
+    """Truncated string form of an event, used for non-text SSE payloads"""
+    event_str = str(event)
+    return event_str[:200] + '...' if len(event_str) > 200 else event_str
+
+class _EventContent(dict):
+    """Content dict whose 'raw_event' is only built when it is first read"""
+    
+    __slots__ = ('_event',)
+    
+    def __init__(self, event, content, has_text):
+        super().__init__(content=content, event_type=type(event).__name__, has_text=has_text)
+        self._event = event
+    
+    def __missing__(self, key):
+        if key != 'raw_event':
+            raise KeyError(key)
+        value = self['raw_event'] = _event_repr(self._event)
+        return value
+    
+    def get(self, key, default=None):
+        if key == 'raw_event':
+            return self[key]
+        return super().get(key, default)
+
+def _text_from_block_delta(block_delta):
+    """contentBlockDelta: streamed model text"""
+    return block_delta.get('delta', {}).get('text')
+
+def _text_from_block_start(block_start):
+    """contentBlockStart: announce the tool the model selected"""
+    tool_info = block_start.get('start', {}).get('toolUse')
+    if tool_info is None:
+        return None
+    tool_name = tool_info.get('name', 'unknown_tool')
+    tool_id = tool_info.get('toolUseId', 'unknown_id')
+    
+    # Clean up tool name by removing namespace prefix
+    # e.g., "bac-tool___ec2_read_operations" -> "ec2_read_operations"
+    clean_tool_name = tool_name.split('___')[-1] if '___' in tool_name else tool_name
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"📤 Tool selected: {clean_tool_name} (ID: {tool_id[:8]}...)")
+    # Create user-friendly message about tool selection
+    return f"\n🔍 Using {clean_tool_name} tool...(ID: {tool_id})\n"
+
+# Handlers for the inner model event of {'event': {...}} stream events, in priority order
+_MODEL_EVENT_HANDLERS = {
+    'contentBlockDelta': _text_from_block_delta,
+    'contentBlockStart': _text_from_block_start,
+}
+
+def _extract_text(event):
+    """Find the text of an event by its shape; returns (text, extraction_method)"""
+    if isinstance(event, dict):
+        inner_event = event.get('event')
+        if inner_event:
+            # DIY agent format: nested model stream event
+            for key, handler in _MODEL_EVENT_HANDLERS.items():
+                if key in inner_event:
+                    text = handler(inner_event[key])
+                    if text:
+                        return text, key
+        # Other dict events (callback data, lifecycle flags) carry no new text
+        return None, None
+    
+    # SDK format: event object with a delta attribute
+    delta = getattr(event, 'delta', None)
+    text = getattr(delta, 'text', None) if delta is not None else None
+    if text:
+        return text, "delta_attribute"
+    return None, None
+
+def extract_content_from_event(event, formatter=None) -> dict:
     """
     Extract structured content from a Strands streaming event.
     Uses priority-based extraction to avoid duplicates.
     
     Args:
         event: Strands streaming event
+        formatter (TextFormatter, optional): Per-stream formatter for split escape sequences
     
     Returns:
-        dict: Structured content with metadata
+        dict: Structured content with metadata; 'raw_event' is built on first access
     """
     try:
-        content_data = {
-            'content': '',
-            'event_type': type(event).__name__,
-            'has_text': False,
-            'raw_event': str(event)[:200] + '...' if len(str(event)) > 200 else str(event)
-        }
-        
-        extracted_text = None
-        extraction_method = None
-        
-        # Priority 1: Extract from nested dictionary structure (DIY agent format)
-        if not extracted_text and isinstance(event, dict) and 'event' in event:
-            inner_event = event['event']
-            if 'contentBlockDelta' in inner_event:
-                delta = inner_event['contentBlockDelta'].get('delta', {})
-                if 'text' in delta and delta['text']:
-                    extracted_text = delta['text']
-                    extraction_method = "nested_dict"
-        
-        # Priority 1.5: Handle contentBlockStart events (tool selection)
-        if not extracted_text and isinstance(event, dict) and 'event' in event:
-            inner_event = event['event']
-            if 'contentBlockStart' in inner_event:
-                start_info = inner_event['contentBlockStart'].get('start', {})
-                if 'toolUse' in start_info:
-                    tool_info = start_info['toolUse']
-                    tool_name = tool_info.get('name', 'unknown_tool')
-                    tool_id = tool_info.get('toolUseId', 'unknown_id')
-                    
-                    # Clean up tool name by removing namespace prefix
-                    # e.g., "bac-tool___ec2_read_operations" -> "ec2_read_operations"
-                    clean_tool_name = tool_name.split('___')[-1] if '___' in tool_name else tool_name
-                    
-                    # Create user-friendly message about tool selection
-                    extracted_text = f"\n🔍 Using {clean_tool_name} tool...(ID: {tool_id})\n"
-                    extraction_method = "tool_start"
-                    logger.debug(f"📤 Tool selected: {clean_tool_name} (ID: {tool_id[:8]}...)")
-
-        # Priority 2: Extract from delta attribute (SDK format)
-        if not extracted_text and hasattr(event, 'delta') and hasattr(event.delta, 'text'):
-            if event.delta.text:
-                #logger.info('# Priority 2: Ecan you creatextract from delta attribute (SDK format)')
-                extracted_text = event.delta.text
-                extraction_method = "delta_attribute"
-
-        # Priority 3: Extract from string representation (fallback)
-        if not extracted_text:
-            #logger.info('# Priority 3: Extract from string representation (fallback)')
-            event_str = str(event)
-            # <uncomment later>
-            # if 'contentBlockDelta' in event_str and "'text':" in event_str:
-            #     import re
-            #     # Try patterns in order of specificity
-            #     patterns = [
-            #         r"'text':\s*'([^']*)'",  # Most specific first
-            #         r'"text":\s*"([^"]*)"',
-            #         r"delta=\{[^}]*'text':\s*'([^']*)'[^}]*\}",
-            #     ]
-                
-            #     for pattern in patterns:
-            #         delta_match = re.search(pattern, event_str)
-            #         if delta_match and delta_match.group(1):
-            #             extracted_text = delta_match.group(1)
-            #             extraction_method = f"regex_{pattern[:20]}..."
-            #             break
+        extracted_text, extraction_method = _extract_text(event)
         
         # Process extracted text if found
         if extracted_text:
-            content_data['content'] = process_text_formatting(extracted_text)
-            content_data['has_text'] = True
-            logger.debug(f"📤 Extracted text via {extraction_method}: {extracted_text[:30]}...")
-        else:
-            logger.debug(f"📭 No text content in event: {content_data['event_type']}")
+            content = formatter.feed(extracted_text) if formatter else process_text_formatting(extracted_text)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📤 Extracted text via {extraction_method}: {extracted_text[:30]}...")
+            return _EventContent(event, content, True)
         
-        return content_data
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📭 No text content in event: {type(event).__name__}")
+        return _EventContent(event, '', False)
         
     except Exception as e:
         logger.error(f"❌ Failed to extract content from event: {e}")
@@ -228,19 +273,20 @@ def extract_content_from_event(event) -> dict:
 # UTILITIES (ENHANCED)
 # ============================================================================
 
-def extract_text_from_event(event):
+def extract_text_from_event(event, formatter=None):
     """
     Extract text content from a Strands streaming event.
     Enhanced version that uses the new content extraction.
     
     Args:
         event: Strands streaming event
+        formatter (TextFormatter, optional): Per-stream formatter for split escape sequences
     
     Returns:
         str: Extracted and formatted text or empty string
     """
     try:
-        content_data = extract_content_from_event(event)
+        content_data = extract_content_from_event(event, formatter)
         return content_data.get('content', '')
         
     except Exception as e:
@@ -4,7 +4,6 @@ Simplified DIY Agent following EXACT AWS documentation MCP patterns
 Based on: https://docs.aws.amazon.com/bedrock-agentcore/latest/devguide/gateway-using-mcp-clients.html
 """
 
-import functools
 import logging
 import sys
 import os
@@ -22,14 +21,14 @@ sys.path.append(project_root)
 from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent, tool
 from strands.models import BedrockModel
-from strands.tools.mcp.mcp_client import MCPClient
 from strands_tools import think
 
 # Shared utilities
 from agent_shared.config_manager import AgentCoreConfigManager
-from agent_shared.auth import setup_oauth, get_m2m_token, is_oauth_available
+from agent_shared.auth import setup_oauth, is_oauth_available, get_token_stats
+from agent_shared.mcp import get_mcp_pool
 from agent_shared.memory import setup_memory, get_conversation_context, save_conversation, is_memory_available
-from agent_shared.responses import format_diy_response, extract_text_from_event, format_error_response
+from agent_shared.responses import format_diy_response, extract_content_from_event, format_error_response, TextFormatter
 
 import asyncio
 import time
@@ -230,23 +229,9 @@ Remember: Progress updates with emojis are MANDATORY, not optional! Follow the e
         return
     
     try:
-        access_token = get_m2m_token()
-        if not access_token:
-            raise Exception("No access token")
-        
-        # Create headers for authentication
-        headers = {"Authorization": f"Bearer {access_token}"}
-        
-        # EXACT AWS pattern: Create MCP client with functools.partial
-        mcp_client = MCPClient(functools.partial(
-            _create_streamable_http_transport,
-            url=gateway_url,
-            headers=headers
-        ))
-        
-        # EXACT AWS pattern: Use context manager
-        with mcp_client:
-            tools = mcp_client.list_tools_sync()
+        # Pooled MCP connection: warm transport and cached tool list shared across requests
+        with get_mcp_pool().session(gateway_url) as mcp_connection:
+            tools = mcp_connection.tools
             
             # Add local tools
             all_tools = [get_current_time, echo_message]
@@ -254,9 +239,7 @@ Remember: Progress updates with emojis are MANDATORY, not optional! Follow the e
                 all_tools.extend(tools)
                 logger.info(f"🛠️ Streaming with {len(tools)} MCP tools + local tools")
             
-            logger.info("$$$$$$$$$$$$$$$$$$$$")
             logger.info(f"All tools count: {len(all_tools)}")
-            logger.info("$$$$$$$$$$$$$$$$$$$$")
 
             agent = Agent(model=bedrock_model, tools=all_tools, system_prompt=system_prompt)
             async for event in agent.stream_async(prompt):
@@ -280,9 +263,6 @@ Remember: Progress updates with emojis are MANDATORY, not optional! Follow the e
         local_tools = [get_current_time, echo_message, think]
         agent = Agent(model=bedrock_model, tools=local_tools)
         async for event in agent.stream_async(prompt):
-            logger.info('@@@@@@@@@@@@@@@@@@@@')
-            logger.info(tools)
-            logger.info('@@@@@@@@@@@@@@@@@@@@')
             yield event
 
 # ============================================================================
@@ -336,20 +316,28 @@ async def stream_response(user_message: str, session_id: str = None, actor_id: s
         # Use AWS documented streaming pattern
         last_event_time = time.time()
         
+        formatter = TextFormatter()
         async for event in execute_agent_streaming(model, final_message):
-            # Format and yield response
-            formatted = format_diy_response(event)
+            # Extract once, then format and yield response
+            content_data = extract_content_from_event(event, formatter)
+            formatted = format_diy_response(event, content_data)
             yield formatted
             last_event_time = time.time()
             
             # Collect text for memory
-            text = extract_text_from_event(event)
+            text = content_data['content']
             if text:
                 response_parts.append(text)
                 
             # Brief pause to prevent overwhelming the client
             #await asyncio.sleep(0.01)
         
+        # Text held back by the formatter at the end of the stream
+        tail = formatter.flush()
+        if tail:
+            yield format_diy_response(None, {'content': tail, 'event_type': 'str', 'has_text': True})
+            response_parts.append(tail)
+        
         # Save to memory if available
         if is_memory_available() and session_id and response_parts:
             full_response = ''.join(response_parts)
@@ -422,7 +410,8 @@ async def invoke_agent(request: InvocationRequest):
 @app.get("/ping")
 async def ping():
     """Health check endpoint"""
-    return {"status": "healthy", "agent_type": "diy_simple", "pattern": "aws_exact"}
+    return {"status": "healthy", "agent_type": "diy_simple", "pattern": "aws_exact",
+            "token_cache": get_token_stats(), "mcp_pool": get_mcp_pool().stats()}
 
 # ============================================================================
 # MAIN
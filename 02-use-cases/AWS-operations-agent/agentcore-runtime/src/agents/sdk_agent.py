@@ -9,7 +9,6 @@ Uses shared business logic with DIY agent for consistency
 # ============================================================================
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-import functools
 import json
 import logging
 import sys
@@ -34,7 +33,6 @@ from strands.models import BedrockModel
 
 # Use AWS documented Strands MCP client pattern
 from mcp.client.streamable_http import streamablehttp_client
-from strands.tools.mcp.mcp_client import MCPClient
 
 # Import loop control tools from strands_tools
 from strands_tools import think, stop, handoff_to_user
@@ -43,9 +41,10 @@ from strands_tools import think, stop, handoff_to_user
 from agent_shared.config_manager import AgentCoreConfigManager
 
 # Agent-specific shared utilities
-from agent_shared.auth import setup_oauth, get_m2m_token, is_oauth_available
+from agent_shared.auth import setup_oauth, is_oauth_available
+from agent_shared.mcp import get_mcp_pool
 from agent_shared.memory import setup_memory, get_conversation_context, save_conversation, is_memory_available
-from agent_shared.responses import format_sdk_response, extract_text_from_event, format_error_response
+from agent_shared.responses import format_sdk_response, extract_text_from_event, format_error_response, TextFormatter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -134,23 +133,9 @@ Remember: Progress updates with emojis are MANDATORY, not optional! Follow the e
         return
     
     try:
-        access_token = get_m2m_token()
-        if not access_token:
-            raise Exception("No access token")
-        
-        # Create headers for authentication
-        headers = {"Authorization": f"Bearer {access_token}"}
-        
-        # EXACT AWS pattern: Create MCP client with functools.partial
-        mcp_client = MCPClient(functools.partial(
-            _create_streamable_http_transport,
-            url=gateway_url,
-            headers=headers
-        ))
-        
-        # EXACT AWS pattern: Use context manager
-        with mcp_client:
-            tools = mcp_client.list_tools_sync()
+        # Pooled MCP connection: warm transport and cached tool list shared across requests
+        with get_mcp_pool().session(gateway_url) as mcp_connection:
+            tools = mcp_connection.tools
             
             # Add local tools
             all_tools = [get_current_time, echo_message, think, stop, handoff_to_user]
@@ -379,16 +364,22 @@ async def invoke(payload):
         model = BedrockModel(**model_settings, streaming=True, timeout=900)
         
         # Use the streaming function with proper MCP context management
+        formatter = TextFormatter()
         async for event in execute_agent_streaming_sdk(model, final_message):
             # Format event for SDK (keeps format_sdk_response)
             formatted = format_sdk_response(event)
             yield formatted
             
             # Extract text for memory storage
-            text = extract_text_from_event(event)
+            text = extract_text_from_event(event, formatter)
             if text:
                 response_parts.append(text)
         
+        # Text held back by the formatter at the end of the stream
+        tail = formatter.flush()
+        if tail:
+            response_parts.append(tail)
+        
         # Save conversation to memory after streaming
         if is_memory_available() and session_id and response_parts:
             full_response = ''.join(response_parts)
@@ -425,6 +416,7 @@ def initialize_services():
 def cleanup_resources():
     """Clean up resources on shutdown"""
     logger.info("🛑 Shutting down SDK Agent...")
+    get_mcp_pool().close_all()
     logger.info("✅ SDK Agent shutdown complete")
 
 # ============================================================================
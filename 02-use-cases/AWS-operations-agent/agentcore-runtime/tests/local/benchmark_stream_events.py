@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming event extraction in agent_shared.responses.
+
+Replays a Strands event stream through the DIY agent's per-event path and
+compares the previous extractor (str(event) twice per event, text formatting
+and debug f-strings on every delta, run once for SSE formatting and again for
+the memory text) against the dispatch-table extractor with a per-stream
+TextFormatter. Reports per-event overhead and end-to-end streaming
+throughput.
+
+Without --events a synthetic stream shaped like Strands' stream_async()
+output is used: raw model events ({"event": {...}}) interleaved with
+callback events that carry the agent, the request state and the text delta.
+With --events, each line of a JSONL file is replayed as one event.
+
+Usage:
+    python tests/local/benchmark_stream_events.py [OPTIONS]
+
+Examples:
+    python tests/local/benchmark_stream_events.py
+    python tests/local/benchmark_stream_events.py --deltas 5000 --repeat 5
+    python tests/local/benchmark_stream_events.py --events recorded_stream.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# agent_shared lives in src/, next to the agents that import it
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from agent_shared import responses  # noqa: E402
+from agent_shared.responses import (  # noqa: E402
+    TextFormatter,
+    extract_content_from_event,
+    format_diy_response,
+    process_text_formatting,
+)
+
+logger = logging.getLogger("bedrock_agentcore.app")
+
+
+class _Agent:
+    """Stand-in for the Agent object Strands puts in callback events"""
+
+    def __init__(self, messages: List[dict]):
+        self.messages = messages
+
+    def __repr__(self) -> str:
+        return f"Agent(model='bedrock', messages={self.messages!r})"
+
+
+def synthetic_stream(deltas: int, tools: int, seed: int) -> List[dict]:
+    """Build a Strands-like event stream with the given number of text deltas"""
+    rng = random.Random(seed)
+    words = [
+        "instance",
+        "bucket",
+        "running",
+        "stopped",
+        "t3.large",
+        "✅",
+        "🔍",
+        "Found",
+        "in",
+        "us-east-1",
+    ]
+    history = [
+        {
+            "role": "user",
+            "content": [{"text": "Give me an overview of my AWS account " * 4}],
+        }
+    ]
+    agent = _Agent(history)
+    state = {"request_state": {}, "event_loop_cycle_id": "6f1c0a3e", "agent": agent}
+
+    events: List[dict] = [
+        {"init_event_loop": True},
+        {"start": True},
+        {"start_event_loop": True},
+        {"event": {"messageStart": {"role": "assistant"}}},
+    ]
+    tool_every = max(deltas // (tools + 1), 1)
+    for i in range(deltas):
+        if tools and i and i % tool_every == 0 and i // tool_every <= tools:
+            tool_use = {
+                "name": f"bac-tool___ec2_read_operations_{i}",
+                "toolUseId": f"tooluse_{i:08d}",
+            }
+            events.append(
+                {
+                    "event": {
+                        "contentBlockStart": {
+                            "start": {"toolUse": tool_use},
+                            "contentBlockIndex": 1,
+                        }
+                    }
+                }
+            )
+            events.append({"current_tool_use": {**tool_use, "input": {}}, **state})
+            events.append({"event": {"contentBlockStop": {"contentBlockIndex": 1}}})
+        text = " ".join(rng.choice(words) for _ in range(rng.randrange(1, 6)))
+        if rng.random() < 0.1:
+            text += "\\n"
+        delta = {"text": text}
+        events.append(
+            {"event": {"contentBlockDelta": {"delta": delta, "contentBlockIndex": 0}}}
+        )
+        events.append({"data": text, "delta": delta, **state})
+    events.append({"event": {"contentBlockStop": {"contentBlockIndex": 0}}})
+    events.append({"event": {"messageStop": {"stopReason": "end_turn"}}})
+    events.append(
+        {
+            "event": {
+                "metadata": {"usage": {"inputTokens": 812, "outputTokens": deltas * 3}}
+            }
+        }
+    )
+    return events
+
+
+def load_events(path: Path) -> List[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _legacy_extract(event) -> dict:
+    """Previous extract_content_from_event, without the commented-out regex fallback"""
+    content_data = {
+        "content": "",
+        "event_type": type(event).__name__,
+        "has_text": False,
+        "raw_event": str(event)[:200] + "..." if len(str(event)) > 200 else str(event),
+    }
+    extracted_text = None
+    extraction_method = None
+    if not extracted_text and isinstance(event, dict) and "event" in event:
+        inner_event = event["event"]
+        if "contentBlockDelta" in inner_event:
+            delta = inner_event["contentBlockDelta"].get("delta", {})
+            if "text" in delta and delta["text"]:
+                extracted_text = delta["text"]
+                extraction_method = "nested_dict"
+    if not extracted_text and isinstance(event, dict) and "event" in event:
+        inner_event = event["event"]
+        if "contentBlockStart" in inner_event:
+            start_info = inner_event["contentBlockStart"].get("start", {})
+            if "toolUse" in start_info:
+                tool_info = start_info["toolUse"]
+                tool_name = tool_info.get("name", "unknown_tool")
+                tool_id = tool_info.get("toolUseId", "unknown_id")
+                clean_tool_name = (
+                    tool_name.split("___")[-1] if "___" in tool_name else tool_name
+                )
+                extracted_text = (
+                    f"\n🔍 Using {clean_tool_name} tool...(ID: {tool_id})\n"
+                )
+                extraction_method = "tool_start"
+                logger.debug(
+                    f"📤 Tool selected: {clean_tool_name} (ID: {tool_id[:8]}...)"
+                )
+    if not extracted_text and hasattr(event, "delta") and hasattr(event.delta, "text"):
+        if event.delta.text:
+            extracted_text = event.delta.text
+            extraction_method = "delta_attribute"
+    if not extracted_text:
+        str(event)
+    if extracted_text:
+        processed = (
+            extracted_text.replace("\\n", "\n")
+            .replace("\\t", "\t")
+            .replace("\\r", "\r")
+        )
+        logger.debug(
+            f"📝 Text processing: {len(extracted_text)} chars → {len(processed)} chars"
+        )
+        if "\\n" in extracted_text:
+            logger.debug(
+                f"🔄 Converted literal newlines in text: {extracted_text[:50]}..."
+            )
+        content_data["content"] = processed
+        content_data["has_text"] = True
+        logger.debug(
+            f"📤 Extracted text via {extraction_method}: {extracted_text[:30]}..."
+        )
+    else:
+        logger.debug(f"📭 No text content in event: {content_data['event_type']}")
+    return content_data
+
+
+def _legacy_format(event) -> str:
+    content_data = _legacy_extract(event)
+    if content_data["has_text"]:
+        payload = {
+            "content": content_data["content"],
+            "type": "text_delta",
+            "metadata": {
+                "event_type": content_data["event_type"],
+                "has_formatting": "\n" in content_data["content"],
+            },
+        }
+        logger.debug(f"📤 Formatted text content: {len(content_data['content'])} chars")
+    else:
+        payload = {
+            "event": content_data["raw_event"],
+            "type": "event",
+            "metadata": {"event_type": content_data["event_type"]},
+        }
+        logger.debug(f"📤 Formatted non-text event: {content_data['event_type']}")
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def legacy_path(events: List[dict]) -> tuple:
+    """Previous DIY loop: format the event, then extract its text again for memory"""
+    parts = []
+    size = 0
+    for event in events:
+        size += len(_legacy_format(event))
+        text = _legacy_extract(event)["content"]
+        if text:
+            parts.append(text)
+    return "".join(parts), size
+
+
+def current_path(events: List[dict]) -> tuple:
+    """Current DIY loop: extract once with a per-stream formatter"""
+    parts = []
+    size = 0
+    formatter = TextFormatter()
+    for event in events:
+        content_data = extract_content_from_event(event, formatter)
+        size += len(format_diy_response(event, content_data))
+        if content_data["content"]:
+            parts.append(content_data["content"])
+    tail = formatter.flush()
+    if tail:
+        parts.append(tail)
+    return "".join(parts), size
+
+
+async def _replay(events: List[dict]):
+    for event in events:
+        yield event
+        # Let other tasks run, as a real model stream does between chunks
+        await asyncio.sleep(0)
+
+
+async def _stream_current(events: List[dict]) -> int:
+    size = 0
+    formatter = TextFormatter()
+    async for event in _replay(events):
+        content_data = extract_content_from_event(event, formatter)
+        size += len(format_diy_response(event, content_data))
+    return size
+
+
+async def _stream_legacy(events: List[dict]) -> int:
+    size = 0
+    async for event in _replay(events):
+        size += len(_legacy_format(event))
+        _legacy_extract(event)
+    return size
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming event extraction")
+    parser.add_argument(
+        "--events", type=Path, help="JSONL file with one recorded event per line"
+    )
+    parser.add_argument(
+        "--deltas",
+        type=int,
+        default=2000,
+        help="Text deltas in the synthetic stream (default: 2000)",
+    )
+    parser.add_argument(
+        "--tools",
+        type=int,
+        default=5,
+        help="Tool calls in the synthetic stream (default: 5)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement, best is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Run with DEBUG logging enabled (output discarded)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Debug output goes nowhere; only the cost of producing it is measured
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG if args.debug else logging.INFO)
+
+    events = (
+        load_events(args.events)
+        if args.events
+        else synthetic_stream(args.deltas, args.tools, args.seed)
+    )
+    print(
+        f"Replaying {len(events):,} events, debug logging {'on' if args.debug else 'off'}\n"
+    )
+
+    legacy_text, _ = legacy_path(events)
+    current_text, _ = current_path(events)
+    if legacy_text != current_text:
+        print("⚠️ Extracted text differs from the previous extractor")
+
+    results = [
+        (
+            "previous",
+            best_of(lambda: legacy_path(events), args.repeat),
+            best_of(lambda: asyncio.run(_stream_legacy(events)), args.repeat),
+        ),
+        (
+            "dispatch",
+            best_of(lambda: current_path(events), args.repeat),
+            best_of(lambda: asyncio.run(_stream_current(events)), args.repeat),
+        ),
+    ]
+
+    baseline = results[0][1]
+    print(f"{'extractor':<12}{'us/event':>10}{'speedup':>9}{'stream events/s':>18}")
+    for name, per_event_total, stream_total in results:
+        print(
+            f"{name:<12}{per_event_total / len(events) * 1e6:>10.2f}{baseline / per_event_total:>8.2f}x"
+            f"{len(events) / stream_total:>18,.0f}"
+        )
+
+    # Sanity check: the shortcut must not change formatting of escaped text
+    assert process_text_formatting("a\\nb") == "a\nb"
+    assert responses.TextFormatter().feed("plain") == "plain"
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Shared utilities for AgentCore project
 Provides centralized configuration management and validation
 """
 
-from .config_manager import AgentCoreConfigManager
+from .config_manager import AgentCoreConfigManager, ConfigSnapshot, reload_config
 from .config_validator import ConfigValidator
 
-__all__ = ['AgentCoreConfigManager', 'ConfigValidator']
\ No newline at end of file
+__all__ = ['AgentCoreConfigManager', 'ConfigSnapshot', 'reload_config', 'ConfigValidator']
\ No newline at end of file
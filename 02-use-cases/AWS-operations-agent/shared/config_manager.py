@@ -6,11 +6,93 @@ Unified configuration management for all AgentCore consumers
 import os
 import yaml
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+STATIC_CONFIG_PATH = "config/static-config.yaml"
+DYNAMIC_CONFIG_PATH = "config/dynamic-config.yaml"
+
+DEFAULT_REGION = "us-east-1"
+DEFAULT_MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Recursively copy a frozen value back into plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Parsed, read-only configuration (static + dynamic) with typed accessors"""
+    static: Mapping[str, Any]
+    dynamic: Mapping[str, Any]
+    merged: Mapping[str, Any]
+    # (mtime_ns, size) of each file when it was read, None if missing
+    signature: Tuple[Optional[Tuple[int, int]], ...]
+    
+    def get(self, path: str, default: Any = None) -> Any:
+        """Look up a dotted path such as "gateway.url" in the merged configuration"""
+        value: Any = self.merged
+        for key in path.split("."):
+            if not isinstance(value, Mapping) or key not in value:
+                return default
+            value = value[key]
+        return value
+    
+    @property
+    def region(self) -> str:
+        return self.get("aws.region") or DEFAULT_REGION
+    
+    @property
+    def model_id(self) -> str:
+        return self.get("agents.modelid") or DEFAULT_MODEL_ID
+    
+    @property
+    def gateway_url(self) -> str:
+        return self.get("gateway.url") or ""
+    
+    @property
+    def memory_id(self) -> Optional[str]:
+        return self.get("memory.id") or None
+    
+    @property
+    def oauth_provider_name(self) -> Optional[str]:
+        return self.get("oauth.provider_name") or None
+
+# Snapshots are shared by every manager in the process, keyed by project root
+_snapshots: Dict[Path, ConfigSnapshot] = {}
+_snapshots_lock = threading.Lock()
+_project_roots: Dict[Path, Path] = {}
+
+def _file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def reload_config(project_root: Optional[Path] = None) -> None:
+    """Drop cached snapshots so the next access re-reads the YAML files"""
+    with _snapshots_lock:
+        if project_root is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(Path(project_root), None)
 
 class AgentCoreConfigManager:
     """Unified configuration management for all AgentCore consumers"""
@@ -28,7 +110,14 @@ class AgentCoreConfigManager:
         
     def _find_project_root(self) -> Path:
         """Find the project root directory containing .agentcore.yaml"""
-        current = Path(__file__).parent
+        start = Path(__file__).parent
+        project_root = _project_roots.get(start)
+        if project_root is None:
+            project_root = _project_roots[start] = self._search_project_root(start)
+        return project_root
+    
+    def _search_project_root(self, start: Path) -> Path:
+        current = start
         while current != current.parent:
             if (current / '.agentcore.yaml').exists():
                 return current
@@ -81,11 +170,38 @@ class AgentCoreConfigManager:
         
         return result
     
+    # Snapshot Methods
+    def snapshot(self) -> ConfigSnapshot:
+        """Get the cached configuration snapshot, re-reading it if either file changed"""
+        paths = (self.project_root / STATIC_CONFIG_PATH, self.project_root / DYNAMIC_CONFIG_PATH)
+        signature = tuple(_file_signature(path) for path in paths)
+        snapshot = _snapshots.get(self.project_root)
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+        
+        with _snapshots_lock:
+            snapshot = _snapshots.get(self.project_root)
+            if snapshot is None or snapshot.signature != signature:
+                static = self._load_yaml(STATIC_CONFIG_PATH)
+                dynamic = self._load_yaml(DYNAMIC_CONFIG_PATH)
+                snapshot = ConfigSnapshot(
+                    static=_freeze(static),
+                    dynamic=_freeze(dynamic),
+                    merged=_freeze(self._deep_merge(static, dynamic)),
+                    signature=signature
+                )
+                _snapshots[self.project_root] = snapshot
+        return snapshot
+    
+    def reload(self) -> ConfigSnapshot:
+        """Re-read the configuration files now"""
+        reload_config(self.project_root)
+        return self.snapshot()
+    
     # Static Configuration Methods
     def get_static_config(self) -> Dict[str, Any]:
         """Get static configuration (version controlled)"""
-        # Load consolidated static config file
-        return self._load_yaml("config/static-config.yaml")
+        return _thaw(self.snapshot().static)
     
     def get_base_settings(self) -> Dict[str, Any]:
         """Get base settings only (backward compatibility)"""
@@ -94,56 +210,47 @@ class AgentCoreConfigManager:
     # Dynamic Configuration Methods
     def get_dynamic_config(self) -> Dict[str, Any]:
         """Get dynamic configuration (deployment generated)"""
-        # Load consolidated dynamic config file
-        return self._load_yaml("config/dynamic-config.yaml")
+        return _thaw(self.snapshot().dynamic)
     
     def update_dynamic_config(self, updates: Dict[str, Any]) -> None:
         """Update dynamic configuration file"""
-        file_path = "config/dynamic-config.yaml"
-        current = self._load_yaml(file_path)
+        current = self._load_yaml(DYNAMIC_CONFIG_PATH)
         updated = self._deep_merge(current, updates)
-        self._save_yaml(file_path, updated)
+        self._save_yaml(DYNAMIC_CONFIG_PATH, updated)
+        # Writes within the mtime resolution would otherwise look unchanged
+        reload_config(self.project_root)
     
     # Merged Configuration Methods
     def get_merged_config(self) -> Dict[str, Any]:
         """Get complete configuration (static + dynamic merged)"""
-        static = self.get_static_config()
-        dynamic = self.get_dynamic_config()
-        return self._deep_merge(static, dynamic)
+        return _thaw(self.snapshot().merged)
     
     # Convenience Methods for Backward Compatibility
     def get_model_settings(self) -> Dict[str, Any]:
         """Get model settings (backward compatibility)"""
-        config = self.get_merged_config()
-        aws_config = config.get("aws", {})
-        agents_config = config.get("agents", {})
-        
+        snapshot = self.snapshot()
         return {
-            "region_name": aws_config.get("region", "us-east-1"),
-            "model_id": agents_config.get("modelid", "us.anthropic.claude-3-7-sonnet-20250219-v1:0"),
+            "region_name": snapshot.get("aws.region", DEFAULT_REGION),
+            "model_id": snapshot.get("agents.modelid", DEFAULT_MODEL_ID),
             "temperature": 0.7,  # Default from current usage
             "max_tokens": 4096   # Default from current usage
         }
     
     def get_gateway_url(self) -> str:
         """Get gateway URL (backward compatibility)"""
-        config = self.get_merged_config()
-        return config.get("gateway", {}).get("url", "")
+        return self.snapshot().get("gateway.url", "")
     
     def get_oauth_settings(self) -> Dict[str, Any]:
         """Get OAuth settings (backward compatibility)"""
-        config = self.get_merged_config()
-        return config.get("okta", {})
+        return _thaw(self.snapshot().get("okta", {}))
     
     def get_tools_schema(self) -> List[Dict[str, Any]]:
         """Get Bedrock agent tools schema (for gateway target creation)"""
-        config = self.get_static_config()
-        return config.get("tools_schema", [])
+        return _thaw(self.snapshot().static.get("tools_schema", []))
     
     def get_mcp_lambda_config(self) -> Dict[str, Any]:
         """Get MCP lambda configuration (for deployment and gateway operations)"""
-        config = self.get_merged_config()
-        return config.get("mcp_lambda", {})
+        return _thaw(self.snapshot().get("mcp_lambda", {}))
     
     def validate(self) -> bool:
         """Validate current configuration"""
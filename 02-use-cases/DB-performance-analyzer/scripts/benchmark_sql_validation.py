@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQL validation in pg_analyze_performance.py on generated scripts.
+
+Generates SQL scripts with string literals, quoted identifiers, comments and
+dollar-quoted bodies, and times validate_query plus the complexity analysis
+of every statement. Throughput should stay flat as scripts grow, since the
+tokenizer makes a single pass over the text.
+
+Usage:
+    python benchmark_sql_validation.py [--statements 100 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pg_analyze_performance import (  # noqa: E402
+    analyze_query_complexity,
+    validate_query_statements,
+)
+
+STATEMENT_TEMPLATES = [
+    "SELECT o.id, c.name, 'status; shipped' AS note FROM orders o "
+    "JOIN customers c ON c.id = o.customer_id WHERE o.total > {i} AND c.region = 'eu' -- filter {i}\n",
+    'SELECT "Order Id", count(*) FROM "Sales; Archive" /* nightly ; job */ '
+    "WHERE created_at > now() - interval '{i} days' GROUP BY 1\n",
+    "SELECT $body$ select 'x'; drop table ignored; $body$ AS txt, sum(amount) OVER (PARTITION BY region) "
+    "FROM payments WHERE id IN (SELECT id FROM refunds WHERE amount > {i})\n",
+    "SHOW work_mem\n",
+]
+
+
+def generate_script(statement_count):
+    """Build a script with the given number of statements"""
+    parts = []
+    for i in range(statement_count):
+        parts.append(STATEMENT_TEMPLATES[i % len(STATEMENT_TEMPLATES)].format(i=i))
+    return ";\n".join(parts) + ";"
+
+
+def validate_and_score(script):
+    statements = validate_query_statements(script)
+    for stmt in statements:
+        analyze_query_complexity(stmt["text"], stmt["tokens"])
+    return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQL validation")
+    parser.add_argument(
+        "--statements",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="Statement counts of the generated scripts",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timed iterations"
+    )
+    args = parser.parse_args()
+
+    print(f"{'statements':>10} {'size (KB)':>10} {'median (ms)':>12} {'MB/s':>8}")
+    for statement_count in args.statements:
+        script = generate_script(statement_count)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            parsed = validate_and_score(script)
+            timings.append(time.perf_counter() - start)
+        assert parsed == statement_count
+        median = statistics.median(timings)
+        size = len(script)
+        print(
+            f"{statement_count:>10} {size / 1024:>10.1f} {median * 1000:>12.2f} {size / median / 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -199,6 +199,40 @@ lambda_target_config = {
                             },
                             "required": ["environment","action_type"]
                             }
+                        },
+                        {
+                        "name": "slow_query_delta",
+                        "description": "Ranks the queries that were slow since the previous call, using pg_stat_statements snapshots instead of all-time totals. Reports per-interval calls, execution time, blocks read and temp blocks. The first call saves a baseline. Provide the environment (dev/prod). Use action_type default value as slow_query_delta.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "environment": {
+                                    "type": "string"
+                                },
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "The type of action to perform. Use 'slow_query_delta' for this tool."
+                                }
+                            },
+                            "required": ["environment","action_type"]
+                            }
+                        },
+                        {
+                        "name": "full_report",
+                        "description": "Runs several of the pg_stat analyses concurrently in one call and returns a merged database health report. Provide the environment (dev/prod). Use action_type full_report to run every analysis except slow_query_delta (which saves a new baseline on each call, so it only runs when listed explicitly), or a comma-separated list of action types (for example slow_query,bloat_analysis,xid_analysis) to run only those.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "environment": {
+                                    "type": "string"
+                                },
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "Use 'full_report' for every analysis except slow_query_delta, or a comma-separated list of action types."
+                                }
+                            },
+                            "required": ["environment","action_type"]
+                            }
                         }
                 ]
             }
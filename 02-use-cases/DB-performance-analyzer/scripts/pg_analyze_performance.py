@@ -1,10 +1,14 @@
+import copy
+import hashlib
 import json
 import boto3
 import psycopg2
 import os
+import threading
 import re
 import time
 import logging
+from collections import OrderedDict, namedtuple
 from datetime import datetime
 from botocore.exceptions import ClientError
 
@@ -20,12 +24,124 @@ class QueryLimitError(Exception):
     """Custom exception for query limit violations"""
     pass
 
-def analyze_query_complexity(query):
+# SQL tokenizer shared by validate_query and analyze_query_complexity. It scans
+# the text once, so validation stays linear in the size of the script.
+SqlToken = namedtuple('SqlToken', ['kind', 'value', 'start', 'end'])
+
+# Token kinds that carry no meaning for validation or complexity analysis
+_SQL_TRIVIA = frozenset(['whitespace', 'comment'])
+
+_SQL_TOKEN_PATTERN = re.compile(r"""
+    (?P<whitespace>\s+)
+  | (?P<line_comment>--[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<dollar_quote>\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$)
+  | (?P<escape_string>[eE]'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'?)
+  | (?P<string>'[^']*(?:''[^']*)*'?)
+  | (?P<quoted_identifier>"[^"]*(?:""[^"]*)*"?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<parameter>\$\d+)
+  | (?P<symbol>.)
+""", re.VERBOSE | re.DOTALL)
+
+_BLOCK_COMMENT_DELIMITER = re.compile(r'/\*|\*/')
+
+def tokenize_sql(query):
+    """
+    Split SQL text into tokens in a single pass
+
+    Handles line and (nested) block comments, single-quoted and E'' strings,
+    dollar-quoted strings and quoted identifiers, so keywords and semicolons
+    inside them are never mistaken for SQL. Word tokens are lower-cased.
+
+    Args:
+        query (str): SQL text
+
+    Returns:
+        list: SqlToken(kind, value, start, end) tuples
+    """
+    tokens = []
+    pos = 0
+    length = len(query)
+    while pos < length:
+        match = _SQL_TOKEN_PATTERN.match(query, pos)
+        kind = match.lastgroup
+        end = match.end()
+
+        if kind == 'block_comment':
+            # Postgres block comments nest
+            depth = 1
+            for delimiter in _BLOCK_COMMENT_DELIMITER.finditer(query, end):
+                depth += 1 if delimiter.group() == '/*' else -1
+                if depth == 0:
+                    end = delimiter.end()
+                    break
+            else:
+                end = length
+            kind = 'comment'
+        elif kind == 'line_comment':
+            kind = 'comment'
+        elif kind == 'dollar_quote':
+            closing = query.find(match.group(), end)
+            end = length if closing == -1 else closing + len(match.group())
+            kind = 'string'
+        elif kind == 'escape_string':
+            kind = 'string'
+
+        value = query[pos:end]
+        if kind == 'word':
+            value = value.lower()
+        tokens.append(SqlToken(kind, value, pos, end))
+        pos = end
+    return tokens
+
+def _significant_tokens(tokens):
+    return [token for token in tokens if token.kind not in _SQL_TRIVIA]
+
+def parse_sql_statements(query):
+    """
+    Tokenize SQL text and split it into statements
+
+    Args:
+        query (str): SQL text, possibly containing several statements
+
+    Returns:
+        list: One dict per non-empty statement with its 'text' (without the
+            trailing semicolon and surrounding comments), its significant
+            'tokens', its 'command' (first token) and the set of 'keywords'
+    """
+    statements = []
+    current = []
+
+    def finish_statement():
+        if current:
+            statements.append({
+                'text': query[current[0].start:current[-1].end],
+                'tokens': list(current),
+                'command': current[0].value.lower(),
+                'keywords': {token.value for token in current if token.kind == 'word'}
+            })
+            current.clear()
+
+    for token in tokenize_sql(query):
+        if token.kind in _SQL_TRIVIA:
+            continue
+        if token.kind == 'symbol' and token.value == ';':
+            finish_statement()
+        else:
+            current.append(token)
+    finish_statement()
+    return statements
+
+def analyze_query_complexity(query, tokens=None):
     """
     Analyze query complexity and potential resource impact
     
     Args:
         query (str): SQL query to analyze
+        tokens (list): Significant tokens of the query from parse_sql_statements,
+            to avoid tokenizing it again
     
     Returns:
         dict: Complexity metrics
@@ -33,42 +149,70 @@ def analyze_query_complexity(query):
     Raises:
         QueryComplexityError: If query is too complex
     """
-    query_lower = query.lower()
+    if tokens is None:
+        tokens = _significant_tokens(tokenize_sql(query))
     complexity_score = 0
     warnings = []
     
-    # Check for joins
-    join_count = sum(1 for join_type in ['join', 'inner join', 'left join', 'right join', 'full join'] 
-                    if join_type in query_lower)
+    join_types = set()
+    subquery_count = 0
+    agg_count = 0
+    uses_window_functions = False
+    where_seen = False
+    and_count = 0
+    or_count = 0
+    agg_functions = {'count', 'sum', 'avg', 'max', 'min'}
+    
+    for index, token in enumerate(tokens):
+        next_token = tokens[index + 1] if index + 1 < len(tokens) else None
+        next_value = next_token.value if next_token else None
+        if token.kind == 'symbol':
+            # Subqueries
+            if token.value == '(' and next_value == 'select':
+                subquery_count += 1
+            continue
+        if token.kind != 'word':
+            continue
+        value = token.value
+        if value == 'join':
+            join_types.add('join')
+            previous_value = tokens[index - 1].value if index > 0 else None
+            if previous_value in ('inner', 'left', 'right', 'full'):
+                join_types.add(f"{previous_value} join")
+        elif value in agg_functions and next_value == '(':
+            agg_count += 1
+        elif (value == 'over' and next_value == '(') or (value == 'partition' and next_value == 'by'):
+            uses_window_functions = True
+        elif value == 'where':
+            where_seen = True
+        elif where_seen and value == 'and':
+            and_count += 1
+        elif where_seen and value == 'or':
+            or_count += 1
+    
+    # Check for joins (each join type present counts once)
+    join_count = len(join_types)
     complexity_score += join_count * 2
     if join_count > 3:
         warnings.append(f"Query contains {join_count} joins - consider simplifying")
     
     # Check for subqueries
-    subquery_count = query_lower.count('(select')
     complexity_score += subquery_count * 3
     if subquery_count > 2:
         warnings.append(f"Query contains {subquery_count} subqueries - consider restructuring")
     
     # Check for aggregations
-    agg_functions = ['count(', 'sum(', 'avg(', 'max(', 'min(']
-    agg_count = sum(query_lower.count(func) for func in agg_functions)
     complexity_score += agg_count
     
     # Check for window functions
-    if 'over(' in query_lower or 'partition by' in query_lower:
+    if uses_window_functions:
         complexity_score += 3
         warnings.append("Query uses window functions - monitor performance")
     
     # Check for complex WHERE conditions
-    where_pos = query_lower.find('where')
-    if where_pos != -1:
-        where_clause = query_lower[where_pos:]
-        and_count = where_clause.count(' and ')
-        or_count = where_clause.count(' or ')
-        complexity_score += (and_count + or_count)
-        if (and_count + or_count) > 5:
-            warnings.append(f"Complex WHERE clause with {and_count + or_count} conditions")
+    complexity_score += (and_count + or_count)
+    if (and_count + or_count) > 5:
+        warnings.append(f"Complex WHERE clause with {and_count + or_count} conditions")
     
     return {
         'complexity_score': complexity_score,
@@ -97,7 +241,8 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
     
     try:
         # Validate and split queries
-        statements = validate_query(query)
+        parsed_statements = validate_query_statements(query)
+        statements = [parsed['text'] for parsed in parsed_statements]
         
         # Check number of statements
         if len(statements) > max_statements:
@@ -115,9 +260,10 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
             cur.execute("SET idle_in_transaction_session_timeout = '60s'")
             
             # Execute each statement
-            for stmt_index, stmt in enumerate(statements, 1):
+            for stmt_index, parsed in enumerate(parsed_statements, 1):
+                stmt = parsed['text']
                 # Analyze query complexity
-                complexity_metrics = analyze_query_complexity(stmt)
+                complexity_metrics = analyze_query_complexity(stmt, parsed['tokens'])
                 if complexity_metrics['complexity_score'] > max_complexity:
                     raise QueryComplexityError(
                         f"Statement {stmt_index} is too complex (score: {complexity_metrics['complexity_score']})"
@@ -153,11 +299,11 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
                     #explain_plan = cur.fetchone()[0]
                     
                     # Analyze plan for potential issues
-                    optimization_suggestions = analyze_query_performance(secret_name, stmt)
-                    if optimization_suggestions:
+                    plan_analysis = analyze_query_performance(secret_name, stmt)
+                    if plan_analysis['recommendations']:
                         response['optimization_suggestions'].extend(
-                            f"Statement {stmt_index}: {suggestion}"
-                            for suggestion in optimization_suggestions
+                            f"Statement {stmt_index}: {suggestion['issue']}"
+                            for suggestion in plan_analysis['recommendations']
                         )
                 
                 # Execute actual query
@@ -235,27 +381,185 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
     
     finally:
         if conn:
+            release_db_connection(conn)
+
+# Secrets, parameter lookups and database connections are cached at module
+# level so warm Lambda invocations skip the Secrets Manager call and the
+# TLS/auth handshake with the database
+SECRET_CACHE_TTL_SECONDS = int(os.environ.get('SECRET_CACHE_TTL_SECONDS', '300'))
+DB_POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', '4'))
+DB_POOL_CHECKOUT_TIMEOUT_SECONDS = int(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT_SECONDS', '30'))
+# Pooled connections idle for longer than this are pinged before reuse
+DB_HEALTH_CHECK_IDLE_SECONDS = int(os.environ.get('DB_HEALTH_CHECK_IDLE_SECONDS', '30'))
+
+_cache_lock = threading.Lock()
+_ttl_cache = {}
+_aws_clients = {}
+_connection_pools = {}
+_connection_owners = {}
+
+def _get_aws_client(service_name, region_name=None):
+    """Return a boto3 client that is reused across invocations"""
+    key = (service_name, region_name)
+    with _cache_lock:
+        if key not in _aws_clients:
+            _aws_clients[key] = boto3.session.Session().client(
+                service_name=service_name,
+                region_name=region_name
+            )
+        return _aws_clients[key]
+
+def _get_cached(key, loader, ttl_seconds=SECRET_CACHE_TTL_SECONDS):
+    """Return a cached value, calling loader when it is missing or expired"""
+    now = time.time()
+    with _cache_lock:
+        entry = _ttl_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+    value = loader()
+    with _cache_lock:
+        _ttl_cache[key] = (now + ttl_seconds, value)
+    return value
+
+def _invalidate_cached(key):
+    with _cache_lock:
+        _ttl_cache.pop(key, None)
+
+class DatabaseConnectionPool:
+    """Bounded pool of connections for one set of credentials.
+
+    Connections are reset before they are returned to the pool, so session
+    settings such as statement_timeout never leak into the next caller, and
+    connections that sat idle are health checked before they are reused.
+    """
+
+    def __init__(self, connect_params, max_connections=DB_POOL_MAX_CONNECTIONS):
+        self.connect_params = connect_params
+        self.max_connections = max_connections
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.closed = False
+
+    def getconn(self, timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS):
+        """Check out a healthy connection, opening a new one if none is idle"""
+        if not self._slots.acquire(timeout=timeout):
+            raise Exception(f"Timed out after {timeout}s waiting for a database connection")
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    return psycopg2.connect(**self.connect_params)
+                conn, last_used = idle
+                if self._is_healthy(conn, last_used):
+                    return conn
+                print("Discarding stale pooled database connection")
+                self._close_quietly(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn):
+        """Return a connection to the pool, closing it if it cannot be reused"""
+        try:
+            if self.closed or conn.closed:
+                self._close_quietly(conn)
+                return
+            try:
+                # Roll back and RESET ALL so the next caller gets a clean session
+                conn.reset()
+            except psycopg2.Error:
+                self._close_quietly(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        """Close idle connections; checked out ones are closed when returned"""
+        self.closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _is_healthy(conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < DB_HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
             conn.close()
+        except Exception:
+            pass
+
+def _get_connection_pool(secret_name):
+    """Return the pool for a secret, replacing it if the credentials changed"""
+    secret = get_secret(secret_name)
+    connect_params = {
+        'host': secret['host'],
+        'database': secret['dbname'],
+        'user': secret['username'],
+        'password': secret['password'],
+        'port': secret['port']
+    }
+    with _cache_lock:
+        pool = _connection_pools.get(secret_name)
+        if pool is not None and pool.connect_params == connect_params:
+            return pool
+        if pool is not None:
+            pool.closeall()
+        pool = DatabaseConnectionPool(connect_params)
+        _connection_pools[secret_name] = pool
+        return pool
+
+def _checkout_connection(secret_name):
+    pool = _get_connection_pool(secret_name)
+    conn = pool.getconn()
+    with _cache_lock:
+        _connection_owners[id(conn)] = pool
+    return conn
+
+def release_db_connection(conn):
+    """Return a connection from connect_to_db to its pool"""
+    with _cache_lock:
+        pool = _connection_owners.pop(id(conn), None)
+    if pool is None:
+        conn.close()
+    else:
+        pool.putconn(conn)
 
 def get_secret(secret_name):
-    """Get secret from AWS Secrets Manager """
-    secret_name = secret_name
-    region_name = os.environ['REGION']
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-    
-    try:
-        secret_value = client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(secret_value['SecretString'])
-        return secret
-    except ClientError as e:
-        raise Exception(f"Failed to get secret: {str(e)}")
+    """Get secret from AWS Secrets Manager, cached for SECRET_CACHE_TTL_SECONDS"""
+    def load_secret():
+        client = _get_aws_client('secretsmanager', os.environ['REGION'])
+        try:
+            secret_value = client.get_secret_value(SecretId=secret_name)
+            return json.loads(secret_value['SecretString'])
+        except ClientError as e:
+            raise Exception(f"Failed to get secret: {str(e)}")
+
+    return _get_cached(('secret', secret_name), load_secret)
 
 def get_env_secret(environment):
-    ssm_client = boto3.client('ssm')
+    """Retrieve the secret name for the specified environment, cached per environment"""
+    return _get_cached(('env_secret', environment), lambda: _lookup_env_secret(environment))
+
+def _lookup_env_secret(environment):
+    ssm_client = _get_aws_client('ssm')
     """Retrieve the secret name for the specified environment"""
     if environment == 'prod':
         try:
@@ -283,18 +587,17 @@ def get_env_secret(environment):
         raise ValueError(f"Unknown environment: {environment}")
 
 def connect_to_db(secret_name):
-    """Establish database connection"""
-    cur_secret = secret_name
-    secret = get_secret(cur_secret)
+    """Get a pooled database connection; give it back with release_db_connection"""
     try:
-        conn = psycopg2.connect(
-            host=secret['host'],
-            database=secret['dbname'],
-            user=secret['username'],
-            password=secret['password'],
-            port=secret['port']
-        )
-        return conn
+        return _checkout_connection(secret_name)
+    except psycopg2.OperationalError as e:
+        # The password may have been rotated, retry once with a fresh secret
+        print(f"Connection failed, refreshing secret and retrying: {str(e)}")
+        _invalidate_cached(('secret', secret_name))
+        try:
+            return _checkout_connection(secret_name)
+        except Exception as retry_error:
+            raise Exception(f"Failed to connect to the database: {str(retry_error)}")
     except Exception as e:
         raise Exception(f"Failed to connect to the database: {str(e)}")
 
@@ -570,8 +873,8 @@ def extract_database_object_ddl(secret_name, object_type, object_name=None, obje
     finally:
         if conn:
             try:
-                conn.close()
-                print("\nDatabase connection closed")
+                release_db_connection(conn)
+                print("\nDatabase connection released")
             except Exception as e:
                 print(f"\nError closing connection: {str(e)}")
 
@@ -754,6 +1057,201 @@ def clean_query_for_explain(query):
     
     return cleaned_query.strip()
 
+# Plan analyses are cached per query fingerprint (literals normalized) for warm
+# invocations. An entry is reused while the statistics version of the
+# relations in its plan is unchanged; otherwise the query is explained again
+# and the new plan is diffed against the cached one. A reused EXPLAIN ANALYZE
+# result carries the query it was measured with, since its literals may differ.
+PLAN_CACHE_MAX_ENTRIES = int(os.environ.get('PLAN_CACHE_MAX_ENTRIES', '128'))
+PLAN_CACHE_TTL_SECONDS = int(os.environ.get('PLAN_CACHE_TTL_SECONDS', '900'))
+# Cost and row changes smaller than this fraction are left out of plan diffs
+PLAN_DIFF_MIN_CHANGE = float(os.environ.get('PLAN_DIFF_MIN_CHANGE', '0.1'))
+
+_plan_cache = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+def fingerprint_query(query):
+    """
+    Fingerprint a query with literals, parameters, comments and whitespace
+    normalized, so queries differing only in constants share a fingerprint
+    """
+    parts = []
+    for token in _significant_tokens(tokenize_sql(query)):
+        if token.kind in ('string', 'number', 'parameter'):
+            parts.append('?')
+        else:
+            parts.append(token.value)
+    return hashlib.sha256(' '.join(parts).encode('utf-8')).hexdigest()
+
+def iter_plan_nodes(plan):
+    """
+    Yield (node, depth) for every node of an EXPLAIN plan in depth-first order
+
+    Uses an explicit stack instead of recursion, so plans with thousands of
+    nested nodes do not hit the recursion limit.
+    """
+    stack = [(plan, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        children = node.get('Plans', [])
+        for child in reversed(children):
+            stack.append((child, depth + 1))
+
+def plan_node_label(node):
+    """Short description of a plan node, e.g. 'Index Scan on orders using orders_pkey'"""
+    label = node.get('Node Type', 'Unknown')
+    if node.get('Join Type'):
+        label = f"{node['Join Type']} {label}"
+    if node.get('Relation Name'):
+        label += f" on {node['Relation Name']}"
+    if node.get('Index Name'):
+        label += f" using {node['Index Name']}"
+    return label
+
+def plan_signature(plan):
+    """Hash of the plan shape (node labels and depths), ignoring costs and rows"""
+    digest = hashlib.sha256()
+    for node, depth in iter_plan_nodes(plan):
+        digest.update(f"{depth}:{plan_node_label(node)};".encode('utf-8'))
+    return digest.hexdigest()
+
+def plan_relation_names(plan):
+    """Sorted names of the tables and indexes a plan reads"""
+    names = set()
+    for node, _ in iter_plan_nodes(plan):
+        for key in ('Relation Name', 'Index Name'):
+            if node.get(key):
+                names.add(node[key])
+    return sorted(names)
+
+def get_plan_stats_version(cur, relation_names):
+    """
+    Return a version string for the schema and statistics of the given relations
+
+    The version changes when a relation is altered, re-analyzed, gains or loses
+    indexes, or its size estimates change. Returns None if it cannot be read.
+    """
+    if not relation_names:
+        return ''
+    try:
+        cur.execute("""
+            SELECT md5(string_agg(concat_ws(':', c.oid, c.xmin, c.relpages, c.reltuples,
+                                            s.last_analyze, s.last_autoanalyze,
+                                            (SELECT string_agg(i.indexrelid::text, ',' ORDER BY i.indexrelid)
+                                             FROM pg_index i WHERE i.indrelid = c.oid)),
+                                  ';' ORDER BY c.oid))
+            FROM pg_class c
+            LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+            WHERE c.oid IN (SELECT to_regclass(quote_ident(name)) FROM unnest(%s::text[]) AS name)
+        """, (relation_names,))
+        return cur.fetchone()[0] or ''
+    except psycopg2.Error as e:
+        logger.warning(f"Could not read plan statistics version: {str(e)}")
+        cur.connection.rollback()
+        return None
+
+def _get_cached_plan(cache_key):
+    with _plan_cache_lock:
+        entry = _plan_cache.get(cache_key)
+        if entry is None:
+            return None
+        _plan_cache.move_to_end(cache_key)
+        return entry
+
+def _store_cached_plan(cache_key, entry):
+    with _plan_cache_lock:
+        _plan_cache[cache_key] = entry
+        _plan_cache.move_to_end(cache_key)
+        while len(_plan_cache) > PLAN_CACHE_MAX_ENTRIES:
+            _plan_cache.popitem(last=False)
+
+def _plan_path(link):
+    """Turn a (child_index, parent_link) chain into a path like '0.2.1'"""
+    indexes = []
+    while link is not None:
+        index, link = link
+        indexes.append(str(index))
+    return '.'.join(reversed(indexes)) or 'root'
+
+def _plan_rows(node):
+    return node.get('Actual Rows', node.get('Plan Rows'))
+
+def _relative_change(before, after):
+    if before is None or after is None:
+        return 0
+    if before == 0:
+        return 0 if after == 0 else 1
+    return abs(after - before) / abs(before)
+
+def diff_execution_plans(old_plan, new_plan, min_change=PLAN_DIFF_MIN_CHANGE):
+    """
+    Compare two EXPLAIN plans node by node
+
+    Nodes are matched by their position in the tree. A node whose type,
+    relation or index differs is reported as 'replaced' (its subtree is not
+    compared further); matching nodes are reported as 'changed' when their
+    total cost or rows moved by at least min_change.
+
+    Returns:
+        list: Dicts with the node 'path', 'change', labels and cost/row deltas
+    """
+    changes = []
+    stack = [(old_plan, new_plan, None)]
+    while stack:
+        old_node, new_node, link = stack.pop()
+        change = {'path': _plan_path(link)}
+        if old_node is None:
+            change.update({
+                'change': 'added',
+                'node': plan_node_label(new_node),
+                'cost_after': new_node.get('Total Cost'),
+                'rows_after': _plan_rows(new_node)
+            })
+            changes.append(change)
+            continue
+        if new_node is None:
+            change.update({
+                'change': 'removed',
+                'node': plan_node_label(old_node),
+                'cost_before': old_node.get('Total Cost'),
+                'rows_before': _plan_rows(old_node)
+            })
+            changes.append(change)
+            continue
+
+        old_label = plan_node_label(old_node)
+        new_label = plan_node_label(new_node)
+        cost_before, cost_after = old_node.get('Total Cost'), new_node.get('Total Cost')
+        rows_before, rows_after = _plan_rows(old_node), _plan_rows(new_node)
+        change.update({
+            'node': new_label,
+            'cost_before': cost_before,
+            'cost_after': cost_after,
+            'cost_delta': None if None in (cost_before, cost_after) else cost_after - cost_before,
+            'rows_before': rows_before,
+            'rows_after': rows_after,
+            'rows_delta': None if None in (rows_before, rows_after) else rows_after - rows_before
+        })
+        if old_label != new_label:
+            change.update({'change': 'replaced', 'previous_node': old_label})
+            changes.append(change)
+            continue
+        if (_relative_change(cost_before, cost_after) >= min_change
+                or _relative_change(rows_before, rows_after) >= min_change):
+            change['change'] = 'changed'
+            changes.append(change)
+
+        old_children = old_node.get('Plans', [])
+        new_children = new_node.get('Plans', [])
+        for index in range(max(len(old_children), len(new_children)) - 1, -1, -1):
+            stack.append((
+                old_children[index] if index < len(old_children) else None,
+                new_children[index] if index < len(new_children) else None,
+                (index, link)
+            ))
+    return changes
+
 def analyze_query_performance(secret_name, query_or_object_name, parameters=None, object_type=None):
     """
     Analyze query performance and provide optimization recommendations
@@ -779,6 +1277,30 @@ def analyze_query_performance(secret_name, query_or_object_name, parameters=None
             # Check if the query contains parameter placeholders
             has_parameters = any(f'${i}' in query_to_analyze for i in range(1, 21))
 
+            # Reuse the cached analysis while the statistics of the plan's
+            # relations are unchanged
+            cache_key = (secret_name, has_parameters, fingerprint_query(query_to_analyze))
+            cached = _get_cached_plan(cache_key)
+            stats_version = None
+            if cached:
+                stats_version = get_plan_stats_version(cur, cached['relations'])
+                is_fresh = time.time() - cached['cached_at'] < PLAN_CACHE_TTL_SECONDS
+                if is_fresh and stats_version is not None and stats_version == cached['stats_version']:
+                    print("Using cached plan analysis")
+                    analysis = copy.deepcopy(cached['analysis'])
+                    analysis['plan_cache'] = {
+                        'status': 'hit',
+                        'cached_at': datetime.utcfromtimestamp(cached['cached_at']).isoformat()
+                    }
+                    if not has_parameters:
+                        # Actual rows and timings were measured by EXPLAIN ANALYZE
+                        # of the cached query, whose literals may differ
+                        analysis['plan_cache']['actual_metrics_from'] = {
+                            'query': cached['query'],
+                            'same_literals': cached['query'] == query_to_analyze
+                        }
+                    return analysis
+
             if has_parameters:
                 # Replace $n parameters with dummy placeholders
                 modified_query = query_to_analyze
@@ -808,13 +1330,37 @@ def analyze_query_performance(secret_name, query_or_object_name, parameters=None
                 # Pass False for is_generic_plan
                 analysis = analyze_execution_plan(plan[0], estimated_plan[0], False)
 
+            plan_root = plan[0]['Plan']
+            relations = plan_relation_names(plan_root)
+            if stats_version is None or relations != cached['relations']:
+                stats_version = get_plan_stats_version(cur, relations)
+
+            signature = plan_signature(plan_root)
+            # The cached copy describes this plan only, not how it changed
+            cached_analysis = copy.deepcopy(analysis)
+            if cached:
+                analysis['plan_changed'] = signature != cached['signature']
+                analysis['plan_changes'] = diff_execution_plans(cached['plan'], plan_root)
+            analysis['plan_cache'] = {'status': 'refreshed' if cached else 'miss'}
+
+            if stats_version is not None:
+                _store_cached_plan(cache_key, {
+                    'query': query_to_analyze,
+                    'plan': plan_root,
+                    'signature': signature,
+                    'relations': relations,
+                    'stats_version': stats_version,
+                    'analysis': cached_analysis,
+                    'cached_at': time.time()
+                })
+
             return analysis
 
     except Exception as e:
         raise Exception(f"Failed to analyze query performance: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def analyze_execution_plan(actual_plan, estimated_plan, is_generic_plan):
     """
@@ -865,9 +1411,15 @@ def analyze_execution_plan(actual_plan, estimated_plan, is_generic_plan):
 
 def analyze_plan_node(node, analysis, is_generic_plan):
     """
-    Recursively analyze each node in the execution plan
+    Analyze each node in the execution plan, walking the tree iteratively
+    """
+    for plan_node, _ in iter_plan_nodes(node):
+        _analyze_single_plan_node(plan_node, analysis, is_generic_plan)
+
+def _analyze_single_plan_node(node, analysis, is_generic_plan):
+    """
+    Check one plan node for expensive operations
     """
-    # Analyze current node
     node_type = node['Node Type']
     
     # Check for expensive operations with appropriate metrics based on plan type
@@ -907,10 +1459,6 @@ def analyze_plan_node(node, analysis, is_generic_plan):
     if 'Filter' in node:
         analyze_filter_condition(node['Filter'], analysis)
 
-    # Recursively analyze child nodes
-    for child in node.get('Plans', []):
-        analyze_plan_node(child, analysis, is_generic_plan)
-
 def analyze_filter_condition(filter_condition, analysis):
     """
     Analyze filter conditions for potential optimization opportunities
@@ -1002,6 +1550,26 @@ def generate_recommendations(analysis):
                 """
             })
 
+def format_plan_change(change):
+    """
+    Describe one entry from diff_execution_plans
+    """
+    if change['change'] == 'added':
+        return f"[{change['path']}] Added {change['node']} (cost {change['cost_after']}, rows {change['rows_after']})"
+    if change['change'] == 'removed':
+        return f"[{change['path']}] Removed {change['node']} (cost {change['cost_before']}, rows {change['rows_before']})"
+
+    deltas = []
+    if change.get('cost_delta') is not None:
+        deltas.append(f"cost {change['cost_before']} -> {change['cost_after']} ({change['cost_delta']:+.2f})")
+    if change.get('rows_delta') is not None:
+        deltas.append(f"rows {change['rows_before']} -> {change['rows_after']} ({change['rows_delta']:+})")
+    if change['change'] == 'replaced':
+        description = f"{change['previous_node']} replaced by {change['node']}"
+    else:
+        description = change['node']
+    return f"[{change['path']}] {description}: {', '.join(deltas)}"
+
 def format_analysis_output(analysis):
     """
     Format the analysis results into human-readable text
@@ -1027,8 +1595,28 @@ def format_analysis_output(analysis):
         output.append(f"- Actual Rows: {analysis['performance_stats'].get('actual_rows', 'N/A')}")
         output.append(f"- Estimated Rows: {analysis['performance_stats'].get('estimated_rows', 'N/A')}")
     
+    plan_cache = analysis.get('plan_cache', {})
+    if plan_cache.get('status') == 'hit':
+        output.append(f"- Plan Cache: reused analysis from {plan_cache['cached_at']} (statistics unchanged)")
+        actual_metrics_from = plan_cache.get('actual_metrics_from')
+        if actual_metrics_from and actual_metrics_from['same_literals']:
+            output.append("- Actual metrics are from the earlier run of this query, not a new execution")
+        elif actual_metrics_from:
+            output.append("- Actual metrics are from an earlier run with different literal values, not this query:")
+            output.append(f"  {actual_metrics_from['query']}")
+    
     output.append("")
 
+    # Plan changes since the cached analysis
+    if analysis.get('plan_changes'):
+        if analysis.get('plan_changed'):
+            output.append("Plan Changes Since Last Analysis (plan shape changed):")
+        else:
+            output.append("Plan Changes Since Last Analysis:")
+        for change in analysis['plan_changes']:
+            output.append(f"- {format_plan_change(change)}")
+        output.append("")
+
     # Issues
     if analysis['issues']:
         output.append("Identified Issues:")
@@ -1096,15 +1684,15 @@ def monitor_query_performance(query, start_time, rows_returned):
     
     return metrics
 
-def validate_query(query):
+def validate_query_statements(query):
     """
-    Validate query for security concerns and split into statements
+    Validate query for security concerns and split into parsed statements
     
     Args:
         query (str): SQL query to validate
     
     Returns:
-        list: List of validated statements
+        list: Statements from parse_sql_statements
         
     Raises:
         ValueError: If query contains prohibited operations
@@ -1112,113 +1700,46 @@ def validate_query(query):
     if not query or not isinstance(query, str):
         raise ValueError("Query must be a non-empty string")
 
-    def is_within_quotes(text, position):
-        """Check if a position in text is within quotes"""
-        single_quotes = False
-        double_quotes = False
-        for i in range(position):
-            if text[i] == "'" and not double_quotes:
-                single_quotes = not single_quotes
-            elif text[i] == '"' and not single_quotes:
-                double_quotes = not double_quotes
-        return single_quotes or double_quotes
-
-    def split_statements(query_text):
-        """Split query into individual statements, respecting quotes and comments"""
-        statements = []
-        current_stmt = []
-        i = 0
-        comment_block = False
-        line_comment = False
-        
-        while i < len(query_text):
-            char = query_text[i]
-            
-            # Handle comment blocks
-            if query_text[i:i+2] == '/*' and not line_comment:
-                comment_block = True
-                current_stmt.append(char)
-                i += 1
-            elif query_text[i:i+2] == '*/' and comment_block:
-                comment_block = False
-                current_stmt.append(char)
-                i += 1
-            # Handle line comments
-            elif query_text[i:i+2] == '--' and not comment_block:
-                line_comment = True
-                current_stmt.append(char)
-                i += 1
-            elif char == '\n' and line_comment:
-                line_comment = False
-                current_stmt.append(char)
-            # Handle semicolons
-            elif char == ';' and not comment_block and not line_comment and not is_within_quotes(query_text, i):
-                current_stmt.append(char)
-                stmt = ''.join(current_stmt).strip()
-                if stmt:
-                    statements.append(stmt)
-                current_stmt = []
-            else:
-                current_stmt.append(char)
-            i += 1
-        
-        # Add the last statement if exists
-        last_stmt = ''.join(current_stmt).strip()
-        if last_stmt:
-            statements.append(last_stmt)
-        
-        return [stmt for stmt in statements if stmt]
+    dangerous_operations = {
+        'insert', 'update', 'delete', 'drop', 'truncate', 'alter',
+        'create', 'grant', 'revoke', 'execute', 'copy'
+    }
 
-    # Split into statements
-    statements = split_statements(query)
-    validated_statements = []
+    statements = parse_sql_statements(query)
+    if not statements:
+        raise ValueError("Query must contain at least one statement")
 
     # Validate each statement
     for stmt in statements:
-        stmt = stmt.strip()
-        if stmt.endswith(';'):
-            stmt = stmt[:-1]
-        
-        stmt_lower = stmt.lower().strip()
-        
         # Get the command type
-        first_word = stmt_lower.split()[0] if stmt_lower.split() else ''
+        first_word = stmt['command']
         
         if first_word not in ['select', 'show']:
             raise ValueError(f"Prohibited operation detected: {first_word}")
         
-        # For SELECT statements, check for dangerous operations
+        # For SELECT statements, check for dangerous operations. Keywords only
+        # come from SQL text, never from strings, identifiers or comments.
         if first_word == 'select':
-            dangerous_operations = [
-                r'\binsert\b', r'\bupdate\b', r'\bdelete\b', r'\bdrop\b', 
-                r'\btruncate\b', r'\balter\b', r'\bcreate\b', r'\bgrant\b', 
-                r'\brevoke\b', r'\bexecute\b', r'\bcopy\b'
-            ]
-            
-            # Remove content within quotes for checking
-            query_for_check = ''
-            in_quote = False
-            quote_char = None
-            
-            for char in stmt:
-                if char in ["'", '"'] and (not quote_char or char == quote_char):
-                    if not in_quote:
-                        quote_char = char
-                        in_quote = True
-                    else:
-                        quote_char = None
-                        in_quote = False
-                elif not in_quote:
-                    query_for_check += char
-            
-            # Check for dangerous operations
-            for operation in dangerous_operations:
-                if re.search(operation, query_for_check.lower()):
-                    raise ValueError(f"Statement contains prohibited operation: {operation}")
-        
-        validated_statements.append(stmt)
+            prohibited = dangerous_operations & stmt['keywords']
+            if prohibited:
+                raise ValueError(f"Statement contains prohibited operation: {sorted(prohibited)[0]}")
+    
+    return statements
+
+def validate_query(query):
+    """
+    Validate query for security concerns and split into statements
+    
+    Args:
+        query (str): SQL query to validate
     
-    return validated_statements
+    Returns:
+        list: List of validated statements
+        
+    Raises:
+        ValueError: If query contains prohibited operations
+    """
+    return [stmt['text'] for stmt in validate_query_statements(query)]
 
 def execute_read_query(secret_name, query, max_rows=20):
     """
@@ -1245,7 +1766,8 @@ def execute_read_query(secret_name, query, max_rows=20):
     
     try:
         # Validate and split queries
-        statements = validate_query(query)
+        parsed_statements = validate_query_statements(query)
+        statements = [parsed['text'] for parsed in parsed_statements]
         
         # Connect to database
         conn = connect_to_db(secret_name)
@@ -1256,7 +1778,8 @@ def execute_read_query(secret_name, query, max_rows=20):
             cur.execute("SET statement_timeout = '30s'")
             
             # Execute each statement
-            for stmt_index, stmt in enumerate(statements, 1):
+            for stmt_index, parsed in enumerate(parsed_statements, 1):
+                stmt = parsed['text']
                 stmt_response = {
                     'columns': [],
                     'rows': [],
@@ -1310,7 +1833,7 @@ def execute_read_query(secret_name, query, max_rows=20):
                 
                 # Add performance monitoring only for SELECT queries
                 if is_select_query:
-                    complexity_metrics = analyze_query_complexity(stmt)
+                    complexity_metrics = analyze_query_complexity(stmt, parsed['tokens'])
                     stmt_response['complexity_metrics'] = complexity_metrics
                     
                     # Add complexity warnings if any
@@ -1355,7 +1878,7 @@ def execute_read_query(secret_name, query, max_rows=20):
     
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_enhanced_results(results):
     """
@@ -1619,7 +2142,7 @@ def execute_enhanced_query_diagnostics(secret_name, query):
         raise Exception(f"Failed to execute enhanced query diagnostics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def execute_performance_insights_analysis(secret_name):
     """
@@ -1702,7 +2225,7 @@ def execute_performance_insights_analysis(secret_name):
         raise Exception(f"Failed to execute performance insights analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_enhanced_diagnostics_output(results):
     """Format enhanced diagnostics results for display"""
@@ -3,25 +3,185 @@ import json
 import boto3
 import psycopg2
 import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
+# Secrets, parameter lookups and database connections are cached at module
+# level so warm Lambda invocations skip the Secrets Manager call and the
+# TLS/auth handshake with the database
+SECRET_CACHE_TTL_SECONDS = int(os.environ.get('SECRET_CACHE_TTL_SECONDS', '300'))
+DB_POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', '4'))
+DB_POOL_CHECKOUT_TIMEOUT_SECONDS = int(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT_SECONDS', '30'))
+# Pooled connections idle for longer than this are pinged before reuse
+DB_HEALTH_CHECK_IDLE_SECONDS = int(os.environ.get('DB_HEALTH_CHECK_IDLE_SECONDS', '30'))
+# Applied to every statement so one slow diagnostic query cannot hold up a report
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '60000'))
+
+_cache_lock = threading.Lock()
+_ttl_cache = {}
+_aws_clients = {}
+_connection_pools = {}
+_connection_owners = {}
+
+def _get_aws_client(service_name, region_name=None):
+    """Return a boto3 client that is reused across invocations"""
+    key = (service_name, region_name)
+    with _cache_lock:
+        if key not in _aws_clients:
+            _aws_clients[key] = boto3.session.Session().client(
+                service_name=service_name,
+                region_name=region_name
+            )
+        return _aws_clients[key]
+
+def _get_cached(key, loader, ttl_seconds=SECRET_CACHE_TTL_SECONDS):
+    """Return a cached value, calling loader when it is missing or expired"""
+    now = time.time()
+    with _cache_lock:
+        entry = _ttl_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+    value = loader()
+    with _cache_lock:
+        _ttl_cache[key] = (now + ttl_seconds, value)
+    return value
+
+def _invalidate_cached(key):
+    with _cache_lock:
+        _ttl_cache.pop(key, None)
+
+class DatabaseConnectionPool:
+    """Bounded pool of connections for one set of credentials.
+
+    Connections are reset before they are returned to the pool, so session
+    settings such as statement_timeout never leak into the next caller, and
+    connections that sat idle are health checked before they are reused.
+    """
+
+    def __init__(self, connect_params, max_connections=DB_POOL_MAX_CONNECTIONS):
+        self.connect_params = connect_params
+        self.max_connections = max_connections
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.closed = False
+
+    def getconn(self, timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS):
+        """Check out a healthy connection, opening a new one if none is idle"""
+        if not self._slots.acquire(timeout=timeout):
+            raise Exception(f"Timed out after {timeout}s waiting for a database connection")
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    return psycopg2.connect(**self.connect_params)
+                conn, last_used = idle
+                if self._is_healthy(conn, last_used):
+                    return conn
+                print("Discarding stale pooled database connection")
+                self._close_quietly(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn):
+        """Return a connection to the pool, closing it if it cannot be reused"""
+        try:
+            if self.closed or conn.closed:
+                self._close_quietly(conn)
+                return
+            try:
+                # Roll back and RESET ALL so the next caller gets a clean session
+                conn.reset()
+            except psycopg2.Error:
+                self._close_quietly(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        """Close idle connections; checked out ones are closed when returned"""
+        self.closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _is_healthy(conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < DB_HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+def _get_connection_pool(secret_name):
+    """Return the pool for a secret, replacing it if the credentials changed"""
+    secret = get_secret(secret_name)
+    connect_params = {
+        'host': secret['host'],
+        'database': secret['dbname'],
+        'user': secret['username'],
+        'password': secret['password'],
+        'port': secret['port'],
+        'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+    }
+    with _cache_lock:
+        pool = _connection_pools.get(secret_name)
+        if pool is not None and pool.connect_params == connect_params:
+            return pool
+        if pool is not None:
+            pool.closeall()
+        pool = DatabaseConnectionPool(connect_params)
+        _connection_pools[secret_name] = pool
+        return pool
+
+def _checkout_connection(secret_name):
+    pool = _get_connection_pool(secret_name)
+    conn = pool.getconn()
+    with _cache_lock:
+        _connection_owners[id(conn)] = pool
+    return conn
+
+def release_db_connection(conn):
+    """Return a connection from connect_to_db to its pool"""
+    with _cache_lock:
+        pool = _connection_owners.pop(id(conn), None)
+    if pool is None:
+        conn.close()
+    else:
+        pool.putconn(conn)
+
 def get_secret(secret_name):
-    """Get secret from AWS Secrets Manager """
-    #secret_name = os.environ['SECRET_NAME']
-    region_name = os.environ['REGION']
-    
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-    
-    try:
-        secret_value = client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(secret_value['SecretString'])
-        return secret
-    except ClientError as e:
-        raise Exception(f"Failed to get secret: {str(e)}")
+    """Get secret from AWS Secrets Manager, cached for SECRET_CACHE_TTL_SECONDS"""
+    def load_secret():
+        client = _get_aws_client('secretsmanager', os.environ['REGION'])
+        try:
+            secret_value = client.get_secret_value(SecretId=secret_name)
+            return json.loads(secret_value['SecretString'])
+        except ClientError as e:
+            raise Exception(f"Failed to get secret: {str(e)}")
+
+    return _get_cached(('secret', secret_name), load_secret)
 
 def execute_slow_query(secret_name, min_exec_time):
     """Execute enhanced slow query analysis based on runbooks.py diagnostics"""
@@ -185,7 +345,7 @@ def execute_slow_query(secret_name, min_exec_time):
         raise Exception(f"Failed to retrieve slow queries: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_slow_query(results):
     """Format results in a human-readable string"""
@@ -361,7 +521,7 @@ def execute_connect_issues(secret_name, min_exec_time):
         raise Exception(f"Failed to retrieve connection metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_conn_issues(results):
     """Format connection management results in a human-readable string"""
@@ -509,7 +669,7 @@ def execute_index_analysis(secret_name):
         raise Exception(f"Failed to retrieve index metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
     
 def format_results_for_index_analysis(results):
     """Format index analysis results in a human-readable string"""
@@ -724,7 +884,7 @@ def execute_autovacuum_analysis(secret_name):
         raise Exception(f"Failed to retrieve autovacuum metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_autovacuum_analysis(results):
     """Format autovacuum analysis results in a human-readable string"""
@@ -870,7 +1030,7 @@ def execute_io_analysis(secret_name):
         raise Exception(f"Failed to retrieve I/O metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_io_analysis(results):
     """Format I/O analysis results in a human-readable string"""
@@ -1010,7 +1170,7 @@ def execute_replication_analysis(secret_name):
         raise Exception(f"Failed to retrieve replication metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_replication_analysis(results):
     """Format replication analysis results in a human-readable string"""
@@ -1161,7 +1321,7 @@ def execute_system_health(secret_name):
         raise Exception(f"Failed to retrieve system health metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_system_health(results):
     """Format system health analysis results in a human-readable string"""
@@ -1256,24 +1416,26 @@ def format_results_for_system_health(results):
     return output
 
 def connect_to_db(secret_name):
-    """Establish database connection"""
-    cur_secret = secret_name
-    secret = get_secret(cur_secret)
+    """Get a pooled database connection; give it back with release_db_connection"""
     try:
-        print("in connect_to_db")
-        conn = psycopg2.connect(
-            host=secret['host'],
-            database=secret['dbname'],
-            user=secret['username'],
-            password=secret['password'],
-            port=secret['port']
-        )
-        return conn
+        return _checkout_connection(secret_name)
+    except psycopg2.OperationalError as e:
+        # The password may have been rotated, retry once with a fresh secret
+        print(f"Connection failed, refreshing secret and retrying: {str(e)}")
+        _invalidate_cached(('secret', secret_name))
+        try:
+            return _checkout_connection(secret_name)
+        except Exception as retry_error:
+            raise Exception(f"Failed to connect to the database: {str(retry_error)}")
     except Exception as e:
         raise Exception(f"Failed to connect to the database: {str(e)}")
 
 def get_env_secret(environment):
-    ssm_client = boto3.client('ssm')
+    """Retrieve the secret name for the specified environment, cached per environment"""
+    return _get_cached(('env_secret', environment), lambda: _lookup_env_secret(environment))
+
+def _lookup_env_secret(environment):
+    ssm_client = _get_aws_client('ssm')
     print("in get_env_secret")
     """Retrieve the secret name for the specified environment"""
     if environment == 'prod':
@@ -1338,7 +1500,7 @@ def execute_vacuum_progress_analysis(secret_name):
         raise Exception(f"Failed to retrieve vacuum progress: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def execute_xid_analysis(secret_name):
     """Execute XID wraparound analysis based on runbooks.py"""
@@ -1400,7 +1562,7 @@ def execute_xid_analysis(secret_name):
         raise Exception(f"Failed to retrieve XID analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def execute_bloat_analysis(secret_name):
     """Execute table and index bloat analysis based on runbooks.py"""
@@ -1474,7 +1636,7 @@ def execute_bloat_analysis(secret_name):
         raise Exception(f"Failed to retrieve bloat analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def execute_long_running_transactions(secret_name):
     """Execute long-running transaction analysis based on runbooks.py"""
@@ -1504,7 +1666,7 @@ def execute_long_running_transactions(secret_name):
         raise Exception(f"Failed to retrieve long-running transactions: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_vacuum_progress(results):
     """Format vacuum progress results for display"""
@@ -1596,6 +1758,319 @@ def format_results_for_long_running_transactions(results):
     
     return output
 
+# pg_stat_statements snapshots for the slow_query_delta action. Counters are
+# stored per (userid, dbid, queryid) in SQLite under /tmp, which survives warm
+# Lambda invocations, so each call reports activity since the previous one.
+PGSTAT_SNAPSHOT_DB = os.environ.get('PGSTAT_SNAPSHOT_DB', '/tmp/pgstat_snapshots.sqlite3')
+PGSTAT_SNAPSHOT_RETENTION = int(os.environ.get('PGSTAT_SNAPSHOT_RETENTION', '10'))
+PGSTAT_DELTA_TOP_N = int(os.environ.get('PGSTAT_DELTA_TOP_N', '10'))
+
+# Counter columns of pg_stat_statements kept in each snapshot
+SNAPSHOT_COUNTERS = [
+    'calls', 'total_exec_time', 'rows', 'shared_blks_hit', 'shared_blks_read',
+    'temp_blks_read', 'temp_blks_written'
+]
+
+_snapshot_lock = threading.Lock()
+
+def _open_snapshot_store():
+    """Open the snapshot database, creating the tables on first use"""
+    store = sqlite3.connect(PGSTAT_SNAPSHOT_DB)
+    counter_columns = ', '.join(f"{name} REAL NOT NULL" for name in SNAPSHOT_COUNTERS)
+    store.executescript(f"""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            secret_name TEXT NOT NULL,
+            taken_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS snapshot_counters (
+            snapshot_id INTEGER NOT NULL,
+            userid INTEGER NOT NULL,
+            dbid INTEGER NOT NULL,
+            queryid INTEGER NOT NULL,
+            {counter_columns},
+            PRIMARY KEY (snapshot_id, userid, dbid, queryid)
+        );
+        CREATE TABLE IF NOT EXISTS query_texts (
+            secret_name TEXT NOT NULL,
+            queryid INTEGER NOT NULL,
+            query TEXT NOT NULL,
+            PRIMARY KEY (secret_name, queryid)
+        );
+    """)
+    return store
+
+def save_pgstat_snapshot(store, secret_name, counters, taken_at):
+    """Store counter vectors as a new snapshot and return the previous one.
+
+    Returns:
+        tuple: (previous taken_at, {(userid, dbid, queryid): counters}) or None
+    """
+    previous = store.execute(
+        "SELECT id, taken_at FROM snapshots WHERE secret_name = ? ORDER BY id DESC LIMIT 1",
+        (secret_name,)
+    ).fetchone()
+    previous_counters = None
+    if previous:
+        previous_counters = {
+            tuple(row[:3]): row[3:]
+            for row in store.execute(
+                f"SELECT userid, dbid, queryid, {', '.join(SNAPSHOT_COUNTERS)} "
+                "FROM snapshot_counters WHERE snapshot_id = ?",
+                (previous[0],)
+            )
+        }
+
+    with store:
+        snapshot_id = store.execute(
+            "INSERT INTO snapshots (secret_name, taken_at) VALUES (?, ?)",
+            (secret_name, taken_at)
+        ).lastrowid
+        placeholders = ', '.join('?' * (len(SNAPSHOT_COUNTERS) + 4))
+        store.executemany(
+            f"INSERT INTO snapshot_counters VALUES ({placeholders})",
+            ((snapshot_id,) + key + tuple(values) for key, values in counters.items())
+        )
+        # Keep only the most recent snapshots for this database
+        stale_ids = [row[0] for row in store.execute(
+            "SELECT id FROM snapshots WHERE secret_name = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+            (secret_name, PGSTAT_SNAPSHOT_RETENTION)
+        )]
+        if stale_ids:
+            id_list = ', '.join('?' * len(stale_ids))
+            store.execute(f"DELETE FROM snapshot_counters WHERE snapshot_id IN ({id_list})", stale_ids)
+            store.execute(f"DELETE FROM snapshots WHERE id IN ({id_list})", stale_ids)
+
+    if previous is None:
+        return None
+    return previous[1], previous_counters
+
+def compute_pgstat_deltas(previous_counters, current_counters):
+    """Per-queryid counter deltas between two snapshots.
+
+    Entries that are new since the previous snapshot, or whose call count went
+    down (pg_stat_statements was reset or the entry was evicted), count from zero.
+    """
+    deltas = {}
+    for key, values in current_counters.items():
+        previous_values = previous_counters.get(key)
+        if previous_values is None or values[0] < previous_values[0]:
+            delta = tuple(values)
+        else:
+            delta = tuple(current - before for current, before in zip(values, previous_values))
+        if delta[0] > 0:
+            deltas[key] = dict(zip(SNAPSHOT_COUNTERS, delta))
+    return deltas
+
+def execute_slow_query_delta(secret_name):
+    """Rank queries by execution time spent since the previous snapshot"""
+    counters_query = f"""
+        -- Counter vectors only; showtext => false avoids transferring query texts
+        SELECT userid, dbid, queryid,
+               {', '.join(f'sum({name})' for name in SNAPSHOT_COUNTERS)}
+        FROM pg_stat_statements(false)
+        WHERE queryid IS NOT NULL
+        GROUP BY userid, dbid, queryid;
+    """
+    texts_query = """
+        SELECT DISTINCT ON (queryid) queryid, query
+        FROM pg_stat_statements
+        WHERE queryid = ANY(%s);
+    """
+
+    conn = None
+    try:
+        conn = connect_to_db(secret_name)
+        with conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_stat_statements;")
+            conn.commit()
+            cur.execute(counters_query)
+            current_counters = {
+                tuple(row[:3]): tuple(float(value or 0) for value in row[3:])
+                for row in cur.fetchall()
+            }
+        taken_at = time.time()
+
+        with _snapshot_lock:
+            store = _open_snapshot_store()
+            try:
+                previous = save_pgstat_snapshot(store, secret_name, current_counters, taken_at)
+                if previous is None:
+                    return {
+                        'baseline': True,
+                        'tracked_queries': len(current_counters)
+                    }
+                previous_taken_at, previous_counters = previous
+                deltas = compute_pgstat_deltas(previous_counters, current_counters)
+                top = sorted(deltas.items(), key=lambda item: item[1]['total_exec_time'], reverse=True)
+                top = top[:PGSTAT_DELTA_TOP_N]
+
+                # Fetch texts only for ranked queries not seen before
+                queryids = sorted({key[2] for key, _ in top})
+                known_texts = dict(store.execute(
+                    f"SELECT queryid, query FROM query_texts WHERE secret_name = ? "
+                    f"AND queryid IN ({', '.join('?' * len(queryids))})",
+                    [secret_name] + queryids
+                ).fetchall()) if queryids else {}
+                missing = [queryid for queryid in queryids if queryid not in known_texts]
+                if missing:
+                    with conn.cursor() as cur:
+                        cur.execute(texts_query, (missing,))
+                        new_texts = cur.fetchall()
+                    with store:
+                        store.executemany(
+                            "INSERT OR REPLACE INTO query_texts VALUES (?, ?, ?)",
+                            ((secret_name, queryid, query) for queryid, query in new_texts)
+                        )
+                    known_texts.update(new_texts)
+            finally:
+                store.close()
+
+        interval_seconds = taken_at - previous_taken_at
+        top_queries = []
+        for (userid, dbid, queryid), delta in top:
+            delta.update({
+                'queryid': queryid,
+                'userid': userid,
+                'dbid': dbid,
+                'query': known_texts.get(queryid, '<query text not available>'),
+                'mean_exec_time': delta['total_exec_time'] / delta['calls'],
+                'calls_per_sec': delta['calls'] / interval_seconds if interval_seconds > 0 else None
+            })
+            top_queries.append(delta)
+        return {
+            'baseline': False,
+            'interval_seconds': interval_seconds,
+            'active_queries': len(deltas),
+            'total_exec_time': sum(delta['total_exec_time'] for delta in deltas.values()),
+            'top_queries': top_queries
+        }
+    except Exception as e:
+        raise Exception(f"Failed to compute pg_stat_statements deltas: {str(e)}")
+    finally:
+        if conn:
+            release_db_connection(conn)
+
+def format_results_for_slow_query_delta(results):
+    """Format pg_stat_statements deltas for display"""
+    if results['baseline']:
+        return (f"Saved a baseline snapshot of {results['tracked_queries']} statements. "
+                "Run slow_query_delta again to see the queries that were slow since now.")
+
+    output = "=== SLOW QUERIES SINCE LAST SNAPSHOT ===\n"
+    output += f"Interval: {results['interval_seconds']:.0f} seconds, "
+    output += f"{results['active_queries']} statements executed, "
+    output += f"{results['total_exec_time'] / 1000:.2f} s total execution time\n"
+    if not results['top_queries']:
+        return output + "\nNo statements were executed in this interval.\n"
+
+    for idx, query in enumerate(results['top_queries'], 1):
+        share = query['total_exec_time'] / results['total_exec_time'] * 100 if results['total_exec_time'] else 0
+        output += f"\nQuery #{idx} (queryid {query['queryid']}):\n"
+        output += f"• Execution Time: {query['total_exec_time']:.2f} ms ({share:.1f}% of interval)\n"
+        output += f"• Calls: {query['calls']:.0f}"
+        if query['calls_per_sec'] is not None:
+            output += f" ({query['calls_per_sec']:.2f}/s)"
+        output += "\n"
+        output += f"• Mean Time: {query['mean_exec_time']:.2f} ms\n"
+        output += f"• Rows: {query['rows']:.0f}\n"
+        output += f"• Shared Blocks Read: {query['shared_blks_read']:.0f} (hit: {query['shared_blks_hit']:.0f})\n"
+        output += f"• Temp Blocks Read/Written: {query['temp_blks_read']:.0f}/{query['temp_blks_written']:.0f}\n"
+        output += f"• Query: {query['query'][:200]}\n"
+    return output
+
+FULL_REPORT_ACTION = 'full_report'
+MIN_EXEC_TIME = 1000
+
+# Actions that save state on every run; full_report only runs them when they
+# are also named explicitly, so it does not reset the slow_query_delta baseline
+STATEFUL_ACTIONS = ('slow_query_delta',)
+
+# action_type -> (log message, function returning the formatted section)
+PGSTAT_ACTIONS = {
+    'slow_query': ("Executing slow query scripts",
+                   lambda secret_name: format_results_for_slow_query(execute_slow_query(secret_name, MIN_EXEC_TIME))),
+    'connection_management_issues': ("Executing connection_management_issues",
+                                     lambda secret_name: format_results_for_conn_issues(execute_connect_issues(secret_name, MIN_EXEC_TIME))),
+    'index_analysis': ("Executing index_analysis",
+                       lambda secret_name: format_results_for_index_analysis(execute_index_analysis(secret_name))),
+    'autovacuum_analysis': ("Executing autovacuum_analysis",
+                            lambda secret_name: format_results_for_autovacuum_analysis(execute_autovacuum_analysis(secret_name))),
+    'io_analysis': ("Executing io_analysis",
+                    lambda secret_name: format_results_for_io_analysis(execute_io_analysis(secret_name))),
+    'replication_analysis': ("Executing replication_analysis",
+                             lambda secret_name: format_results_for_replication_analysis(execute_replication_analysis(secret_name))),
+    'system_health': ("Executing system_health",
+                      lambda secret_name: format_results_for_system_health(execute_system_health(secret_name))),
+    'vacuum_progress': ("Executing vacuum_progress analysis",
+                        lambda secret_name: format_results_for_vacuum_progress(execute_vacuum_progress_analysis(secret_name))),
+    'xid_analysis': ("Executing XID wraparound analysis",
+                     lambda secret_name: format_results_for_xid_analysis(execute_xid_analysis(secret_name))),
+    'bloat_analysis': ("Executing table bloat analysis",
+                       lambda secret_name: format_results_for_bloat_analysis(execute_bloat_analysis(secret_name))),
+    'long_running_transactions': ("Executing long-running transactions analysis",
+                                  lambda secret_name: format_results_for_long_running_transactions(execute_long_running_transactions(secret_name))),
+    'slow_query_delta': ("Executing slow query delta analysis",
+                         lambda secret_name: format_results_for_slow_query_delta(execute_slow_query_delta(secret_name))),
+}
+
+def run_action(action_type, secret_name):
+    """Run one analysis and return its formatted output"""
+    message, run = PGSTAT_ACTIONS[action_type]
+    print(message)
+    return run(secret_name)
+
+def parse_action_list(action_type):
+    """Expand an action_type (one action, full_report, a list or a
+    comma-separated string) into the action names to run"""
+    if isinstance(action_type, list):
+        actions = action_type
+    else:
+        actions = action_type.split(',')
+    actions = [action.strip() for action in actions if action and action.strip()]
+    if FULL_REPORT_ACTION in actions:
+        actions = [action for action in PGSTAT_ACTIONS if action not in STATEFUL_ACTIONS] + \
+            [action for action in actions if action in STATEFUL_ACTIONS]
+    # Drop duplicates but keep the requested order
+    actions = list(dict.fromkeys(actions))
+    unknown = [action for action in actions if action not in PGSTAT_ACTIONS]
+    if unknown or not actions:
+        raise ValueError(f"Unknown action_type '{', '.join(unknown) or action_type}'. Available actions: {', '.join(PGSTAT_ACTIONS)}, {FULL_REPORT_ACTION}")
+    return actions
+
+def run_full_report(secret_name, actions):
+    """Run several analyses concurrently and merge their sections in order.
+
+    Each analysis checks out its own pooled connection, so at most
+    DB_POOL_MAX_CONNECTIONS run at once. A failing analysis is reported in
+    its section instead of failing the whole report.
+    """
+    start_time = time.time()
+
+    def run_section(action_type):
+        section_start = time.time()
+        try:
+            output = run_action(action_type, secret_name)
+        except Exception as e:
+            print(f"Error in {action_type}: {str(e)}")
+            output = f"Error running {action_type}: {str(e)}\n"
+        return output, time.time() - section_start
+
+    with ThreadPoolExecutor(max_workers=min(DB_POOL_MAX_CONNECTIONS, len(actions))) as executor:
+        sections = list(executor.map(run_section, actions))
+
+    elapsed = time.time() - start_time
+    slowest = max(duration for _, duration in sections)
+    print(f"Full report with {len(actions)} analyses finished in {elapsed:.2f}s (slowest analysis {slowest:.2f}s)")
+
+    output = f"Database Health Report ({len(actions)} analyses)\n"
+    output += "=" * 50 + "\n\n"
+    for action_type, (section, duration) in zip(actions, sections):
+        output += f"## {action_type} ({duration:.2f}s)\n\n"
+        output += section
+        output += "\n\n"
+    return output
+
 def lambda_handler(event, context):
     try:
         print(f"Received event: {json.dumps(event)}")
@@ -1620,62 +2095,18 @@ def lambda_handler(event, context):
             
         print(f"Environment: {environment}")
         secret_name = get_env_secret(environment)
-        min_exec_time = 1000
-        # Get slow queries
-        #if tool_name == 'slow_query':
-        if action_type == 'slow_query':
-            print("Executing slow query scripts")
-            results = execute_slow_query(secret_name, min_exec_time)
-            # Format results for Bedrock Agent
-            formatted_output = format_results_for_slow_query(results)
-            print(formatted_output)
-        elif action_type == 'connection_management_issues':
-            print("Executing connection_management_issues")
-            results = execute_connect_issues(secret_name, min_exec_time)
-            # Format results for Bedrock Agent
-            formatted_output = format_results_for_conn_issues(results)
-        elif action_type == 'index_analysis':
-            print("Executing index_analysis")
-            results = execute_index_analysis(secret_name)
-            formatted_output = format_results_for_index_analysis(results)
-        elif action_type == 'autovacuum_analysis':
-            print("Executing autovacuum_analysis")
-            results = execute_autovacuum_analysis(secret_name)
-            formatted_output = format_results_for_autovacuum_analysis(results)
-        elif action_type == 'io_analysis':
-            print("Executing io_analysis")
-            results = execute_io_analysis(secret_name)
-            formatted_output = format_results_for_io_analysis(results)
-        elif action_type == 'replication_analysis':
-            print("Executing replication_analysis")
-            results = execute_replication_analysis(secret_name)
-            formatted_output = format_results_for_replication_analysis(results)
-        elif action_type == 'system_health':
-            print("Executing system_health")
-            results = execute_system_health(secret_name)
-            formatted_output = format_results_for_system_health(results)
-        elif action_type == 'vacuum_progress':
-            print("Executing vacuum_progress analysis")
-            results = execute_vacuum_progress_analysis(secret_name)
-            formatted_output = format_results_for_vacuum_progress(results)
-        elif action_type == 'xid_analysis':
-            print("Executing XID wraparound analysis")
-            results = execute_xid_analysis(secret_name)
-            formatted_output = format_results_for_xid_analysis(results)
-        elif action_type == 'bloat_analysis':
-            print("Executing table bloat analysis")
-            results = execute_bloat_analysis(secret_name)
-            formatted_output = format_results_for_bloat_analysis(results)
-        elif action_type == 'long_running_transactions':
-            print("Executing long-running transactions analysis")
-            results = execute_long_running_transactions(secret_name)
-            formatted_output = format_results_for_long_running_transactions(results)
-        else:
+        try:
+            actions = parse_action_list(action_type)
+        except ValueError as e:
             return {
                 "functionResponse": {
-                    "content": f"Error: Unknown action_type '{action_type}'. Available actions: slow_query, connection_management_issues, index_analysis, autovacuum_analysis, io_analysis, replication_analysis, system_health, vacuum_progress, xid_analysis, bloat_analysis, long_running_transactions"
+                    "content": f"Error: {str(e)}"
                 }
             }
+        if len(actions) == 1:
+            formatted_output = run_action(actions[0], secret_name)
+        else:
+            formatted_output = run_full_report(secret_name, actions)
 
         response_body = {
         'TEXT': {
@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from time_series import TimeIndex
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+# Separator used when joining searchable fields so a keyword never matches
+# across two fields
+_TEXT_SEPARATOR = "\x00"
+
+
+class IndexedRecords:
+    """Records from a single data file with equality indexes on selected fields"""
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        index_fields: Sequence[str] = (),
+        text_fields: Sequence[str] = (),
+        time_field: Optional[str] = None,
+    ):
+        self.records = records
+        self.indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        for field_name in index_fields:
+            index: Dict[Any, List[Dict[str, Any]]] = {}
+            for record in records:
+                index.setdefault(record.get(field_name), []).append(record)
+            self.indexes[field_name] = index
+
+        # Lowercased searchable text per record, keyed by record identity
+        self._search_text: Dict[int, str] = {}
+        if text_fields:
+            for record in records:
+                self._search_text[id(record)] = _build_search_text(record, text_fields)
+
+        # Timestamps parsed once into a sorted epoch array
+        self.time_index = TimeIndex(records, time_field) if time_field else None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def lookup(self, field_name: str, value: Any) -> List[Dict[str, Any]]:
+        """Return records whose indexed field equals value"""
+        return list(self.indexes[field_name].get(value, []))
+
+    def filter(self, **criteria: Any) -> List[Dict[str, Any]]:
+        """Return records matching all criteria, ignoring criteria set to None.
+
+        The most selective indexed criterion is used to pick the candidate set;
+        the remaining criteria are checked on those candidates only.
+        """
+        active = {name: value for name, value in criteria.items() if value is not None}
+        if not active:
+            return list(self.records)
+
+        candidates = self.records
+        indexed = [
+            (name, self.indexes[name].get(value, []))
+            for name, value in active.items()
+            if name in self.indexes
+        ]
+        if indexed:
+            # The chosen index already guarantees its own criterion
+            chosen, candidates = min(indexed, key=lambda item: len(item[1]))
+            del active[chosen]
+            if not active:
+                return list(candidates)
+
+        return [
+            record
+            for record in candidates
+            if all(record.get(name) == value for name, value in active.items())
+        ]
+
+    def search(
+        self, keyword: str, candidates: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Case-insensitive substring search over the configured text fields"""
+        keyword = keyword.lower()
+        if candidates is None:
+            candidates = self.records
+        return [
+            record
+            for record in candidates
+            if keyword in self._search_text.get(id(record), "")
+        ]
+
+    def between(
+        self,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        candidates: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return records inside the inclusive time window, in file order"""
+        if self.time_index is None:
+            raise ValueError("No time field registered for these records")
+        return self.time_index.window(start_epoch, end_epoch, candidates)
+
+
+def _build_search_text(record: Dict[str, Any], text_fields: Sequence[str]) -> str:
+    """Join string and list-of-string fields of a record into lowercased text"""
+    parts = []
+    for field_name in text_fields:
+        value = record.get(field_name)
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, list):
+            parts.extend(item for item in value if isinstance(item, str))
+    return _TEXT_SEPARATOR.join(parts).lower()
+
+
+def _load_json(file_path: Path) -> Any:
+    """Parse a JSON data file"""
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+@dataclass
+class _DataFileSpec:
+    """How a registered data file is parsed and indexed"""
+
+    list_key: Optional[str] = None
+    index_fields: Tuple[str, ...] = ()
+    text_fields: Tuple[str, ...] = ()
+    time_field: Optional[str] = None
+    parser: Callable[[Path], Any] = _load_json
+
+
+@dataclass
+class _DataFileEntry:
+    """Parsed contents of a data file at a given modification time"""
+
+    version: Tuple[int, int]
+    document: Any
+    records: IndexedRecords = field(default_factory=lambda: IndexedRecords([]))
+
+
+class DataStore:
+    """Parses backend data files once and serves them from memory.
+
+    Files are registered with the fields to index, loaded at startup and
+    re-parsed only when their modification time or size changes, so edits to
+    the demo data are picked up without restarting the servers.
+    """
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self._specs: Dict[str, _DataFileSpec] = {}
+        self._entries: Dict[str, _DataFileEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        filename: str,
+        list_key: Optional[str] = None,
+        index_fields: Sequence[str] = (),
+        text_fields: Sequence[str] = (),
+        time_field: Optional[str] = None,
+        parser: Callable[[Path], Any] = _load_json,
+    ) -> None:
+        """Register a data file.
+
+        Args:
+            filename: File name relative to the store base path
+            list_key: Key of the record list in the document; None when the
+                document itself is a list or holds no records
+            index_fields: Record fields to build equality indexes on
+            text_fields: Record fields used by keyword search
+            time_field: Record field holding an ISO timestamp to build a
+                time index on
+            parser: Function turning the file path into a document
+        """
+        self._specs[filename] = _DataFileSpec(
+            list_key=list_key,
+            index_fields=tuple(index_fields),
+            text_fields=tuple(text_fields),
+            time_field=time_field,
+            parser=parser,
+        )
+
+    def load_all(self) -> None:
+        """Eagerly load every registered file that exists"""
+        for filename in self._specs:
+            if not self.exists(filename):
+                logging.warning(f"Data file not found, skipping preload: {filename}")
+                continue
+            entry = self._get_entry(filename)
+            logging.info(f"Loaded {filename}: {len(entry.records)} records indexed")
+
+    def exists(self, filename: str) -> bool:
+        """Check whether a registered data file is present on disk"""
+        return (self.base_path / filename).exists()
+
+    def document(self, filename: str) -> Any:
+        """Return the parsed document of a data file"""
+        return self._get_entry(filename).document
+
+    def records(self, filename: str) -> IndexedRecords:
+        """Return the indexed records of a data file"""
+        return self._get_entry(filename).records
+
+    def _get_entry(self, filename: str) -> _DataFileEntry:
+        """Return the cached entry, re-parsing the file if it changed on disk"""
+        spec = self._specs[filename]
+        file_path = self.base_path / filename
+        stat = os.stat(file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(filename)
+        if entry is not None and entry.version == version:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and entry.version == version:
+                return entry
+
+            document = spec.parser(file_path)
+            entry = _DataFileEntry(
+                version=version,
+                document=document,
+                records=IndexedRecords(
+                    _extract_records(document, spec.list_key),
+                    index_fields=spec.index_fields,
+                    text_fields=spec.text_fields,
+                    time_field=spec.time_field,
+                ),
+            )
+            if filename in self._entries:
+                logging.info(f"Reloaded {filename} after modification")
+            self._entries[filename] = entry
+            return entry
+
+
+def _extract_records(document: Any, list_key: Optional[str]) -> List[Dict[str, Any]]:
+    """Get the record list out of a parsed document"""
+    if isinstance(document, list):
+        return document
+    if list_key and isinstance(document, dict):
+        records = document.get(list_key, [])
+        if isinstance(records, list):
+            return records
+    return []
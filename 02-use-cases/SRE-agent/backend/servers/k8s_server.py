@@ -1,10 +1,9 @@
-import json
 import logging
-from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional
 
+from data_store import DataStore
 from fastapi import (
     Depends,
     FastAPI,
@@ -14,6 +13,7 @@ from fastapi import (
 )
 from pydantic import BaseModel, Field
 from retrieve_api_key import retrieve_api_key
+from time_series import window_bounds
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -27,6 +27,19 @@ app = FastAPI(title="Kubernetes Analysis API", version="1.0.0")
 # Base path for fake data
 DATA_PATH = Path(__file__).parent.parent / "data" / "k8s_data"
 
+# Data files are parsed once and indexed, then reloaded only when modified
+DATA_STORE = DataStore(DATA_PATH)
+DATA_STORE.register("pods.json", list_key="pods", index_fields=("namespace", "name"))
+DATA_STORE.register(
+    "deployments.json", list_key="deployments", index_fields=("namespace", "name")
+)
+DATA_STORE.register(
+    "events.json", list_key="events", index_fields=("type",), time_field="timestamp"
+)
+DATA_STORE.register("resource_usage.json")
+DATA_STORE.register("nodes.json", list_key="nodes", index_fields=("name",))
+DATA_STORE.load_all()
+
 # API Key for authentication
 CREDENTIAL_PROVIDER_NAME = "sre-agent-api-key-credential-provider"
 
@@ -50,46 +63,6 @@ def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return x_api_key
 
 
-def _parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse ISO timestamp string to datetime object"""
-    try:
-        # Handle both with and without timezone
-        if timestamp_str.endswith("Z"):
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        elif "+" in timestamp_str or timestamp_str.endswith("0"):
-            return datetime.fromisoformat(timestamp_str)
-        else:
-            return datetime.fromisoformat(timestamp_str + "+00:00")
-    except:
-        # Fallback: assume current time if parsing fails
-        return datetime.now(timezone.utc)
-
-
-def _filter_events_by_time(events: list, since: Optional[str] = None) -> list:
-    """Filter events by since timestamp"""
-    if not since:
-        return events
-
-    filtered_events = []
-    since_dt = _parse_timestamp(since)
-
-    for event in events:
-        event_timestamp = event.get("timestamp")
-        if not event_timestamp:
-            continue
-
-        try:
-            event_dt = _parse_timestamp(event_timestamp)
-
-            if event_dt >= since_dt:
-                filtered_events.append(event)
-        except:
-            # Include events with unparseable timestamps
-            filtered_events.append(event)
-
-    return filtered_events
-
-
 # Pydantic Models
 class PodStatus(str, Enum):
     """Pod status enumeration"""
@@ -249,18 +222,10 @@ async def get_pod_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "pods.json", "r") as f:
-            data = json.load(f)
-
-        pods = data.get("pods", [])
-
-        # Filter by namespace if provided
-        if namespace:
-            pods = [p for p in pods if p.get("namespace") == namespace]
-
-        # Filter by pod name if provided
-        if pod_name:
-            pods = [p for p in pods if p.get("name") == pod_name]
+        # Filter by namespace and pod name if provided
+        pods = DATA_STORE.records("pods.json").filter(
+            namespace=namespace or None, name=pod_name or None
+        )
 
         return PodStatusResponse(pods=pods)
     except Exception as e:
@@ -296,16 +261,9 @@ async def get_deployment_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "deployments.json", "r") as f:
-            data = json.load(f)
-
-        deployments = data.get("deployments", [])
-
-        if namespace:
-            deployments = [d for d in deployments if d.get("namespace") == namespace]
-
-        if deployment_name:
-            deployments = [d for d in deployments if d.get("name") == deployment_name]
+        deployments = DATA_STORE.records("deployments.json").filter(
+            namespace=namespace or None, name=deployment_name or None
+        )
 
         return DeploymentStatusResponse(deployments=deployments)
     except Exception as e:
@@ -345,16 +303,13 @@ async def get_cluster_events(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "events.json", "r") as f:
-            data = json.load(f)
-
-        events = data.get("events", [])
-
-        if severity:
-            events = [e for e in events if e.get("type") == severity]
+        all_events = DATA_STORE.records("events.json")
+        events = all_events.filter(type=severity or None)
 
         # Filter by since timestamp
-        events = _filter_events_by_time(events, since)
+        if since:
+            since_epoch, _ = window_bounds(since)
+            events = all_events.between(since_epoch, None, events)
 
         return EventsResponse(events=events)
     except Exception as e:
@@ -390,8 +345,7 @@ async def get_resource_usage(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "resource_usage.json", "r") as f:
-            data = json.load(f)
+        data = DATA_STORE.document("resource_usage.json")
 
         resource_usage = data.get("resource_usage", {})
 
@@ -434,13 +388,7 @@ async def get_node_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "nodes.json", "r") as f:
-            data = json.load(f)
-
-        nodes = data.get("nodes", [])
-
-        if node_name:
-            nodes = [n for n in nodes if n.get("name") == node_name]
+        nodes = DATA_STORE.records("nodes.json").filter(name=node_name or None)
 
         return {"nodes": nodes}
     except Exception as e:
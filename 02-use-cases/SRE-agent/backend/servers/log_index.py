@@ -0,0 +1,303 @@
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from time_series import to_epoch
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+# Number of lines per indexed block; a block is the unit of seeking and pruning
+DEFAULT_BLOCK_LINES = 2048
+
+# Chunk size used when reading the log file backwards
+REVERSE_READ_CHUNK_BYTES = 64 * 1024
+
+# Only trigrams inside runs of word characters are indexed. A pattern that is
+# a substring of a line has each of its word runs inside a word run of the
+# line, so looking up the pattern's word trigrams never misses a match.
+_WORD_RUN = re.compile(r"\w{3,}")
+
+
+def parse_log_line(line: str) -> Dict[str, str]:
+    """Parse a `<timestamp> [LEVEL] <service> <message>` log line"""
+    parts = line.strip().split(" ", 3)
+    if len(parts) < 4:
+        return {"message": line.strip()}
+
+    timestamp, level_part, service, message = parts
+
+    # Extract log level from [LEVEL] format
+    level = "INFO"
+    if "[" in level_part and "]" in level_part:
+        level = level_part.strip("[]")
+
+    return {
+        "timestamp": timestamp,
+        "level": level,
+        "service": service,
+        "message": message,
+    }
+
+
+def _word_trigrams(text: str) -> set:
+    """Return the 3-character substrings of the word runs in text"""
+    trigrams: set = set()
+    for word in set(_WORD_RUN.findall(text)):
+        trigrams.update(word[i : i + 3] for i in range(len(word) - 2))
+    return trigrams
+
+
+def iter_lines_reversed(
+    file_path: Path, chunk_size: int = REVERSE_READ_CHUNK_BYTES
+) -> Iterator[str]:
+    """Yield the lines of a file from last to first without reading it whole"""
+    with open(file_path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            # The first piece may be the tail of a line that starts earlier
+            remainder = lines.pop(0)
+            for raw in reversed(lines):
+                if raw.strip():
+                    yield raw.decode("utf-8", errors="replace")
+        if remainder.strip():
+            yield remainder.decode("utf-8", errors="replace")
+
+
+@dataclass
+class _LogBlock:
+    """A run of consecutive lines with its byte range and time bounds"""
+
+    start: int
+    end: int
+    line_count: int = 0
+    min_epoch: Optional[float] = None
+    max_epoch: Optional[float] = None
+    # Lines whose timestamp could not be parsed always pass time filters
+    has_unparsed_timestamps: bool = False
+
+    def add_line(self, length: int, epoch: Optional[float], timed: bool) -> None:
+        self.end += length
+        self.line_count += 1
+        if epoch is not None:
+            if self.min_epoch is None or epoch < self.min_epoch:
+                self.min_epoch = epoch
+            if self.max_epoch is None or epoch > self.max_epoch:
+                self.max_epoch = epoch
+        elif timed:
+            self.has_unparsed_timestamps = True
+
+    def overlaps(
+        self, start_epoch: Optional[float], end_epoch: Optional[float]
+    ) -> bool:
+        if self.has_unparsed_timestamps:
+            return True
+        if self.min_epoch is None:
+            return False
+        if start_epoch is not None and self.max_epoch < start_epoch:
+            return False
+        if end_epoch is not None and self.min_epoch > end_epoch:
+            return False
+        return True
+
+
+class LogIndex:
+    """Incremental block index over a text log file.
+
+    The file is split into blocks of consecutive lines. Each block records
+    its byte offsets and the time range of its lines, and a trigram index
+    maps every 3-character substring of a word to a bitmap of the blocks
+    containing it. Searches seek straight to candidate blocks and stop as soon as the
+    limit is reached; appended lines are indexed on the next refresh, so
+    memory and latency do not grow with the size of the file.
+    """
+
+    def __init__(self, file_path: Path, block_lines: int = DEFAULT_BLOCK_LINES):
+        self.file_path = Path(file_path)
+        self.block_lines = block_lines
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, file_id: Optional[Tuple[int, int]]) -> None:
+        self._file_id = file_id
+        self._indexed_offset = 0
+        self._blocks: List[_LogBlock] = []
+        self._trigrams: Dict[str, int] = {}
+
+    def refresh(self) -> None:
+        """Index lines appended since the last refresh.
+
+        The index is rebuilt from scratch if the file was replaced or
+        truncated (log rotation).
+        """
+        stat = os.stat(self.file_path)
+        file_id = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            if file_id != self._file_id or stat.st_size < self._indexed_offset:
+                if self._file_id is not None:
+                    logging.info(f"Log file {self.file_path} was rotated, reindexing")
+                self._reset(file_id)
+            if stat.st_size > self._indexed_offset:
+                self._index_from(self._indexed_offset)
+
+    def _index_from(self, offset: int) -> None:
+        """Index complete lines starting at byte offset"""
+        block = self._current_block(offset)
+        pending_text: List[str] = []
+
+        with open(self.file_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                # Leave a partially written last line for the next refresh
+                if not raw.endswith(b"\n"):
+                    break
+                line = raw.decode("utf-8", errors="replace")
+                parts = line.strip().split(" ", 3)
+                timestamp = parts[0] if len(parts) == 4 else ""
+                epoch = to_epoch(timestamp) if timestamp else None
+                block.add_line(len(raw), epoch, bool(timestamp))
+                pending_text.append(line.lower())
+                offset += len(raw)
+
+                if block.line_count >= self.block_lines:
+                    self._add_trigrams(len(self._blocks) - 1, pending_text)
+                    pending_text = []
+                    block = self._current_block(offset)
+
+        self._add_trigrams(len(self._blocks) - 1, pending_text)
+        self._indexed_offset = offset
+
+    def _current_block(self, offset: int) -> _LogBlock:
+        """Return the last block if it has room, otherwise start a new one"""
+        if self._blocks and self._blocks[-1].line_count < self.block_lines:
+            return self._blocks[-1]
+        block = _LogBlock(start=offset, end=offset)
+        self._blocks.append(block)
+        return block
+
+    def _add_trigrams(self, block_id: int, lines: List[str]) -> None:
+        if not lines:
+            return
+        bit = 1 << block_id
+        for trigram in _word_trigrams("".join(lines)):
+            self._trigrams[trigram] = self._trigrams.get(trigram, 0) | bit
+
+    def _candidate_blocks(
+        self,
+        pattern: Optional[str],
+        start_epoch: Optional[float],
+        end_epoch: Optional[float],
+    ) -> List[_LogBlock]:
+        """Blocks that may contain lines matching pattern and time window"""
+        bitmap = -1  # all blocks
+        if pattern:
+            for trigram in _word_trigrams(pattern):
+                bitmap &= self._trigrams.get(trigram, 0)
+                if not bitmap:
+                    return []
+
+        time_filtered = start_epoch is not None or end_epoch is not None
+        return [
+            block
+            for block_id, block in enumerate(self._blocks)
+            if bitmap >> block_id & 1
+            and (not time_filtered or block.overlaps(start_epoch, end_epoch))
+        ]
+
+    def _read_lines(self, start: int, end: Optional[int] = None) -> List[str]:
+        with open(self.file_path, "rb") as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+        return data.decode("utf-8", errors="replace").splitlines()
+
+    def search(
+        self,
+        pattern: Optional[str] = None,
+        level: Optional[str] = None,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, str]]:
+        """Return up to limit entries in file order matching all filters.
+
+        Args:
+            pattern: Case-insensitive substring matched against the raw line
+            level: Exact log level
+            start_epoch: Inclusive lower time bound in epoch seconds
+            end_epoch: Inclusive upper time bound in epoch seconds
+            limit: Maximum number of entries to return
+        """
+        self.refresh()
+        pattern = pattern.lower() if pattern else None
+        time_filtered = start_epoch is not None or end_epoch is not None
+
+        with self._lock:
+            ranges = [
+                (block.start, block.end)
+                for block in self._candidate_blocks(pattern, start_epoch, end_epoch)
+            ]
+            # Lines after the indexed offset (an unterminated last line)
+            ranges.append((self._indexed_offset, None))
+
+        results: List[Dict[str, str]] = []
+        for start, end in ranges:
+            for line in self._read_lines(start, end):
+                if not line.strip():
+                    continue
+                if pattern and pattern not in line.lower():
+                    continue
+                entry = parse_log_line(line)
+                if level and entry.get("level") != level:
+                    continue
+                if time_filtered and not _in_window(entry, start_epoch, end_epoch):
+                    continue
+                results.append(entry)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def recent(
+        self, limit: int = 100, service: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Return the last limit entries, most recent first, reading from the end"""
+        results: List[Dict[str, str]] = []
+        for line in iter_lines_reversed(self.file_path):
+            entry = parse_log_line(line)
+            if service and service not in entry.get("service", ""):
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+
+def _in_window(
+    entry: Dict[str, str], start_epoch: Optional[float], end_epoch: Optional[float]
+) -> bool:
+    """Check an entry against a time window; entries without timestamp fail"""
+    timestamp = entry.get("timestamp")
+    if not timestamp:
+        return False
+    epoch = to_epoch(timestamp)
+    if epoch is None:
+        # Include logs with unparseable timestamps
+        return True
+    if start_epoch is not None and epoch < start_epoch:
+        return False
+    if end_epoch is not None and epoch > end_epoch:
+        return False
+    return True
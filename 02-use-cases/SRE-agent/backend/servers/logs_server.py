@@ -1,9 +1,9 @@
-import json
 import logging
-from datetime import datetime, timezone
+import threading
 from pathlib import Path
 from typing import Optional
 
+from data_store import DataStore
 from fastapi import (
     Depends,
     FastAPI,
@@ -12,7 +12,9 @@ from fastapi import (
     Query,
 )
 from fastapi.responses import JSONResponse
+from log_index import LogIndex
 from retrieve_api_key import retrieve_api_key
+from time_series import window_bounds
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -25,6 +27,19 @@ app = FastAPI(title="Application Logs API", version="1.0.0")
 
 DATA_PATH = Path(__file__).parent.parent / "data" / "logs_data"
 
+# JSON data files are parsed once and indexed, then reloaded only when modified
+DATA_STORE = DataStore(DATA_PATH)
+DATA_STORE.register("error.log", index_fields=("service",), time_field="timestamp")
+DATA_STORE.register("log_patterns.json", list_key="patterns")
+DATA_STORE.register("log_counts.json")
+DATA_STORE.load_all()
+
+# Block/trigram index over the text application log, extended as it grows
+APPLICATION_LOG_INDEX = LogIndex(DATA_PATH / "application.log")
+if (DATA_PATH / "application.log").exists():
+    # Build the initial index in the background so startup is not delayed
+    threading.Thread(target=APPLICATION_LOG_INDEX.refresh, daemon=True).start()
+
 # API Key for authentication
 CREDENTIAL_PROVIDER_NAME = "sre-agent-api-key-credential-provider"
 
@@ -48,102 +63,6 @@ def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return x_api_key
 
 
-def _parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse ISO timestamp string to datetime object"""
-    try:
-        # Handle both with and without timezone
-        if timestamp_str.endswith("Z"):
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        elif "+" in timestamp_str or timestamp_str.endswith("0"):
-            return datetime.fromisoformat(timestamp_str)
-        else:
-            return datetime.fromisoformat(timestamp_str + "+00:00")
-    except:
-        # Fallback: assume current time if parsing fails
-        return datetime.now(timezone.utc)
-
-
-def _filter_by_time(
-    logs: list, start_time: Optional[str] = None, end_time: Optional[str] = None
-) -> list:
-    """Filter logs by time range"""
-    if not start_time and not end_time:
-        return logs
-
-    filtered_logs = []
-    start_dt = _parse_timestamp(start_time) if start_time else None
-    end_dt = _parse_timestamp(end_time) if end_time else None
-
-    for log in logs:
-        log_timestamp = log.get("timestamp")
-        if not log_timestamp:
-            continue
-
-        try:
-            log_dt = _parse_timestamp(log_timestamp)
-
-            if start_dt and log_dt < start_dt:
-                continue
-            if end_dt and log_dt > end_dt:
-                continue
-
-            filtered_logs.append(log)
-        except:
-            # Include logs with unparseable timestamps
-            filtered_logs.append(log)
-
-    return filtered_logs
-
-
-def _parse_log_file(file_path: Path, pattern: Optional[str] = None):
-    """Parse log file and filter by pattern"""
-    logs = []
-
-    if file_path.suffix == ".json":
-        with open(file_path, "r") as f:
-            data = json.load(f)
-            # Handle both array and object with array
-            if isinstance(data, list):
-                logs = data
-            elif isinstance(data, dict):
-                # Get the first array value in the dict
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        logs = value
-                        break
-    else:
-        # Parse text log files
-        with open(file_path, "r") as f:
-            for line in f:
-                if pattern and pattern.lower() not in line.lower():
-                    continue
-                # Parse log line to extract timestamp, level, and message
-                parts = line.strip().split(" ", 3)
-                if len(parts) >= 4:
-                    timestamp = parts[0]
-                    level_part = parts[1]
-                    service = parts[2]
-                    message = parts[3] if len(parts) > 3 else ""
-
-                    # Extract log level from [LEVEL] format
-                    level = "INFO"
-                    if "[" in level_part and "]" in level_part:
-                        level = level_part.strip("[]")
-
-                    logs.append(
-                        {
-                            "timestamp": timestamp,
-                            "level": level,
-                            "service": service,
-                            "message": message,
-                        }
-                    )
-                else:
-                    logs.append({"message": line.strip()})
-
-    return logs
-
-
 @app.get("/logs/search")
 async def search_logs(
     pattern: str = Query(..., description="Search pattern or keyword"),
@@ -156,18 +75,17 @@ async def search_logs(
 ):
     """Search logs by pattern/timeframe"""
     try:
-        application_logs = _parse_log_file(DATA_PATH / "application.log", pattern)
-
-        # Filter by log level if provided
-        if log_level:
-            application_logs = [
-                log for log in application_logs if log.get("level") == log_level
-            ]
-
-        # Filter by time range
-        application_logs = _filter_by_time(application_logs, start_time, end_time)
+        start_epoch, end_epoch = window_bounds(start_time, end_time)
+
+        application_logs = APPLICATION_LOG_INDEX.search(
+            pattern=pattern,
+            level=log_level,
+            start_epoch=start_epoch,
+            end_epoch=end_epoch,
+            limit=100,  # Limit results
+        )
 
-        return {"logs": application_logs[:100]}  # Limit results
+        return {"logs": application_logs}
     except Exception as e:
         logging.error(f"Error searching logs: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -181,15 +99,13 @@ async def get_error_logs(
 ):
     """Retrieve error-specific entries"""
     try:
-        with open(DATA_PATH / "error.log", "r") as f:
-            error_logs = json.load(f)
-
-        if service:
-            error_logs = [log for log in error_logs if log.get("service") == service]
+        all_errors = DATA_STORE.records("error.log")
+        error_logs = all_errors.filter(service=service or None)
 
         # Filter by since timestamp
         if since:
-            error_logs = _filter_by_time(error_logs, start_time=since)
+            since_epoch, _ = window_bounds(since)
+            error_logs = all_errors.between(since_epoch, None, error_logs)
 
         return {"errors": error_logs}
     except Exception as e:
@@ -212,14 +128,10 @@ async def analyze_log_patterns(
     """Identify recurring issues"""
     try:
         # Read patterns from actual data file
-        patterns_file = DATA_PATH / "log_patterns.json"
-        if not patterns_file.exists():
+        if not DATA_STORE.exists("log_patterns.json"):
             return {"patterns": []}
 
-        with open(patterns_file, "r") as f:
-            data = json.load(f)
-
-        patterns = data.get("patterns", [])
+        patterns = DATA_STORE.records("log_patterns.json").records
 
         # Filter by min_occurrences
         patterns = [p for p in patterns if p["count"] >= min_occurrences]
@@ -240,14 +152,8 @@ async def get_recent_logs(
 ):
     """Fetch latest log entries"""
     try:
-        all_logs = _parse_log_file(DATA_PATH / "application.log")
-
-        if service:
-            all_logs = [log for log in all_logs if service in log.get("service", "")]
-
-        # Return the most recent logs (last N entries)
-        recent_logs = all_logs[-limit:] if len(all_logs) > limit else all_logs
-        recent_logs.reverse()  # Most recent first
+        # Return the most recent logs (last N entries), most recent first
+        recent_logs = APPLICATION_LOG_INDEX.recent(limit=limit, service=service)
 
         return {"logs": recent_logs}
     except Exception as e:
@@ -271,12 +177,10 @@ async def count_log_events(
     """Count occurrences of specific events"""
     try:
         # Read counts from actual data file
-        counts_file = DATA_PATH / "log_counts.json"
-        if not counts_file.exists():
+        if not DATA_STORE.exists("log_counts.json"):
             return {"total_count": 0, "counts": []}
 
-        with open(counts_file, "r") as f:
-            data = json.load(f)
+        data = DATA_STORE.document("log_counts.json")
 
         if event_type.lower() == "error":
             error_data = data.get("error_counts", {})
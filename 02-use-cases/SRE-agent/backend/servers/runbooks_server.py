@@ -3,6 +3,7 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+from data_store import DataStore
 from fastapi import (
     Depends,
     FastAPI,
@@ -27,6 +28,33 @@ app = FastAPI(title="DevOps Runbooks API", version="1.0.0")
 
 DATA_PATH = Path(__file__).parent.parent / "data" / "runbooks_data"
 
+# Data files are parsed once and indexed, then reloaded only when modified
+DATA_STORE = DataStore(DATA_PATH)
+DATA_STORE.register(
+    "incident_playbooks.json",
+    list_key="playbooks",
+    index_fields=("id", "incident_type", "severity"),
+    text_fields=("title", "description", "steps"),
+)
+DATA_STORE.register(
+    "troubleshooting_guides.json",
+    list_key="guides",
+    index_fields=("category",),
+    text_fields=("title", "id"),
+)
+DATA_STORE.register(
+    "escalation_procedures.json",
+    list_key="escalation_procedures",
+    index_fields=("severity",),
+    text_fields=("title", "trigger_conditions"),
+)
+DATA_STORE.register(
+    "common_resolutions.json",
+    list_key="resolutions",
+    text_fields=("issue", "id", "symptoms"),
+)
+DATA_STORE.load_all()
+
 # API Key for authentication
 CREDENTIAL_PROVIDER_NAME = "sre-agent-api-key-credential-provider"
 
@@ -73,32 +101,19 @@ async def search_runbooks(
             f"🔍 RUNBOOKS API: search_runbooks called - incident_type={incident_type}, keyword={keyword}, severity={severity}"
         )
 
-        with open(DATA_PATH / "incident_playbooks.json", "r") as f:
-            data = json.load(f)
-
-        runbooks = data.get("playbooks", [])
-        original_count = len(runbooks)
+        playbooks = DATA_STORE.records("incident_playbooks.json")
+        original_count = len(playbooks)
 
-        if incident_type:
-            runbooks = [r for r in runbooks if r.get("incident_type") == incident_type]
-            logging.info(
-                f"📋 RUNBOOKS API: Filtered by incident_type '{incident_type}': {len(runbooks)} runbooks"
-            )
-
-        if severity:
-            runbooks = [r for r in runbooks if r.get("severity") == severity]
+        runbooks = playbooks.filter(
+            incident_type=incident_type or None, severity=severity or None
+        )
+        if incident_type or severity:
             logging.info(
-                f"📋 RUNBOOKS API: Filtered by severity '{severity}': {len(runbooks)} runbooks"
+                f"📋 RUNBOOKS API: Filtered by incident_type '{incident_type}', severity '{severity}': {len(runbooks)} runbooks"
             )
 
         if keyword:
-            runbooks = [
-                r
-                for r in runbooks
-                if keyword.lower() in r.get("title", "").lower()
-                or keyword.lower() in r.get("description", "").lower()
-                or any(keyword.lower() in step.lower() for step in r.get("steps", []))
-            ]
+            runbooks = playbooks.search(keyword, runbooks)
             logging.info(
                 f"📋 RUNBOOKS API: Filtered by keyword '{keyword}': {len(runbooks)} runbooks"
             )
@@ -140,25 +155,23 @@ async def get_incident_playbook(
             f"🔍 RUNBOOKS API: get_incident_playbook called for playbook_id='{playbook_id}'"
         )
 
-        with open(DATA_PATH / "incident_playbooks.json", "r") as f:
-            data = json.load(f)
-
-        playbooks = data.get("playbooks", [])
-
-        for playbook in playbooks:
-            if playbook.get("id") == playbook_id:
-                logging.info(
-                    f"📖 RUNBOOKS API: Found playbook '{playbook.get('title', 'No title')}'"
-                )
-                steps = playbook.get("steps", [])
-                logging.info(f"📝 RUNBOOKS API: Playbook has {len(steps)} steps:")
-                for i, step in enumerate(steps):
-                    logging.info(f"   Step {i + 1}: {step}")
+        matches = DATA_STORE.records("incident_playbooks.json").lookup(
+            "id", playbook_id
+        )
+        if matches:
+            playbook = matches[0]
+            logging.info(
+                f"📖 RUNBOOKS API: Found playbook '{playbook.get('title', 'No title')}'"
+            )
+            steps = playbook.get("steps", [])
+            logging.info(f"📝 RUNBOOKS API: Playbook has {len(steps)} steps:")
+            for i, step in enumerate(steps):
+                logging.info(f"   Step {i + 1}: {step}")
 
-                logging.info(
-                    f"📤 RUNBOOKS API: Returning complete playbook data: {json.dumps(playbook, indent=2)}"
-                )
-                return playbook
+            logging.info(
+                f"📤 RUNBOOKS API: Returning complete playbook data: {json.dumps(playbook, indent=2)}"
+            )
+            return playbook
 
         logging.warning(f"❌ RUNBOOKS API: Playbook '{playbook_id}' not found")
         return JSONResponse(status_code=404, content={"error": "Playbook not found"})
@@ -183,25 +196,17 @@ async def get_troubleshooting_guide(
             f"🔍 RUNBOOKS API: get_troubleshooting_guide called - category={category}, issue_type={issue_type}"
         )
 
-        with open(DATA_PATH / "troubleshooting_guides.json", "r") as f:
-            data = json.load(f)
-
-        guides = data.get("guides", [])
-        original_count = len(guides)
+        all_guides = DATA_STORE.records("troubleshooting_guides.json")
+        original_count = len(all_guides)
 
+        guides = all_guides.filter(category=category or None)
         if category:
-            guides = [g for g in guides if g.get("category") == category]
             logging.info(
                 f"📋 RUNBOOKS API: Filtered by category '{category}': {len(guides)} guides"
             )
 
         if issue_type:
-            guides = [
-                g
-                for g in guides
-                if issue_type.lower() in g.get("title", "").lower()
-                or issue_type.lower() in g.get("id", "").lower()
-            ]
+            guides = all_guides.search(issue_type, guides)
             logging.info(
                 f"📋 RUNBOOKS API: Filtered by issue_type '{issue_type}': {len(guides)} guides"
             )
@@ -244,24 +249,11 @@ async def get_escalation_procedures(
 ):
     """Retrieve escalation procedures"""
     try:
-        with open(DATA_PATH / "escalation_procedures.json", "r") as f:
-            data = json.load(f)
-
-        procedures = data.get("escalation_procedures", [])
-
-        if severity:
-            procedures = [p for p in procedures if p.get("severity") == severity]
+        all_procedures = DATA_STORE.records("escalation_procedures.json")
+        procedures = all_procedures.filter(severity=severity or None)
 
         if incident_type:
-            procedures = [
-                p
-                for p in procedures
-                if incident_type.lower() in p.get("title", "").lower()
-                or any(
-                    incident_type.lower() in condition.lower()
-                    for condition in p.get("trigger_conditions", [])
-                )
-            ]
+            procedures = all_procedures.search(incident_type, procedures)
 
         return {"escalation_procedures": procedures}
     except Exception as e:
@@ -281,24 +273,11 @@ async def get_common_resolutions(
             f"🔍 RUNBOOKS API: get_common_resolutions called - issue='{issue}', service={service}"
         )
 
-        with open(DATA_PATH / "common_resolutions.json", "r") as f:
-            data = json.load(f)
-
-        resolutions = data.get("resolutions", [])
+        resolutions = DATA_STORE.records("common_resolutions.json")
         original_count = len(resolutions)
 
         # Filter by issue
-        matching_resolutions = []
-        for resolution in resolutions:
-            if (
-                issue.lower() in resolution.get("issue", "").lower()
-                or issue.lower() in resolution.get("id", "").lower()
-                or any(
-                    issue.lower() in symptom.lower()
-                    for symptom in resolution.get("symptoms", [])
-                )
-            ):
-                matching_resolutions.append(resolution)
+        matching_resolutions = resolutions.search(issue)
 
         logging.info(
             f"📋 RUNBOOKS API: Found {len(matching_resolutions)} matching resolutions for issue '{issue}'"
@@ -0,0 +1,145 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def parse_timestamp(timestamp_str: str) -> datetime:
+    """Parse ISO timestamp string to a timezone-aware datetime.
+
+    Timestamps without timezone are treated as UTC. Falls back to the current
+    time if the string cannot be parsed.
+    """
+    epoch = to_epoch(timestamp_str)
+    if epoch is None:
+        return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def to_epoch(timestamp_str: str) -> Optional[float]:
+    """Convert an ISO timestamp to epoch seconds, None if it cannot be parsed"""
+    try:
+        # datetime.fromisoformat only accepts the Z suffix from Python 3.11
+        if timestamp_str.endswith("Z"):
+            timestamp_str = timestamp_str[:-1] + "+00:00"
+        dt = datetime.fromisoformat(timestamp_str)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def window_bounds(
+    start_time: Optional[str] = None, end_time: Optional[str] = None
+) -> Tuple[Optional[float], Optional[float]]:
+    """Convert optional start/end timestamp strings to epoch bounds"""
+    start_epoch = parse_timestamp(start_time).timestamp() if start_time else None
+    end_epoch = parse_timestamp(end_time).timestamp() if end_time else None
+    return start_epoch, end_epoch
+
+
+class TimeIndex:
+    """Records sorted by timestamp for binary-search time window queries.
+
+    Timestamps are parsed once when the index is built. Records without a
+    timestamp never match a window; records whose timestamp cannot be parsed
+    always match, so bad data stays visible instead of silently disappearing.
+    """
+
+    def __init__(self, records: Sequence[Dict[str, Any]], field: str = "timestamp"):
+        self.records = records
+        timed = []
+        self._unparsed: List[int] = []
+        # Parsed epoch per record identity; None marks an unparseable timestamp
+        self._epoch_by_id: Dict[int, Optional[float]] = {}
+        for position, record in enumerate(records):
+            value = record.get(field)
+            if not value:
+                continue
+            epoch = to_epoch(value)
+            self._epoch_by_id[id(record)] = epoch
+            if epoch is None:
+                self._unparsed.append(position)
+            else:
+                timed.append((epoch, position))
+
+        timed.sort()
+        self.epochs: List[float] = [epoch for epoch, _ in timed]
+        self._positions: List[int] = [position for _, position in timed]
+
+    def _bounds(
+        self, start_epoch: Optional[float], end_epoch: Optional[float]
+    ) -> Tuple[int, int]:
+        """Slice of the sorted epochs inside the inclusive window"""
+        low = 0 if start_epoch is None else bisect_left(self.epochs, start_epoch)
+        high = (
+            len(self.epochs)
+            if end_epoch is None
+            else bisect_right(self.epochs, end_epoch)
+        )
+        return low, high
+
+    def positions(
+        self, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None
+    ) -> List[int]:
+        """Original positions of records inside the inclusive window, in order"""
+        low, high = self._bounds(start_epoch, end_epoch)
+        positions = self._positions[low:high]
+        if self._unparsed:
+            positions = positions + self._unparsed
+        positions.sort()
+        return positions
+
+    def window(
+        self,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        candidates: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return records inside the inclusive window in their original order.
+
+        Args:
+            start_epoch: Inclusive lower bound, None for unbounded
+            end_epoch: Inclusive upper bound, None for unbounded
+            candidates: Optional subset of the indexed records (for example
+                the result of an equality filter) to restrict the result to
+        """
+        if start_epoch is None and end_epoch is None:
+            return list(self.records if candidates is None else candidates)
+
+        # Candidates are a subset of the records, so as many of them means all
+        if candidates is None or len(candidates) == len(self.records):
+            return [
+                self.records[position]
+                for position in self.positions(start_epoch, end_epoch)
+            ]
+
+        # Bisect first, then intersect whichever side is smaller
+        low, high = self._bounds(start_epoch, end_epoch)
+        if high - low + len(self._unparsed) <= len(candidates):
+            candidate_ids = {id(record) for record in candidates}
+            return [
+                self.records[position]
+                for position in self.positions(start_epoch, end_epoch)
+                if id(self.records[position]) in candidate_ids
+            ]
+
+        return [
+            record
+            for record in candidates
+            if self._in_window(id(record), start_epoch, end_epoch)
+        ]
+
+    def _in_window(
+        self, record_id: int, start_epoch: Optional[float], end_epoch: Optional[float]
+    ) -> bool:
+        if record_id not in self._epoch_by_id:
+            return False
+        epoch = self._epoch_by_id[record_id]
+        if epoch is None:
+            return True
+        if start_epoch is not None and epoch < start_epoch:
+            return False
+        if end_epoch is not None and epoch > end_epoch:
+            return False
+        return True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for time window filtering in the demo backend servers.
+
+Compares the per-request cost of the previous approach (parse every record's
+timestamp with datetime.fromisoformat on each request) against
+IndexedRecords.between, which parses timestamps once and answers windows with
+binary search. Both are timed the way the servers call them: with the result
+of filter() as candidates, once without a service criterion and once with one.
+
+Usage:
+    uv run python scripts/benchmark_time_filter.py [OPTIONS]
+
+Examples:
+    uv run python scripts/benchmark_time_filter.py
+    uv run python scripts/benchmark_time_filter.py --sizes 1000 100000 --repeat 50
+    uv run python scripts/benchmark_time_filter.py --window-fraction 0.01
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Add the backend servers directory to path, the servers import siblings directly
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend" / "servers"))
+
+from data_store import IndexedRecords  # noqa: E402
+from time_series import window_bounds  # noqa: E402
+
+BASE_TIME = datetime(2024, 1, 15, 14, 0, tzinfo=timezone.utc)
+
+
+def _generate_records(count: int) -> List[dict]:
+    """Generate metric-like records one second apart"""
+    return [
+        {
+            "timestamp": (BASE_TIME + timedelta(seconds=i)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "service": f"service-{i % 10}",
+            "value": i % 100,
+        }
+        for i in range(count)
+    ]
+
+
+def _linear_filter(
+    records: List[dict],
+    start_time: Optional[str],
+    end_time: Optional[str],
+    service: Optional[str] = None,
+) -> List[dict]:
+    """Previous per-request filter: parse every timestamp on every call"""
+
+    def parse(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    start_dt = parse(start_time) if start_time else None
+    end_dt = parse(end_time) if end_time else None
+    filtered = []
+    for record in records:
+        if service and record["service"] != service:
+            continue
+        record_dt = parse(record["timestamp"])
+        if start_dt and record_dt < start_dt:
+            continue
+        if end_dt and record_dt > end_dt:
+            continue
+        filtered.append(record)
+    return filtered
+
+
+def _time_per_call(func: Callable[[], List[dict]], repeat: int) -> float:
+    """Return the mean wall time of func in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time window filtering")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1_000, 10_000, 100_000],
+        help="Record counts to benchmark",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Requests simulated per size"
+    )
+    parser.add_argument(
+        "--window-fraction",
+        type=float,
+        default=0.1,
+        help="Fraction of the records covered by the queried window",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'records':>10} {'service':>10} {'linear us/req':>15} "
+        f"{'indexed us/req':>15} {'index build ms':>15} {'speedup':>9}"
+    )
+    for size in args.sizes:
+        records = _generate_records(size)
+        # Query the most recent part of the data, as agents usually do
+        window_start = BASE_TIME + timedelta(
+            seconds=int(size * (1 - args.window_fraction))
+        )
+        start_time = window_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+        end_time = records[-1]["timestamp"]
+
+        build_start = time.perf_counter()
+        store = IndexedRecords(
+            records, index_fields=("service",), time_field="timestamp"
+        )
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        for service in (None, "service-3"):
+
+            def indexed(service=service):
+                return store.between(
+                    *window_bounds(start_time, end_time),
+                    store.filter(service=service),
+                )
+
+            def linear(service=service):
+                return _linear_filter(records, start_time, end_time, service)
+
+            assert indexed() == linear()
+            linear_us = _time_per_call(linear, args.repeat)
+            indexed_us = _time_per_call(indexed, args.repeat)
+            print(
+                f"{size:>10} {service or 'all':>10} {linear_us:>15.1f} "
+                f"{indexed_us:>15.1f} {build_ms:>15.1f} "
+                f"{linear_us / indexed_us:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
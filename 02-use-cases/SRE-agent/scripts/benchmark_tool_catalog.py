@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for loading MCP tools in the SRE agent.
+
+Measures the tool-loading part of create_multi_agent_system:
+  - warm start: read the cached tool catalog, build the LangChain tools and
+    partition them per agent
+  - cold start (with --gateway): list the tools on the gateway
+
+Without a cache file, a synthetic catalog based on agent_config.yaml is used.
+
+Usage:
+    uv run python scripts/benchmark_tool_catalog.py [OPTIONS]
+
+Examples:
+    uv run python scripts/benchmark_tool_catalog.py
+    uv run python scripts/benchmark_tool_catalog.py --synthetic 200 --repeat 50
+    uv run python scripts/benchmark_tool_catalog.py --gateway --repeat 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add the project root to path so sre_agent can be imported
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sre_agent.agent_nodes import (  # noqa: E402
+    _filter_tools_for_agent,
+    _load_agent_config,
+)
+from sre_agent.tool_catalog import (  # noqa: E402
+    ToolCatalogCache,
+    build_tools,
+    fetch_tool_schemas,
+)
+
+SYNTHETIC_GATEWAY_URI = "https://synthetic-gateway.example.com"
+
+
+def _synthetic_schemas(count: int) -> List[dict]:
+    """Tool schemas named like the gateway tools, padded with extra tools"""
+    config = _load_agent_config()
+    names = [
+        f"target___{tool}"
+        for agent in config["agents"].values()
+        for tool in agent.get("tools", [])
+    ]
+    names += [f"target___extra_tool_{i}" for i in range(max(0, count - len(names)))]
+    return [
+        {
+            "name": name,
+            "description": f"Synthetic tool {name}",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "service": {"type": "string", "description": "Service name"},
+                    "limit": {"type": "integer", "description": "Result limit"},
+                },
+            },
+        }
+        for name in names[:count]
+    ]
+
+
+def _time_sync(func: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def _time_async(
+    func: Callable[[], Awaitable[object]], repeat: int
+) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    print(
+        f"{label:<32} median {statistics.median(timings):>9.2f} ms   "
+        f"min {min(timings):>9.2f} ms   max {max(timings):>9.2f} ms"
+    )
+
+
+def _warm_start(cache: ToolCatalogCache, connection: dict) -> None:
+    catalog = cache.load()
+    if catalog is None:
+        raise RuntimeError(f"No valid tool catalog at {cache.cache_path}")
+    tools = build_tools(catalog["tools"], connection)
+    config = _load_agent_config()
+    for agent_name in config["agents"]:
+        _filter_tools_for_agent(tools, agent_name, config)
+
+
+async def _run(args) -> None:
+    connection = {"url": "unused", "transport": "streamable_http"}
+
+    if args.gateway:
+        from sre_agent.multi_agent_langgraph import (
+            _gateway_connection,
+            create_mcp_client,
+        )
+
+        gateway_uri, connection = _gateway_connection()
+        client = create_mcp_client()
+        timings = await _time_async(lambda: fetch_tool_schemas(client), args.repeat)
+        _report("cold start (gateway tools/list)", timings)
+        cache = ToolCatalogCache(gateway_uri)
+        cache.save(await fetch_tool_schemas(client))
+    elif args.cache_file:
+        catalog_path = Path(args.cache_file)
+        gateway_uri = json.loads(catalog_path.read_text())["gateway_uri"]
+        cache = ToolCatalogCache(gateway_uri, catalog_path)
+    else:
+        tmp_dir = tempfile.mkdtemp()
+        cache = ToolCatalogCache(SYNTHETIC_GATEWAY_URI, Path(tmp_dir) / "catalog.json")
+        cache.save(_synthetic_schemas(args.synthetic))
+        print(f"Using synthetic catalog with {args.synthetic} tools")
+
+    _report(
+        "warm start (cache + partitions)",
+        _time_sync(lambda: _warm_start(cache, connection), args.repeat),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP tool loading")
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Number of timed iterations"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=50,
+        help="Number of tools in the synthetic catalog",
+    )
+    parser.add_argument(
+        "--cache-file", help="Benchmark the warm start from an existing cache file"
+    )
+    parser.add_argument(
+        "--gateway",
+        action="store_true",
+        help="Also time tools/list against the configured gateway (needs GATEWAY_ACCESS_TOKEN)",
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List
 
 import yaml
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -14,7 +14,7 @@ from langgraph.prebuilt import create_react_agent
 from .agent_state import AgentState
 from .constants import AgentMetadata
 from .llm_utils import create_llm_with_error_handling
-from .memory import SREMemoryClient, create_conversation_memory_manager
+from .memory import create_conversation_memory_manager, get_memory_client
 from .prompt_loader import prompt_loader
 
 # Logging will be configured by the main entry point
@@ -34,16 +34,30 @@ def _create_llm(provider: str = "bedrock", **kwargs):
     return create_llm_with_error_handling(provider, **kwargs)
 
 
+@lru_cache(maxsize=1)
+def _agent_tool_partitions() -> Dict[str, FrozenSet[str]]:
+    """Allowed base tool names per agent, computed once from the agent config."""
+    config = _load_agent_config()
+    global_tools = config.get("global_tools", [])
+    return {
+        agent_name: frozenset(agent_config.get("tools", []) + global_tools)
+        for agent_name, agent_config in config["agents"].items()
+    }
+
+
 def _filter_tools_for_agent(
     all_tools: List[BaseTool], agent_name: str, config: Dict[str, Any]
 ) -> List[BaseTool]:
     """Filter tools based on agent configuration."""
-    agent_config = config["agents"].get(agent_name, {})
-    allowed_tools = agent_config.get("tools", [])
-
-    # Also include global tools
-    global_tools = config.get("global_tools", [])
-    allowed_tools.extend(global_tools)
+    # The cached agent config has its partitions precomputed
+    if config is _load_agent_config():
+        allowed_tools = _agent_tool_partitions().get(agent_name, frozenset())
+    else:
+        agent_config = config["agents"].get(agent_name, {})
+        # Also include global tools
+        allowed_tools = frozenset(
+            agent_config.get("tools", []) + config.get("global_tools", [])
+        )
 
     # Filter tools based on their names
     filtered_tools = []
@@ -71,7 +85,7 @@ def _filter_tools_for_agent(
         logger.info(f"  - {tool_name}: {description_first_line}")
 
     # Debug: Show what was allowed vs what was available
-    logger.debug(f"Agent {agent_name} allowed tools: {allowed_tools}")
+    logger.debug(f"Agent {agent_name} allowed tools: {sorted(allowed_tools)}")
     all_tool_names = [getattr(tool, "name", "unknown") for tool in all_tools]
     logger.debug(f"Agent {agent_name} available tools: {all_tool_names}")
 
@@ -179,7 +193,7 @@ class BaseAgentNode:
                 try:
                     # Get region from llm_kwargs if available
                     region = self.llm_kwargs.get("region_name", "us-east-1") if self.llm_provider == "bedrock" else "us-east-1"
-                    memory_client = SREMemoryClient(region=region)
+                    memory_client = get_memory_client(region=region)
                     conversation_manager = create_conversation_memory_manager(
                         memory_client
                     )
@@ -376,10 +390,10 @@ class BaseAgentNode:
                     # Check if memory hooks are available through the memory client
                     from .memory.hooks import MemoryHookProvider
 
-                    # Use the SREMemoryClient that's already imported at the top
+                    # Reuse the process-wide memory client
                     # Get region from llm_kwargs if available
                     region = self.llm_kwargs.get("region_name", "us-east-1") if self.llm_provider == "bedrock" else "us-east-1"
-                    memory_client = SREMemoryClient(region=region)
+                    memory_client = get_memory_client(region=region)
                     memory_hooks = MemoryHookProvider(memory_client)
 
                     # Create response object for hooks
@@ -17,6 +17,7 @@ from .constants import SREConstants
 # Import logging config
 from .logging_config import configure_logging
 from .multi_agent_langgraph import create_multi_agent_system
+from .supervisor import PARALLEL_AGENTS_NODE
 
 # Configure logging based on DEBUG environment variable
 # This ensures debug mode works even when not run via __main__
@@ -177,6 +178,7 @@ async def invoke_agent(request: InvocationRequest):
                     "logs_agent",
                     "metrics_agent",
                     "runbooks_agent",
+                    PARALLEL_AGENTS_NODE,
                 ]:
                     agent_results = node_output.get("agent_results", {})
                     logger.info(f"{node_name} completed with results")
@@ -155,6 +155,17 @@ class ApplicationConfig(BaseModel):
         description="Filename for saving conversation state",
     )
 
+    tool_catalog_cache_file: str = Field(
+        default=".mcp_tool_catalog.json",
+        description="Filename in the project root for the cached MCP tool catalog",
+    )
+
+    tool_catalog_max_age_seconds: int = Field(
+        default=86400,
+        ge=0,
+        description="Maximum age of the cached MCP tool catalog before it is fetched again at startup",
+    )
+
     spinner_chars: list[str] = Field(
         default=["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"],
         description="Characters used for spinner animation",
@@ -209,6 +220,36 @@ class MemoryConfig(BaseModel):
         description="Maximum character length for conversation content stored in memory",
     )
 
+    # Write-behind batching for conversation and infrastructure events
+    write_batch_max_messages: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Maximum number of messages sent in one batched create_event call",
+    )
+
+    write_flush_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        le=60,
+        description="Maximum seconds a queued memory write waits before it is flushed",
+    )
+
+    # Retrieval cache
+    retrieval_cache_ttl_seconds: float = Field(
+        default=300.0,
+        ge=0,
+        le=3600,
+        description="Seconds a memory retrieval result is served from cache",
+    )
+
+    retrieval_cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        le=10000,
+        description="Maximum number of memory retrieval results kept in cache",
+    )
+
 
 class AgentsConstant(BaseModel):
     """Agent-specific constants for the SRE system."""
@@ -227,6 +268,11 @@ class AgentsConstant(BaseModel):
         default="sre-session", description="Prefix used for session IDs"
     )
 
+    independent_agents: list[str] = Field(
+        default=["kubernetes_agent", "logs_agent", "metrics_agent"],
+        description="Data-gathering agents that do not depend on each other's findings and can run concurrently within a plan step",
+    )
+
     memory_types: dict[str, str] = Field(
         default={
             "preferences": "preferences",
@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Literal
+from typing import Any, Callable, Dict, List, Literal
 
 from langchain_core.messages import HumanMessage
 from langchain_core.tools import BaseTool
 from langgraph.graph import END, StateGraph
 
 from .agent_nodes import (
+    BaseAgentNode,
     create_kubernetes_agent,
     create_logs_agent,
     create_metrics_agent,
@@ -15,7 +17,7 @@ from .agent_nodes import (
 )
 from .agent_state import AgentState
 from .constants import SREConstants
-from .supervisor import SupervisorAgent
+from .supervisor import PARALLEL_AGENTS_NODE, SupervisorAgent
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -61,11 +63,74 @@ def _route_supervisor(state: AgentState) -> str:
         "logs_agent": "logs_agent",
         "metrics_agent": "metrics_agent",
         "runbooks_agent": "runbooks_agent",
+        # A group of independent agents executed concurrently
+        PARALLEL_AGENTS_NODE: PARALLEL_AGENTS_NODE,
     }
 
     return agent_map.get(next_agent, "aggregate")
 
 
+def _create_parallel_agents_node(
+    agent_nodes: Dict[str, BaseAgentNode],
+) -> Callable[[AgentState], Any]:
+    """Create a node that runs the agents of the current plan group concurrently.
+
+    Each agent receives the same input state. Their updates are merged into a
+    single state update so the supervisor sees the group as one completed step.
+    """
+
+    async def _run_parallel_agents(state: AgentState) -> Dict[str, Any]:
+        metadata = state.get("metadata", {})
+        group = [
+            name for name in metadata.get("parallel_agents", []) if name in agent_nodes
+        ]
+        logger.info(f"Running agents in parallel: {', '.join(group)}")
+
+        results = await asyncio.gather(
+            *(agent_nodes[name](state) for name in group), return_exceptions=True
+        )
+
+        existing_messages = state.get("messages", [])
+        agent_results = dict(state.get("agent_results", {}))
+        agents_invoked = list(state.get("agents_invoked", []))
+        new_messages = []
+        merged_metadata = dict(metadata)
+
+        for name, result in zip(group, results):
+            if isinstance(result, BaseException):
+                agent_name = agent_nodes[name].name
+                logger.error(f"Error in {agent_name}: {result}")
+                result = {
+                    "agent_results": {agent_name: f"Error: {str(result)}"},
+                    "agents_invoked": [agent_name],
+                }
+
+            agent_results.update(result.get("agent_results", {}))
+            for invoked in result.get("agents_invoked", []):
+                if invoked not in agents_invoked:
+                    agents_invoked.append(invoked)
+            # Agents return the full history followed by their own messages
+            new_messages.extend(result.get("messages", [])[len(existing_messages) :])
+            merged_metadata.update(
+                {
+                    key: value
+                    for key, value in result.get("metadata", {}).items()
+                    if key not in metadata or value is not metadata[key]
+                }
+            )
+
+        update = {
+            "agent_results": agent_results,
+            "agents_invoked": agents_invoked,
+            "metadata": merged_metadata,
+        }
+        if new_messages:
+            update["messages"] = new_messages
+        return update
+
+    return _run_parallel_agents
+
+
 async def _prepare_initial_state(state: AgentState) -> Dict[str, Any]:
     """Prepare the initial state with the user's query."""
     messages = state.get("messages", [])
@@ -150,6 +215,17 @@ def build_multi_agent_graph(
     workflow.add_node("logs_agent", logs_agent)
     workflow.add_node("metrics_agent", metrics_agent)
     workflow.add_node("runbooks_agent", runbooks_agent)
+    workflow.add_node(
+        PARALLEL_AGENTS_NODE,
+        _create_parallel_agents_node(
+            {
+                "kubernetes_agent": kubernetes_agent,
+                "logs_agent": logs_agent,
+                "metrics_agent": metrics_agent,
+                "runbooks_agent": runbooks_agent,
+            }
+        ),
+    )
     workflow.add_node("aggregate", supervisor.aggregate_responses)
 
     # Set entry point
@@ -167,6 +243,7 @@ def build_multi_agent_graph(
             "logs_agent": "logs_agent",
             "metrics_agent": "metrics_agent",
             "runbooks_agent": "runbooks_agent",
+            PARALLEL_AGENTS_NODE: PARALLEL_AGENTS_NODE,
             "aggregate": "aggregate",
         },
     )
@@ -176,6 +253,7 @@ def build_multi_agent_graph(
     workflow.add_edge("logs_agent", "supervisor")
     workflow.add_edge("metrics_agent", "supervisor")
     workflow.add_edge("runbooks_agent", "supervisor")
+    workflow.add_edge(PARALLEL_AGENTS_NODE, "supervisor")
 
     # Add edge from aggregate to END
     workflow.add_edge("aggregate", END)
@@ -1,6 +1,7 @@
 """Memory module for SRE Agent long-term memory capabilities."""
 
-from .client import SREMemoryClient
+from .cache import MemoryRetrievalCache
+from .client import SREMemoryClient, get_memory_client
 from .config import MemoryConfig
 from .conversation_manager import (
     ConversationMemoryManager,
@@ -18,10 +19,14 @@ from .tools import (
     SaveInvestigationTool,
     SavePreferenceTool,
 )
+from .write_queue import MemoryWriteQueue
 
 __all__ = [
     "SREMemoryClient",
+    "get_memory_client",
     "MemoryConfig",
+    "MemoryWriteQueue",
+    "MemoryRetrievalCache",
     "UserPreference",
     "InfrastructureKnowledge",
     "InvestigationSummary",
@@ -1,10 +1,13 @@
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from bedrock_agentcore.memory import MemoryClient
 
+from .cache import MemoryRetrievalCache
 from .config import _load_memory_config
+from .write_queue import MemoryWriteQueue
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -30,8 +33,25 @@ class SREMemoryClient:
         self.config = _load_memory_config()
         self.memory_ids = {}
         self.force_delete = force_delete
+        self.write_queue: Optional[MemoryWriteQueue] = None
         self._initialize_memories()
 
+        from ..constants import SREConstants
+
+        self.retrieval_cache = MemoryRetrievalCache(
+            max_entries=SREConstants.memory.retrieval_cache_max_entries,
+            ttl_seconds=SREConstants.memory.retrieval_cache_ttl_seconds,
+        )
+
+        if self.memory_id:
+            self.write_queue = MemoryWriteQueue(
+                self.client,
+                self.memory_id,
+                max_batch_messages=SREConstants.memory.write_batch_max_messages,
+                flush_interval_seconds=SREConstants.memory.write_flush_interval_seconds,
+                on_written=self._invalidate_namespaces,
+            )
+
     def _initialize_memories(self):
         """Initialize different memory strategies."""
         try:
@@ -172,11 +192,14 @@ class SREMemoryClient:
         actor_id: str,
         event_data: Dict[str, Any],
         session_id: Optional[str] = None,
+        deferred: bool = False,
     ) -> bool:
         """Save an event to memory using create_event API.
 
         actor_id is always required. session_id is required for infrastructure
-        and investigations memory types, but optional for preferences.
+        and investigations memory types, but optional for preferences. With
+        deferred=True the event is queued and written in a batch by the
+        background write queue.
         """
         if not self.memory_id:
             logger.warning("Memory system not initialized, skipping save")
@@ -190,30 +213,34 @@ class SREMemoryClient:
             raise ValueError(f"session_id is required for {memory_type} memory type")
 
         try:
-            # Add detailed traces for debugging
-            logger.info("=== SAVE_EVENT TRACE START ===")
-            logger.info("Input parameters:")
-            logger.info(f"  memory_type: {memory_type}")
-            logger.info(f"  actor_id: {actor_id}")
-            logger.info(f"  session_id: {session_id}")
-            logger.info(f"  memory_id: {self.memory_id}")
-            logger.info(f"  event_data: {event_data}")
-
             # Convert event data to message format
             messages = [
                 (str(event_data), "ASSISTANT")  # Store as assistant message
             ]
 
-            logger.info("Calling create_event with:")
-            logger.info(f"  memory_id: {self.memory_id}")
-            logger.info(f"  actor_id: {actor_id}")
-            logger.info(f"  session_id: {session_id}")
-            logger.info(f"  messages: {messages}")
-
             # For preferences, use a default session_id since the API requires it
             # but the namespace doesn't use it
             actual_session_id = session_id if session_id else "preferences-default"
 
+            # Cached retrievals covering this namespace are now stale
+            namespace = self._get_namespace(memory_type, actor_id, session_id)
+            self.retrieval_cache.invalidate_namespace(namespace)
+
+            logger.debug(
+                f"save_event: memory_type={memory_type}, actor_id={actor_id}, session_id={actual_session_id}, memory_id={self.memory_id}, event_data={event_data}"
+            )
+
+            if deferred:
+                # Invalidated again once the batch is written, since a retrieval
+                # in between would cache the results from before the write
+                self.write_queue.enqueue(
+                    actor_id, actual_session_id, messages, namespaces=[namespace]
+                )
+                logger.info(
+                    f"Queued {memory_type} event for {actor_id} ({len(messages[0][0])} characters)"
+                )
+                return True
+
             result = self.client.create_event(
                 memory_id=self.memory_id,
                 actor_id=actor_id,
@@ -222,12 +249,9 @@ class SREMemoryClient:
             )
 
             event_id = result.get("eventId", "unknown")
-            logger.info(f"create_event result: {result}")
-            logger.info("=== SAVE_EVENT TRACE END ===")
             logger.info(
-                f"Saved {memory_type} event for {actor_id} (event_id: {event_id})"
+                f"Saved {memory_type} event for {actor_id} (event_id: {event_id}, {len(messages[0][0])} characters)"
             )
-            logger.info(f"Event data size: {len(str(event_data))} characters")
             return True
 
         except Exception as e:
@@ -236,6 +260,32 @@ class SREMemoryClient:
             )
             return False
 
+    def _invalidate_namespaces(self, namespaces: Set[str]) -> None:
+        """Drop cached retrievals for namespaces written by the write queue."""
+        for namespace in namespaces:
+            self.retrieval_cache.invalidate_namespace(namespace)
+
+    def enqueue_messages(
+        self, actor_id: str, session_id: str, messages: List[Tuple[str, str]]
+    ) -> bool:
+        """Queue (content, role) messages for a batched create_event call.
+
+        Returns False if the memory system is offline.
+        """
+        if not self.write_queue:
+            logger.warning("Memory system not initialized, skipping save")
+            return False
+        self.write_queue.enqueue(actor_id, session_id, messages)
+        return True
+
+    def flush_pending_writes(
+        self, wait: bool = False, timeout: Optional[float] = None
+    ) -> bool:
+        """Write queued memory events now instead of waiting for the batch thresholds."""
+        if not self.write_queue:
+            return True
+        return self.write_queue.flush(wait=wait, timeout=timeout)
+
     def retrieve_memories(
         self,
         memory_type: str,
@@ -243,8 +293,13 @@ class SREMemoryClient:
         query: str,
         max_results: int = 10,
         session_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> List[Dict[str, Any]]:
-        """Retrieve memories using the retrieve_memories API."""
+        """Retrieve memories using the retrieve_memories API.
+
+        Results are cached by (memory_type, actor_id, namespace, query) for
+        retrieval_cache_ttl_seconds; set use_cache=False to always call the API.
+        """
         if not self.memory_id:
             logger.warning("Memory system not initialized, returning empty results")
             return []
@@ -253,6 +308,15 @@ class SREMemoryClient:
             # Get appropriate namespace (session_id only needed for infrastructure/investigations)
             namespace = self._get_namespace(memory_type, actor_id, session_id)
 
+            cache_key = (memory_type, actor_id, namespace, query, max_results)
+            if use_cache:
+                cached = self.retrieval_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(
+                        f"Retrieved {len(cached)} {memory_type} memories for {actor_id} from cache"
+                    )
+                    return list(cached)
+
             logger.info(
                 f"Retrieving {memory_type} memories: actor_id={actor_id}, namespace={namespace}, query='{query}'"
             )
@@ -263,6 +327,7 @@ class SREMemoryClient:
                 query=query,
                 top_k=max_results,
             )
+            self.retrieval_cache.put(cache_key, list(result))
 
             logger.info(
                 f"Retrieved {len(result)} {memory_type} memories for {actor_id}"
@@ -377,3 +442,29 @@ class SREMemoryClient:
 
         except Exception as e:
             logger.warning(f"Failed to write memory ID to file: {e}")
+
+
+_memory_clients: Dict[Tuple[str, str], SREMemoryClient] = {}
+_memory_clients_lock = threading.Lock()
+
+
+def get_memory_client(
+    memory_name: str = "sre_agent_memory",
+    region: str = "us-east-1",
+    force_delete: bool = False,
+) -> SREMemoryClient:
+    """Return the process-wide memory client for memory_name and region.
+
+    The memory lookup and strategy setup in SREMemoryClient run only once per
+    process. force_delete always creates a new client, which replaces the
+    pooled one.
+    """
+    key = (memory_name, region)
+    with _memory_clients_lock:
+        client = _memory_clients.get(key)
+        if client is None or force_delete:
+            client = SREMemoryClient(
+                memory_name=memory_name, region=region, force_delete=force_delete
+            )
+            _memory_clients[key] = client
+        return client
@@ -49,7 +49,7 @@ class ConversationMemoryManager:
         agent_name: Optional[str] = None,
     ) -> bool:
         """
-        Store a conversation message in memory using create_event.
+        Queue a conversation message for storage in memory using create_event.
 
         Args:
             content: The message content
@@ -81,20 +81,13 @@ class ConversationMemoryManager:
             # Format message as tuple for AgentCore memory
             message_tuple = (content, role)
 
-            # Use AgentCore's create_event with user_id as actor_id
-            result = self.memory_client.client.create_event(
-                memory_id=self.memory_client.memory_id,
+            # Queue for a batched create_event with user_id as actor_id
+            return self.memory_client.enqueue_messages(
                 actor_id=user_id,  # Use user_id as actor_id as specified
                 session_id=session_id,  # Use provided session_id
                 messages=[message_tuple],  # AgentCore expects list of tuples
             )
 
-            event_id = result.get("eventId", "unknown")
-            logger.info(
-                f"Successfully stored conversation message (event_id: {event_id})"
-            )
-            return True
-
         except Exception as e:
             logger.error(f"Failed to store conversation message: {e}", exc_info=True)
             return False
@@ -107,7 +100,7 @@ class ConversationMemoryManager:
         agent_name: Optional[str] = None,
     ) -> bool:
         """
-        Store multiple conversation messages in a single create_event call.
+        Queue multiple conversation messages for a batched create_event call.
 
         Args:
             messages: List of (content, role) tuples
@@ -153,20 +146,14 @@ class ConversationMemoryManager:
                 else:
                     truncated_messages.append((content, role))
 
-            # Use AgentCore's create_event with batch of messages
-            result = self.memory_client.client.create_event(
-                memory_id=self.memory_client.memory_id,
+            # Queue the batch; the write queue coalesces it with other messages
+            # for the same user and session into batched create_event calls
+            return self.memory_client.enqueue_messages(
                 actor_id=user_id,  # Use user_id as actor_id as specified
                 session_id=session_id,  # Use provided session_id
                 messages=truncated_messages,  # AgentCore expects list of tuples
             )
 
-            event_id = result.get("eventId", "unknown")
-            logger.info(
-                f"Successfully stored conversation batch of {len(messages)} messages (event_id: {event_id})"
-            )
-            return True
-
         except Exception as e:
             logger.error(f"Failed to store conversation batch: {e}", exc_info=True)
             return False
@@ -1,6 +1,7 @@
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -39,27 +40,52 @@ class MemoryHookProvider:
         session_id: str,
         incident_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Hook called when investigation starts."""
+        """Hook called when investigation starts.
+
+        The preference, infrastructure and investigation retrievals are
+        independent, so they run concurrently and the hook takes roughly one
+        retrieval round-trip.
+        """
         try:
-            # Retrieve relevant memories to provide context
-            # Use comprehensive query to get all user preference types
-            preferences = self.memory_client.retrieve_memories(
-                memory_type="preferences",
-                actor_id=user_id,
-                query=SREConstants.memory.user_preferences_query,
-                max_results=SREConstants.memory.max_preferences_results,
+            logger.info(
+                f"Retrieving preferences, infrastructure knowledge and investigation summaries for user '{user_id}' for query: '{query}'"
             )
+            with ThreadPoolExecutor(
+                max_workers=3, thread_name_prefix="memory-retrieval"
+            ) as executor:
+                # Use comprehensive query to get all user preference types
+                preferences_future = executor.submit(
+                    self.memory_client.retrieve_memories,
+                    memory_type="preferences",
+                    actor_id=user_id,
+                    query=SREConstants.memory.user_preferences_query,
+                    max_results=SREConstants.memory.max_preferences_results,
+                )
+                # Get infrastructure knowledge for specific user only
+                knowledge_future = executor.submit(
+                    self.memory_client.retrieve_memories,
+                    memory_type="infrastructure",
+                    actor_id=user_id,  # Only retrieve memories for the current user
+                    query=query,
+                    max_results=SREConstants.memory.max_infrastructure_results,
+                    session_id=None,  # Cross-session search for planning purposes
+                )
+                # Get past investigation summaries for similar issues (cross-session search for planning)
+                investigations_future = executor.submit(
+                    self.memory_client.retrieve_memories,
+                    memory_type="investigations",
+                    actor_id=user_id,  # Use user_id to retrieve only user-specific investigations
+                    query=query,
+                    max_results=SREConstants.memory.max_investigation_results,
+                    session_id=None,  # Cross-session search for planning purposes
+                )
+                preferences = preferences_future.result()
+                all_knowledge = knowledge_future.result()
+                investigations = investigations_future.result()
 
-            # Get infrastructure knowledge for specific user only
+            cache_stats = self.memory_client.retrieval_cache.stats()
             logger.info(
-                f"Retrieving infrastructure knowledge for user '{user_id}' for query: '{query}'"
-            )
-            all_knowledge = self.memory_client.retrieve_memories(
-                memory_type="infrastructure",
-                actor_id=user_id,  # Only retrieve memories for the current user
-                query=query,
-                max_results=SREConstants.memory.max_infrastructure_results,
-                session_id=None,  # Cross-session search for planning purposes
+                f"Memory retrieval cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries"
             )
 
             # Organize knowledge by agent for later distribution
@@ -78,18 +104,6 @@ class MemoryHookProvider:
             else:
                 logger.info(f"No infrastructure knowledge found for user '{user_id}'")
 
-            # Get past investigation summaries for similar issues (cross-session search for planning)
-            logger.info(
-                f"Retrieving investigation summaries for user '{user_id}' for query: '{query}'"
-            )
-            investigations = self.memory_client.retrieve_memories(
-                memory_type="investigations",
-                actor_id=user_id,  # Use user_id to retrieve only user-specific investigations
-                query=query,
-                max_results=SREConstants.memory.max_investigation_results,
-                session_id=None,  # Cross-session search for planning purposes
-            )
-
             if investigations:
                 logger.info(
                     f"Retrieved {len(investigations)} past investigation summaries for user '{user_id}'"
@@ -247,6 +261,9 @@ class MemoryHookProvider:
         except Exception as e:
             logger.error(f"Failed to save investigation summary: {e}")
 
+        # Write queued conversation and infrastructure events without waiting
+        self.memory_client.flush_pending_writes()
+
     def _extract_user_preferences(self, response_text: str, user_id: str, context: str):
         """Extract user preferences from response text."""
         logger.info(
@@ -211,6 +211,7 @@ def _save_infrastructure_knowledge(
             actor_id=actor_id,
             event_data=knowledge.model_dump(),
             session_id=session_id,
+            deferred=True,
         )
         if success:
             logger.info(
@@ -0,0 +1,231 @@
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for pending writes when the interpreter exits
+SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 10.0
+
+
+@dataclass
+class _PendingEvent:
+    """Messages waiting to be written for one actor and session."""
+
+    messages: List[Tuple[str, str]] = field(default_factory=list)
+    namespaces: Set[str] = field(default_factory=set)
+    first_enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class MemoryWriteQueue:
+    """Write-behind queue that coalesces memory writes into batched create_event calls.
+
+    Messages are grouped by (actor_id, session_id) and written by a background
+    thread once a group reaches max_batch_messages, once the oldest pending
+    message is flush_interval_seconds old, or when a flush is requested.
+    Callers never wait for the memory API.
+
+    If on_written is given it is called with the namespaces enqueued alongside
+    a batch once that batch has been written, before flush(wait=True) returns.
+    """
+
+    def __init__(
+        self,
+        client,
+        memory_id: str,
+        max_batch_messages: int = 20,
+        flush_interval_seconds: float = 2.0,
+        on_written: Optional[Callable[[Set[str]], None]] = None,
+    ):
+        self.client = client
+        self.memory_id = memory_id
+        self.max_batch_messages = max_batch_messages
+        self.flush_interval_seconds = flush_interval_seconds
+        self.on_written = on_written
+
+        self._pending: Dict[Tuple[str, str], _PendingEvent] = {}
+        self._condition = threading.Condition()
+        self._flush_requested = False
+        self._in_flight = 0
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+
+        atexit.register(self.close)
+
+    def enqueue(
+        self,
+        actor_id: str,
+        session_id: str,
+        messages: List[Tuple[str, str]],
+        namespaces: Iterable[str] = (),
+    ) -> None:
+        """Queue (content, role) messages for actor_id and session_id.
+
+        namespaces are passed to on_written once the messages are stored.
+        """
+        if not messages:
+            return
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Memory write queue is closed")
+
+            pending = self._pending.setdefault((actor_id, session_id), _PendingEvent())
+            pending.messages.extend(messages)
+            pending.namespaces.update(namespaces)
+            self._ensure_worker()
+            # Wake the worker so it recomputes when the next write is due
+            self._condition.notify_all()
+
+        logger.debug(
+            f"Queued {len(messages)} memory messages for actor_id={actor_id}, session_id={session_id}"
+        )
+
+    def flush(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """Request that all pending messages are written now.
+
+        Args:
+            wait: Block until the queue is drained
+            timeout: Maximum seconds to wait when wait is True
+
+        Returns:
+            bool: True if the queue was drained (always True when not waiting)
+        """
+        with self._condition:
+            if not self._pending and not self._in_flight:
+                return True
+            self._flush_requested = True
+            self._condition.notify_all()
+            if not wait:
+                return True
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout=timeout
+            )
+
+    def close(self) -> None:
+        """Write pending messages and stop the background thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+
+        if worker is not None:
+            worker.join(timeout=SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+            if worker.is_alive():
+                logger.warning(
+                    "Timed out writing pending memory events during shutdown"
+                )
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="memory-write-queue", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._is_due():
+                    self._condition.wait(timeout=self._time_until_due())
+                if not self._pending:
+                    # Only reached once the queue is closed and drained
+                    return
+
+                batches = self._take_due_batches()
+                self._in_flight += len(batches)
+
+            for (actor_id, session_id), messages, namespaces in batches:
+                self._write(actor_id, session_id, messages)
+                if namespaces and self.on_written:
+                    self._notify_written(namespaces)
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+    def _is_due(self) -> bool:
+        """Check whether any pending group should be written now."""
+        if not self._pending:
+            return self._closed
+        if self._closed or self._flush_requested:
+            return True
+        now = time.monotonic()
+        return any(
+            len(pending.messages) >= self.max_batch_messages
+            or now - pending.first_enqueued_at >= self.flush_interval_seconds
+            for pending in self._pending.values()
+        )
+
+    def _time_until_due(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        oldest = min(pending.first_enqueued_at for pending in self._pending.values())
+        return max(0.0, oldest + self.flush_interval_seconds - time.monotonic())
+
+    def _take_due_batches(
+        self,
+    ) -> List[Tuple[Tuple[str, str], List[Tuple[str, str]], Set[str]]]:
+        """Remove due groups from the queue, split into batches of the maximum size."""
+        flush_all = self._closed or self._flush_requested
+        self._flush_requested = False
+        now = time.monotonic()
+
+        batches = []
+        for key in list(self._pending):
+            pending = self._pending[key]
+            if not (
+                flush_all
+                or len(pending.messages) >= self.max_batch_messages
+                or now - pending.first_enqueued_at >= self.flush_interval_seconds
+            ):
+                continue
+            del self._pending[key]
+            for start in range(0, len(pending.messages), self.max_batch_messages):
+                batches.append(
+                    (
+                        key,
+                        pending.messages[start : start + self.max_batch_messages],
+                        pending.namespaces,
+                    )
+                )
+        return batches
+
+    def _write(
+        self, actor_id: str, session_id: str, messages: List[Tuple[str, str]]
+    ) -> None:
+        try:
+            result = self.client.create_event(
+                memory_id=self.memory_id,
+                actor_id=actor_id,
+                session_id=session_id,
+                messages=messages,
+            )
+            logger.info(
+                f"Stored batch of {len(messages)} memory messages for actor_id={actor_id}, session_id={session_id} (event_id: {result.get('eventId', 'unknown')})"
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to store batch of {len(messages)} memory messages for actor_id={actor_id}, session_id={session_id}: {e}",
+                exc_info=True,
+            )
+
+    def _notify_written(self, namespaces: Set[str]) -> None:
+        try:
+            self.on_written(namespaces)
+        except Exception as e:
+            logger.error(
+                f"Memory write callback failed for namespaces {sorted(namespaces)}: {e}",
+                exc_info=True,
+            )
@@ -26,6 +26,8 @@ from .agent_state import AgentState
 from .constants import SREConstants
 from .graph_builder import build_multi_agent_graph
 from .logging_config import configure_logging, should_show_debug_traces
+from .supervisor import PARALLEL_AGENTS_NODE
+from .tool_catalog import ToolCatalogCache, build_tools, fetch_tool_schemas
 
 # Configure logging if not already configured (e.g., when imported by agent_runtime)
 if not logging.getLogger().handlers:
@@ -345,81 +347,75 @@ def _read_gateway_config() -> tuple[str, str]:
         raise
 
 
+def _gateway_connection() -> tuple[str, Dict[str, Any]]:
+    """Return the gateway URI and MCP connection configuration."""
+    gateway_uri, access_token, _ = _read_gateway_config()  # Region not needed here
+
+    return gateway_uri, {
+        "url": f"{gateway_uri}/mcp",
+        "transport": "streamable_http",
+        "headers": {"Authorization": f"Bearer {access_token}"},
+    }
+
+
 def create_mcp_client() -> MultiServerMCPClient:
     """Create and return MultiServerMCPClient with gateway configuration."""
-    gateway_uri, access_token, _ = _read_gateway_config()  # Region not needed here
+    _, connection = _gateway_connection()
 
     # Configure MCP server connection
-    client = MultiServerMCPClient(
-        {
-            "gateway": {
-                "url": f"{gateway_uri}/mcp",
-                "transport": "streamable_http",
-                "headers": {"Authorization": f"Bearer {access_token}"},
-            }
-        }
-    )
+    client = MultiServerMCPClient({"gateway": connection})
 
     return client
 
 
-async def create_multi_agent_system(
-    provider: str = "bedrock",
-    checkpointer=None,
-    force_delete_memory: bool = False,
-    export_graph: bool = False,
-    graph_output_path: str = "./docs/sre_agent_architecture.md",
-    region_name: str = None,
-    **llm_kwargs,
-):
-    """Create multi-agent system with MCP tools."""
-    logger.info(f"Creating multi-agent system with provider: {provider}")
+async def _load_mcp_tools() -> list:
+    """Load MCP tools, from the tool catalog cache when possible.
 
-    # Get Anthropic API key if needed
-    if provider == "anthropic" and not llm_kwargs.get("api_key"):
-        llm_kwargs["api_key"] = _get_anthropic_api_key()
-    
-    # Add region_name to llm_kwargs for bedrock provider
-    if provider == "bedrock" and region_name:
-        llm_kwargs["region_name"] = region_name
-        logger.info(f"Using AWS region for Bedrock: {region_name}")
+    A valid cached catalog is used immediately and refreshed in the
+    background; otherwise the catalog is fetched from the gateway with retry
+    logic and written to the cache.
+    """
+    try:
+        gateway_uri, connection = _gateway_connection()
+        client = MultiServerMCPClient({"gateway": connection})
+        tool_catalog = ToolCatalogCache(gateway_uri)
+    except Exception as e:
+        logger.warning(f"Failed to load MCP tools: {e}")
+        return []
+
+    cached_catalog = tool_catalog.load()
+    if cached_catalog:
+        try:
+            mcp_tools = build_tools(cached_catalog["tools"], connection)
+            logger.info(
+                f"Loaded {len(mcp_tools)} MCP tools from catalog cache (version {cached_catalog['version'][:12]})"
+            )
+            tool_catalog.schedule_refresh(client, cached_catalog["version"])
+            return mcp_tools
+        except Exception as e:
+            logger.warning(f"Failed to build MCP tools from catalog cache: {e}")
 
-    # Create MCP client and get tools with retry logic
-    mcp_tools = []
     max_retries = 3
     retry_count = 0
 
     while retry_count < max_retries:
         try:
-            client = create_mcp_client()
             # Add timeout for MCP tool loading to prevent hanging
-            all_mcp_tools = await asyncio.wait_for(
-                client.get_tools(),
+            tool_schemas = await asyncio.wait_for(
+                fetch_tool_schemas(client),
                 timeout=SREConstants.timeouts.mcp_tools_timeout_seconds,
             )
+            tool_catalog.save(tool_schemas)
 
             # Don't filter out x-amz-agentcore-search as it's a global tool
-            mcp_tools = all_mcp_tools
+            mcp_tools = build_tools(tool_schemas, connection)
 
             logger.info(f"Retrieved {len(mcp_tools)} tools from MCP")
-
-            # Print tool information (only in debug mode)
-            logger.info(f"MCP tools loaded: {len(mcp_tools)}")
-            if should_show_debug_traces():
-                print(f"\nMCP tools loaded: {len(mcp_tools)}")
-                for tool in mcp_tools:
-                    tool_name = getattr(tool, "name", "unknown")
-                    tool_desc = getattr(tool, "description", "No description")
-                    print(f"  - {tool_name}: {tool_desc[:80]}...")
-                    logger.info(f"  - {tool_name}: {tool_desc[:80]}...")
-
-            # Success - break out of retry loop
-            break
+            return mcp_tools
 
         except asyncio.TimeoutError:
             logger.warning("MCP tool loading timed out after 30 seconds")
-            mcp_tools = []
-            break  # Don't retry on timeout
+            return []  # Don't retry on timeout
 
         except Exception as e:
             retry_count += 1
@@ -443,12 +439,47 @@ async def create_multi_agent_system(
                     logger.error(
                         f"Failed to load MCP tools after {max_retries} retries: {e}"
                     )
-                    mcp_tools = []
             else:
                 # For other errors, don't retry
                 logger.warning(f"Failed to load MCP tools: {e}")
-                mcp_tools = []
-                break
+            return []
+
+    return []
+
+
+async def create_multi_agent_system(
+    provider: str = "bedrock",
+    checkpointer=None,
+    force_delete_memory: bool = False,
+    export_graph: bool = False,
+    graph_output_path: str = "./docs/sre_agent_architecture.md",
+    region_name: str = None,
+    **llm_kwargs,
+):
+    """Create multi-agent system with MCP tools."""
+    logger.info(f"Creating multi-agent system with provider: {provider}")
+
+    # Get Anthropic API key if needed
+    if provider == "anthropic" and not llm_kwargs.get("api_key"):
+        llm_kwargs["api_key"] = _get_anthropic_api_key()
+    
+    # Add region_name to llm_kwargs for bedrock provider
+    if provider == "bedrock" and region_name:
+        llm_kwargs["region_name"] = region_name
+        logger.info(f"Using AWS region for Bedrock: {region_name}")
+
+    # Get MCP tools, from the tool catalog cache when possible
+    mcp_tools = await _load_mcp_tools()
+
+    # Print tool information (only in debug mode)
+    logger.info(f"MCP tools loaded: {len(mcp_tools)}")
+    if should_show_debug_traces():
+        print(f"\nMCP tools loaded: {len(mcp_tools)}")
+        for tool in mcp_tools:
+            tool_name = getattr(tool, "name", "unknown")
+            tool_desc = getattr(tool, "description", "No description")
+            print(f"  - {tool_name}: {tool_desc[:80]}...")
+            logger.info(f"  - {tool_name}: {tool_desc[:80]}...")
 
     # Combine local tools with MCP tools
     local_tools = [get_current_time]
@@ -456,7 +487,7 @@ async def create_multi_agent_system(
     # Add memory tools if memory system is enabled
     memory_tools = []
     try:
-        from .memory.client import SREMemoryClient
+        from .memory.client import get_memory_client
         from .memory.config import _load_memory_config
         from .memory.tools import create_memory_tools
 
@@ -465,7 +496,7 @@ async def create_multi_agent_system(
             logger.debug("Adding memory tools to agent tool list")
             # Use the region from parameter if provided, otherwise use config default
             memory_region = region_name if region_name else memory_config.region
-            memory_client = SREMemoryClient(
+            memory_client = get_memory_client(
                 memory_name=memory_config.memory_name,
                 region=memory_region,
                 force_delete=force_delete_memory,
@@ -926,8 +957,17 @@ async def _run_interactive_session(
                             "logs_agent",
                             "metrics_agent",
                             "runbooks_agent",
+                            PARALLEL_AGENTS_NODE,
                         ]:
-                            agent_name = node_name.replace("_agent", "").title()
+                            if node_name == PARALLEL_AGENTS_NODE:
+                                agent_name = " + ".join(
+                                    name.replace("_agent", "").title()
+                                    for name in node_output.get("metadata", {}).get(
+                                        "parallel_agents", []
+                                    )
+                                )
+                            else:
+                                agent_name = node_name.replace("_agent", "").title()
                             print(f"\n🔧 {agent_name} Agent:")
                             logger.info(f"🔧 {agent_name} Agent:")
 
@@ -1340,8 +1380,17 @@ async def main():
                             "logs_agent",
                             "metrics_agent",
                             "runbooks_agent",
+                            PARALLEL_AGENTS_NODE,
                         ]:
-                            agent_name = node_name.replace("_agent", "").title()
+                            if node_name == PARALLEL_AGENTS_NODE:
+                                agent_name = " + ".join(
+                                    name.replace("_agent", "").title()
+                                    for name in node_output.get("metadata", {}).get(
+                                        "parallel_agents", []
+                                    )
+                                )
+                            else:
+                                agent_name = node_name.replace("_agent", "").title()
                             print(f"\n🔧 {agent_name} Agent:")
                             logger.info(f"🔧 {agent_name} Agent:")
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import asyncio
 import json
 import logging
 import os
@@ -15,7 +16,7 @@ from .agent_state import AgentState
 from .constants import SREConstants
 from .llm_utils import create_llm_with_error_handling
 from .memory import create_conversation_memory_manager
-from .memory.client import SREMemoryClient
+from .memory.client import get_memory_client
 from .memory.config import _load_memory_config
 from .memory.hooks import MemoryHookProvider
 from .memory.tools import create_memory_tools
@@ -81,6 +82,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Graph node that runs a group of independent agents concurrently
+PARALLEL_AGENTS_NODE = "parallel_agents"
+
 
 def _json_serializer(obj):
     """JSON serializer for objects not serializable by default json code."""
@@ -128,6 +132,42 @@ class InvestigationPlan(BaseModel):
     reasoning: str = Field(
         description="Brief explanation of the investigation approach"
     )
+    parallel_groups: Optional[List[List[str]]] = Field(
+        default=None,
+        description="Optional grouping of agents_sequence into steps whose agents can run concurrently",
+    )
+
+    def execution_groups(self) -> List[List[str]]:
+        """Split agents_sequence into groups that are executed one after another.
+
+        Agents in the same group run concurrently. Groups proposed by the planner
+        are used when they cover agents_sequence in order; otherwise consecutive
+        independent agents are grouped together.
+        """
+        if self.parallel_groups:
+            flattened = [agent for group in self.parallel_groups for agent in group]
+            if flattened == self.agents_sequence and all(
+                group and len(set(group)) == len(group)
+                for group in self.parallel_groups
+            ):
+                return [list(group) for group in self.parallel_groups]
+            logger.warning(
+                f"Ignoring parallel_groups {self.parallel_groups} that do not match agents_sequence {self.agents_sequence}"
+            )
+
+        independent_agents = set(SREConstants.agents.independent_agents)
+        groups: List[List[str]] = []
+        for agent in self.agents_sequence:
+            if (
+                groups
+                and agent in independent_agents
+                and agent not in groups[-1]
+                and all(member in independent_agents for member in groups[-1])
+            ):
+                groups[-1].append(agent)
+            else:
+                groups.append([agent])
+        return groups
 
 
 class RouteDecision(BaseModel):
@@ -217,7 +257,7 @@ class SupervisorAgent:
         if self.memory_config.enabled:
             # Use region from llm_kwargs if provided for bedrock
             memory_region = llm_kwargs.get("region_name", self.memory_config.region) if llm_provider == "bedrock" else self.memory_config.region
-            self.memory_client = SREMemoryClient(
+            self.memory_client = get_memory_client(
                 memory_name=self.memory_config.memory_name,
                 region=memory_region,
                 force_delete=force_delete_memory,
@@ -317,7 +357,9 @@ class SupervisorAgent:
                         "session_id is required for memory retrieval but not found in state"
                     )
 
-                memory_context = self.memory_hooks.on_investigation_start(
+                # Retrieval is blocking I/O, keep it off the event loop
+                memory_context = await asyncio.to_thread(
+                    self.memory_hooks.on_investigation_start,
                     query=current_query,
                     user_id=user_id,
                     actor_id=actor_id,
@@ -617,65 +659,74 @@ User's query: {current_query}
                 }
             else:
                 # Simple plan - start execution
-                next_agent = (
-                    plan.agents_sequence[0] if plan.agents_sequence else "FINISH"
-                )
                 plan_text = self._format_plan_markdown(plan)
-                return {
-                    "next": next_agent,
-                    "metadata": {
-                        **state.get("metadata", {}),
+                routing = self._route_to_group(state, plan, 0)
+                routing["metadata"].update(
+                    {
                         "investigation_plan": plan.model_dump(),
-                        "routing_reasoning": f"Executing plan step 1: {plan.steps[0] if plan.steps else 'Start'}",
-                        "plan_step": 0,
                         "plan_text": plan_text,
                         "show_plan": True,
-                    },
-                    # Preserve memory context in state
-                    "memory_context": state.get("memory_context", {}),
-                }
+                    }
+                )
+                return routing
         else:
             # Continue executing existing plan
             plan = InvestigationPlan(**existing_plan)
-            current_step = state.get("metadata", {}).get("plan_step", 0)
-
-            # Check if plan is complete
-            if current_step >= len(plan.agents_sequence) or not agents_invoked:
-                next_step = current_step
-            else:
-                next_step = current_step + 1
-
-            if next_step >= len(plan.agents_sequence):
-                # Plan complete
-                return {
-                    "next": "FINISH",
-                    "metadata": {
-                        **state.get("metadata", {}),
-                        "routing_reasoning": "Investigation plan completed. Presenting results.",
-                        "plan_step": next_step,
-                    },
-                    # Preserve memory context in state
-                    "memory_context": state.get("memory_context", {}),
-                }
-            else:
-                # Continue with next agent in plan
-                next_agent = plan.agents_sequence[next_step]
-                step_description = (
-                    plan.steps[next_step]
-                    if next_step < len(plan.steps)
-                    else f"Execute {next_agent}"
-                )
+            current_group = state.get("metadata", {}).get("plan_group", 0)
+
+            # Move to the next group once the current one has run
+            next_group = current_group + 1 if agents_invoked else current_group
+            return self._route_to_group(state, plan, next_group)
+
+    def _route_to_group(
+        self, state: AgentState, plan: InvestigationPlan, group_index: int
+    ) -> Dict[str, Any]:
+        """Build the routing update that executes one group of the plan."""
+        groups = plan.execution_groups()
+
+        # Index into agents_sequence of the first agent in the group
+        plan_step = sum(len(group) for group in groups[:group_index])
+
+        if group_index >= len(groups):
+            # Plan complete
+            return {
+                "next": "FINISH",
+                "metadata": {
+                    **state.get("metadata", {}),
+                    "routing_reasoning": "Investigation plan completed. Presenting results.",
+                    "plan_step": plan_step,
+                    "plan_group": group_index,
+                },
+                # Preserve memory context in state
+                "memory_context": state.get("memory_context", {}),
+            }
+
+        group = groups[group_index]
+        step_description = (
+            plan.steps[plan_step]
+            if plan_step < len(plan.steps)
+            else f"Execute {', '.join(group)}"
+        )
+        routing_reasoning = f"Executing plan step {plan_step + 1}: {step_description}"
 
-                return {
-                    "next": next_agent,
-                    "metadata": {
-                        **state.get("metadata", {}),
-                        "routing_reasoning": f"Executing plan step {next_step + 1}: {step_description}",
-                        "plan_step": next_step,
-                    },
-                    # Preserve memory context in state
-                    "memory_context": state.get("memory_context", {}),
-                }
+        if len(group) > 1:
+            next_node = PARALLEL_AGENTS_NODE
+            routing_reasoning += f" (running {', '.join(group)} in parallel)"
+        else:
+            next_node = group[0]
+
+        return {
+            "next": next_node,
+            "metadata": {
+                **state.get("metadata", {}),
+                "routing_reasoning": routing_reasoning,
+                "plan_step": plan_step,
+                "plan_group": group_index,
+                "parallel_agents": group,
+            },
+            # Preserve memory context in state
+            "memory_context": state.get("memory_context", {}),
+        }
 
     async def aggregate_responses(self, state: AgentState) -> Dict[str, Any]:
         """Aggregate responses from multiple agents into a final response."""
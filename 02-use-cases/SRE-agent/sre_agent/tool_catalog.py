@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool as MCPTool
+
+from .constants import SREConstants
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cache file changes
+CATALOG_FORMAT_VERSION = 1
+
+# Safety limit for paginated tools/list calls
+_MAX_LIST_PAGES = 1000
+
+# Background refresh tasks, referenced so they are not garbage collected
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+def _default_cache_path() -> Path:
+    """Cache file in the project root, next to the other local state files."""
+    return Path(__file__).parent.parent / SREConstants.app.tool_catalog_cache_file
+
+
+def catalog_version(tool_schemas: List[Dict[str, Any]]) -> str:
+    """Content hash of a tool catalog, used like an ETag to detect changes."""
+    canonical = json.dumps(
+        sorted(tool_schemas, key=lambda schema: schema.get("name", "")),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def fetch_tool_schemas(
+    client, server_name: str = "gateway"
+) -> List[Dict[str, Any]]:
+    """List the tools of an MCP server as JSON-serializable schemas."""
+    schemas: List[Dict[str, Any]] = []
+    async with client.session(server_name) as session:
+        cursor = None
+        for _ in range(_MAX_LIST_PAGES):
+            page = await session.list_tools(cursor=cursor)
+            schemas.extend(
+                tool.model_dump(mode="json", exclude_none=True) for tool in page.tools
+            )
+            cursor = page.nextCursor
+            if not cursor:
+                return schemas
+    raise RuntimeError(f"Reached max of {_MAX_LIST_PAGES} pages while listing tools")
+
+
+def build_tools(
+    tool_schemas: List[Dict[str, Any]], connection: Dict[str, Any]
+) -> List[BaseTool]:
+    """Convert cached tool schemas to LangChain tools.
+
+    The tools open a new session on the given connection for each call, the
+    same way tools returned by MultiServerMCPClient.get_tools() do.
+    """
+    return [
+        convert_mcp_tool_to_langchain_tool(
+            None, MCPTool.model_validate(schema), connection=connection
+        )
+        for schema in tool_schemas
+    ]
+
+
+class ToolCatalogCache:
+    """Persisted MCP tool schemas for a gateway.
+
+    The cache stores the tool schemas (never credentials) together with the
+    gateway URI and a content hash. A cached catalog lets the agent start
+    without a tools/list round-trip; a background refresh compares the hash
+    with the live catalog and rewrites the cache when the gateway changed.
+    """
+
+    def __init__(
+        self,
+        gateway_uri: str,
+        cache_path: Optional[Path] = None,
+        max_age_seconds: Optional[int] = None,
+    ):
+        self.gateway_uri = gateway_uri
+        self.cache_path = Path(cache_path) if cache_path else _default_cache_path()
+        self.max_age_seconds = (
+            max_age_seconds
+            if max_age_seconds is not None
+            else SREConstants.app.tool_catalog_max_age_seconds
+        )
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the cached catalog if it is valid for this gateway and fresh."""
+        try:
+            with open(self.cache_path, "r") as f:
+                catalog = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No MCP tool catalog cache at {self.cache_path}")
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable MCP tool catalog cache: {e}")
+            return None
+
+        if catalog.get("format_version") != CATALOG_FORMAT_VERSION:
+            logger.info("Ignoring MCP tool catalog cache with an old format")
+            return None
+        if catalog.get("gateway_uri") != self.gateway_uri:
+            logger.info("Ignoring MCP tool catalog cache for a different gateway")
+            return None
+        age = time.time() - catalog.get("fetched_at", 0)
+        if age > self.max_age_seconds:
+            logger.info(f"Ignoring MCP tool catalog cache that is {age:.0f}s old")
+            return None
+        if catalog.get("version") != catalog_version(catalog.get("tools", [])):
+            logger.warning("Ignoring MCP tool catalog cache with a mismatched hash")
+            return None
+        return catalog
+
+    def save(self, tool_schemas: List[Dict[str, Any]]) -> str:
+        """Persist tool schemas and return their version hash."""
+        version = catalog_version(tool_schemas)
+        catalog = {
+            "format_version": CATALOG_FORMAT_VERSION,
+            "gateway_uri": self.gateway_uri,
+            "version": version,
+            "fetched_at": time.time(),
+            "tools": tool_schemas,
+        }
+        try:
+            # Write to a temporary file first so readers never see a partial file
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(catalog, indent=2))
+            tmp_path.replace(self.cache_path)
+            logger.info(
+                f"Saved MCP tool catalog ({len(tool_schemas)} tools, version {version[:12]}) to {self.cache_path}"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to save MCP tool catalog cache: {e}")
+        return version
+
+    async def refresh(self, client, cached_version: str, server_name: str = "gateway"):
+        """Fetch the live catalog and update the cache if it changed."""
+        try:
+            tool_schemas = await asyncio.wait_for(
+                fetch_tool_schemas(client, server_name),
+                timeout=SREConstants.timeouts.mcp_tools_timeout_seconds,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Background MCP tool catalog refresh failed: {e}")
+            return
+
+        version = self.save(tool_schemas)
+        if version != cached_version:
+            logger.warning(
+                f"MCP tool catalog changed on the gateway ({cached_version[:12]} -> {version[:12]}); "
+                "the new tools are used from the next start"
+            )
+        else:
+            logger.info("MCP tool catalog cache is up to date")
+
+    def schedule_refresh(
+        self, client, cached_version: str, server_name: str = "gateway"
+    ) -> asyncio.Task:
+        """Start a background refresh on the running event loop."""
+        task = asyncio.create_task(self.refresh(client, cached_version, server_name))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+        return task
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The backend servers run from their own directory and import sibling modules
+# directly (e.g. `from data_store import DataStore`), so tests do the same
+SERVERS_PATH = Path(__file__).parents[3] / "backend" / "servers"
+sys.path.insert(0, str(SERVERS_PATH))
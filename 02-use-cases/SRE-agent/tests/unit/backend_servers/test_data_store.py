@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+from data_store import DataStore, IndexedRecords
+
+PODS = [
+    {"name": "web-1", "namespace": "production", "status": "Running"},
+    {"name": "web-2", "namespace": "production", "status": "CrashLoopBackOff"},
+    {"name": "db-1", "namespace": "staging", "status": "Running"},
+]
+
+
+class TestIndexedRecords:
+    """Tests for IndexedRecords."""
+
+    @pytest.fixture
+    def records(self):
+        """Create indexed pod records."""
+        return IndexedRecords(
+            PODS, index_fields=("namespace", "name"), text_fields=("name", "status")
+        )
+
+    def test_filter_without_criteria_returns_copy(self, records):
+        """Test that an empty filter returns every record in a new list."""
+        result = records.filter()
+
+        assert result == PODS
+        assert result is not records.records
+
+    def test_filter_by_indexed_fields(self, records):
+        """Test filtering on one and several indexed fields."""
+        assert len(records.filter(namespace="production")) == 2
+        assert records.filter(namespace="production", name="web-2") == [PODS[1]]
+        assert records.filter(namespace="staging", name="web-2") == []
+
+    def test_filter_ignores_none_criteria(self, records):
+        """Test that None criteria do not restrict results."""
+        assert len(records.filter(namespace=None, name=None)) == 3
+
+    def test_filter_by_unindexed_field(self, records):
+        """Test filtering on a field without an index."""
+        assert records.filter(status="Running") == [PODS[0], PODS[2]]
+
+    def test_lookup(self, records):
+        """Test exact lookup through an index."""
+        assert records.lookup("name", "db-1") == [PODS[2]]
+        assert records.lookup("name", "missing") == []
+
+    def test_search_is_case_insensitive(self, records):
+        """Test keyword search over text fields."""
+        assert records.search("CRASHLOOP") == [PODS[1]]
+        assert records.search("running", records.filter(namespace="staging")) == [
+            PODS[2]
+        ]
+
+
+class TestDataStore:
+    """Tests for DataStore."""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        """Create a data directory with a pods file."""
+        (tmp_path / "pods.json").write_text(json.dumps({"pods": PODS}))
+        return tmp_path
+
+    def test_records_and_document(self, data_dir):
+        """Test loading records and the raw document."""
+        store = DataStore(data_dir)
+        store.register("pods.json", list_key="pods", index_fields=("namespace",))
+        store.load_all()
+
+        assert len(store.records("pods.json")) == 3
+        assert store.document("pods.json") == {"pods": PODS}
+
+    def test_file_parsed_once(self, data_dir):
+        """Test that unchanged files are served from memory."""
+        calls = []
+
+        def parser(path):
+            calls.append(path)
+            return json.loads(path.read_text())
+
+        store = DataStore(data_dir)
+        store.register("pods.json", list_key="pods", parser=parser)
+
+        store.records("pods.json")
+        store.records("pods.json")
+        store.document("pods.json")
+
+        assert len(calls) == 1
+
+    def test_reload_on_modification(self, data_dir):
+        """Test that a modified file is re-parsed on next access."""
+        store = DataStore(data_dir)
+        store.register("pods.json", list_key="pods", index_fields=("namespace",))
+        assert len(store.records("pods.json").filter(namespace="staging")) == 1
+
+        pods_file = data_dir / "pods.json"
+        pods_file.write_text(json.dumps({"pods": PODS[:2]}))
+        stat = pods_file.stat()
+        os.utime(pods_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert store.records("pods.json").filter(namespace="staging") == []
+
+    def test_missing_file(self, data_dir):
+        """Test behavior for registered files that do not exist."""
+        store = DataStore(data_dir)
+        store.register("missing.json")
+        store.load_all()
+
+        assert store.exists("missing.json") is False
+        with pytest.raises(FileNotFoundError):
+            store.document("missing.json")
@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import pytest
+from log_index import LogIndex, iter_lines_reversed, parse_log_line
+
+
+def _line(minute: int, level: str, service: str, message: str) -> str:
+    return f"2024-01-15T14:{minute:02d}:00Z [{level}] {service} {message}\n"
+
+
+def _epoch(timestamp: str) -> float:
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+
+class TestParseLogLine:
+    """Tests for parse_log_line."""
+
+    def test_structured_line(self):
+        """Test parsing a well-formed log line."""
+        entry = parse_log_line(_line(5, "ERROR", "web-service", "Connection refused"))
+
+        assert entry == {
+            "timestamp": "2024-01-15T14:05:00Z",
+            "level": "ERROR",
+            "service": "web-service",
+            "message": "Connection refused",
+        }
+
+    def test_unstructured_line(self):
+        """Test that short lines keep only the message."""
+        assert parse_log_line("  stack trace  \n") == {"message": "stack trace"}
+
+
+class TestLogIndex:
+    """Tests for LogIndex."""
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        """Create a log file with 50 lines spread over several blocks."""
+        path = tmp_path / "application.log"
+        lines = []
+        for minute in range(50):
+            if minute % 10 == 0:
+                lines.append(_line(minute, "ERROR", "db-service", "Database timeout"))
+            else:
+                lines.append(_line(minute, "INFO", "web-service", "Request served"))
+        path.write_text("".join(lines))
+        return path
+
+    def test_search_by_pattern(self, log_file):
+        """Test case-insensitive pattern search across blocks."""
+        index = LogIndex(log_file, block_lines=8)
+
+        results = index.search(pattern="DATABASE")
+
+        assert [r["timestamp"][14:16] for r in results] == [
+            "00",
+            "10",
+            "20",
+            "30",
+            "40",
+        ]
+
+    def test_search_stops_at_limit(self, log_file):
+        """Test that search returns at most limit entries in file order."""
+        index = LogIndex(log_file, block_lines=8)
+
+        results = index.search(pattern="request", limit=3)
+
+        assert [r["timestamp"][14:16] for r in results] == ["01", "02", "03"]
+
+    def test_search_unknown_pattern(self, log_file):
+        """Test that patterns absent from the trigram index match nothing."""
+        index = LogIndex(log_file, block_lines=8)
+
+        assert index.search(pattern="kernel panic") == []
+
+    def test_search_by_level_and_time(self, log_file):
+        """Test level and inclusive time window filters."""
+        index = LogIndex(log_file, block_lines=8)
+        start = _epoch("2024-01-15T14:10:00Z")
+        end = _epoch("2024-01-15T14:30:00Z")
+
+        results = index.search(level="ERROR", start_epoch=start, end_epoch=end)
+
+        assert [r["timestamp"][14:16] for r in results] == ["10", "20", "30"]
+
+    def test_refresh_indexes_appended_lines(self, log_file):
+        """Test that lines appended after the first search are found."""
+        index = LogIndex(log_file, block_lines=8)
+        assert index.search(pattern="disk full") == []
+
+        with open(log_file, "a") as f:
+            f.write(_line(55, "ERROR", "storage", "Disk full"))
+
+        assert len(index.search(pattern="disk full")) == 1
+
+    def test_unterminated_last_line_is_searched(self, log_file):
+        """Test that a last line without newline is still returned."""
+        with open(log_file, "a") as f:
+            f.write(_line(55, "WARN", "cache", "Eviction storm").rstrip("\n"))
+        index = LogIndex(log_file, block_lines=8)
+
+        assert index.search(pattern="eviction")[0]["service"] == "cache"
+
+    def test_recent_most_recent_first(self, log_file):
+        """Test reading the latest entries from the end of the file."""
+        index = LogIndex(log_file)
+
+        results = index.recent(limit=3)
+
+        assert [r["timestamp"][14:16] for r in results] == ["49", "48", "47"]
+
+    def test_recent_filtered_by_service(self, log_file):
+        """Test service filtering on recent entries."""
+        index = LogIndex(log_file)
+
+        results = index.recent(limit=2, service="db")
+
+        assert [r["timestamp"][14:16] for r in results] == ["40", "30"]
+
+
+def test_iter_lines_reversed_small_chunks(tmp_path):
+    """Test reverse reading with lines spanning chunk boundaries."""
+    path = tmp_path / "lines.log"
+    path.write_text("first line\nsecond line\n\nthird line")
+
+    assert list(iter_lines_reversed(path, chunk_size=4)) == [
+        "third line",
+        "second line",
+        "first line",
+    ]
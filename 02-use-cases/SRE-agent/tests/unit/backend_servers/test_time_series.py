@@ -0,0 +1,95 @@
+from datetime import timezone
+
+from time_series import TimeIndex, parse_timestamp, to_epoch, window_bounds
+
+RECORDS = [
+    {"id": 0, "timestamp": "2024-01-15T14:22:00Z"},
+    {"id": 1, "timestamp": "2024-01-15T14:20:00Z"},
+    {"id": 2, "timestamp": "not-a-timestamp"},
+    {"id": 3},
+    {"id": 4, "timestamp": "2024-01-15T14:25:00+00:00"},
+    {"id": 5, "timestamp": "2024-01-15T14:21:00"},
+]
+
+
+def _ids(records):
+    return [record["id"] for record in records]
+
+
+class TestParsing:
+    """Tests for timestamp parsing helpers."""
+
+    def test_to_epoch_formats(self):
+        """Test Z suffix, explicit offset and naive timestamps agree."""
+        expected = to_epoch("2024-01-15T14:20:00Z")
+
+        assert to_epoch("2024-01-15T14:20:00+00:00") == expected
+        assert to_epoch("2024-01-15T14:20:00") == expected
+        assert to_epoch("2024-01-15T15:20:00+01:00") == expected
+
+    def test_to_epoch_invalid(self):
+        """Test that invalid input returns None."""
+        assert to_epoch("yesterday") is None
+        assert to_epoch("") is None
+
+    def test_parse_timestamp_is_timezone_aware(self):
+        """Test that parsed datetimes are always in UTC."""
+        assert parse_timestamp("2024-01-15T14:20:00").tzinfo == timezone.utc
+
+    def test_window_bounds(self):
+        """Test conversion of optional bounds."""
+        assert window_bounds() == (None, None)
+        assert window_bounds("2024-01-15T14:20:00Z")[0] == to_epoch(
+            "2024-01-15T14:20:00Z"
+        )
+
+
+class TestTimeIndex:
+    """Tests for TimeIndex."""
+
+    def test_window_preserves_original_order(self):
+        """Test inclusive bounds, original order and unparseable records."""
+        index = TimeIndex(RECORDS)
+
+        result = index.window(
+            to_epoch("2024-01-15T14:21:00Z"), to_epoch("2024-01-15T14:22:00Z")
+        )
+
+        assert _ids(result) == [0, 2, 5]
+
+    def test_open_ended_window(self):
+        """Test windows bounded on one side only."""
+        index = TimeIndex(RECORDS)
+
+        assert _ids(index.window(to_epoch("2024-01-15T14:22:00Z"))) == [0, 2, 4]
+        assert _ids(index.window(None, to_epoch("2024-01-15T14:20:00Z"))) == [1, 2]
+
+    def test_unbounded_window_returns_everything(self):
+        """Test that no bounds returns all records, including untimed ones."""
+        index = TimeIndex(RECORDS)
+
+        assert _ids(index.window()) == [0, 1, 2, 3, 4, 5]
+
+    def test_window_with_candidates(self):
+        """Test restricting a window to a subset of the records."""
+        index = TimeIndex(RECORDS)
+        candidates = [RECORDS[4], RECORDS[3], RECORDS[1]]
+
+        result = index.window(to_epoch("2024-01-15T14:21:00Z"), None, candidates)
+
+        assert _ids(result) == [4]
+
+    def test_window_with_candidates_uses_the_smaller_side(self):
+        """Test that bisect-then-intersect and candidate scans agree."""
+        records = [
+            {"id": i, "timestamp": f"2024-01-15T14:{i:02d}:00Z", "odd": i % 2}
+            for i in range(60)
+        ]
+        index = TimeIndex(records)
+        odd = [record for record in records if record["odd"]]
+        narrow = (to_epoch("2024-01-15T14:10:00Z"), to_epoch("2024-01-15T14:14:00Z"))
+        wide = (to_epoch("2024-01-15T14:02:00Z"), None)
+
+        assert _ids(index.window(*narrow, odd)) == [11, 13]
+        assert _ids(index.window(*wide, odd)) == list(range(3, 60, 2))
+        assert _ids(index.window(*narrow, list(records))) == [10, 11, 12, 13, 14]
@@ -0,0 +1,68 @@
+import time
+
+from sre_agent.memory.cache import MemoryRetrievalCache
+
+
+def _key(namespace, query="query"):
+    return ("infrastructure", "user1", namespace, query, 10)
+
+
+class TestMemoryRetrievalCache:
+    """Test the TTL + LRU memory retrieval cache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = MemoryRetrievalCache()
+        key = _key("/sre/infrastructure/user1")
+
+        assert cache.get(key) is None
+        cache.put(key, [{"content": {"text": "memory"}}])
+        assert cache.get(key) == [{"content": {"text": "memory"}}]
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entries_expire_after_ttl(self):
+        """Test that expired entries are treated as misses."""
+        cache = MemoryRetrievalCache(ttl_seconds=0.01)
+        key = _key("/sre/infrastructure/user1")
+        cache.put(key, [])
+
+        time.sleep(0.02)
+
+        assert cache.get(key, "missing") == "missing"
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache keeps at most max_entries entries."""
+        cache = MemoryRetrievalCache(max_entries=2)
+        first, second, third = (_key("/ns", query) for query in ("a", "b", "c"))
+        cache.put(first, ["a"])
+        cache.put(second, ["b"])
+
+        # Touch the first entry so the second becomes least recently used
+        cache.get(first)
+        cache.put(third, ["c"])
+
+        assert cache.get(first) == ["a"]
+        assert cache.get(second) is None
+        assert cache.get(third) == ["c"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_namespace_drops_parent_namespaces(self):
+        """Test that saving to a session namespace invalidates cross-session results."""
+        cache = MemoryRetrievalCache()
+        session_key = _key("/sre/infrastructure/user1/session1")
+        cross_session_key = _key("/sre/infrastructure/user1")
+        other_user_key = _key("/sre/infrastructure/user10")
+        for key in (session_key, cross_session_key, other_user_key):
+            cache.put(key, [])
+
+        removed = cache.invalidate_namespace("/sre/infrastructure/user1/session1")
+
+        assert removed == 2
+        assert cache.get(session_key) is None
+        assert cache.get(cross_session_key) is None
+        assert cache.get(other_user_key) == []
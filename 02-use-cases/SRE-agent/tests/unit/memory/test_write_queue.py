@@ -0,0 +1,121 @@
+import time
+from unittest.mock import Mock
+
+from sre_agent.memory.write_queue import MemoryWriteQueue
+
+
+def _make_queue(**kwargs):
+    client = Mock()
+    client.create_event.return_value = {"eventId": "event-1"}
+    return client, MemoryWriteQueue(client, "memory-123", **kwargs)
+
+
+class TestMemoryWriteQueue:
+    """Test the write-behind queue for memory events."""
+
+    def test_flush_coalesces_messages_per_actor_and_session(self):
+        """Test that queued messages for one session are written in one call."""
+        client, queue = _make_queue(flush_interval_seconds=60)
+
+        queue.enqueue("user1", "session1", [("question", "USER")])
+        queue.enqueue("user1", "session1", [("answer", "ASSISTANT")])
+        queue.enqueue("user2", "session2", [("other", "USER")])
+        assert client.create_event.call_count == 0
+
+        assert queue.flush(wait=True, timeout=5) is True
+
+        calls = {
+            (call.kwargs["actor_id"], call.kwargs["session_id"]): call.kwargs[
+                "messages"
+            ]
+            for call in client.create_event.call_args_list
+        }
+        assert calls == {
+            ("user1", "session1"): [("question", "USER"), ("answer", "ASSISTANT")],
+            ("user2", "session2"): [("other", "USER")],
+        }
+        queue.close()
+
+    def test_batch_size_threshold_triggers_write(self):
+        """Test that a full batch is written without waiting for the interval."""
+        client, queue = _make_queue(max_batch_messages=2, flush_interval_seconds=60)
+
+        queue.enqueue("user1", "session1", [("a", "USER"), ("b", "ASSISTANT")])
+
+        deadline = time.monotonic() + 5
+        while client.create_event.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.create_event.call_count == 1
+        queue.close()
+
+    def test_interval_threshold_triggers_write(self):
+        """Test that pending messages are written after the flush interval."""
+        client, queue = _make_queue(flush_interval_seconds=0.05)
+
+        queue.enqueue("user1", "session1", [("a", "USER")])
+
+        deadline = time.monotonic() + 5
+        while client.create_event.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.create_event.call_count == 1
+
+    def test_large_groups_are_split_into_batches(self):
+        """Test that a group larger than the batch size is split."""
+        client, queue = _make_queue(max_batch_messages=2, flush_interval_seconds=60)
+
+        queue.enqueue(
+            "user1", "session1", [("1", "USER"), ("2", "USER"), ("3", "USER")]
+        )
+        queue.flush(wait=True, timeout=5)
+
+        sizes = sorted(
+            len(call.kwargs["messages"]) for call in client.create_event.call_args_list
+        )
+        assert sizes == [1, 2]
+        queue.close()
+
+    def test_close_writes_pending_messages(self):
+        """Test that closing the queue drains pending messages."""
+        client, queue = _make_queue(flush_interval_seconds=60)
+
+        queue.enqueue("user1", "session1", [("a", "USER")])
+        queue.close()
+
+        assert client.create_event.call_count == 1
+
+    def test_write_failure_does_not_stop_the_queue(self):
+        """Test that a failed create_event is logged and later writes still happen."""
+        client, queue = _make_queue(flush_interval_seconds=60)
+        client.create_event.side_effect = [Exception("API error"), {"eventId": "e2"}]
+
+        queue.enqueue("user1", "session1", [("a", "USER")])
+        queue.flush(wait=True, timeout=5)
+        queue.enqueue("user1", "session1", [("b", "USER")])
+        queue.flush(wait=True, timeout=5)
+
+        assert client.create_event.call_count == 2
+        queue.close()
+
+    def test_on_written_runs_after_the_batch_is_stored(self):
+        """Test that namespaces are reported only once their batch is written."""
+        written = []
+        client, queue = _make_queue(
+            flush_interval_seconds=60,
+            on_written=lambda namespaces: written.append(
+                (client.create_event.call_count, sorted(namespaces))
+            ),
+        )
+
+        queue.enqueue("user1", "session1", [("a", "USER")], namespaces=["/ns/a"])
+        queue.enqueue("user1", "session1", [("b", "USER")], namespaces=["/ns/b"])
+        queue.enqueue("user2", "session2", [("c", "USER")])
+        assert written == []
+
+        assert queue.flush(wait=True, timeout=5) is True
+
+        # One callback for the user1 batch, made after its create_event call
+        assert len(written) == 1
+        calls_before_callback, namespaces = written[0]
+        assert calls_before_callback >= 1
+        assert namespaces == ["/ns/a", "/ns/b"]
+        queue.close()
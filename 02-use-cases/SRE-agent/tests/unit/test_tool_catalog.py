@@ -0,0 +1,100 @@
+import json
+
+from sre_agent.tool_catalog import ToolCatalogCache, build_tools, catalog_version
+
+GATEWAY_URI = "https://gateway.example.com"
+
+TOOL_SCHEMAS = [
+    {
+        "name": "target___get_pod_status",
+        "description": "Get pod status",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"namespace": {"type": "string"}},
+        },
+    },
+    {
+        "name": "target___search_logs",
+        "description": "Search logs",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"pattern": {"type": "string"}},
+        },
+    },
+]
+
+
+class TestCatalogVersion:
+    """Test the tool catalog content hash."""
+
+    def test_version_ignores_tool_order(self):
+        """Test that reordering tools does not change the version."""
+        assert catalog_version(TOOL_SCHEMAS) == catalog_version(TOOL_SCHEMAS[::-1])
+
+    def test_version_changes_with_schema(self):
+        """Test that a schema change produces a new version."""
+        changed = [dict(TOOL_SCHEMAS[0], description="Changed"), TOOL_SCHEMAS[1]]
+        assert catalog_version(TOOL_SCHEMAS) != catalog_version(changed)
+
+
+class TestToolCatalogCache:
+    """Test persisting and loading the MCP tool catalog."""
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that a saved catalog is loaded back for the same gateway."""
+        cache = ToolCatalogCache(GATEWAY_URI, tmp_path / "catalog.json")
+        version = cache.save(TOOL_SCHEMAS)
+
+        catalog = cache.load()
+
+        assert catalog["version"] == version
+        assert catalog["tools"] == TOOL_SCHEMAS
+
+    def test_missing_cache_returns_none(self, tmp_path):
+        """Test that a missing cache file is a cache miss."""
+        cache = ToolCatalogCache(GATEWAY_URI, tmp_path / "catalog.json")
+        assert cache.load() is None
+
+    def test_other_gateway_is_ignored(self, tmp_path):
+        """Test that a catalog saved for another gateway is not used."""
+        ToolCatalogCache(GATEWAY_URI, tmp_path / "catalog.json").save(TOOL_SCHEMAS)
+        cache = ToolCatalogCache("https://other.example.com", tmp_path / "catalog.json")
+        assert cache.load() is None
+
+    def test_expired_cache_is_ignored(self, tmp_path):
+        """Test that a catalog older than max_age_seconds is not used."""
+        cache = ToolCatalogCache(GATEWAY_URI, tmp_path / "catalog.json")
+        cache.save(TOOL_SCHEMAS)
+
+        data = json.loads(cache.cache_path.read_text())
+        data["fetched_at"] -= 3600
+        cache.cache_path.write_text(json.dumps(data))
+
+        assert ToolCatalogCache(GATEWAY_URI, cache.cache_path, 60).load() is None
+
+    def test_modified_cache_is_ignored(self, tmp_path):
+        """Test that a catalog whose tools do not match its version is not used."""
+        cache = ToolCatalogCache(GATEWAY_URI, tmp_path / "catalog.json")
+        cache.save(TOOL_SCHEMAS)
+
+        data = json.loads(cache.cache_path.read_text())
+        data["tools"] = data["tools"][:1]
+        cache.cache_path.write_text(json.dumps(data))
+
+        assert cache.load() is None
+
+
+class TestBuildTools:
+    """Test converting cached schemas to LangChain tools."""
+
+    def test_build_tools_keeps_names_and_descriptions(self):
+        """Test that cached schemas become tools with the same names."""
+        connection = {"url": f"{GATEWAY_URI}/mcp", "transport": "streamable_http"}
+
+        tools = build_tools(TOOL_SCHEMAS, connection)
+
+        assert [tool.name for tool in tools] == [
+            "target___get_pod_status",
+            "target___search_logs",
+        ]
+        assert tools[1].description == "Search logs"
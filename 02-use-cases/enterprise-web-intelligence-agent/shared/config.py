@@ -45,6 +45,10 @@ class AgentConfig:
     browser_timeout: int = 60000  # 60 seconds
     browser_session_timeout: int = 3600  # 1 hour
     
+    # Parallel Analysis Configuration
+    max_parallel_sessions: int = int(os.environ.get("MAX_PARALLEL_SESSIONS", "10"))  # browser sessions in the pool
+    competitor_timeout: int = int(os.environ.get("COMPETITOR_TIMEOUT_SECONDS", "600"))  # 10 minutes per competitor
+    
     # Code Interpreter Configuration
     code_session_timeout: int = 1800  # 30 minutes
     
@@ -9,8 +9,6 @@ import json
 import time
 import tempfile
 import shutil
-import gzip
-import io
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -18,6 +16,10 @@ from typing import Dict, List, Optional, Tuple
 import boto3
 from rich.console import Console
 
+# Shared batch download and decoded cache; interactive_tools is put on the
+# path by utils.imports.setup_interactive_tools_import()
+from interactive_tools.live_view_sessionreplay.recording_cache import RecordingCache, S3ObjectStore
+
 console = Console()
 
 
@@ -44,6 +46,7 @@ class UnifiedS3DataSource:
         self.prefix = prefix.rstrip('/')
         self.session_id = session_id
         self.temp_dir = Path(tempfile.mkdtemp(prefix='bedrock_agentcore_replay_'))
+        self.recording_cache = RecordingCache(S3ObjectStore(self.s3_client))
         
         # Fix: Build the full prefix correctly
         if session_id:
@@ -72,6 +75,7 @@ class UnifiedS3DataSource:
     
     def cleanup(self):
         """Clean up temp files"""
+        self.recording_cache.shutdown()
         if self.temp_dir.exists():
             try:
                 shutil.rmtree(self.temp_dir)
@@ -171,48 +175,25 @@ class UnifiedS3DataSource:
             # Get metadata
             metadata = self._get_metadata()
             
-            # List all objects in session directory
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=self.full_prefix
-            )
+            # List batch files in the session directory with their ETags
+            batch_files = self.recording_cache.list_batches(self.bucket, f"{self.full_prefix}/")
             
-            if 'Contents' not in response:
+            if not batch_files:
                 console.print(f"[yellow]No files found in session[/yellow]")
                 return self._create_fallback_recording_data()
             
-            # Find batch files
-            batch_files = [
-                obj['Key'] for obj in response['Contents']
-                if obj['Key'].endswith('.gz') or 'batch-' in obj['Key']
-            ]
+            cached = sum(1 for obj in batch_files if self.recording_cache.is_cached(obj))
+            console.print(f"Found {len(batch_files)} batch files ({cached} cached)")
             
-            console.print(f"Found {len(batch_files)} batch files")
+            def report_error(obj, error):
+                console.print(f"[yellow]Error processing {obj.key}: {error}[/yellow]")
             
-            # Process batch files
-            all_events = []
-            for key in batch_files:
-                try:
-                    console.print(f"[dim]Processing: {key.split('/')[-1]}[/dim]")
-                    response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                    
-                    # Read and decompress
-                    with gzip.GzipFile(fileobj=io.BytesIO(response['Body'].read())) as gz:
-                        content = gz.read().decode('utf-8')
-                        
-                        # Parse JSON lines
-                        for line in content.splitlines():
-                            if line.strip():
-                                try:
-                                    event = json.loads(line)
-                                    # Validate event structure
-                                    if 'type' in event and 'timestamp' in event:
-                                        all_events.append(event)
-                                except json.JSONDecodeError:
-                                    continue
-                    
-                except Exception as e:
-                    console.print(f"[yellow]Error processing {key}: {e}[/yellow]")
+            # Download and decompress batches in parallel; cached batches are read from disk
+            all_events = self.recording_cache.load_events(
+                batch_files,
+                on_batch=lambda obj: console.print(f"[dim]Processed: {obj.name}[/dim]"),
+                on_error=report_error
+            )
             
             console.print(f"[green]✅ Loaded {len(all_events)} events[/green]")
             
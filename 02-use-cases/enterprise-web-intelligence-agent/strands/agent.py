@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -240,12 +241,229 @@ class CompetitiveIntelligenceAgent:
         
         return tools
     
-    async def _analyze_website_impl(self, competitor_name: str, competitor_url: str) -> str:
-        """Implementation of website analysis."""
+    async def _analyze_website_impl(self, competitor_name: str, competitor_url: str,
+                                     browser_tools: Optional[BrowserTools] = None,
+                                     progress: Optional[Progress] = None) -> str:
+        """Implementation of website analysis.
+        
+        Runs on the main browser session unless another one is passed in
+        (parallel mode). Parallel runs share one Progress display, since rich
+        allows only one live display at a time.
+        """
+        browser_tools = browser_tools or self.browser_tools
+        if progress is None:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                console=console
+            ) as progress:
+                return await self._analyze_website_impl(competitor_name, competitor_url, browser_tools, progress)
+        
         console.print(f"\n[bold blue]🔍 Analyzing: {competitor_name}[/bold blue]")
         console.print(f"[cyan]URL: {competitor_url}[/cyan]")
         
         competitor_data = {}
+        stage_timings = {}
+        started = time.perf_counter()
+        screenshots_before = len(browser_tools._screenshots_taken)
+        apis_before = len(browser_tools._discovered_apis)
+        task = progress.add_task(f"Analyzing {competitor_name}...", total=10)
+        
+        async def stage(name: str, description: str, operation):
+            """Run one analysis step, advancing the progress bar and timing it"""
+            progress.update(task, description=f"{competitor_name}: {description}", advance=1)
+            stage_started = time.perf_counter()
+            try:
+                return await operation
+            finally:
+                stage_timings[name] = round(time.perf_counter() - stage_started, 2)
+        
+        try:
+            # Navigate to website
+            nav_result = await stage("navigate", "Navigating to website...",
+                                     browser_tools.navigate_to_url(competitor_url))
+            competitor_data['navigation'] = nav_result
+            
+            if nav_result.get('status') != 'success':
+                console.print(f"[yellow]⚠️ Navigation failed: {nav_result.get('error')}[/yellow]")
+                # Continue anyway to try to get some data
+            
+            # Take screenshot
+            await stage("screenshot", "Taking homepage screenshot...",
+                        browser_tools.take_annotated_screenshot(f"{competitor_name} - Homepage"))
+            
+            # Discover sections
+            discovered_sections = await stage("discover_sections", "Discovering page sections...",
+                                              browser_tools.intelligent_scroll_and_discover())
+            competitor_data['discovered_sections'] = discovered_sections
+            console.print(f"[green]{competitor_name}: found {len(discovered_sections)} key sections[/green]")
+            
+            # Try to find pricing page
+            async def visit_pricing_page():
+                if await browser_tools.smart_navigation("pricing"):
+                    await asyncio.sleep(3)
+                    await browser_tools.take_annotated_screenshot(f"{competitor_name} - Pricing")
+            
+            await stage("pricing_page", "Looking for pricing page...", visit_pricing_page())
+            
+            # Analyze forms
+            form_data = await stage("forms", "Checking interactive elements...",
+                                    browser_tools.analyze_forms_and_inputs())
+            competitor_data['interactive_elements'] = form_data
+            
+            # Extract pricing
+            pricing_result = await stage("pricing", "Extracting pricing...",
+                                         browser_tools.extract_pricing_info())
+            competitor_data['pricing'] = pricing_result
+            
+            # Extract features
+            features_result = await stage("features", "Extracting features...",
+                                          browser_tools.extract_product_features())
+            competitor_data['features'] = features_result
+            
+            # Explore additional pages
+            additional_pages = await stage("additional_pages", "Exploring additional pages...",
+                                           browser_tools.explore_multi_page_workflow(
+                                               ["features", "docs", "api", "about"]
+                                           ))
+            competitor_data['additional_pages'] = additional_pages
+            
+            # Capture metrics
+            metrics = await stage("metrics", "Capturing metrics...",
+                                  browser_tools.capture_performance_metrics())
+            competitor_data['performance_metrics'] = metrics
+            
+            # Save to state
+            progress.update(task, description=f"{competitor_name}: Saving data...", advance=1)
+            all_competitor_data = self._safe_state_get("competitor_data", {})
+            all_competitor_data[competitor_name] = {
+                "url": competitor_url,
+                "timestamp": datetime.now().isoformat(),
+                **competitor_data,
+                "stage_timings": stage_timings,
+                "duration": round(time.perf_counter() - started, 2),
+                "status": "success"
+            }
+            self.agent.state.set("competitor_data", all_competitor_data)
+            
+            # Update metrics in state with what this analysis added
+            total_screenshots = self._safe_state_get("total_screenshots", 0)
+            self.agent.state.set("total_screenshots",
+                                 total_screenshots + len(browser_tools._screenshots_taken) - screenshots_before)
+            
+            discovered_apis = self._safe_state_get("discovered_apis", [])
+            discovered_apis.extend(browser_tools._discovered_apis[apis_before:])
+            self.agent.state.set("discovered_apis", discovered_apis)
+            
+        except Exception as e:
+            console.print(f"[red]❌ Error analyzing {competitor_name}: {e}[/red]")
+            import traceback
+            traceback.print_exc()
+            
+            self._record_competitor_error(competitor_name, str(e), stage_timings, started)
+            return f"Error analyzing {competitor_name}: {str(e)}"
+        finally:
+            progress.update(task, completed=10)
+        
+        console.print(f"[green]✅ Completed: {competitor_name}[/green]")
+        return f"Successfully analyzed {competitor_name} - found {len(discovered_sections)} sections, extracted pricing and features"
+    
+    def _record_competitor_error(self, competitor_name: str, error: str,
+                                 stage_timings: Optional[Dict] = None, started: Optional[float] = None):
+        """Store a failed analysis in state."""
+        competitor_data = {"status": "error", "error": error}
+        if stage_timings:
+            competitor_data["stage_timings"] = stage_timings
+        if started is not None:
+            competitor_data["duration"] = round(time.perf_counter() - started, 2)
+        
+        all_competitor_data = self._safe_state_get("competitor_data", {})
+        all_competitor_data[competitor_name] = competitor_data
+        self.agent.state.set("competitor_data", all_competitor_data)
+    
+    async def _open_parallel_session(self) -> BrowserTools:
+        """Start another recorded session on the agent's browser."""
+        browser_session = BrowserTools(self.config)
+        browser_session.browser_id = self.browser_tools.browser_id
+        browser_session.recording_config = self.browser_tools.recording_config
+        # Track the browser session for cleanup
+        self.parallel_browser_sessions.append(browser_session)
+        await browser_session.initialize_browser_session(self.browser_tools.llm)
+        return browser_session
+    
+    async def analyze_competitors_parallel(self, competitors: List[Dict]) -> Dict:
+        """Analyze competitors concurrently on a pool of browser sessions.
+        
+        The pool holds the main (live-viewed) session plus up to
+        max_parallel_sessions - 1 extra sessions on the same browser, so at
+        most that many competitors are analyzed at once. Each competitor is
+        limited to competitor_timeout seconds; the session of a competitor that
+        timed out is closed and replaced rather than handed to the next one.
+        """
+        pool_size = max(1, min(self.config.max_parallel_sessions, len(competitors)))
+        console.print("\n[bold cyan]⚡ Starting Parallel Analysis Mode[/bold cyan]")
+        console.print(f"Analyzing {len(competitors)} competitors on {pool_size} browser sessions...")
+        
+        start_time = time.perf_counter()
+        
+        # Start the extra sessions concurrently; one that fails to start just shrinks the pool
+        opened = await asyncio.gather(
+            *(self._open_parallel_session() for _ in range(pool_size - 1)),
+            return_exceptions=True
+        )
+        pool = asyncio.Queue()
+        pool.put_nowait(self.browser_tools)
+        for session in opened:
+            if isinstance(session, Exception):
+                console.print(f"[yellow]⚠️ Could not start a parallel browser session: {session}[/yellow]")
+            else:
+                pool.put_nowait(session)
+        session_startup = time.perf_counter() - start_time
+        ready_sessions = live_sessions = pool.qsize()
+        console.print(f"[green]✅ {ready_sessions} browser sessions ready in {session_startup:.1f}s[/green]")
+        
+        timeout = self.config.competitor_timeout
+        
+        async def replace(browser_session: BrowserTools):
+            """Retire a timed-out session and put a fresh one in the pool."""
+            nonlocal live_sessions
+            # The cancelled operation may still be using the page, so the session is
+            # not reused; the live-viewed main session stays open until cleanup()
+            if browser_session is not self.browser_tools:
+                try:
+                    await browser_session.cleanup()
+                except Exception as e:
+                    console.print(f"[yellow]⚠️ Error closing timed-out browser session: {e}[/yellow]")
+            try:
+                pool.put_nowait(await self._open_parallel_session())
+            except Exception as e:
+                console.print(f"[yellow]⚠️ Could not replace timed-out browser session: {e}[/yellow]")
+                live_sessions -= 1
+                if live_sessions == 0:
+                    # Wake the remaining competitors so they fail instead of waiting forever
+                    pool.put_nowait(None)
+        
+        async def analyze(competitor: Dict, progress: Progress):
+            browser_session = await pool.get()
+            if browser_session is None:
+                pool.put_nowait(None)
+                self._record_competitor_error(competitor['name'], "No browser session available")
+                return None
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(
+                    self._analyze_website_impl(competitor['name'], competitor['url'], browser_session, progress),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                console.print(f"[red]⏱️ {competitor['name']} timed out after {timeout}s[/red]")
+                self._record_competitor_error(competitor['name'], f"Timed out after {timeout}s", started=started)
+                timed_out, browser_session = browser_session, None
+                await replace(timed_out)
+            finally:
+                if browser_session is not None:
+                    pool.put_nowait(browser_session)
         
         with Progress(
             SpinnerColumn(),
@@ -253,96 +471,49 @@ class CompetitiveIntelligenceAgent:
             BarColumn(),
             console=console
         ) as progress:
-            task = progress.add_task(f"Analyzing {competitor_name}...", total=10)
-            
-            try:
-                # Navigate to website
-                progress.update(task, description="Navigating to website...", advance=1)
-                nav_result = await self.browser_tools.navigate_to_url(competitor_url)
-                competitor_data['navigation'] = nav_result
-                
-                if nav_result.get('status') != 'success':
-                    console.print(f"[yellow]⚠️ Navigation failed: {nav_result.get('error')}[/yellow]")
-                    # Continue anyway to try to get some data
-                
-                # Take screenshot
-                progress.update(task, description="Taking homepage screenshot...", advance=1)
-                await self.browser_tools.take_annotated_screenshot(f"{competitor_name} - Homepage")
-                
-                # Discover sections
-                progress.update(task, description="Discovering page sections...", advance=1)
-                discovered_sections = await self.browser_tools.intelligent_scroll_and_discover()
-                competitor_data['discovered_sections'] = discovered_sections
-                console.print(f"[green]Found {len(discovered_sections)} key sections[/green]")
-                
-                # Try to find pricing page
-                progress.update(task, description="Looking for pricing page...", advance=1)
-                found_pricing = await self.browser_tools.smart_navigation("pricing")
-                if found_pricing:
-                    await asyncio.sleep(3)
-                    await self.browser_tools.take_annotated_screenshot(f"{competitor_name} - Pricing")
-                
-                # Analyze forms
-                progress.update(task, description="Checking interactive elements...", advance=1)
-                form_data = await self.browser_tools.analyze_forms_and_inputs()
-                competitor_data['interactive_elements'] = form_data
-                
-                # Extract pricing
-                progress.update(task, description="Extracting pricing...", advance=1)
-                pricing_result = await self.browser_tools.extract_pricing_info()
-                competitor_data['pricing'] = pricing_result
-                
-                # Extract features
-                progress.update(task, description="Extracting features...", advance=1)
-                features_result = await self.browser_tools.extract_product_features()
-                competitor_data['features'] = features_result
-                
-                # Explore additional pages
-                progress.update(task, description="Exploring additional pages...", advance=1)
-                additional_pages = await self.browser_tools.explore_multi_page_workflow(
-                    ["features", "docs", "api", "about"]
-                )
-                competitor_data['additional_pages'] = additional_pages
-                
-                # Capture metrics
-                progress.update(task, description="Capturing metrics...", advance=1)
-                metrics = await self.browser_tools.capture_performance_metrics()
-                competitor_data['performance_metrics'] = metrics
-                
-                # Save to state
-                progress.update(task, description="Saving data...", advance=1)
-                all_competitor_data = self._safe_state_get("competitor_data", {})
-                all_competitor_data[competitor_name] = {
-                    "url": competitor_url,
-                    "timestamp": datetime.now().isoformat(),
-                    **competitor_data,
-                    "status": "success"
-                }
-                self.agent.state.set("competitor_data", all_competitor_data)
-                
-                # Update metrics in state
-                total_screenshots = self._safe_state_get("total_screenshots", 0)
-                self.agent.state.set("total_screenshots", total_screenshots + len(self.browser_tools._screenshots_taken))
-                
-                discovered_apis = self._safe_state_get("discovered_apis", [])
-                discovered_apis.extend(self.browser_tools._discovered_apis)
-                self.agent.state.set("discovered_apis", discovered_apis)
-                
-            except Exception as e:
-                console.print(f"[red]❌ Error analyzing {competitor_name}: {e}[/red]")
-                import traceback
-                traceback.print_exc()
-                
-                competitor_data = {"status": "error", "error": str(e)}
-                
-                all_competitor_data = self._safe_state_get("competitor_data", {})
-                all_competitor_data[competitor_name] = competitor_data
-                self.agent.state.set("competitor_data", all_competitor_data)
-                
-                return f"Error analyzing {competitor_name}: {str(e)}"
+            await asyncio.gather(*(analyze(competitor, progress) for competitor in competitors))
         
-        console.print(f"[green]✅ Completed: {competitor_name}[/green]")
-        return f"Successfully analyzed {competitor_name} - found {len(discovered_sections)} sections, extracted pricing and features"
+        duration = time.perf_counter() - start_time
+        execution_stats = self._execution_stats(competitors, duration)
+        execution_stats["session_startup"] = round(session_startup, 2)
+        execution_stats["concurrent_sessions"] = ready_sessions
+        
+        console.print("\n[green]✅ Parallel analysis complete![/green]")
+        console.print(f"  • Execution time: {duration:.2f} seconds (sessions ready after {session_startup:.2f}s)")
+        console.print(f"  • Slowest competitor: {execution_stats['slowest_competitor']:.2f} seconds")
+        
+        parallel_sessions = [
+            {
+                "session_id": session.browser_client.session_id if session.browser_client else None,
+                "recording_path": session.recording_path
+            }
+            for session in [self.browser_tools] + self.parallel_browser_sessions
+        ]
+        return {"execution_stats": execution_stats, "parallel_sessions": parallel_sessions}
+    
+    def _execution_stats(self, competitors: List[Dict], duration: float) -> Dict:
+        """Wall time and per-stage timing statistics for a run."""
+        competitor_data = self._safe_state_get("competitor_data", {})
+        durations = [data.get("duration", 0) for data in competitor_data.values()]
+        
+        stage_durations = {}
+        for data in competitor_data.values():
+            for stage_name, seconds in data.get("stage_timings", {}).items():
+                stage_durations.setdefault(stage_name, []).append(seconds)
+        
+        return {
+            "total_duration": round(duration, 2),
+            "avg_duration_per_competitor": round(duration / len(competitors), 2) if competitors else 0,
+            "slowest_competitor": max(durations, default=0),
+            "stages": {
+                stage_name: {
+                    "count": len(values),
+                    "avg": round(sum(values) / len(values), 2),
+                    "max": max(values)
+                }
+                for stage_name, values in stage_durations.items()
+            }
+        }
     
     def _create_callback_handler(self):
         """Create a callback handler for progress tracking."""
@@ -369,28 +540,39 @@ class CompetitiveIntelligenceAgent:
             console.print("\n[cyan]🤖 Starting competitive analysis workflow...[/cyan]")
             console.print(f"[bold]Analyzing {len(competitors)} competitors[/bold]")
             
-            # Analyze each competitor sequentially
-            for i, competitor in enumerate(competitors, 1):
-                console.print(f"\n[bold yellow]📊 Competitor {i}/{len(competitors)}: {competitor['name']}[/bold yellow]")
+            parallel_results = {}
+            if parallel and len(competitors) > 1:
+                self.agent.state.set("parallel_mode", True)
+                parallel_results = await self.analyze_competitors_parallel(competitors)
+            else:
+                start_time = time.perf_counter()
                 
-                try:
-                    # Directly invoke the tool
-                    result = self.agent.tool.analyze_website(
-                        competitor_name=competitor['name'],
-                        competitor_url=competitor['url']
-                    )
-                    console.print(f"[green]✓ {competitor['name']} analysis complete[/green]")
-                    console.print(f"[dim]Result: {result[:200]}...[/dim]" if len(result) > 200 else f"[dim]Result: {result}[/dim]")
+                # Analyze each competitor sequentially
+                for i, competitor in enumerate(competitors, 1):
+                    console.print(f"\n[bold yellow]📊 Competitor {i}/{len(competitors)}: {competitor['name']}[/bold yellow]")
                     
-                    # Add a small delay between competitors to avoid overwhelming
-                    if i < len(competitors):
-                        console.print(f"[dim]Waiting 2 seconds before next competitor...[/dim]")
-                        await asyncio.sleep(2)
+                    try:
+                        # Directly invoke the tool
+                        result = self.agent.tool.analyze_website(
+                            competitor_name=competitor['name'],
+                            competitor_url=competitor['url']
+                        )
+                        console.print(f"[green]✓ {competitor['name']} analysis complete[/green]")
+                        console.print(f"[dim]Result: {result[:200]}...[/dim]" if len(result) > 200 else f"[dim]Result: {result}[/dim]")
                         
-                except Exception as comp_error:
-                    console.print(f"[red]❌ Error analyzing {competitor['name']}: {comp_error}[/red]")
-                    # Continue with next competitor even if one fails
-                    continue
+                        # Add a small delay between competitors to avoid overwhelming
+                        if i < len(competitors):
+                            console.print(f"[dim]Waiting 2 seconds before next competitor...[/dim]")
+                            await asyncio.sleep(2)
+                            
+                    except Exception as comp_error:
+                        console.print(f"[red]❌ Error analyzing {competitor['name']}: {comp_error}[/red]")
+                        # Continue with next competitor even if one fails
+                        continue
+                
+                parallel_results["execution_stats"] = self._execution_stats(
+                    competitors, time.perf_counter() - start_time
+                )
             
             console.print("\n[bold cyan]All competitors analyzed, generating insights...[/bold cyan]")
             
@@ -447,7 +629,9 @@ class CompetitiveIntelligenceAgent:
                 "analysis_results": self._safe_state_get("analysis_results", {}),
                 "apis_discovered": self._safe_state_get("discovered_apis", []),
                 "session_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
-                "parallel_mode": self._safe_state_get("parallel_mode", False)
+                "parallel_mode": self._safe_state_get("parallel_mode", False),
+                "parallel_sessions": parallel_results.get("parallel_sessions", []),
+                "execution_stats": parallel_results.get("execution_stats", {})
             }
             
         except Exception as e:
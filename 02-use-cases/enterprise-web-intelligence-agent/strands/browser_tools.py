@@ -92,8 +92,10 @@ class BrowserTools:
         self.browser_client = BrowserClient(region=self.config.region)
         self.browser_client.identifier = self.browser_id
         
-        # Start a session
-        session_id = self.browser_client.start(
+        # Start a session; the call blocks, so run it in a thread to let
+        # parallel sessions start at the same time
+        session_id = await asyncio.to_thread(
+            self.browser_client.start,
             identifier=self.browser_id,
             name=f"competitive_intel_session_{datetime.now().strftime('%Y%m%d-%H%M%S')}",
             session_timeout_seconds=self.config.browser_session_timeout
@@ -836,5 +838,5 @@ class BrowserTools:
         
         if self.browser_client:
             console.print("[yellow]🛑 Stopping session...[/yellow]")
-            self.browser_client.stop()
+            await asyncio.to_thread(self.browser_client.stop)
             console.print("✅ Cleanup complete")
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""Bounded execution of blocking agent and sandbox calls for IDE sessions.
+
+Strands agents and CodeInterpreter response streams are synchronous, so the
+FastAPI endpoints hand them to a fixed-size thread pool instead of running
+them on the event loop. Requests of one session run one at a time and queue
+behind each other; when a session's queue or the server-wide backlog is
+full, new requests are rejected with ServerBusyError instead of piling up.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterable
+
+# Chunks buffered between a streaming worker and a slow consumer
+STREAM_BUFFER_SIZE = 16
+
+_STREAM_ITEM = "item"
+_STREAM_ERROR = "error"
+_STREAM_DONE = "done"
+
+
+class ServerBusyError(Exception):
+    """Raised when a request cannot be queued or waited too long for its turn"""
+
+    pass
+
+
+class _SessionSlot:
+    """Serializes the requests of one session and counts how many are queued"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.queued = 0
+
+
+class ExecutionQueue:
+    """Thread pool for blocking calls with per-session ordering and backpressure"""
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_pending: int = None,
+        max_queued_per_session: int = None,
+        queue_timeout_seconds: float = None,
+    ):
+        self.max_workers = max_workers or int(os.getenv("EXECUTION_MAX_WORKERS", "8"))
+        self.max_pending = max_pending or int(os.getenv("EXECUTION_MAX_PENDING", "32"))
+        self.max_queued_per_session = max_queued_per_session or int(
+            os.getenv("SESSION_MAX_QUEUED_REQUESTS", "4")
+        )
+        self.queue_timeout_seconds = queue_timeout_seconds or float(
+            os.getenv("SESSION_QUEUE_TIMEOUT_SECONDS", "300")
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="ide-exec"
+        )
+        self._sessions: Dict[str, _SessionSlot] = {}
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    @asynccontextmanager
+    async def slot(self, session_id: str):
+        """Wait for the session's turn; raise ServerBusyError if the queue is full"""
+        session_slot = self._sessions.get(session_id)
+        if session_slot is None:
+            session_slot = self._sessions[session_id] = _SessionSlot()
+        if (
+            self._pending >= self.max_pending
+            or session_slot.queued >= self.max_queued_per_session
+        ):
+            self._rejected += 1
+            raise ServerBusyError(
+                f"Too many queued requests (session {session_slot.queued}/{self.max_queued_per_session}, "
+                f"server {self._pending}/{self.max_pending}) - try again shortly"
+            )
+
+        self._pending += 1
+        session_slot.queued += 1
+        try:
+            try:
+                await asyncio.wait_for(
+                    session_slot.lock.acquire(), self.queue_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                self._rejected += 1
+                raise ServerBusyError(
+                    f"Waited more than {self.queue_timeout_seconds:.0f}s for the previous request of session {session_id}"
+                )
+            self._running += 1
+            try:
+                yield
+            finally:
+                self._running -= 1
+                session_slot.lock.release()
+        finally:
+            self._pending -= 1
+            session_slot.queued -= 1
+            if session_slot.queued == 0:
+                self._sessions.pop(session_id, None)
+
+    async def run(self, session_id: str, func: Callable, *args):
+        """Run a blocking call in the pool during the session's turn"""
+        async with self.slot(session_id):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def iterate(
+        self, session_id: str, func: Callable[..., Iterable], *args
+    ) -> AsyncIterator:
+        """Run a blocking generator in the pool and yield its items as they are produced.
+
+        The worker waits while STREAM_BUFFER_SIZE items are buffered, so a
+        slow client slows the producer down instead of growing memory. If the
+        consumer stops early, the worker stops after its current item.
+        """
+        async with self.slot(session_id):
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue(maxsize=STREAM_BUFFER_SIZE)
+            cancelled = threading.Event()
+
+            def put(kind, value):
+                asyncio.run_coroutine_threadsafe(
+                    queue.put((kind, value)), loop
+                ).result()
+
+            def produce():
+                try:
+                    for item in func(*args):
+                        if cancelled.is_set():
+                            return
+                        put(_STREAM_ITEM, item)
+                except Exception as e:
+                    if not cancelled.is_set():
+                        put(_STREAM_ERROR, e)
+                    return
+                if not cancelled.is_set():
+                    put(_STREAM_DONE, None)
+
+            producer = loop.run_in_executor(self._executor, produce)
+            try:
+                while True:
+                    kind, value = await queue.get()
+                    if kind == _STREAM_DONE:
+                        break
+                    if kind == _STREAM_ERROR:
+                        raise value
+                    yield value
+                await producer
+            finally:
+                if not producer.done():
+                    cancelled.set()
+                    # Unblock a worker waiting on a full buffer
+                    while not queue.empty():
+                        queue.get_nowait()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self._running,
+            "queued": self._pending - self._running,
+            "sessions": len(self._sessions),
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
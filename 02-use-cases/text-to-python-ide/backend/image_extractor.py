@@ -0,0 +1,136 @@
+"""Single-pass separation of IMAGE_DATA: payloads from CodeInterpreter stdout.
+
+Chart code prints images as `IMAGE_DATA:<base64>` lines. The extractor is
+fed stdout chunks as the response stream delivers them and returns the
+display text right away, while image payloads are copied once into their
+own buffer. A payload may be split across chunks, and so may the marker.
+Only the first bytes of a payload are decoded, to check the PNG/JPEG
+signature.
+"""
+
+import base64
+import re
+from typing import List
+
+IMAGE_MARKER = "IMAGE_DATA:"
+
+# Payloads shorter than this are not treated as images (same as the old regex extractor)
+MIN_IMAGE_BASE64_LENGTH = 1000
+
+# 12 base64 characters decode to the 9 bytes needed for the signature checks
+_SIGNATURE_BASE64_LENGTH = 12
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+)
+
+_NON_BASE64 = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+class ExtractedImage:
+    """An image payload; data is a memoryview over the base64 bytes"""
+
+    def __init__(self, image_format: str, data: memoryview):
+        self.format = image_format
+        self.data = data
+
+    def base64_text(self) -> str:
+        return str(self.data, "ascii")
+
+    def to_dict(self, source: str = "agentcore_stdout") -> dict:
+        return {"format": self.format, "data": self.base64_text(), "source": source}
+
+
+def detect_image_format(payload) -> str:
+    """Return 'png' or 'jpeg' from the start of a base64 payload, or None"""
+    if len(payload) < _SIGNATURE_BASE64_LENGTH:
+        return None
+    try:
+        head = base64.b64decode(payload[:_SIGNATURE_BASE64_LENGTH], validate=True)
+    except ValueError:
+        return None
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    return None
+
+
+class StreamingImageExtractor:
+    """Split stdout into display text and images in one pass over the chunks"""
+
+    def __init__(self):
+        self.images: List[ExtractedImage] = []
+        self.rejected = 0
+        self._pending = ""
+        self._payload = None
+        self._skip_newline = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a stdout chunk and return its text with image payloads removed"""
+        if self._pending:
+            chunk = self._pending + chunk
+            self._pending = ""
+        text_parts = []
+        pos = 0
+        length = len(chunk)
+
+        while pos < length:
+            if self._skip_newline:
+                self._skip_newline = False
+                if chunk.startswith("\r\n", pos):
+                    pos += 2
+                    continue
+                if chunk[pos] == "\n":
+                    pos += 1
+                    continue
+
+            if self._payload is not None:
+                match = _NON_BASE64.search(chunk, pos)
+                end = match.start() if match else length
+                self._payload += chunk[pos:end].encode("ascii")
+                pos = end
+                if match:
+                    self._finish_image()
+                continue
+
+            marker_start = chunk.find(IMAGE_MARKER, pos)
+            if marker_start == -1:
+                # Hold back a possible partial marker at the end of the chunk
+                keep = self._partial_marker_length(chunk, pos)
+                text_parts.append(chunk[pos : length - keep])
+                self._pending = chunk[length - keep :]
+                break
+            text_parts.append(chunk[pos:marker_start])
+            pos = marker_start + len(IMAGE_MARKER)
+            self._payload = bytearray()
+
+        return "".join(text_parts)
+
+    def finish(self) -> str:
+        """End of stream: complete a trailing image and return text held back"""
+        text = self._pending
+        self._pending = ""
+        if self._payload is not None:
+            self._finish_image()
+        return text
+
+    def _finish_image(self):
+        payload = self._payload
+        self._payload = None
+        self._skip_newline = True
+        image_format = (
+            detect_image_format(payload)
+            if len(payload) > MIN_IMAGE_BASE64_LENGTH
+            else None
+        )
+        if image_format is None or len(payload) % 4:
+            self.rejected += 1
+            return
+        self.images.append(ExtractedImage(image_format, memoryview(payload)))
+
+    @staticmethod
+    def _partial_marker_length(chunk: str, pos: int) -> int:
+        for keep in range(min(len(IMAGE_MARKER) - 1, len(chunk) - pos), 0, -1):
+            if chunk.endswith(IMAGE_MARKER[:keep]):
+                return keep
+        return 0
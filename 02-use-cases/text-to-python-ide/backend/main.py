@@ -1,7 +1,7 @@
 import json
 import os
 from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import asyncio
@@ -11,6 +11,7 @@ import boto3
 from botocore.exceptions import NoCredentialsError, ProfileNotFound
 from botocore.config import Config
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import time
 from functools import lru_cache
 
@@ -120,17 +121,37 @@ except ImportError:
         raise
 
 # Import AgentCore for code interpreter
-from bedrock_agentcore.tools.code_interpreter_client import code_session
+from sandbox_pool import SandboxFileUploadError, SandboxPool
+from execution_queue import ExecutionQueue, ServerBusyError
+from session_store import SessionStore
+from image_extractor import StreamingImageExtractor
+
+# Sandboxes are kept per IDE session; executor agent tool calls use the
+# sandbox of the session set here (a shared sandbox if none is set)
+SHARED_AGENT_SANDBOX = "strands-agent"
+current_sandbox_session = ContextVar("current_sandbox_session", default=SHARED_AGENT_SANDBOX)
+sandbox_pool = None
+
+# Agent calls and sandbox executions block, so they run on a bounded thread
+# pool with one request at a time per session
+execution_queue = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global aws_session, aws_region
+    global aws_session, aws_region, sandbox_pool, execution_queue, active_sessions
     aws_session, aws_region = setup_aws_credentials()
+    sandbox_pool = SandboxPool(aws_region)
+    execution_queue = ExecutionQueue()
+    active_sessions = SessionStore(CodeInterpreterSession)
     initialize_agents()
+    sandbox_pool.start()
+    active_sessions.start()
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown
+    execution_queue.shutdown()
+    active_sessions.shutdown()
+    sandbox_pool.shutdown()
 
 app = FastAPI(
     title="AgentCore Code Interpreter", 
@@ -168,232 +189,222 @@ class FileUploadRequest(BaseModel):
     content: str
     session_id: Optional[str] = None
 
+# Number of history entries returned per page by /api/session/{id}/history
+HISTORY_PAGE_SIZE = int(os.getenv('SESSION_HISTORY_PAGE_SIZE', '50'))
+
 # Session management
 class CodeInterpreterSession:
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, store: SessionStore):
         self.session_id = session_id
-        self.conversation_history = []
-        self.code_history = []
-        self.execution_results = []
+        self.store = store
+        # Histories are appended to disk; only recent entries stay in memory
+        self.conversation_history = store.open_history(session_id, "conversation")
+        self.code_history = store.open_history(session_id, "code")
+        self.execution_results = store.open_history(session_id, "executions")
         self.interactive_sessions = {}  # Track interactive execution sessions
-        self.uploaded_csv = None  # Store uploaded CSV file data
+        # Uploaded CSV metadata; the content is in the blob store under uploaded_csv['blob']
+        manifest = store.load_manifest(session_id) or {}
+        self.uploaded_csv = manifest.get('uploaded_csv')
+        # Agents are per session: sessions run in parallel and a Strands agent
+        # keeps its conversation, so it must not be shared between them
+        self.generator_agent = None
+        self.executor_agent = None
+
+    def get_generator_agent(self):
+        if self.generator_agent is None:
+            self.generator_agent = create_code_generator_agent()
+        return self.generator_agent
+
+    def get_executor_agent(self):
+        if self.executor_agent is None:
+            self.executor_agent = create_code_executor_agent()
+        return self.executor_agent
+
+    def set_uploaded_csv(self, filename: Optional[str], content: Optional[str] = None):
+        """Store the uploaded CSV in the blob store (or clear it when filename is None)"""
+        if filename is None:
+            self.uploaded_csv = None
+        else:
+            self.uploaded_csv = {
+                "filename": filename,
+                "blob": self.store.blobs.put_text(content),
+                "size": len(content),
+                "timestamp": time.time()
+            }
+        self.save_manifest()
+
+    def get_uploaded_csv_content(self) -> str:
+        return self.store.blobs.get_text(self.uploaded_csv['blob']) or ""
+
+    def get_session_files(self) -> list:
+        """Files to upload to the sandbox before executing code"""
+        if not self.uploaded_csv:
+            return []
+        return [{
+            'filename': self.uploaded_csv['filename'],
+            'content': self.get_uploaded_csv_content()
+        }]
+
+    def save_manifest(self):
+        self.store.save_manifest(self.session_id, {
+            "session_id": self.session_id,
+            "uploaded_csv": self.uploaded_csv,
+            "saved_at": time.time()
+        })
+
+    def memory_bytes(self) -> int:
+        """Rough size of what this session keeps in memory"""
+        size = (self.conversation_history.memory_bytes() + self.code_history.memory_bytes()
+                + self.execution_results.memory_bytes())
+        for agent in (self.generator_agent, self.executor_agent):
+            if agent is not None:
+                size += len(str(agent.messages))
+        return size
 
 # Global variables for agents
 code_generator_agent = None
 code_executor_agent = None
 executor_type = "unknown"  # Track which executor type we're using
-active_sessions = {}
 
-def clean_output_for_display(output: str) -> str:
-    """Clean output for display by removing image binary data while preserving analysis text"""
-    if not output:
-        return output
-    
-    # If output contains IMAGE_DATA, extract everything except the binary
-    if 'IMAGE_DATA:' in output:
-        parts = output.split('IMAGE_DATA:')
-        cleaned_parts = []
-        
-        # Add the part before IMAGE_DATA
-        if parts[0].strip():
-            cleaned_parts.append(parts[0].strip())
-        
-        # Process parts after IMAGE_DATA
-        for i in range(1, len(parts)):
-            # Split on newline to separate binary from any following text
-            lines = parts[i].split('\n', 1)
-            if len(lines) > 1:
-                # Skip the binary line, keep any text after it
-                remaining_text = lines[1].strip()
-                if remaining_text and not remaining_text.startswith(('iVBOR', '/9j/', 'data:')):
-                    cleaned_parts.append(remaining_text)
-        
-        if cleaned_parts:
-            result = '\n\n'.join(cleaned_parts)
-            print(f"🧹 Cleaned output: removed image binary, kept {len(result)} chars of text")
-            return result
-        else:
-            return "Code executed successfully - chart generated"
-    
-    return output
+# Sessions are kept in memory up to count, idle time and memory limits and
+# loaded back from disk when evicted (SessionStore, created at startup)
+active_sessions = None
 
 def extract_image_data(execution_result: str):
-    """Extract base64 image data from execution results - fixed for AgentCore format"""
-    try:
-        import re
-        import base64
-        
-        images = []
-        
-        print(f"🔍 Image extraction - Input length: {len(execution_result)}")
-        print(f"🔍 Contains IMAGE_DATA: {'IMAGE_DATA:' in execution_result}")
-        
-        if 'IMAGE_DATA:' in execution_result:
-            # Find all IMAGE_DATA: patterns in the text
-            # AgentCore puts the full base64 string in stdout, so we need a greedy pattern
-            pattern = r'IMAGE_DATA:([A-Za-z0-9+/=\n\r\s]+?)(?=\n[A-Za-z]|\nBase64|\n$|$)'
-            matches = re.findall(pattern, execution_result, re.MULTILINE | re.DOTALL)
-            
-            print(f"🔍 Regex matches found: {len(matches)}")
-            
-            for i, match in enumerate(matches):
-                try:
-                    # Clean up the base64 string - remove all whitespace and newlines
-                    clean_match = re.sub(r'[\s\n\r]', '', match)
-                    
-                    print(f"🔍 Match {i+1} - Original length: {len(match)}, Clean length: {len(clean_match)}")
-                    print(f"🔍 Match {i+1} - Starts with: {clean_match[:50]}...")
-                    
-                    # Must be reasonable length for an image (at least 1KB when decoded)
-                    if len(clean_match) > 1000:
-                        # Validate it's valid base64 and can be decoded
-                        decoded = base64.b64decode(clean_match)
-                        print(f"🔍 Match {i+1} - Decoded length: {len(decoded)} bytes")
-                        
-                        # Check if it looks like a PNG (starts with PNG signature)
-                        if decoded.startswith(b'\x89PNG\r\n\x1a\n'):
-                            images.append({
-                                'format': 'png',
-                                'data': clean_match,
-                                'source': 'agentcore_stdout'
-                            })
-                            print(f"✅ Match {i+1} - Valid PNG image extracted")
-                        # Also check for JPEG signatures
-                        elif decoded.startswith(b'\xff\xd8\xff'):
-                            images.append({
-                                'format': 'jpeg',
-                                'data': clean_match,
-                                'source': 'agentcore_stdout'
-                            })
-                            print(f"✅ Match {i+1} - Valid JPEG image extracted")
-                        else:
-                            print(f"⚠️  Match {i+1} - Invalid image signature")
-                    else:
-                        print(f"⚠️  Match {i+1} - Too short to be valid image")
-                except Exception as e:
-                    print(f"❌ Match {i+1} - Extraction error: {e}")
-                    continue
-        
-        print(f"🎯 Final result: {len(images)} images extracted")
-        return images
-        
-    except Exception as e:
-        print(f"❌ Image extraction error: {e}")
-        return []
-
-def upload_files_to_agentcore_sandbox(files_data: list, aws_region: str) -> bool:
-    """Upload files to AgentCore sandbox using writeFiles tool"""
+    """Extract base64 images from complete execution output (e.g. an agent's response text)"""
+    extractor = StreamingImageExtractor()
+    extractor.feed(execution_result)
+    extractor.finish()
+    print(f"🎯 Image extraction: {len(extractor.images)} images, {extractor.rejected} invalid payloads")
+    return [image.to_dict() for image in extractor.images]
+
+def upload_files_to_agentcore_sandbox(files_data: list, aws_region: str, session_id: str = SHARED_AGENT_SANDBOX) -> bool:
+    """Upload files to the session's AgentCore sandbox using writeFiles tool (only changed files are sent)"""
     try:
         print(f"🔧 Uploading {len(files_data)} files to AgentCore sandbox...")
         
-        with code_session(aws_region) as code_client:
-            response = code_client.invoke("writeFiles", {"content": files_data})
-            
-            for event in response["stream"]:
-                result = event.get("result", {})
-                if result.get("isError", False):
-                    error_content = result.get("content", [{}])
-                    error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                    print(f"❌ File upload error: {error_text}")
-                    return False
-                else:
-                    content = result.get("content", [])
-                    for item in content:
-                        if item.get("type") == "text":
-                            print(f"✅ File upload result: {item.get('text', '')}")
-                    return True
-        
-        return False
+        sandbox = sandbox_pool.get(session_id)
+        with sandbox.lock:
+            sandbox.sync_files(files_data)
+        return True
         
     except Exception as e:
         print(f"❌ File upload failed: {str(e)}")
         return False
 
-def execute_chart_code_direct(code: str, session_files: list = None) -> tuple[str, list]:
-    """Execute chart code directly with AgentCore to preserve full base64 output"""
+def stream_code_execution(code: str, session_files: list = None, session_id: str = SHARED_AGENT_SANDBOX):
+    """Execute code in the session's sandbox and yield (stream, text) chunks as events arrive.
+
+    stream is "stdout", "stderr" or "error"; an "error" chunk ends the execution.
+    """
+    print(f"\n🎨 Direct AgentCore execution")
+    print(f"📝 Code length: {len(code)} characters")
+    
+    # Clean the code to remove any markdown formatting
+    clean_code = extract_python_code_from_prompt(code)
+    print(f"🔧 Clean code length: {len(clean_code)} characters")
+    
+    files_data = [
+        {"path": file_info['filename'], "text": file_info['content']}
+        for file_info in session_files or []
+    ]
+    
+    # Execute the cleaned code in the session's sandbox, uploading files first if they changed
     try:
-        print(f"\n🎨 Direct AgentCore chart execution")
-        print(f"📝 Code length: {len(code)} characters")
-        
-        # Clean the code to remove any markdown formatting
-        clean_code = extract_python_code_from_prompt(code)
-        print(f"🔧 Clean code length: {len(clean_code)} characters")
-        
-        with code_session(aws_region) as code_client:
-            # Upload files to sandbox if provided
-            if session_files:
-                print(f"📁 Uploading {len(session_files)} files to sandbox...")
-                files_data = []
-                for file_info in session_files:
-                    files_data.append({
-                        "path": file_info['filename'],
-                        "text": file_info['content']
-                    })
-                
-                # Upload files using writeFiles tool
-                upload_response = code_client.invoke("writeFiles", {"content": files_data})
-                for event in upload_response["stream"]:
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        error_content = result.get("content", [{}])
-                        error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                        print(f"❌ File upload error: {error_text}")
-                        return f"File upload failed: {error_text}", []
-                    else:
-                        content = result.get("content", [])
-                        for item in content:
-                            if item.get("type") == "text":
-                                print(f"✅ File upload: {item.get('text', '')}")
-            
-            # Execute the cleaned code
-            response = code_client.invoke("executeCode", {
-                "code": clean_code,
-                "language": "python",
-                "clearContext": False
-            })
-        
-        # Process response directly without Strands-Agents truncation
-        output_parts = []
-        full_stdout = ""
-        
-        for event in response["stream"]:
-            result = event.get("result", {})
-            
-            if result.get("isError", False):
-                error_content = result.get("content", [{}])
-                error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                print(f"❌ Direct execution error: {error_text}")
-                return f"Error: {error_text}", []
-            
-            # Extract structured content
-            structured_content = result.get("structuredContent", {})
-            stdout = structured_content.get("stdout", "")
-            stderr = structured_content.get("stderr", "")
-            
-            if stdout:
-                output_parts.append(stdout)
-                full_stdout += stdout
-                print(f"📤 Direct stdout captured: {len(stdout)} characters")
-            if stderr:
-                output_parts.append(f"Errors: {stderr}")
-                print(f"⚠️  Direct stderr: {stderr}")
-        
-        # Combine output
-        final_output = "\n".join(output_parts) if output_parts else "Code executed successfully"
-        
-        # Extract images directly from full stdout
-        images = extract_image_data(full_stdout)
-        
-        # Clean the output for display (remove image binary but keep analysis text)
-        display_output = clean_output_for_display(final_output)
+        response = sandbox_pool.invoke(session_id, "executeCode", {
+            "code": clean_code,
+            "language": "python",
+            "clearContext": False
+        }, files=files_data)
+    except SandboxFileUploadError as e:
+        yield "error", f"File upload failed: {e}"
+        return
+    
+    # Process response directly without Strands-Agents truncation
+    for event in response["stream"]:
+        result = event.get("result", {})
+        
+        if result.get("isError", False):
+            error_content = result.get("content", [{}])
+            error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
+            print(f"❌ Direct execution error: {error_text}")
+            yield "error", f"Error: {error_text}"
+            return
+        
+        # Extract structured content
+        structured_content = result.get("structuredContent", {})
+        stdout = structured_content.get("stdout", "")
+        stderr = structured_content.get("stderr", "")
+        
+        if stdout:
+            print(f"📤 Direct stdout captured: {len(stdout)} characters")
+            yield "stdout", stdout
+        if stderr:
+            print(f"⚠️  Direct stderr: {stderr}")
+            yield "stderr", stderr
+
+class ExecutionOutputCollector:
+    """Builds display output and images from stream_code_execution chunks as they arrive"""
+
+    def __init__(self):
+        self.extractor = StreamingImageExtractor()
+        self.parts = []  # [stream, text] pairs; consecutive stdout chunks share one part
+        self.error = None
+
+    def add(self, stream: str, text: str) -> str:
+        """Record a chunk and return the text to display for it (stdout without image payloads)"""
+        if stream == "error":
+            self.error = text
+            return text
+        if stream == "stdout":
+            text = self.extractor.feed(text)
+            self._append_stdout(text)
+            return text
+        self.parts.append(["stderr", f"Errors: {text}"])
+        return text
+
+    def _append_stdout(self, text: str):
+        if not text:
+            return
+        if self.parts and self.parts[-1][0] == "stdout":
+            self.parts[-1][1] += text
+        else:
+            self.parts.append(["stdout", text])
+
+    def result(self) -> tuple[str, list]:
+        """Display output and image dicts of the finished execution"""
+        if self.error is not None:
+            return self.error, []
+        self._append_stdout(self.extractor.finish())
+        images = [image.to_dict() for image in self.extractor.images]
+        
+        texts = [text.strip() for _, text in self.parts if text.strip()]
+        if texts:
+            display_output = "\n".join(texts)
+        elif images:
+            display_output = "Code executed successfully - chart generated"
+        else:
+            display_output = "Code executed successfully"
         
         print(f"✅ Direct execution completed:")
-        print(f"   Output length: {len(final_output)}")
         print(f"   Display output length: {len(display_output)}")
-        print(f"   Images extracted: {len(images)}")
+        print(f"   Images extracted: {len(images)} ({self.extractor.rejected} invalid payloads)")
         
         return display_output, images
-        
+
+def collect_execution_output(chunks) -> tuple[str, list]:
+    """Turn stream_code_execution chunks into display output and extracted images"""
+    collector = ExecutionOutputCollector()
+    for stream, text in chunks:
+        collector.add(stream, text)
+        if stream == "error":
+            break
+    return collector.result()
+
+def execute_chart_code_direct(code: str, session_files: list = None, session_id: str = SHARED_AGENT_SANDBOX) -> tuple[str, list]:
+    """Execute chart code directly with AgentCore to preserve full base64 output"""
+    try:
+        return collect_execution_output(stream_code_execution(code, session_files, session_id))
     except Exception as e:
         print(f"❌ Direct AgentCore execution failed: {str(e)}")
         import traceback
@@ -667,38 +678,23 @@ def execute_python_code(code: str, description: str = "", files: list = None) ->
     print(f"🔧 Clean code preview: {clean_code[:200]}...")
     
     try:
-        with code_session(aws_region) as code_client:
-            # Upload files to sandbox if provided
-            if files:
-                print(f"📁 Uploading {len(files)} files to sandbox...")
-                files_data = []
-                for file_info in files:
-                    files_data.append({
-                        "path": file_info.get('filename', 'uploaded_file.csv'),
-                        "text": file_info.get('content', '')
-                    })
-                
-                # Upload files using writeFiles tool
-                upload_response = code_client.invoke("writeFiles", {"content": files_data})
-                for event in upload_response["stream"]:
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        error_content = result.get("content", [{}])
-                        error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                        print(f"❌ File upload error: {error_text}")
-                        return f"File upload failed: {error_text}"
-                    else:
-                        content = result.get("content", [])
-                        for item in content:
-                            if item.get("type") == "text":
-                                print(f"✅ File upload: {item.get('text', '')}")
-            
-            # Execute the code
-            response = code_client.invoke("executeCode", {
+        files_data = [
+            {
+                "path": file_info.get('filename', 'uploaded_file.csv'),
+                "text": file_info.get('content', '')
+            }
+            for file_info in files or []
+        ]
+        
+        # Execute the code in the calling session's sandbox (shared agent sandbox if unknown)
+        try:
+            response = sandbox_pool.invoke(current_sandbox_session.get(), "executeCode", {
                 "code": clean_code,
                 "language": "python",
                 "clearContext": False
-            })
+            }, files=files_data)
+        except SandboxFileUploadError as e:
+            return f"File upload failed: {e}"
         
         # Process the response stream to capture all output
         output_parts = []
@@ -829,6 +825,54 @@ def setup_aws_credentials():
     _aws_session_cache = result
     return result
 
+def create_code_generator_agent():
+    """Create a Strands code generator agent on the cached Bedrock model"""
+    bedrock_model, model_id = create_bedrock_model_with_fallback(aws_region)
+    return Agent(
+        model=bedrock_model,
+        system_prompt=f"""You are a Python code generator specialist powered by {model_id}. Your role is to:
+        1. Generate clean, well-commented Python code based on user requirements
+        2. Follow Python best practices and PEP 8 style guidelines
+        3. Include appropriate error handling where needed
+        4. Only return executable Python code without explanations or markdown formatting
+        5. Make sure the code is complete and runnable
+        6. Do not include any text before or after the code
+
+        Focus on creating practical, efficient code that solves the user's specific problem.
+        Return ONLY the Python code, no explanations, no markdown, no additional text."""
+    )
+
+def create_code_executor_agent():
+    """Create a Strands code executor agent with the AgentCore execute_python_code tool"""
+    bedrock_model, model_id = create_bedrock_model_with_fallback(aws_region)
+    # Following the sample system prompt
+    SYSTEM_PROMPT = f"""You are a helpful AI assistant powered by {model_id} that validates all answers through code execution.
+
+VALIDATION PRINCIPLES:
+1. When making claims about code, algorithms, or calculations - write code to verify them
+2. Use execute_python_code to test mathematical calculations, algorithms, and logic
+3. Create test scripts to validate your understanding before giving answers
+4. Always show your work with actual code execution
+5. If uncertain, explicitly state limitations and validate what you can
+
+APPROACH:
+- If asked about a programming concept, implement it in code to demonstrate
+- If asked for calculations, compute them programmatically AND show the code
+- If implementing algorithms, include test cases to prove correctness
+- Document your validation process for transparency
+- The sandbox maintains state between executions, so you can refer to previous results
+
+TOOL AVAILABLE:
+- execute_python_code: Run Python code and see output
+
+RESPONSE FORMAT: The execute_python_code tool returns execution results including stdout, stderr, and any errors."""
+
+    return Agent(
+        model=bedrock_model,
+        tools=[execute_python_code],
+        system_prompt=SYSTEM_PROMPT
+    )
+
 def initialize_agents():
     """Initialize agents using strands-agents with AgentCore CodeInterpreter tool - cached"""
     global code_generator_agent, code_executor_agent, executor_type, current_model_id
@@ -853,58 +897,28 @@ def initialize_agents():
         print(f"🎯 Using model: {model_id}")
         
         # Initialize Code Generator Agent using strands-agents
-        code_generator_agent = Agent(
-            model=bedrock_model,
-            system_prompt=f"""You are a Python code generator specialist powered by {model_id}. Your role is to:
-            1. Generate clean, well-commented Python code based on user requirements
-            2. Follow Python best practices and PEP 8 style guidelines
-            3. Include appropriate error handling where needed
-            4. Only return executable Python code without explanations or markdown formatting
-            5. Make sure the code is complete and runnable
-            6. Do not include any text before or after the code
-            
-            Focus on creating practical, efficient code that solves the user's specific problem.
-            Return ONLY the Python code, no explanations, no markdown, no additional text."""
-        )
+        code_generator_agent = create_code_generator_agent()
         
-        # Test AgentCore availability
-        with code_session(aws_region) as test_client:
-            test_response = test_client.invoke("executeCode", {
+        # Test AgentCore availability; the test sandbox becomes the first warm sandbox
+        test_sandbox = sandbox_pool.new_sandbox()
+        try:
+            test_response = test_sandbox.invoke("executeCode", {
                 "code": "print('AgentCore initialization test successful')",
                 "language": "python",
                 "clearContext": True
             })
+            for _ in test_response["stream"]:
+                pass
+        except Exception:
+            test_sandbox.stop()
+            raise
+        sandbox_pool.add_warm(test_sandbox)
         
         # AgentCore is working - create executor agent with AgentCore tool
         executor_type = "agentcore"
         
-        # Create Code Executor Agent with AgentCore tool - following the sample system prompt
-        SYSTEM_PROMPT = f"""You are a helpful AI assistant powered by {model_id} that validates all answers through code execution.
-
-VALIDATION PRINCIPLES:
-1. When making claims about code, algorithms, or calculations - write code to verify them
-2. Use execute_python_code to test mathematical calculations, algorithms, and logic
-3. Create test scripts to validate your understanding before giving answers
-4. Always show your work with actual code execution
-5. If uncertain, explicitly state limitations and validate what you can
-
-APPROACH:
-- If asked about a programming concept, implement it in code to demonstrate
-- If asked for calculations, compute them programmatically AND show the code
-- If implementing algorithms, include test cases to prove correctness
-- Document your validation process for transparency
-- The sandbox maintains state between executions, so you can refer to previous results
-
-TOOL AVAILABLE:
-- execute_python_code: Run Python code and see output
-
-RESPONSE FORMAT: The execute_python_code tool returns execution results including stdout, stderr, and any errors."""
-        
-        code_executor_agent = Agent(
-            model=bedrock_model,
-            tools=[execute_python_code],
-            system_prompt=SYSTEM_PROMPT
-        )
+        # Create Code Executor Agent with AgentCore tool
+        code_executor_agent = create_code_executor_agent()
         
         print("✅ Agents initialized successfully:")
         print(f"   - Code Generator: Strands-Agents Agent with {model_id}")
@@ -924,15 +938,28 @@ RESPONSE FORMAT: The execute_python_code tool returns execution results includin
 
 # Startup is now handled by lifespan context manager
 
-def get_or_create_session(session_id: Optional[str] = None) -> CodeInterpreterSession:
-    """Get existing session or create new one"""
+def session_lease(session_id: Optional[str] = None):
+    """Get existing session or create new one, leased for the current request"""
     if session_id is None:
         session_id = str(uuid.uuid4())
     
-    if session_id not in active_sessions:
-        active_sessions[session_id] = CodeInterpreterSession(session_id)
-    
-    return active_sessions[session_id]
+    return active_sessions.lease(session_id)
+
+def run_agent(agent, prompt: str, session_id: str = SHARED_AGENT_SANDBOX):
+    """Run a Strands agent to completion in the calling worker thread.
+
+    invoke_async keeps the context variables of this thread, so the agent's
+    execute_python_code calls run in the session's sandbox.
+    """
+    token = current_sandbox_session.set(session_id)
+    try:
+        return asyncio.run(agent.invoke_async(prompt))
+    finally:
+        current_sandbox_session.reset(token)
+
+def server_busy_exception(e: ServerBusyError) -> HTTPException:
+    print(f"⏳ Rejecting request: {e}")
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
 
 # Utility functions for code analysis
 def detect_chart_code(code: str) -> bool:
@@ -981,33 +1008,33 @@ def input(prompt=''):
 async def generate_code(request: CodeGenerationRequest):
     """Generate Python code using the strands-agents code generator agent"""
     try:
-        session = get_or_create_session(request.session_id)
-        
-        # Check if prompt mentions files but no CSV is uploaded
-        file_keywords = ['file', 'csv', 'data', 'dataset', 'load', 'read', 'import', 'upload']
-        mentions_file = any(keyword in request.prompt.lower() for keyword in file_keywords)
-        
-        if mentions_file and not session.uploaded_csv:
-            return {
-                "success": False,
-                "requires_file": True,
-                "message": "Your request mentions working with files. Please upload a CSV file first.",
-                "session_id": session.session_id
-            }
-        
-        # Prepare prompt with CSV context if available
-        enhanced_prompt = request.prompt
-        
-        # Check if the request involves visualization/charts
-        chart_keywords = ['plot', 'chart', 'graph', 'visualiz', 'histogram', 'scatter', 'bar chart', 'line chart', 'pie chart', 'heatmap', 'matplotlib', 'seaborn', 'plotly']
-        needs_visualization = any(keyword in request.prompt.lower() for keyword in chart_keywords)
-        
-        if session.uploaded_csv:
-            csv_info = f"""
+        with session_lease(request.session_id) as session:
+            # Check if prompt mentions files but no CSV is uploaded
+            file_keywords = ['file', 'csv', 'data', 'dataset', 'load', 'read', 'import', 'upload']
+            mentions_file = any(keyword in request.prompt.lower() for keyword in file_keywords)
+            
+            if mentions_file and not session.uploaded_csv:
+                return {
+                    "success": False,
+                    "requires_file": True,
+                    "message": "Your request mentions working with files. Please upload a CSV file first.",
+                    "session_id": session.session_id
+                }
+            
+            # Prepare prompt with CSV context if available
+            enhanced_prompt = request.prompt
+            
+            # Check if the request involves visualization/charts
+            chart_keywords = ['plot', 'chart', 'graph', 'visualiz', 'histogram', 'scatter', 'bar chart', 'line chart', 'pie chart', 'heatmap', 'matplotlib', 'seaborn', 'plotly']
+            needs_visualization = any(keyword in request.prompt.lower() for keyword in chart_keywords)
+            
+            if session.uploaded_csv:
+                csv_content = session.get_uploaded_csv_content()
+                csv_info = f"""
 You have access to a CSV file named '{session.uploaded_csv['filename']}' with the following content preview:
 
 ```csv
-{session.uploaded_csv['content'][:1000]}{'...' if len(session.uploaded_csv['content']) > 1000 else ''}
+{csv_content[:1000]}{'...' if len(csv_content) > 1000 else ''}
 ```
 
 When generating code, assume this CSV data is available and can be loaded using pandas.read_csv() or similar methods. 
@@ -1015,11 +1042,11 @@ Use the filename '{session.uploaded_csv['filename']}' in your code.
 
 User request: {request.prompt}
 """
-            enhanced_prompt = csv_info
-        
-        # Add chart rendering instructions if visualization is needed
-        if needs_visualization:
-            chart_instructions = """
+                enhanced_prompt = csv_info
+            
+            # Add chart rendering instructions if visualization is needed
+            if needs_visualization:
+                chart_instructions = """
 
 IMPORTANT: For reliable chart rendering in the web interface, use this approach:
 
@@ -1053,33 +1080,37 @@ print("Chart generated successfully!")
 
 This ensures your charts are properly displayed in the web interface.
 """
-            enhanced_prompt += chart_instructions
-        
-        # Use the strands-agents agent for code generation
-        agent_result = code_generator_agent(enhanced_prompt)
-        
-        # Extract string content from AgentResult
-        generated_code = str(agent_result) if agent_result is not None else ""
-        
-        # Store generation in session history
-        session.conversation_history.append({
-            "type": "generation",
-            "prompt": request.prompt,
-            "enhanced_prompt": enhanced_prompt if session.uploaded_csv else None,
-            "generated_code": generated_code,
-            "agent": "strands_code_generator",
-            "csv_used": session.uploaded_csv['filename'] if session.uploaded_csv else None,
-            "timestamp": time.time()
-        })
-        
-        return {
-            "success": True,
-            "code": generated_code,
-            "session_id": session.session_id,
-            "agent_used": "strands_code_generator",
-            "csv_file_used": session.uploaded_csv['filename'] if session.uploaded_csv else None
-        }
+                enhanced_prompt += chart_instructions
+            
+            # Use the session's strands-agents agent for code generation, off the event loop
+            agent_result = await execution_queue.run(
+                session.session_id, run_agent, session.get_generator_agent(), enhanced_prompt, session.session_id
+            )
+            
+            # Extract string content from AgentResult
+            generated_code = str(agent_result) if agent_result is not None else ""
+            
+            # Store generation in session history
+            session.conversation_history.append({
+                "type": "generation",
+                "prompt": request.prompt,
+                "enhanced_prompt": enhanced_prompt if session.uploaded_csv else None,
+                "generated_code": generated_code,
+                "agent": "strands_code_generator",
+                "csv_used": session.uploaded_csv['filename'] if session.uploaded_csv else None,
+                "timestamp": time.time()
+            })
+            
+            return {
+                "success": True,
+                "code": generated_code,
+                "session_id": session.session_id,
+                "agent_used": "strands_code_generator",
+                "csv_file_used": session.uploaded_csv['filename'] if session.uploaded_csv else None
+            }
         
+    except ServerBusyError as e:
+        raise server_busy_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Code generation failed: {str(e)}")
 
@@ -1104,7 +1135,10 @@ Provide:
 
 Keep response short and practical."""
             
-            analysis_result = code_generator_agent(analysis_prompt)
+            # A throwaway agent: analysis requests have no session and must not share a conversation
+            analysis_result = await execution_queue.run(
+                request.session_id or "code-analysis", run_agent, create_code_generator_agent(), analysis_prompt
+            )
             
             return {
                 "success": True,
@@ -1120,6 +1154,8 @@ Keep response short and practical."""
                 "suggestions": None
             }
         
+    except ServerBusyError as e:
+        raise server_busy_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Code analysis failed: {str(e)}")
 
@@ -1127,135 +1163,137 @@ Keep response short and practical."""
 async def execute_code(request: CodeExecutionRequest):
     """Execute Python code using hybrid approach: direct AgentCore for charts, Strands-Agents for others"""
     try:
-        session = get_or_create_session(request.session_id)
-        
-        # Track execution start time
-        execution_start_time = time.time()
-        
-        # Check if code is interactive
-        is_interactive = request.interactive or detect_interactive_code(request.code)
-        
-        # Try to find the original prompt from recent conversation history
-        user_prompt = None
-        if session.conversation_history:
-            # Look for the most recent generation entry with a prompt
-            for entry in reversed(session.conversation_history):
-                if entry.get('prompt'):  # Direct prompt field
-                    user_prompt = entry['prompt']
-                    break
-                elif entry.get('type') == 'generation' and entry.get('generated_code'):
-                    # Check if this generated code matches the current code being executed
-                    if entry.get('generated_code') and request.code.strip() in entry.get('generated_code', ''):
-                        user_prompt = entry.get('prompt')
+        with session_lease(request.session_id) as session:
+            # Track execution start time
+            execution_start_time = time.time()
+            
+            # Check if code is interactive
+            is_interactive = request.interactive or detect_interactive_code(request.code)
+            
+            # Try to find the original prompt from recent conversation history
+            user_prompt = None
+            if session.conversation_history:
+                # Look for the most recent generation entry with a prompt
+                for entry in reversed(session.conversation_history):
+                    if entry.get('prompt'):  # Direct prompt field
+                        user_prompt = entry['prompt']
                         break
-        
-        # If no prompt found, check if this is a direct code execution
-        if not user_prompt:
-            # For direct executions, we can create a descriptive prompt based on the code
-            code_lines = request.code.strip().split('\n')
-            if len(code_lines) == 1 and len(code_lines[0]) < 100:
-                user_prompt = f"Execute: {code_lines[0]}"
-            elif 'input(' in request.code:
-                user_prompt = "Interactive code execution"
-            elif any(keyword in request.code.lower() for keyword in ['import matplotlib', 'plt.', 'plot', 'chart']):
-                user_prompt = "Generate visualization/chart"
-            elif 'import pandas' in request.code or 'pd.' in request.code:
-                user_prompt = "Data analysis with pandas"
+                    elif entry.get('type') == 'generation' and entry.get('generated_code'):
+                        # Check if this generated code matches the current code being executed
+                        if entry.get('generated_code') and request.code.strip() in entry.get('generated_code', ''):
+                            user_prompt = entry.get('prompt')
+                            break
+            
+            # If no prompt found, check if this is a direct code execution
+            if not user_prompt:
+                # For direct executions, we can create a descriptive prompt based on the code
+                code_lines = request.code.strip().split('\n')
+                if len(code_lines) == 1 and len(code_lines[0]) < 100:
+                    user_prompt = f"Execute: {code_lines[0]}"
+                elif 'input(' in request.code:
+                    user_prompt = "Interactive code execution"
+                elif any(keyword in request.code.lower() for keyword in ['import matplotlib', 'plt.', 'plot', 'chart']):
+                    user_prompt = "Generate visualization/chart"
+                elif 'import pandas' in request.code or 'pd.' in request.code:
+                    user_prompt = "Data analysis with pandas"
+                else:
+                    user_prompt = "Direct code execution"
+            
+            # Prepare code for execution
+            if is_interactive and request.inputs:
+                prepared_code = prepare_interactive_code(request.code, request.inputs)
+                print(f"🔄 Interactive code prepared with {len(request.inputs)} inputs")
             else:
-                user_prompt = "Direct code execution"
-        
-        # Prepare code for execution
-        if is_interactive and request.inputs:
-            prepared_code = prepare_interactive_code(request.code, request.inputs)
-            print(f"🔄 Interactive code prepared with {len(request.inputs)} inputs")
-        else:
-            prepared_code = request.code
-        
-        # Check if this is chart/visualization code
-        is_chart_code = detect_chart_code(prepared_code)
-        
-        # Get session files for sandbox upload
-        session_files = []
-        if session.uploaded_csv:
-            session_files.append({
-                'filename': session.uploaded_csv['filename'],
-                'content': session.uploaded_csv['content']
-            })
-        
-        # REVERTED: Use original logic - only force direct AgentCore for charts and files, NOT for interactive
-        if is_chart_code or session_files:
-            print(f"🎨 Chart code detected - using direct AgentCore execution")
+                prepared_code = request.code
             
-            # Use direct AgentCore execution to preserve full base64 output
-            execution_result_str, images = execute_chart_code_direct(prepared_code, session_files)
-            agent_used = "direct_agentcore_charts"
+            # Check if this is chart/visualization code
+            is_chart_code = detect_chart_code(prepared_code)
             
-        else:
-            print(f"📝 Regular code - using Strands-Agents execution")
+            # Get session files for sandbox upload
+            session_files = session.get_session_files()
             
-            # For regular code, if files are needed, use direct AgentCore as well
-            # since Strands-Agents tools can't easily access session files
-            if session_files:
-                print(f"📁 Files detected - switching to direct AgentCore for file access")
-                execution_result_str, images = execute_chart_code_direct(prepared_code, session_files)
-                agent_used = "direct_agentcore_with_files"
+            # REVERTED: Use original logic - only force direct AgentCore for charts and files, NOT for interactive
+            if is_chart_code or session_files:
+                print(f"🎨 Chart code detected - using direct AgentCore execution")
+                
+                # Use direct AgentCore execution to preserve full base64 output
+                execution_result_str, images = await execution_queue.run(
+                    session.session_id, execute_chart_code_direct, prepared_code, session_files, session.session_id
+                )
+                agent_used = "direct_agentcore_charts"
+                
             else:
-                # Use strands-agents with AgentCore tool for regular code without files
-                execution_prompt = f"""Execute this Python code using the execute_python_code tool:
+                print(f"📝 Regular code - using Strands-Agents execution")
+                
+                # For regular code, if files are needed, use direct AgentCore as well
+                # since Strands-Agents tools can't easily access session files
+                if session_files:
+                    print(f"📁 Files detected - switching to direct AgentCore for file access")
+                    execution_result_str, images = await execution_queue.run(
+                        session.session_id, execute_chart_code_direct, prepared_code, session_files, session.session_id
+                    )
+                    agent_used = "direct_agentcore_with_files"
+                else:
+                    # Use strands-agents with AgentCore tool for regular code without files
+                    execution_prompt = f"""Execute this Python code using the execute_python_code tool:
 
 ```python
 {prepared_code}
 ```
 
 Use the tool to run the code and return the complete output."""
-                
-                execution_result = code_executor_agent(execution_prompt)
-                
-                # Debug the AgentResult structure
-                print(f"🔍 AgentResult type: {type(execution_result)}")
-                
-                # Extract the actual text content from AgentResult
-                execution_result_str = extract_text_from_agent_result(execution_result)
-                print(f"📊 Extracted text length: {len(execution_result_str)}")
-                
-                # Extract image data from execution results
-                images = extract_image_data(execution_result_str)
-                agent_used = "strands_agents_with_agentcore"
-        
-        # Calculate execution duration
-        execution_end_time = time.time()
-        execution_duration = execution_end_time - execution_start_time
-        
-        # Store execution in session history
-        session.code_history.append(request.code)
-        session.execution_results.append({
-            "code": request.code,
-            "result": execution_result_str,
-            "agent": agent_used,
-            "executor_type": "agentcore",
-            "interactive": is_interactive,
-            "inputs_provided": request.inputs if is_interactive else None,
-            "images": images,
-            "is_chart_code": is_chart_code,
-            "timestamp": execution_end_time,
-            "execution_duration": execution_duration,
-            "prompt": user_prompt,
-            "start_time": execution_start_time,
-            "end_time": execution_end_time
-        })
-        
-        return {
-            "success": True,
-            "result": execution_result_str,
-            "session_id": session.session_id,
-            "agent_used": agent_used,
-            "executor_type": "agentcore",
-            "interactive": is_interactive,
-            "inputs_used": request.inputs if is_interactive else None,
-            "images": images,
-            "is_chart_code": is_chart_code
-        }
+                    
+                    execution_result = await execution_queue.run(
+                        session.session_id, run_agent, session.get_executor_agent(), execution_prompt, session.session_id
+                    )
+                    
+                    # Debug the AgentResult structure
+                    print(f"🔍 AgentResult type: {type(execution_result)}")
+                    
+                    # Extract the actual text content from AgentResult
+                    execution_result_str = extract_text_from_agent_result(execution_result)
+                    print(f"📊 Extracted text length: {len(execution_result_str)}")
+                    
+                    # Extract image data from execution results
+                    images = extract_image_data(execution_result_str)
+                    agent_used = "strands_agents_with_agentcore"
+            
+            # Calculate execution duration
+            execution_end_time = time.time()
+            execution_duration = execution_end_time - execution_start_time
+            
+            # Store execution in session history
+            session.code_history.append(request.code)
+            session.execution_results.append({
+                "code": request.code,
+                "result": execution_result_str,
+                "agent": agent_used,
+                "executor_type": "agentcore",
+                "interactive": is_interactive,
+                "inputs_provided": request.inputs if is_interactive else None,
+                "images": images,
+                "is_chart_code": is_chart_code,
+                "timestamp": execution_end_time,
+                "execution_duration": execution_duration,
+                "prompt": user_prompt,
+                "start_time": execution_start_time,
+                "end_time": execution_end_time
+            })
+            
+            return {
+                "success": True,
+                "result": execution_result_str,
+                "session_id": session.session_id,
+                "agent_used": agent_used,
+                "executor_type": "agentcore",
+                "interactive": is_interactive,
+                "inputs_used": request.inputs if is_interactive else None,
+                "images": images,
+                "is_chart_code": is_chart_code
+            }
         
+    except ServerBusyError as e:
+        raise server_busy_exception(e)
     except Exception as e:
         print(f"❌ Code execution failed: {str(e)}")
         import traceback
@@ -1266,71 +1304,65 @@ Use the tool to run the code and return the complete output."""
 async def clear_csv_from_session(session_id: str):
     """Clear CSV file from session and AgentCore context"""
     try:
-        session = get_or_create_session(session_id)
-        
-        if session.uploaded_csv:
-            filename = session.uploaded_csv['filename']
+        with session_lease(session_id) as session:
+            if session.uploaded_csv:
+                filename = session.uploaded_csv['filename']
+                
+                # Clear CSV from session
+                session.set_uploaded_csv(None)
+                
+                # Add to conversation history
+                session.conversation_history.append({
+                    "type": "csv_removal",
+                    "filename": filename,
+                    "timestamp": time.time()
+                })
+                
+                print(f"🗑️ CSV file '{filename}' cleared from session {session_id}")
+                
+                return {
+                    "success": True,
+                    "message": f"CSV file '{filename}' removed successfully",
+                    "session_id": session_id
+                }
+            else:
+                return {
+                    "success": True,
+                    "message": "No CSV file to remove",
+                    "session_id": session_id
+                }
             
-            # Clear CSV from session
-            session.uploaded_csv = None
+    except Exception as e:
+        print(f"❌ Error clearing CSV from session: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to clear CSV: {str(e)}")
+
+@app.post("/api/upload-csv")
+async def upload_csv_file(request: FileUploadRequest):
+    """Upload and process a CSV file"""
+    try:
+        with session_lease(request.session_id) as session:
+            # Validate CSV content
+            if not request.filename.lower().endswith('.csv'):
+                raise HTTPException(status_code=400, detail="Only CSV files are allowed")
             
-            # Add to conversation history
+            # Store CSV file in session
             session.conversation_history.append({
-                "type": "csv_removal",
-                "filename": filename,
+                "type": "csv_upload",
+                "filename": request.filename,
+                "content": request.content,
                 "timestamp": time.time()
             })
             
-            print(f"🗑️ CSV file '{filename}' cleared from session {session_id}")
+            # Store CSV data for code generation (content goes to the blob store)
+            session.set_uploaded_csv(request.filename, request.content)
             
             return {
                 "success": True,
-                "message": f"CSV file '{filename}' removed successfully",
-                "session_id": session_id
-            }
-        else:
-            return {
-                "success": True,
-                "message": "No CSV file to remove",
-                "session_id": session_id
+                "message": f"CSV file {request.filename} uploaded successfully",
+                "session_id": session.session_id,
+                "filename": request.filename,
+                "preview": request.content[:500] + "..." if len(request.content) > 500 else request.content
             }
-            
-    except Exception as e:
-        print(f"❌ Error clearing CSV from session: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to clear CSV: {str(e)}")
-
-@app.post("/api/upload-csv")
-async def upload_csv_file(request: FileUploadRequest):
-    """Upload and process a CSV file"""
-    try:
-        session = get_or_create_session(request.session_id)
-        
-        # Validate CSV content
-        if not request.filename.lower().endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Only CSV files are allowed")
-        
-        # Store CSV file in session
-        session.conversation_history.append({
-            "type": "csv_upload",
-            "filename": request.filename,
-            "content": request.content,
-            "timestamp": time.time()
-        })
-        
-        # Store CSV data for code generation
-        session.uploaded_csv = {
-            "filename": request.filename,
-            "content": request.content,
-            "timestamp": asyncio.get_event_loop().time()
-        }
-        
-        return {
-            "success": True,
-            "message": f"CSV file {request.filename} uploaded successfully",
-            "session_id": session.session_id,
-            "filename": request.filename,
-            "preview": request.content[:500] + "..." if len(request.content) > 500 else request.content
-        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV upload failed: {str(e)}")
@@ -1339,45 +1371,68 @@ async def upload_csv_file(request: FileUploadRequest):
 async def upload_file(request: FileUploadRequest):
     """Upload and process a Python file"""
     try:
-        session = get_or_create_session(request.session_id)
-        
-        # Store file in session
-        session.conversation_history.append({
-            "type": "file_upload",
-            "filename": request.filename,
-            "content": request.content,
-            "timestamp": time.time()
-        })
-        
-        return {
-            "success": True,
-            "message": f"File {request.filename} uploaded successfully",
-            "session_id": session.session_id,
-            "content": request.content
-        }
+        with session_lease(request.session_id) as session:
+            # Store file in session
+            session.conversation_history.append({
+                "type": "file_upload",
+                "filename": request.filename,
+                "content": request.content,
+                "timestamp": time.time()
+            })
+            
+            return {
+                "success": True,
+                "message": f"File {request.filename} uploaded successfully",
+                "session_id": session.session_id,
+                "content": request.content
+            }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
 
 @app.get("/api/session/{session_id}/history")
-async def get_session_history(session_id: str):
-    """Get session history"""
+async def get_session_history(session_id: str, offset: int = 0, limit: int = HISTORY_PAGE_SIZE,
+                              resolve_blobs: bool = True):
+    """Get a page of session history, newest entries first by offset.
+
+    offset skips that many of the most recent entries of each list. With
+    resolve_blobs=false, large values (images, file contents) are returned as
+    {"$blob": hash} references that can be fetched from /api/blobs/{hash}.
+    """
     try:
-        if session_id not in active_sessions:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        session = active_sessions[session_id]
-        
-        return {
-            "success": True,
-            "session_id": session_id,
-            "conversation_history": session.conversation_history,
-            "execution_results": session.execution_results
-        }
+        with active_sessions.lease(session_id, create=False) as session:
+            if session is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            offset = max(offset, 0)
+            limit = min(max(limit, 1), HISTORY_PAGE_SIZE * 10)
+            
+            return {
+                "success": True,
+                "session_id": session_id,
+                "conversation_history": session.conversation_history.page(offset, limit, resolve_blobs),
+                "execution_results": session.execution_results.page(offset, limit, resolve_blobs),
+                "conversation_total": len(session.conversation_history),
+                "execution_total": len(session.execution_results),
+                "offset": offset,
+                "limit": limit,
+                "has_more": offset + limit < max(len(session.conversation_history), len(session.execution_results))
+            }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session history: {str(e)}")
 
+@app.get("/api/blobs/{digest}")
+async def get_blob(digest: str):
+    """Get a value referenced from session history by its content hash"""
+    data = active_sessions.blobs.get(digest)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return Response(content=data, media_type="text/plain; charset=utf-8",
+                    headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
 @app.get("/api/agents/status")
 async def get_agents_status():
     """Get status of all agents"""
@@ -1417,6 +1472,60 @@ async def get_agents_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get agents status: {str(e)}")
 
+async def stream_execution_over_websocket(websocket: WebSocket, session_id: str, message: dict):
+    """Execute code in the session's sandbox and send each output chunk as an execution_output message"""
+    with session_lease(session_id) as session:
+        execution_start_time = time.time()
+        
+        inputs = message.get("inputs")
+        is_interactive = message.get("interactive") or detect_interactive_code(message["code"])
+        prepared_code = prepare_interactive_code(message["code"], inputs) if is_interactive and inputs else message["code"]
+        session_files = session.get_session_files()
+        
+        collector = ExecutionOutputCollector()
+        output = execution_queue.iterate(session_id, stream_code_execution, prepared_code, session_files, session_id)
+        try:
+            async for stream, text in output:
+                # Image payloads are held back and only sent once, in the final result
+                display_text = collector.add(stream, text)
+                if display_text:
+                    await websocket.send_text(json.dumps({
+                        "type": "execution_output",
+                        "stream": stream,
+                        "data": display_text,
+                        "session_id": session_id
+                    }))
+        finally:
+            # Frees the session's slot right away if the client went away mid-stream
+            await output.aclose()
+        
+        execution_result_str, images = collector.result()
+        execution_end_time = time.time()
+        session.code_history.append(message["code"])
+        session.execution_results.append({
+            "code": message["code"],
+            "result": execution_result_str,
+            "agent": "direct_agentcore_stream",
+            "executor_type": "agentcore",
+            "interactive": is_interactive,
+            "inputs_provided": inputs if is_interactive else None,
+            "images": images,
+            "is_chart_code": detect_chart_code(prepared_code),
+            "timestamp": execution_end_time,
+            "execution_duration": execution_end_time - execution_start_time,
+            "prompt": None,
+            "start_time": execution_start_time,
+            "end_time": execution_end_time
+        })
+        
+        await websocket.send_text(json.dumps({
+            "type": "execution_result",
+            "success": collector.error is None,
+            "result": execution_result_str,
+            "images": images,
+            "session_id": session_id
+        }))
+
 # WebSocket endpoint for real-time communication
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
@@ -1431,42 +1540,39 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             if message["type"] == "generate_code":
                 # Handle code generation via WebSocket
                 try:
-                    agent_result = code_generator_agent(message["prompt"])
-                    
-                    # Extract string content from AgentResult
-                    generated_code = str(agent_result) if agent_result is not None else ""
-                    
-                    await websocket.send_text(json.dumps({
-                        "type": "code_generated",
-                        "success": True,
-                        "code": generated_code,
-                        "session_id": session_id
-                    }))
+                    with session_lease(session_id) as session:
+                        agent_result = await execution_queue.run(
+                            session_id, run_agent, session.get_generator_agent(), message["prompt"], session_id
+                        )
+                        
+                        # Extract string content from AgentResult
+                        generated_code = str(agent_result) if agent_result is not None else ""
+                        
+                        await websocket.send_text(json.dumps({
+                            "type": "code_generated",
+                            "success": True,
+                            "code": generated_code,
+                            "session_id": session_id
+                        }))
                 except Exception as e:
                     await websocket.send_text(json.dumps({
                         "type": "error",
                         "success": False,
+                        "busy": isinstance(e, ServerBusyError),
                         "error": str(e)
                     }))
             
             elif message["type"] == "execute_code":
-                # Handle code execution via WebSocket
+                # Handle code execution via WebSocket, streaming stdout/stderr as it arrives
                 try:
-                    if executor_type == "agentcore":
-                        execution_result = code_executor_agent(f"Execute this code: {message['code']}")
-                    else:
-                        execution_result = code_executor_agent(f"Simulate execution of: {message['code']}")
-                    
-                    await websocket.send_text(json.dumps({
-                        "type": "execution_result",
-                        "success": True,
-                        "result": execution_result,
-                        "session_id": session_id
-                    }))
+                    await stream_execution_over_websocket(websocket, session_id, message)
+                except WebSocketDisconnect:
+                    raise
                 except Exception as e:
                     await websocket.send_text(json.dumps({
                         "type": "error",
                         "success": False,
+                        "busy": isinstance(e, ServerBusyError),
                         "error": str(e)
                     }))
                     
@@ -1486,6 +1592,9 @@ async def health_check():
         "current_model": current_model,
         "aws_region": aws_region,
         "authentication": "AWS Profile" if os.getenv('AWS_PROFILE') else "Access Keys",
+        "sandboxes": sandbox_pool.stats() if sandbox_pool else None,
+        "execution_queue": execution_queue.stats() if execution_queue else None,
+        "sessions": active_sessions.stats() if active_sessions else None,
         "architecture": {
             "code_generation": f"Strands-Agents Agent ({current_model})",
             "code_execution": f"{executor_type.title().replace('_', ' ')} Agent ({current_model})"
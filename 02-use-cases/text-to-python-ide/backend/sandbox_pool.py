@@ -0,0 +1,303 @@
+"""Pooled AgentCore CodeInterpreter sandboxes for IDE sessions.
+
+Each IDE session keeps one long-lived sandbox, so repeated executions skip
+sandbox startup and keep the Python context between runs, notebook style.
+New sessions take a pre-started sandbox from a small warm pool. Files are
+uploaded with writeFiles only when their content hash changes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
+
+# Error codes returned when a sandbox session has expired or was stopped
+SESSION_GONE_ERROR_CODES = {"ResourceNotFoundException", "ValidationException"}
+
+
+class SandboxFileUploadError(Exception):
+    """Raised when writeFiles reports an error"""
+
+    pass
+
+
+def get_stream_error_text(response) -> Optional[str]:
+    """Return the error text of a CodeInterpreter response stream, if any"""
+    for event in response["stream"]:
+        result = event.get("result", {})
+        if result.get("isError", False):
+            error_content = result.get("content", [{}])
+            return (
+                error_content[0].get("text", "Unknown error")
+                if error_content
+                else "Unknown error"
+            )
+        for item in result.get("content", []):
+            if item.get("type") == "text":
+                print(f"✅ File upload: {item.get('text', '')}")
+    return None
+
+
+class Sandbox:
+    """A started CodeInterpreter session and the files already written to it"""
+
+    def __init__(self, region: str):
+        self.client = CodeInterpreter(region)
+        self.lock = threading.Lock()
+        self.file_hashes: Dict[str, str] = {}
+        self.started_at = 0.0
+        self.last_used = 0.0
+
+    def start(self, session_timeout_seconds: int):
+        self.client.start(session_timeout_seconds=session_timeout_seconds)
+        self.started_at = self.last_used = time.monotonic()
+
+    def stop(self):
+        try:
+            self.client.stop()
+        except Exception as e:
+            print(f"⚠️  Failed to stop sandbox {self.client.session_id}: {e}")
+
+    def invoke(self, method: str, params: dict):
+        self.last_used = time.monotonic()
+        return self.client.invoke(method, params)
+
+    def sync_files(self, files: List[dict]) -> int:
+        """Write files ({"path", "text"} dicts) whose content changed; return how many were written"""
+        hashes = {
+            file_info["path"]: hashlib.sha256(
+                file_info["text"].encode("utf-8")
+            ).hexdigest()
+            for file_info in files
+        }
+        changed = [
+            file_info
+            for file_info in files
+            if self.file_hashes.get(file_info["path"]) != hashes[file_info["path"]]
+        ]
+        if not changed:
+            print(f"📁 {len(files)} files unchanged - skipping upload")
+            return 0
+
+        print(f"📁 Uploading {len(changed)} changed files to sandbox...")
+        error_text = get_stream_error_text(
+            self.invoke("writeFiles", {"content": changed})
+        )
+        if error_text:
+            print(f"❌ File upload error: {error_text}")
+            raise SandboxFileUploadError(error_text)
+        for file_info in changed:
+            self.file_hashes[file_info["path"]] = hashes[file_info["path"]]
+        return len(changed)
+
+
+class SandboxPool:
+    """Per-session sandboxes with idle eviction and a warm pool for new sessions"""
+
+    def __init__(
+        self,
+        region: str,
+        warm_size: Optional[int] = None,
+        idle_timeout_seconds: Optional[int] = None,
+        session_timeout_seconds: Optional[int] = None,
+    ):
+        self.region = region
+        self.warm_size = (
+            warm_size
+            if warm_size is not None
+            else int(os.getenv("SANDBOX_WARM_POOL_SIZE", "1"))
+        )
+        self.idle_timeout_seconds = idle_timeout_seconds or int(
+            os.getenv("SANDBOX_IDLE_TIMEOUT_SECONDS", "600")
+        )
+        self.session_timeout_seconds = session_timeout_seconds or int(
+            os.getenv("SANDBOX_SESSION_TIMEOUT_SECONDS", "3600")
+        )
+        # Retire sandboxes a minute before AgentCore would end them
+        self.max_age_seconds = max(self.session_timeout_seconds - 60, 60)
+
+        self._sessions: Dict[str, Sandbox] = {}
+        self._warm: List[Sandbox] = []
+        self._lock = threading.Lock()
+        self._replenishing = False
+        self._stop_event = threading.Event()
+        self._reaper = None
+
+    def start(self):
+        """Start the idle reaper and fill the warm pool in the background"""
+        if self._reaper is None:
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="sandbox-reaper", daemon=True
+            )
+            self._reaper.start()
+        self._replenish_async()
+
+    def shutdown(self):
+        """Stop every sandbox"""
+        self._stop_event.set()
+        with self._lock:
+            sandboxes = list(self._sessions.values()) + self._warm
+            self._sessions.clear()
+            self._warm.clear()
+        for sandbox in sandboxes:
+            sandbox.stop()
+        print(f"🧹 Stopped {len(sandboxes)} sandboxes")
+
+    def add_warm(self, sandbox: Sandbox):
+        with self._lock:
+            self._warm.append(sandbox)
+
+    def new_sandbox(self) -> Sandbox:
+        sandbox = Sandbox(self.region)
+        start_time = time.time()
+        sandbox.start(self.session_timeout_seconds)
+        print(
+            f"🚀 Started sandbox {sandbox.client.session_id} in {time.time() - start_time:.2f}s"
+        )
+        return sandbox
+
+    def get(self, session_id: str) -> Sandbox:
+        """Return the session's sandbox, taking a warm one or starting one if needed"""
+        with self._lock:
+            sandbox = self._sessions.get(session_id)
+            if sandbox is not None and not self._is_expiring(sandbox):
+                return sandbox
+            if sandbox is not None:
+                del self._sessions[session_id]
+            stale = sandbox
+            sandbox = None
+            while self._warm and sandbox is None:
+                candidate = self._warm.pop()
+                if self._is_expiring(candidate):
+                    threading.Thread(target=candidate.stop, daemon=True).start()
+                else:
+                    sandbox = candidate
+
+        if stale is not None:
+            stale.stop()
+        if sandbox is None:
+            sandbox = self.new_sandbox()
+        else:
+            print(
+                f"♨️  Using warm sandbox {sandbox.client.session_id} for session {session_id}"
+            )
+        self._replenish_async()
+
+        with self._lock:
+            # Another request for the same session may have won the race
+            existing = self._sessions.get(session_id)
+            if existing is not None:
+                self._warm.append(sandbox)
+                return existing
+            self._sessions[session_id] = sandbox
+        return sandbox
+
+    def discard(self, session_id: str, sandbox: Optional[Sandbox] = None):
+        """Stop the session's sandbox (only if it is still the given one)"""
+        with self._lock:
+            current = self._sessions.get(session_id)
+            if current is None or (sandbox is not None and current is not sandbox):
+                return
+            del self._sessions[session_id]
+        current.stop()
+
+    def invoke(
+        self,
+        session_id: str,
+        method: str,
+        params: dict,
+        files: Optional[List[dict]] = None,
+    ):
+        """Invoke a method in the session's sandbox after syncing changed files.
+
+        If the sandbox expired on the AgentCore side, the call is retried once
+        in a new sandbox (which gets all files uploaded again).
+        """
+        for attempt in (1, 2):
+            sandbox = self.get(session_id)
+            try:
+                with sandbox.lock:
+                    if files:
+                        sandbox.sync_files(files)
+                    return sandbox.invoke(method, params)
+            except ClientError as e:
+                if (
+                    attempt == 2
+                    or e.response.get("Error", {}).get("Code")
+                    not in SESSION_GONE_ERROR_CODES
+                ):
+                    raise
+                print(
+                    f"♻️  Sandbox for session {session_id} is gone ({e}) - starting a new one"
+                )
+                self.discard(session_id, sandbox)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._sessions), "warm": len(self._warm)}
+
+    def _is_expiring(self, sandbox: Sandbox) -> bool:
+        return time.monotonic() - sandbox.started_at > self.max_age_seconds
+
+    def _replenish_async(self):
+        with self._lock:
+            if (
+                self._replenishing
+                or len(self._warm) >= self.warm_size
+                or self._stop_event.is_set()
+            ):
+                return
+            self._replenishing = True
+        threading.Thread(
+            target=self._replenish, name="sandbox-warmup", daemon=True
+        ).start()
+
+    def _replenish(self):
+        try:
+            while not self._stop_event.is_set():
+                with self._lock:
+                    if len(self._warm) >= self.warm_size:
+                        return
+                try:
+                    sandbox = self.new_sandbox()
+                except Exception as e:
+                    print(f"⚠️  Failed to pre-start sandbox: {e}")
+                    return
+                self.add_warm(sandbox)
+        finally:
+            with self._lock:
+                self._replenishing = False
+
+    def _reap_loop(self):
+        interval = min(30, self.idle_timeout_seconds)
+        while not self._stop_event.wait(interval):
+            now = time.monotonic()
+            with self._lock:
+                idle = [
+                    (session_id, sandbox)
+                    for session_id, sandbox in self._sessions.items()
+                    if (
+                        now - sandbox.last_used > self.idle_timeout_seconds
+                        or self._is_expiring(sandbox)
+                    )
+                    and not sandbox.lock.locked()
+                ]
+                for session_id, _ in idle:
+                    del self._sessions[session_id]
+                expired_warm = [
+                    sandbox for sandbox in self._warm if self._is_expiring(sandbox)
+                ]
+                self._warm = [
+                    sandbox for sandbox in self._warm if sandbox not in expired_warm
+                ]
+            for session_id, sandbox in idle:
+                print(f"💤 Evicting idle sandbox for session {session_id}")
+                sandbox.stop()
+            for sandbox in expired_warm:
+                sandbox.stop()
+            if expired_warm:
+                self._replenish_async()
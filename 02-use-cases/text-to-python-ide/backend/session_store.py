@@ -0,0 +1,457 @@
+"""Bounded IDE session storage with on-disk history and blobs.
+
+Sessions live in an LRU dict limited by count, idle time and estimated
+memory. Evicted sessions are not lost: their history is appended to JSONL
+files as it is recorded and their state is kept in a small manifest, so the
+next request for the session loads it back from disk.
+
+Large values (chart images, uploaded CSVs, long outputs) are written once to
+a content-addressed blob store and history entries only hold their hash.
+Only the most recent history entries stay in memory; older ones are read
+from disk a page at a time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Strings longer than this are moved from history entries to the blob store
+BLOB_THRESHOLD_BYTES = 4096
+
+# History entries per list that stay in memory
+HISTORY_MEMORY_ENTRIES = 20
+
+# Key of the {"$blob": digest, "size": n} references that replace large strings
+BLOB_REF_KEY = "$blob"
+
+MANIFEST_FILE = "session.json"
+
+
+class BlobStore:
+    """Content-addressed files named by the sha256 of their content"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def is_digest(digest: str) -> bool:
+        return len(digest) == 64 and all(c in "0123456789abcdef" for c in digest)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        """Store data and return its digest; identical content is stored once"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            # Refresh the mtime so pruning keeps blobs that are still in use
+            os.utime(path)
+            return digest
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return digest
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get(self, digest: str) -> Optional[bytes]:
+        if not self.is_digest(digest):
+            return None
+        path = self.path(digest)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            # Reads count as use too, so pruning keeps blobs that are still viewed
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def get_text(self, digest: str) -> Optional[str]:
+        data = self.get(digest)
+        return data.decode("utf-8") if data is not None else None
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete blobs not written or read for max_age_seconds"""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def externalize(self, value):
+        """Return a copy of value with long strings replaced by blob references"""
+        if isinstance(value, str):
+            if len(value) > BLOB_THRESHOLD_BYTES:
+                return {BLOB_REF_KEY: self.put_text(value), "size": len(value)}
+            return value
+        if isinstance(value, dict):
+            return {key: self.externalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(item) for item in value]
+        return value
+
+    def resolve(self, value):
+        """Return a copy of value with blob references replaced by their text"""
+        if isinstance(value, dict):
+            if BLOB_REF_KEY in value:
+                text = self.get_text(value[BLOB_REF_KEY])
+                return text if text is not None else {**value, "missing": True}
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+
+class SessionHistory:
+    """Append-only history list backed by a JSONL file.
+
+    Behaves like the list it replaces for appending, len() and iterating
+    over recent entries; only the last HISTORY_MEMORY_ENTRIES entries are
+    kept in memory and page() reads any range from the file.
+    """
+
+    def __init__(self, path: Path, blobs: BlobStore):
+        self.path = path
+        self.blobs = blobs
+        self._lock = threading.Lock()
+        self._offsets: List[int] = []
+        self._recent: List[dict] = []
+        self._recent_bytes: List[int] = []
+        self._load_index()
+
+    def _load_index(self):
+        """Index line offsets of an existing file and keep its tail in memory"""
+        if not self.path.exists():
+            return
+        offset = 0
+        lines = deque(maxlen=HISTORY_MEMORY_ENTRIES)
+        with open(self.path, "rb") as f:
+            for line in f:
+                self._offsets.append(offset)
+                offset += len(line)
+                lines.append(line)
+        for line in lines:
+            self._remember(json.loads(line), len(line))
+
+    def _remember(self, entry: dict, size: int):
+        self._recent.append(entry)
+        self._recent_bytes.append(size)
+        if len(self._recent) > HISTORY_MEMORY_ENTRIES:
+            del self._recent[0]
+            del self._recent_bytes[0]
+
+    def append(self, entry: dict):
+        stored = self.blobs.externalize(entry)
+        line = (json.dumps(stored, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            self._offsets.append(offset)
+            self._remember(stored, len(line))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __bool__(self) -> bool:
+        return bool(self._offsets)
+
+    def __iter__(self):
+        return iter(list(self._recent))
+
+    def __reversed__(self):
+        return reversed(list(self._recent))
+
+    def memory_bytes(self) -> int:
+        return sum(self._recent_bytes) + 8 * len(self._offsets)
+
+    def page(
+        self, offset: int = 0, limit: int = 50, resolve_blobs: bool = True
+    ) -> List[dict]:
+        """Entries in recorded order, skipping the `offset` most recent ones"""
+        with self._lock:
+            end = max(len(self._offsets) - offset, 0)
+            start = max(end - limit, 0)
+            if start == end:
+                return []
+            in_memory = len(self._offsets) - len(self._recent)
+            if start >= in_memory:
+                entries = self._recent[start - in_memory : end - in_memory]
+            else:
+                with open(self.path, "rb") as f:
+                    f.seek(self._offsets[start])
+                    entries = [json.loads(f.readline()) for _ in range(end - start)]
+        return (
+            [self.blobs.resolve(entry) for entry in entries]
+            if resolve_blobs
+            else entries
+        )
+
+
+class SessionStore:
+    """LRU store of sessions bounded by count, idle time and estimated memory.
+
+    Sessions are created by session_factory(session_id, store); they must
+    provide memory_bytes() and save_manifest() (called before eviction).
+    Evicted sessions are rebuilt from disk by the same factory. Requests hold
+    a lease() on their session so it is not evicted while they use it, which
+    would leave two live objects writing the same history files.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        root: Optional[str] = None,
+        max_sessions: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        disk_ttl_seconds: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.root = Path(
+            root
+            or os.getenv(
+                "SESSION_STORE_DIR",
+                os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), "session_data"
+                ),
+            )
+        )
+        self.max_sessions = max_sessions or int(
+            os.getenv("SESSION_MAX_IN_MEMORY", "200")
+        )
+        self.max_memory_bytes = (
+            max_memory_bytes
+            or int(os.getenv("SESSION_MAX_MEMORY_MB", "256")) * 1024 * 1024
+        )
+        self.ttl_seconds = ttl_seconds or int(
+            os.getenv("SESSION_IDLE_TTL_SECONDS", "1800")
+        )
+        self.disk_ttl_seconds = disk_ttl_seconds or int(
+            os.getenv("SESSION_DISK_TTL_SECONDS", str(7 * 24 * 3600))
+        )
+
+        self.blobs = BlobStore(self.root / "blobs")
+        self._sessions: "OrderedDict[str, object]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._leases: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._sweeper = None
+        self._evicted = 0
+
+    def session_dir(self, session_id: str) -> Path:
+        # Session ids come from URLs, so never use them as path components directly
+        return (
+            self.root
+            / "sessions"
+            / hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        )
+
+    def load_manifest(self, session_id: str) -> Optional[dict]:
+        try:
+            with open(self.session_dir(session_id) / MANIFEST_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save_manifest(self, session_id: str, manifest: dict):
+        directory = self.session_dir(session_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = directory / (MANIFEST_FILE + ".tmp")
+        tmp_path.write_text(json.dumps(manifest, default=str))
+        tmp_path.replace(directory / MANIFEST_FILE)
+
+    def open_history(self, session_id: str, name: str) -> SessionHistory:
+        return SessionHistory(
+            self.session_dir(session_id) / f"{name}.jsonl", self.blobs
+        )
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions:
+                return True
+        return (self.session_dir(session_id) / MANIFEST_FILE).exists()
+
+    def get(self, session_id: str):
+        """Return the session from memory or disk, or None if it does not exist"""
+        if session_id not in self:
+            return None
+        return self.get_or_create(session_id)
+
+    def get_or_create(self, session_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                self._last_used[session_id] = time.monotonic()
+                return session
+            session = self.session_factory(session_id, self)
+            self._sessions[session_id] = session
+            self._last_used[session_id] = time.monotonic()
+            while len(self._sessions) > self.max_sessions:
+                if not self._evict_oldest(keep=session_id):
+                    # Every other session is leased; go over the limit until one is released
+                    break
+            return session
+
+    @contextmanager
+    def lease(self, session_id: str, create: bool = True):
+        """Yield the session for the duration of a request, pinned in memory.
+
+        With create=False, yields None if the session does not exist.
+        """
+        with self._lock:
+            session = self.get_or_create(session_id) if create else self.get(session_id)
+            if session is not None:
+                self._leases[session_id] = self._leases.get(session_id, 0) + 1
+        try:
+            yield session
+        finally:
+            if session is not None:
+                with self._lock:
+                    remaining = self._leases.pop(session_id) - 1
+                    if remaining:
+                        self._leases[session_id] = remaining
+                    if session_id in self._last_used:
+                        self._last_used[session_id] = time.monotonic()
+
+    def _evictable(self, keep: Optional[str] = None) -> List[str]:
+        """Session ids without a lease, least recently used first"""
+        return [
+            session_id
+            for session_id in self._sessions
+            if session_id != keep and session_id not in self._leases
+        ]
+
+    def _evict(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self._last_used.pop(session_id, None)
+        self._evicted += 1
+        try:
+            session.save_manifest()
+        except OSError as e:
+            print(f"⚠️  Failed to save session {session_id} before eviction: {e}")
+
+    def _evict_oldest(self, keep: Optional[str] = None) -> bool:
+        """Evict the least recently used session without a lease, False if there is none"""
+        evictable = self._evictable(keep)
+        if not evictable:
+            return False
+        session_id = evictable[0]
+        print(f"💾 Evicting session {session_id} from memory (LRU)")
+        self._evict(session_id)
+        return True
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return sum(session.memory_bytes() for session in sessions)
+
+    def sweep(self):
+        """Evict idle sessions, then least recently used ones while over the memory budget"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                session_id
+                for session_id, last_used in self._last_used.items()
+                if now - last_used > self.ttl_seconds and session_id not in self._leases
+            ]
+            for session_id in idle:
+                print(f"💤 Evicting idle session {session_id} from memory")
+                self._evict(session_id)
+            usage = {
+                session_id: session.memory_bytes()
+                for session_id, session in self._sessions.items()
+            }
+            total = sum(usage.values())
+            for session_id in self._evictable():
+                if total <= self.max_memory_bytes or len(self._sessions) <= 1:
+                    break
+                total -= usage.get(session_id, 0)
+                print(f"💾 Evicting session {session_id} from memory (LRU)")
+                self._evict(session_id)
+
+    def prune_disk(self):
+        """Delete session directories and blobs unused for disk_ttl_seconds"""
+        cutoff = time.time() - self.disk_ttl_seconds
+        sessions_root = self.root / "sessions"
+        removed = 0
+        if sessions_root.exists():
+            for directory in sessions_root.iterdir():
+                try:
+                    newest = max(
+                        (path.stat().st_mtime for path in directory.iterdir()),
+                        default=0,
+                    )
+                except FileNotFoundError:
+                    continue
+                if newest < cutoff:
+                    shutil.rmtree(directory, ignore_errors=True)
+                    removed += 1
+        blobs = self.blobs.prune(self.disk_ttl_seconds)
+        if removed or blobs:
+            print(f"🧹 Pruned {removed} stored sessions and {blobs} blobs")
+
+    def start(self):
+        """Start the background sweeper"""
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def shutdown(self):
+        """Stop the sweeper and save every session's manifest"""
+        self._stop_event.set()
+        with self._lock:
+            for session in self._sessions.values():
+                try:
+                    session.save_manifest()
+                except OSError as e:
+                    print(f"⚠️  Failed to save session {session.session_id}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_memory = len(self._sessions)
+            leased = len(self._leases)
+        return {
+            "in_memory": in_memory,
+            "leased": leased,
+            "memory_bytes": self.memory_bytes(),
+            "evicted": self._evicted,
+        }
+
+    def _sweep_loop(self):
+        interval = min(60, self.ttl_seconds)
+        last_prune = 0.0
+        while not self._stop_event.wait(interval):
+            try:
+                self.sweep()
+                if time.monotonic() - last_prune > 3600:
+                    self.prune_disk()
+                    last_prune = time.monotonic()
+            except Exception as e:
+                print(f"⚠️  Session sweep failed: {e}")
@@ -13,6 +13,10 @@ lsof -ti:3000 | xargs kill -9 2>/dev/null || true
 echo "📄 Cleaning up log files..."
 rm -f backend.log frontend.log *.pid
 
+# Clean up stored session history and blobs
+echo "💾 Cleaning up stored sessions..."
+rm -rf backend/session_data
+
 # Clean up temporary files
 echo "🗑 Cleaning up temporary files..."
 find . -name "*.pyc" -delete
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for concurrent IDE sessions against a running backend.
+
+Opens N sessions in parallel, each running M executions one after another,
+and reports throughput, latency percentiles, time to first output chunk
+(WebSocket mode) and how many requests were rejected as busy (HTTP 429 or
+a WebSocket error with busy=true).
+
+Modes:
+  ws    execute_code over /ws/{session_id} (direct sandbox execution, streamed)
+  http  POST /api/execute-code (Strands executor agent for plain code)
+
+Usage:
+    python tests/benchmark_concurrent_sessions.py [--sessions 8] [--requests 3] [--mode ws]
+
+Start the backend first: cd backend && python main.py
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+import websockets
+
+DEFAULT_CODE = """import time
+start = time.time()
+for step in range(3):
+    print(f"step {step}: {sum(i * i for i in range(200000))}", flush=True)
+    time.sleep(0.5)
+print(f"done in {time.time() - start:.2f}s")
+"""
+
+
+async def run_ws_session(base_url: str, code: str, request_count: int, results: list):
+    session_id = f"bench-{uuid.uuid4()}"
+    ws_url = base_url.replace("http", "ws", 1) + f"/ws/{session_id}"
+    async with websockets.connect(ws_url, max_size=None) as websocket:
+        for _ in range(request_count):
+            start = time.perf_counter()
+            first_chunk = None
+            await websocket.send(json.dumps({"type": "execute_code", "code": code}))
+            while True:
+                message = json.loads(await websocket.recv())
+                if message["type"] == "execution_output" and first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                elif message["type"] in ("execution_result", "error"):
+                    results.append(
+                        {
+                            "latency": time.perf_counter() - start,
+                            "first_chunk": first_chunk,
+                            "ok": message.get("success", False),
+                            "busy": message.get("busy", False),
+                        }
+                    )
+                    break
+
+
+def post_execute(base_url: str, code: str, session_id: str) -> dict:
+    request = urllib.request.Request(
+        f"{base_url}/api/execute-code",
+        data=json.dumps({"code": code, "session_id": session_id}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=900) as response:
+            ok = json.loads(response.read()).get("success", False)
+            busy = False
+    except urllib.error.HTTPError as e:
+        ok, busy = False, e.code == 429
+    return {
+        "latency": time.perf_counter() - start,
+        "first_chunk": None,
+        "ok": ok,
+        "busy": busy,
+    }
+
+
+async def run_http_session(base_url: str, code: str, request_count: int, results: list):
+    session_id = f"bench-{uuid.uuid4()}"
+    for _ in range(request_count):
+        results.append(
+            await asyncio.to_thread(post_execute, base_url, code, session_id)
+        )
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def main_async(args):
+    code = DEFAULT_CODE
+    if args.code_file:
+        with open(args.code_file) as f:
+            code = f.read()
+    run_session = run_ws_session if args.mode == "ws" else run_http_session
+    results = []
+
+    print(
+        f"🚀 {args.sessions} sessions x {args.requests} executions ({args.mode}) against {args.url}"
+    )
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_session(args.url, code, args.requests, results)
+            for _ in range(args.sessions)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    completed = [result for result in results if result["ok"]]
+    latencies = [result["latency"] for result in completed]
+    first_chunks = [
+        result["first_chunk"]
+        for result in completed
+        if result["first_chunk"] is not None
+    ]
+
+    print("\n📊 Results")
+    print(f"   Wall time:        {elapsed:.2f}s")
+    print(f"   Completed:        {len(completed)}/{len(results)}")
+    print(f"   Rejected (busy):  {sum(1 for result in results if result['busy'])}")
+    print(f"   Throughput:       {len(completed) / elapsed:.2f} executions/s")
+    if latencies:
+        print(f"   Latency median:   {statistics.median(latencies):.2f}s")
+        print(f"   Latency p95:      {percentile(latencies, 0.95):.2f}s")
+    if first_chunks:
+        print(f"   First chunk p50:  {statistics.median(first_chunks):.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent IDE sessions")
+    parser.add_argument(
+        "--url", default="http://localhost:8000", help="Backend base URL"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=8, help="Number of concurrent sessions"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=3, help="Executions per session"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["ws", "http"],
+        default="ws",
+        help="Execution endpoint to load",
+    )
+    parser.add_argument(
+        "--code-file", help="Python file to execute instead of the default workload"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test that sessions with a request in flight survive the session sweeper
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from session_store import SessionStore
+
+
+class FakeSession:
+    """Minimal session with an on-disk history, like CodeInterpreterSession"""
+
+    def __init__(self, session_id, store):
+        self.session_id = session_id
+        self.conversation_history = store.open_history(session_id, "conversation")
+
+    def memory_bytes(self):
+        return 1024 * 1024
+
+    def save_manifest(self):
+        pass
+
+
+def make_store(**kwargs):
+    return SessionStore(
+        FakeSession, root=tempfile.mkdtemp(prefix="session-store-test-"), **kwargs
+    )
+
+
+def test_sweep_skips_session_with_request_in_flight():
+    """An idle, over-budget session is not evicted while a request holds its lease"""
+    print("🔍 Testing sweeper during an in-flight request")
+    store = make_store(ttl_seconds=1, max_memory_bytes=1)
+    agent_started = threading.Event()
+    sweep_done = threading.Event()
+    seen = {}
+
+    def request():
+        with store.lease("busy") as session:
+            session.conversation_history.append({"type": "generation", "step": 1})
+            agent_started.set()
+            # Stands in for the agent call awaited inside the handler
+            sweep_done.wait(timeout=5)
+            session.conversation_history.append({"type": "generation", "step": 2})
+            seen["session"] = session
+
+    worker = threading.Thread(target=request)
+    worker.start()
+    assert agent_started.wait(timeout=5)
+
+    # Make the leased session idle and over the memory budget, then sweep
+    store.get_or_create("other")
+    with store._lock:
+        for session_id in store._last_used:
+            store._last_used[session_id] = time.monotonic() - 60
+    store.sweep()
+    assert "busy" in store._sessions, "leased session was evicted"
+    assert "other" not in store._sessions
+    sweep_done.set()
+    worker.join(timeout=5)
+
+    # A concurrent request gets the same object, so history offsets stay consistent
+    assert store.get_or_create("busy") is seen["session"]
+    history = seen["session"].conversation_history
+    assert [entry["step"] for entry in history.page(0, 10)] == [1, 2]
+    print("✅ Leased session kept in memory")
+
+
+def test_released_session_can_be_evicted():
+    """Once the request ends, the session is evicted as usual"""
+    print("🔍 Testing eviction after the lease is released")
+    store = make_store(max_sessions=1)
+    with store.lease("first"):
+        store.get_or_create("second")
+        assert set(store._sessions) == {"first", "second"}
+    store.get_or_create("third")
+    assert "first" not in store._sessions
+    assert store.stats()["leased"] == 0
+    print("✅ Released session evicted")
+
+
+if __name__ == "__main__":
+    test_sweep_skips_session_with_request_in_flight()
+    test_released_session_can_be_evicted()
+    print("\n🎉 All session store tests passed")